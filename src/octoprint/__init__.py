@@ -823,6 +823,8 @@ def init_pluginsystem(
         plugin_validators.append(safe_mode_validator)
 
     compatibility_ignored_list = settings.get(["plugins", "_forcedCompatible"])
+    plugin_lazy_activation = settings.getBoolean(["plugins", "_lazyActivation"])
+    plugin_budgets = settings.get(["plugins", "_budgets"], merged=True)
 
     from octoprint.plugin import plugin_manager
 
@@ -836,6 +838,8 @@ def init_pluginsystem(
         plugin_validators=plugin_validators,
         compatibility_ignored_list=compatibility_ignored_list,
         plugin_flags=plugin_flags,
+        plugin_lazy_activation=plugin_lazy_activation,
+        plugin_budgets=plugin_budgets,
     )
 
     settings_overlays = {}
@@ -7,7 +7,7 @@ import os
 from functools import partial
 
 from octoprint.access import ADMIN_GROUP, GUEST_GROUP, READONLY_GROUP, USER_GROUP
-from octoprint.access.permissions import OctoPrintPermission, Permissions
+from octoprint.access.permissions import OctoPrintPermission, Permissions, needs_catalog
 from octoprint.settings import settings
 from octoprint.util import atomic_write, yaml
 from octoprint.vendor.flask_principal import Need, Permission
@@ -306,6 +306,7 @@ class FilebasedGroupManager(GroupManager):
 
                 for group in self._groups.values():
                     group._subgroups = self._to_groups(*group._subgroups)
+                needs_catalog.changed()
 
                 if self._dirty:
                     self._save()
@@ -566,6 +567,8 @@ class Group:
         self._changeable = changeable
         self._toggleable = toggleable
 
+        self._needs = None
+
     def as_dict(self):
         from octoprint.access.permissions import OctoPrintPermission
 
@@ -632,6 +635,9 @@ class Group:
                 self._permissions.append(permission)
                 dirty = True
 
+        if dirty:
+            self._changed()
+
         return dirty
 
     def remove_permissions_from_group(self, permissions):
@@ -651,6 +657,9 @@ class Group:
                 self._permissions.remove(permission)
                 dirty = True
 
+        if dirty:
+            self._changed()
+
         return dirty
 
     def has_subgroup_transitive(self, key, seen=None):
@@ -688,6 +697,9 @@ class Group:
                 self._subgroups.append(group)
                 dirty = True
 
+        if dirty:
+            self._changed()
+
         return dirty
 
     def remove_subgroups_from_group(self, subgroups):
@@ -707,6 +719,9 @@ class Group:
                 self._subgroups.remove(group)
                 dirty = True
 
+        if dirty:
+            self._changed()
+
         return dirty
 
     def change_default(self, default):
@@ -733,20 +748,38 @@ class Group:
 
     @property
     def needs(self):
-        needs = set()
-        needs.add(GroupNeed(self.key))
-        for p in self.permissions:
-            needs = needs.union(p.needs)
-        for g in self.subgroups:
-            needs = needs.union(g.needs)
-
-        return needs
+        return self._effective_needs()[0]
 
     def has_permission(self, permission):
         if Permissions.ADMIN.get_name() in self._permissions:
             return True
 
-        return permission.needs.issubset(self.needs)
+        return self.has_needs(*permission.needs)
+
+    def has_needs(self, *needs):
+        mask = needs_catalog.mask(needs)
+        return self._effective_needs()[1] & mask == mask
+
+    def _effective_needs(self):
+        generation = needs_catalog.generation
+
+        cached = self._needs
+        if cached is None or cached[0] != generation:
+            needs = {GroupNeed(self.key)}
+            for p in self.permissions:
+                needs.update(p.needs)
+            for g in self.subgroups:
+                needs.update(g.needs)
+
+            needs = frozenset(needs)
+            cached = self._needs = (generation, needs, needs_catalog.mask(needs))
+
+        return cached[1:]
+
+    def _changed(self):
+        # not only our own cached needs are outdated now, but also those of all groups and
+        # users containing this group
+        needs_catalog.changed()
 
     def __repr__(self):
         return (
@@ -2,6 +2,7 @@ __author__ = "Marc Hannappel <salandora@gmail.com>"
 __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
 __copyright__ = "Copyright (C) 2017 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
+import threading
 from collections import OrderedDict, defaultdict
 from functools import wraps
 
@@ -12,6 +13,45 @@ from octoprint.access import ADMIN_GROUP, READONLY_GROUP, USER_GROUP
 from octoprint.vendor.flask_principal import Need, Permission, PermissionDenied, RoleNeed
 
 
+class NeedsCatalog:
+    """
+    Assigns each need a bit, so that sets of needs can be represented and compared as plain
+    ``int`` bitmasks.
+
+    Users and groups cache their effective needs together with the :attr:`generation` they
+    were computed at. Anything that might change the effective needs of other principals,
+    like changes to groups or newly registered permissions, calls :meth:`changed`, which
+    makes all those caches rebuild on next access.
+    """
+
+    def __init__(self):
+        self._bits = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def changed(self):
+        with self._lock:
+            self._generation += 1
+
+    def mask(self, needs):
+        """The bitmask of ``needs``, assigning bits to needs not seen so far."""
+        mask = 0
+        for need in needs:
+            bit = self._bits.get(need)
+            if bit is None:
+                with self._lock:
+                    bit = self._bits.setdefault(need, 1 << len(self._bits))
+            mask |= bit
+        return mask
+
+
+needs_catalog = NeedsCatalog()
+
+
 class OctoPrintPermission(Permission):
     @classmethod
     def convert_needs_to_dict(cls, needs):
@@ -226,6 +266,9 @@ class PermissionsMetaClass(type):
             value.key = key
             cls.permissions[key] = value
 
+            # admins get all permissions, including this one
+            needs_catalog.changed()
+
     def __getattr__(cls, key):
         permission = cls.permissions.get(key)
 
@@ -312,6 +355,15 @@ class Permissions(metaclass=PermissionsMetaClass):
         dangerous=True,
     )
 
+    METRICS = OctoPrintPermission(
+        "Metrics",
+        gettext(
+            "Allows to retrieve internal performance metrics, e.g. for monitoring "
+            "through Prometheus"
+        ),
+        RoleNeed("metrics"),
+    )
+
     FILES_LIST = OctoPrintPermission(
         "File List",
         gettext(
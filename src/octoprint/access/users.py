@@ -14,7 +14,7 @@ from flask_login import AnonymousUserMixin, UserMixin
 from werkzeug.local import LocalProxy
 
 from octoprint.access.groups import Group, GroupChangeListener
-from octoprint.access.permissions import OctoPrintPermission, Permissions
+from octoprint.access.permissions import OctoPrintPermission, Permissions, needs_catalog
 from octoprint.settings import settings as s
 from octoprint.util import atomic_write, generate_api_key, to_bytes, yaml
 from octoprint.util import get_fully_qualified_classname as fqcn
@@ -538,6 +538,7 @@ class FilebasedUserManager(UserManager):
 
     def _refresh_groups(self, user):
         user._groups = self._to_groups(*(g.key for g in user.groups))
+        user._invalidate_needs()
 
     def add_user(
         self,
@@ -944,6 +945,8 @@ class User(UserMixin):
 
         self._settings = settings
 
+        self._needs = None
+
     @property
     def is_active(self):
         return self._active
@@ -1042,6 +1045,9 @@ class User(UserMixin):
                 self._permissions.append(permission)
                 dirty = True
 
+        if dirty:
+            self._invalidate_needs()
+
         return dirty
 
     def remove_permissions_from_user(self, permissions):
@@ -1057,6 +1063,9 @@ class User(UserMixin):
                 self._permissions.remove(permission)
                 dirty = True
 
+        if dirty:
+            self._invalidate_needs()
+
         return dirty
 
     def add_groups_to_user(self, groups):
@@ -1072,6 +1081,9 @@ class User(UserMixin):
                 self._groups.append(group)
                 dirty = True
 
+        if dirty:
+            self._invalidate_needs()
+
         return dirty
 
     def remove_groups_from_user(self, groups):
@@ -1087,6 +1099,9 @@ class User(UserMixin):
                 self._groups.remove(group)
                 dirty = True
 
+        if dirty:
+            self._invalidate_needs()
+
         return dirty
 
     @property
@@ -1113,23 +1128,37 @@ class User(UserMixin):
 
     @property
     def needs(self):
-        needs = set()
-
-        for permission in self.permissions:
-            if permission is not None:
-                needs = needs.union(permission.needs)
-
-        for group in self.groups:
-            if group is not None:
-                needs = needs.union(group.needs)
-
-        return needs
+        return self._effective_needs()[0]
 
     def has_permission(self, permission):
         return self.has_needs(*permission.needs)
 
     def has_needs(self, *needs):
-        return set(needs).issubset(self.needs)
+        mask = needs_catalog.mask(needs)
+        return self._effective_needs()[1] & mask == mask
+
+    def _effective_needs(self):
+        generation = needs_catalog.generation
+
+        cached = self._needs
+        if cached is None or cached[0] != generation:
+            needs = set()
+
+            for permission in self.permissions:
+                if permission is not None:
+                    needs.update(permission.needs)
+
+            for group in self.groups:
+                if group is not None:
+                    needs.update(group.needs)
+
+            needs = frozenset(needs)
+            cached = self._needs = (generation, needs, needs_catalog.mask(needs))
+
+        return cached[1:]
+
+    def _invalidate_needs(self):
+        self._needs = None
 
     def __repr__(self):
         return (
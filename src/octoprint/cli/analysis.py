@@ -78,6 +78,7 @@ def cli():
 @click.option("--bed-z", "bedz", type=float, default=0)
 @click.option("--progress", "progress", is_flag=True)
 @click.option("--layers", "layers", is_flag=True)
+@click.option("--time-index", "time_index", is_flag=True)
 @click.argument("path", type=click.Path())
 def gcode_command(
     path,
@@ -92,6 +93,7 @@ def gcode_command(
     bedz,
     progress,
     layers,
+    time_index,
 ):
     """Runs a GCODE file analysis."""
 
@@ -124,7 +126,11 @@ def gcode_command(
         def progress_callback(percentage):
             click.echo(f"PROGRESS:{percentage}")
 
-    interpreter = gcode(progress_callback=progress_callback, incl_layers=layers)
+    interpreter = gcode(
+        progress_callback=progress_callback,
+        incl_layers=layers,
+        incl_time_index=time_index,
+    )
 
     interpreter.load(
         path,
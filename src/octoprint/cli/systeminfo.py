@@ -117,6 +117,17 @@ def get_systeminfo_bundle(systeminfo, logbase, printer=None, plugin_manager=None
         if os.path.exists(logpath):
             z.add_path(logpath, arcname=log)
 
+    # add samples of the sampling profiler, if it's running
+    from octoprint.util.profiler import get_profiler
+
+    profiler = get_profiler()
+    if profiler is not None:
+        z.add(to_bytes(profiler.folded()), arcname="profile.folded")
+        z.add(
+            to_bytes("\n".join(f"{k}: {v}" for k, v in sorted(profiler.stats().items()))),
+            arcname="profile.txt",
+        )
+
     # add additional bundle contents from bundled plugins
     if plugin_manager:
         for name, hook in plugin_manager.get_hooks(
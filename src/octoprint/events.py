@@ -10,13 +10,24 @@ import re
 import shlex
 import subprocess
 import threading
+import time
 
 import octoprint.plugin
 from octoprint.settings import settings
+from octoprint.util import metrics
 
 # singleton
 _instance = None
 
+_queue_depth = metrics.gauge(
+    "octoprint_event_queue_depth", "Number of events waiting to be dispatched"
+)
+_listener_seconds = metrics.histogram(
+    "octoprint_event_listener_seconds",
+    "Time spent by event listeners processing an event",
+    labelnames=("listener",),
+)
+
 
 def all_events():
     return [
@@ -175,6 +186,8 @@ class EventManager:
         self._queue = queue.Queue()
         self._held_back = queue.Queue()
 
+        _queue_depth.set_function(lambda: self._queue.qsize() + self._held_back.qsize())
+
         self._worker = threading.Thread(target=self._work)
         self._worker.daemon = True
         self._worker.start()
@@ -195,6 +208,7 @@ class EventManager:
 
                 for listener in eventListeners:
                     self._logger.debug(f"Sending action to {listener!r}")
+                    start = time.monotonic()
                     try:
                         listener(event, payload)
                     except Exception:
@@ -203,11 +217,30 @@ class EventManager:
                                 event, payload, listener
                             )
                         )
+                    finally:
+                        _listener_seconds.labels(_listener_name(listener)).observe(
+                            time.monotonic() - start
+                        )
+
+                # make sure plugins waiting for this event are active before dispatching it
+                octoprint.plugin.plugin_manager().activate_lazy_plugins(f"event:{event}")
+
+                # handlers are called one after the other, so the time between two
+                # callbacks is the time the respective handler took
+                last = time.monotonic()
+
+                def on_handled(name, *args):
+                    nonlocal last
+                    now = time.monotonic()
+                    _listener_seconds.labels(f"plugin:{name}").observe(now - last)
+                    last = now
 
                 octoprint.plugin.call_plugin(
                     octoprint.plugin.types.EventHandlerPlugin,
                     "on_event",
                     args=(event, payload),
+                    callback=on_handled,
+                    error_callback=on_handled,
                 )
             self._logger.info("Event loop shut down")
         except Exception:
@@ -279,6 +312,13 @@ class EventManager:
         return self._worker.is_alive()
 
 
+def _listener_name(listener):
+    name = getattr(listener, "__qualname__", None)
+    if name is None:
+        name = type(listener).__qualname__
+    return f"{getattr(listener, '__module__', None) or ''}.{name}".lstrip(".")
+
+
 class GenericEventListener:
     """
     The GenericEventListener can be subclassed to easily create custom event listeners.
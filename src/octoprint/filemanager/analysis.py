@@ -12,10 +12,22 @@ import time
 
 from octoprint.events import Events, eventManager
 from octoprint.settings import settings
-from octoprint.util import dict_merge, yaml
+from octoprint.util import dict_merge, metrics, yaml
 from octoprint.util import get_fully_qualified_classname as fqcn
 from octoprint.util.platform import CLOSE_FDS
 
+_backlog = metrics.gauge(
+    "octoprint_analysis_queue_backlog",
+    "Number of files waiting for or in analysis",
+    labelnames=("type",),
+)
+_duration_seconds = metrics.histogram(
+    "octoprint_analysis_duration_seconds",
+    "Time needed to analyse a file",
+    labelnames=("type",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
 EMPTY_RESULT = {
     "_empty": True,
     "printingArea": {
@@ -93,6 +105,8 @@ class AnalysisQueue:
         self._queues = {}
         for key, queue_factory in queue_factories.items():
             self._queues[key] = queue_factory(self._analysis_finished)
+            if hasattr(self._queues[key], "backlog"):
+                _backlog.labels(key).set_function(self._queues[key].backlog)
 
     def register_finish_callback(self, callback):
         self._callbacks.append(callback)
@@ -250,6 +264,13 @@ class AbstractAnalysisQueue:
             self._done.wait()
             self._done.clear()
 
+    def backlog(self):
+        """
+        Returns the number of entries waiting for analysis, including the one
+        currently being analysed.
+        """
+        return self._queue.qsize() + (1 if self._current is not None else 0)
+
     def pause(self):
         """
         Pauses processing of the queue, e.g. when a print is active.
@@ -325,10 +346,10 @@ class AbstractAnalysisQueue:
                 result = self._do_analysis(high_priority=high_priority)
             except TypeError:
                 result = self._do_analysis()
+            duration = time.monotonic() - start_time
+            _duration_seconds.labels(entry.type).observe(duration)
             self._logger.info(
-                "Analysis of entry {} finished, needed {:.2f}s".format(
-                    entry, time.monotonic() - start_time
-                )
+                "Analysis of entry {} finished, needed {:.2f}s".format(entry, duration)
             )
             self._finished_callback(self._current, result)
         except RuntimeError as exc:
@@ -420,6 +441,9 @@ class GcodeAnalysisQueue(AbstractAnalysisQueue):
          * Depth of the travel area along the Y axis, in mm
        - * ``travelDimensions.height``
          * Height of the travel area along the Z axis, in mm
+       - * ``timeIndex``
+         * Planned print time and layer at positions throughout the file, see
+           :class:`~octoprint.util.gcodeInterpreter.TimeIndex`
     """
 
     def __init__(self, finished_callback):
@@ -473,6 +497,7 @@ class GcodeAnalysisQueue(AbstractAnalysisQueue):
                 f"--throttle={throttle}",
                 f"--throttle-lines={throttle_lines}",
                 f"--bed-z={bed_z}",
+                "--time-index",
             ]
             for offset in offsets[1:]:
                 command += ["--offset", str(offset[0]), str(offset[1])]
@@ -538,6 +563,8 @@ class GcodeAnalysisQueue(AbstractAnalysisQueue):
                 result["travelDimensions"] = analysis["travel_dimensions"]
                 if analysis["total_time"]:
                     result["estimatedPrintTime"] = analysis["total_time"] * 60
+                if analysis.get("time_index"):
+                    result["timeIndex"] = analysis["time_index"]
                 if analysis["extrusion_length"]:
                     result["filament"] = {}
                     for i in range(len(analysis["extrusion_length"])):
@@ -589,6 +589,7 @@ class StorageInterface:
 
         duration_estimate = None
         filament_estimate = {}
+        time_index = None
 
         if entry.metadata and entry.metadata.analysis:
             if entry.metadata.analysis.estimatedPrintTime:
@@ -600,6 +601,8 @@ class StorageInterface:
                     k: FilamentEstimate(length=v.length, volume=v.volume, weight=v.weight)
                     for k, v in entry.metadata.analysis.filament.items()
                 }
+            if entry.metadata.analysis.additional:
+                time_index = entry.metadata.analysis.additional.get("timeIndex")
 
         return PrintJob(
             storage=self.storage,
@@ -611,6 +614,7 @@ class StorageInterface:
             duration_estimate=duration_estimate,
             filament_estimate=filament_estimate,
             path_on_disk=path_on_disk,
+            time_index=time_index,
             params=params,
         )
 
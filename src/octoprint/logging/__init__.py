@@ -56,6 +56,45 @@ def log_to_handler(logger, handler, level, msg, exc_info=None, extra=None, *args
             handler.handle(record)
 
 
+def log_batch(logger, level, entries):
+    """
+    Logs a batch of messages to the provided logger's own handlers, preserving their timestamps.
+
+    Handlers supporting it (see :class:`~octoprint.logging.handlers.AsyncLogHandlerMixin`) get the whole
+    batch in one go, all others record by record. The records are not propagated to parent loggers.
+
+    Arguments:
+            logger: logger to log to
+            level: level to log at
+            entries: iterable of ``(timestamp, message)`` tuples, timestamps as returned by ``time.time()``
+    """
+    if logger.disabled or not logger.isEnabledFor(level):
+        return
+
+    records = []
+    for created, msg in entries:
+        record = logger.makeRecord(logger.name, level, "(unknown file)", 0, msg, (), None)
+        record.relativeCreated += (created - record.created) * 1000
+        record.created = created
+        record.msecs = int((created - int(created)) * 1000) + 0.0
+        if logger.filter(record):
+            records.append(record)
+
+    if not records:
+        return
+
+    for handler in logger.handlers:
+        batch = [record for record in records if record.levelno >= handler.level]
+        if not batch:
+            continue
+
+        if callable(getattr(handler, "handle_batch", None)):
+            handler.handle_batch(batch)
+        else:
+            for record in batch:
+                handler.handle(record)
+
+
 def get_handler(name, logger=None):
     """
     Retrieves the handler named ``name``.
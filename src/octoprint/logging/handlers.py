@@ -8,6 +8,7 @@ import time
 class AsyncLogHandlerMixin(logging.Handler):
     def __init__(self, *args, **kwargs):
         self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._batching = False
         super().__init__(*args, **kwargs)
 
     def emit(self, record):
@@ -19,10 +20,46 @@ class AsyncLogHandlerMixin(logging.Handler):
         except Exception:
             self.handleError(record)
 
+    def handle_batch(self, records):
+        """
+        Emits a batch of records with a single executor submission and a single flush.
+
+        Filtering happens right away, just like in ``handle``.
+        """
+        if getattr(self._executor, "_shutdown", False):
+            return
+
+        records = [record for record in records if self.filter(record)]
+        if not records:
+            return
+
+        try:
+            self._executor.submit(self._emit_batch, records)
+        except Exception:
+            for record in records:
+                self.handleError(record)
+
+    def flush(self):
+        if self._batching:
+            return
+        # noinspection PyUnresolvedReferences
+        super().flush()
+
     def _emit(self, record):
         # noinspection PyUnresolvedReferences
         super().emit(record)
 
+    def _emit_batch(self, records):
+        with self.lock:
+            self._batching = True
+            try:
+                for record in records:
+                    # noinspection PyUnresolvedReferences
+                    super().emit(record)
+            finally:
+                self._batching = False
+            self.flush()
+
     def close(self):
         self._executor.shutdown(wait=True)
         super().close()
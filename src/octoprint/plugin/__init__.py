@@ -53,6 +53,8 @@ def plugin_manager(
     plugin_flags=None,
     plugin_validators=None,
     compatibility_ignored_list=None,
+    plugin_lazy_activation=True,
+    plugin_budgets=None,
 ):
     """
     Factory method for initially constructing and consecutively retrieving the :class:`~octoprint.plugin.core.PluginManager`
@@ -88,6 +90,10 @@ def plugin_manager(
         plugin_validators (list): A list of additional plugin validators through which to process each plugin.
         compatibility_ignored_list (list): A list of plugin keys for which it will be ignored if they are flagged as
             incompatible. This is for development purposes only and should not be used in production.
+        plugin_lazy_activation (boolean): Whether plugins declaring activation triggers should be imported lazily on
+            the first such trigger (True, default) or right away during startup (False).
+        plugin_budgets (dict): A dict mapping hook names and mixin methods (wildcards allowed) to the maximum time in
+            ms a single call into a plugin may take before a warning gets logged.
 
     Returns:
         PluginManager: A fully initialized :class:`~octoprint.plugin.core.PluginManager` instance to be used for plugin
@@ -141,6 +147,8 @@ def plugin_manager(
                 plugin_flags=plugin_flags,
                 plugin_validators=plugin_validators,
                 compatibility_ignored_list=compatibility_ignored_list,
+                plugin_lazy_activation=plugin_lazy_activation,
+                plugin_budgets=plugin_budgets,
             )
         else:
             raise ValueError("Plugin Manager not initialized yet")
@@ -600,6 +608,18 @@ class PluginSettings:
     def clean_all_data(self):
         self.settings.remove(self._prefix_path())
 
+    def mark_changed(self):
+        """
+        Signals that the data the plugin returns from :meth:`~octoprint.plugin.SettingsPlugin.on_settings_load`
+        changed without going through the settings, e.g. because it includes values the plugin keeps elsewhere.
+
+        Clients revalidating their cached copy of the settings will then fetch them again. Changes made through the
+        setters of this class are detected automatically.
+
+        Directly forwards to :func:`octoprint.settings.Settings.bump_generation`.
+        """
+        self.settings.bump_generation()
+
     def __getattr__(self, item):
         all_access_methods = list(self.access_methods.keys()) + list(
             self.deprecated_access_methods.keys()
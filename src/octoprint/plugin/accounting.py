@@ -0,0 +1,267 @@
+"""
+Accounting of the time plugins spend in their hooks and mixin methods.
+
+The :class:`~octoprint.plugin.core.PluginManager` wraps every hook handler and
+mixin method it hands out, so that all calls into plugin code, no matter whether
+they come from :func:`~octoprint.plugin.call_plugin`, the communication layer or
+the event bus, are recorded per plugin and entry point.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import collections
+import fnmatch
+import functools
+import logging
+import math
+import threading
+import time
+
+
+class PluginCallStats:
+    """
+    Statistics of the calls into one entry point of one plugin.
+
+    Arguments:
+        plugin (str): identifier of the plugin
+        entry_point (str): hook name or mixin method, e.g. ``EventHandlerPlugin.on_event``
+        budget (float): wall time in ms a single call may take before it gets
+            logged, or None
+        samples (int): number of recent durations to keep for the percentiles
+    """
+
+    def __init__(self, plugin, entry_point, budget=None, samples=1000):
+        self.plugin = plugin
+        self.entry_point = entry_point
+        self.budget = budget
+
+        self._recent = collections.deque(maxlen=samples)
+        self._mutex = threading.Lock()
+
+        self._last_warning = None
+        self._suppressed = 0
+
+        self.reset()
+
+    def reset(self):
+        """Clears all recorded calls."""
+        with self._mutex:
+            self.calls = 0
+            self.exceptions = 0
+            self.total = 0.0
+            self.cpu = 0.0
+            self.max = 0.0
+            self.over_budget = 0
+            self._recent.clear()
+
+    def record(self, duration, cpu=None, exception=False):
+        """
+        Records a call that took ``duration`` ms of wall time (and ``cpu`` ms of
+        CPU time).
+
+        Returns:
+            bool: whether the call exceeded the budget
+        """
+        with self._mutex:
+            self.calls += 1
+            self.total += duration
+            if cpu is not None:
+                self.cpu += cpu
+            if duration > self.max:
+                self.max = duration
+            if exception:
+                self.exceptions += 1
+            self._recent.append(duration)
+
+            if self.budget is not None and duration > self.budget:
+                self.over_budget += 1
+                return True
+        return False
+
+    def percentile(self, percentile):
+        """Returns the ``percentile`` of the most recent call durations, in ms."""
+        with self._mutex:
+            recent = sorted(self._recent)
+        if not recent:
+            return 0.0
+        index = max(0, math.ceil(percentile / 100 * len(recent)) - 1)
+        return recent[index]
+
+    def as_dict(self):
+        return {
+            "plugin": self.plugin,
+            "entry_point": self.entry_point,
+            "calls": self.calls,
+            "exceptions": self.exceptions,
+            "total": self.total,
+            "cpu": self.cpu,
+            "p99": self.percentile(99),
+            "max": self.max,
+            "budget": self.budget,
+            "over_budget": self.over_budget,
+        }
+
+
+class PluginAccounting:
+    """
+    Keeps the :class:`PluginCallStats` of all plugins and wraps plugin callables to
+    record them.
+
+    Arguments:
+        budgets (dict): maximum wall time in ms per call, by entry point pattern
+            (``fnmatch`` syntax, e.g. ``octoprint.comm.protocol.gcode.*``)
+        timings_logtarget (str): logger prefix to log every call's timing to on
+            debug level, extended by the called function's name
+        timings_message (str): message to log every call's timing with
+        warning_interval (float): minimum seconds between two log warnings about
+            the same entry point of the same plugin exceeding its budget
+    """
+
+    def __init__(
+        self,
+        budgets=None,
+        timings_logtarget=None,
+        timings_message="{func} - {timing:05.2f}ms",
+        warning_interval=60.0,
+    ):
+        self._logger = logging.getLogger(__name__)
+
+        self.budgets = dict(budgets) if budgets else {}
+        self.timings_logtarget = timings_logtarget
+        self.timings_message = timings_message
+        self.warning_interval = warning_interval
+
+        self._stats = {}
+        self._mutex = threading.Lock()
+
+    def get(self, plugin, entry_point):
+        """Returns the :class:`PluginCallStats` for ``plugin`` and ``entry_point``."""
+        key = (plugin, entry_point)
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._mutex:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = PluginCallStats(
+                        plugin, entry_point, budget=self.budget_for(entry_point)
+                    )
+        return stats
+
+    def budget_for(self, entry_point):
+        """Returns the budget in ms configured for ``entry_point``, or None."""
+        budget = self.budgets.get(entry_point)
+        if budget is None:
+            for pattern, value in self.budgets.items():
+                if fnmatch.fnmatch(entry_point, pattern):
+                    budget = value
+                    break
+        return budget
+
+    def record(self, plugin, entry_point, duration, cpu=None, exception=False):
+        """
+        Records a call into ``entry_point`` of ``plugin`` that took ``duration`` ms,
+        logging a warning if it exceeded the budget.
+        """
+        stats = self.get(plugin, entry_point)
+        if stats.record(duration, cpu=cpu, exception=exception):
+            self._warn_over_budget(stats, duration)
+
+    def wrap(self, plugin, entry_point, f):
+        """Wraps ``f`` so that all calls to it get recorded."""
+        stats = self.get(plugin, entry_point)
+
+        timings_logger = None
+        func = None
+        if self.timings_logtarget:
+            func = _fqfn(f)
+            timings_logger = logging.getLogger(self.timings_logtarget + "." + func)
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            exception = False
+            start = time.perf_counter()
+            start_cpu = time.thread_time()
+            try:
+                return f(*args, **kwargs)
+            except BaseException:
+                exception = True
+                raise
+            finally:
+                duration = (time.perf_counter() - start) * 1000
+                if stats.record(
+                    duration,
+                    cpu=(time.thread_time() - start_cpu) * 1000,
+                    exception=exception,
+                ):
+                    self._warn_over_budget(stats, duration)
+
+                if timings_logger is not None and timings_logger.isEnabledFor(
+                    logging.DEBUG
+                ):
+                    data = {
+                        "func": func,
+                        "func_args": "?",
+                        "func_kwargs": "?",
+                        "timing": duration,
+                    }
+                    timings_logger.debug(self.timings_message.format(**data), extra=data)
+
+        return wrapper
+
+    def stats(self, plugin=None):
+        """
+        Returns the stats of all plugins or only ``plugin`` as dicts, most time
+        consuming first. Entry points that haven't been called are left out.
+        """
+        with self._mutex:
+            stats = list(self._stats.values())
+
+        return sorted(
+            (
+                s.as_dict()
+                for s in stats
+                if s.calls and (plugin is None or s.plugin == plugin)
+            ),
+            key=lambda s: s["total"],
+            reverse=True,
+        )
+
+    def reset(self, plugin=None):
+        """Clears the recorded calls of all plugins or only ``plugin``."""
+        with self._mutex:
+            stats = list(self._stats.values())
+
+        for s in stats:
+            if plugin is None or s.plugin == plugin:
+                s.reset()
+
+    def _warn_over_budget(self, stats, duration):
+        now = time.monotonic()
+        if (
+            stats._last_warning is not None
+            and now - stats._last_warning < self.warning_interval
+        ):
+            stats._suppressed += 1
+            return
+
+        message = (
+            f"Plugin {stats.plugin} took {duration:.2f}ms in {stats.entry_point}, "
+            f"exceeding its budget of {stats.budget}ms"
+        )
+        if stats._suppressed:
+            message += f" ({stats._suppressed} more times since the last warning)"
+        self._logger.warning(message, extra={"plugin": stats.plugin})
+
+        stats._last_warning = now
+        stats._suppressed = 0
+
+
+def _fqfn(f):
+    if hasattr(f, "__self__"):
+        # bound method
+        return "{}.{}.{}".format(
+            f.__self__.__class__.__module__, f.__self__.__class__.__name__, f.__name__
+        )
+    else:
+        return f"{f.__module__}.{f.__name__}"
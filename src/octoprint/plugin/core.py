@@ -37,7 +37,8 @@ from os import scandir
 
 from packaging.specifiers import SpecifierSet
 
-from octoprint.util import deprecated, sv, time_this, to_unicode
+from octoprint.plugin.accounting import PluginAccounting
+from octoprint.util import deprecated, sv, to_unicode
 from octoprint.util.version import get_python_version_string, is_python_compatible
 
 SUFFIXES = importlib.machinery.SOURCE_SUFFIXES + importlib.machinery.BYTECODE_SUFFIXES
@@ -162,6 +163,15 @@ def parse_plugin_metadata(path):
 
                     break
 
+        for key in (ControlProperties.attr_activation,):
+            for a in reversed(assignments):
+                targets = extract_target_ids(a)
+                if key in targets:
+                    if isinstance(a.value, (ast.List, ast.Tuple)):
+                        values = [extract_value(x) for x in a.value.elts]
+                        result[key] = [x for x in values if isinstance(x, str) and x]
+                    break
+
         for a in reversed(all_relevant):
             targets = extract_names(a)
             if any(x in targets for x in ControlProperties.all()):
@@ -221,6 +231,17 @@ class ControlProperties:
     and similar places.
     """
 
+    attr_activation = "__plugin_activation__"
+    """
+    Module attribute from which to retrieve the triggers upon which to lazily activate the plugin.
+
+    If set to a list of trigger strings, the plugin module will not be imported during startup but only
+    once the first of those triggers fires. Supported triggers are ``hook:<hook name>``, ``implementation:<mixin name>``,
+    ``event:<event name>`` and ``blueprint``, all but the last supporting :func:`fnmatch.fnmatch` patterns.
+
+    Must be a list of plain string literals, as it's evaluated from the plugin's AST.
+    """
+
     attr_hooks = "__plugin_hooks__"
     """ Module attribute from which to retrieve the plugin's provided hooks. """
 
@@ -393,6 +414,9 @@ class PluginInfo:
         self.invalid_syntax = False
         """Whether invalid syntax was encountered while trying to load this plugin."""
 
+        self.lazy = False
+        """Whether this plugin is lazily activated and its module has not yet been imported."""
+
         self.flags = []
         """Additional flags assigned to the plugin through config."""
 
@@ -682,6 +706,19 @@ class PluginInfo:
             ControlProperties.attr_hidden, default=False, incl_metadata=True
         )
 
+    @property
+    def activation(self):
+        """
+        Lazy activation triggers of the plugin module as defined in :attr:`attr_activation` if available, otherwise
+        an empty list is returned.
+
+        Returns:
+            list: Lazy activation triggers of the plugin
+        """
+        return self._get_instance_attribute(
+            ControlProperties.attr_activation, default=[], incl_metadata=True
+        )
+
     @property
     def hooks(self):
         """
@@ -858,6 +895,8 @@ class PluginManager:
         plugin_flags=None,
         plugin_validators=None,
         compatibility_ignored_list=None,
+        plugin_lazy_activation=True,
+        plugin_budgets=None,
     ):
         self.logger = logging.getLogger(__name__)
 
@@ -909,6 +948,13 @@ class PluginManager:
         self.compatibility_ignored_list = compatibility_ignored_list
         self.plugin_considered_bundled = plugin_considered_bundled
         self.plugin_flags = plugin_flags
+        self.plugin_lazy_activation = plugin_lazy_activation
+
+        self.accounting = PluginAccounting(
+            budgets=plugin_budgets,
+            timings_logtarget=self.plugin_timings_logtarget,
+            timings_message=self.plugin_timings_message,
+        )
 
         self.enabled_plugins = {}
         self.disabled_plugins = {}
@@ -920,6 +966,14 @@ class PluginManager:
         self._plugin_apikeys_mutex = threading.RLock()
         self._plugin_apikeys = {}
 
+        self._lazy_plugins_mutex = threading.RLock()
+        self._lazy_plugins = {}
+        self._lazy_plugin_specs = {}
+        self._lazy_activating = set()
+        self._lazy_initialized = set()
+        self._lazy_unmatched_triggers = set()
+        self._implementations_initialized = False
+
         self.implementation_injects = {}
         self.implementation_inject_factories = []
         self.implementation_pre_inits = []
@@ -930,6 +984,7 @@ class PluginManager:
         self.on_plugin_enabled = lambda *args, **kwargs: None
         self.on_plugin_disabled = lambda *args, **kwargs: None
         self.on_plugin_implementations_initialized = lambda *args, **kwargs: None
+        self.on_plugin_activated = lambda *args, **kwargs: None
 
         self.on_plugins_loaded = lambda *args, **kwargs: None
         self.on_plugins_enabled = lambda *args, **kwargs: None
@@ -974,6 +1029,14 @@ class PluginManager:
             for key, value in self._plugin_hooks.items()
         }
 
+    @property
+    def lazy_plugins(self):
+        """
+        Returns:
+                (dict) dictionary of enabled plugins that are waiting for their lazy activation
+        """
+        return dict(self._lazy_plugins)
+
     def find_plugins(self, existing=None, ignore_uninstalled=True, incl_all_found=False):
         added, found = self._find_plugins(
             existing=existing, ignore_uninstalled=ignore_uninstalled
@@ -1292,6 +1355,15 @@ class PluginManager:
         ):
             return plugin
 
+        if self.plugin_lazy_activation and plugin.activation:
+            # lazy plugin, keep the dummy entry and defer the import to the first activation trigger
+            self.logger.debug(
+                f"Plugin {plugin} will be activated lazily on {', '.join(plugin.activation)}"
+            )
+            plugin.lazy = True
+            self._lazy_plugin_specs[key] = spec
+            return plugin
+
         # ... then create and return the real one
         return self._import_plugin(
             key,
@@ -1678,6 +1750,13 @@ class PluginManager:
     def _activate_plugin(self, name, plugin):
         plugin.hotchangeable = self.is_restart_needing_plugin(plugin)
 
+        if plugin.lazy:
+            # nothing to register yet, just wait for one of its triggers
+            with self._lazy_plugins_mutex:
+                self._lazy_plugins[name] = plugin
+                self._lazy_unmatched_triggers.clear()
+            return
+
         # evaluate registered hooks
         for hook, definition in plugin.hooks.items():
             try:
@@ -1705,6 +1784,7 @@ class PluginManager:
             mixins = self.mixins_matching_bases(
                 plugin.implementation.__class__, *self.plugin_bases
             )
+            wrapped = set()
             for mixin in mixins:
                 self.plugin_implementations_by_type[mixin].append(
                     (name, plugin.implementation)
@@ -1714,21 +1794,31 @@ class PluginManager:
                         lambda a: not a.startswith("_") and callable(getattr(mixin, a)),
                         dir(mixin),
                     ):
-                        # wrap method with time_this
+                        if method in wrapped:
+                            continue
+
+                        # wrap method for accounting, attributed to the mixin defining it
+                        defining = next(
+                            (c for c in mixin.__mro__ if method in c.__dict__), mixin
+                        )
                         setattr(
                             plugin.implementation,
                             method,
-                            time_this(
-                                logtarget=self.plugin_timings_logtarget,
-                                expand_logtarget=True,
-                                message=self.plugin_timings_message,
-                            )(getattr(plugin.implementation, method)),
+                            self.accounting.wrap(
+                                name,
+                                f"{defining.__name__}.{method}",
+                                getattr(plugin.implementation, method),
+                            ),
                         )
+                        wrapped.add(method)
 
             self.plugin_implementations[name] = plugin.implementation
-            plugin.implementation.__timing_wrapped = True
+            setattr(plugin.implementation, "__timing_wrapped", True)
 
     def _deactivate_plugin(self, name, plugin):
+        with self._lazy_plugins_mutex:
+            self._lazy_plugins.pop(name, None)
+
         for hook, definition in plugin.hooks.items():
             try:
                 callback, order = self._get_callback_and_order(definition)
@@ -1766,6 +1856,119 @@ class PluginManager:
                     # that's ok, the plugin was just not registered for the type
                     pass
 
+    def activate_lazy_plugins(self, trigger):
+        """
+        Activates all lazy plugins that declared an activation trigger matching ``trigger``.
+
+        Cheap to call if there are no pending lazy plugins or if ``trigger`` has already been found
+        to not match any of them.
+
+        Args:
+                trigger (str): the trigger that fired, e.g. ``hook:octoprint.comm.protocol.gcode.sending``
+
+        Returns:
+                (list) identifiers of the plugins that were activated
+        """
+        if not self._lazy_plugins or trigger in self._lazy_unmatched_triggers:
+            return []
+
+        with self._lazy_plugins_mutex:
+            names = [
+                name
+                for name, plugin in self._lazy_plugins.items()
+                if name not in self._lazy_activating
+                and any(fnmatch.fnmatch(trigger, t) for t in plugin.activation)
+            ]
+            if not names:
+                self._lazy_unmatched_triggers.add(trigger)
+                return []
+
+        return [
+            name for name in names if self.activate_lazy_plugin(name, trigger=trigger)
+        ]
+
+    def activate_lazy_plugin(self, name, trigger=None):
+        """
+        Imports and loads the lazy plugin ``name`` and enables it for real, registering its hooks and implementation.
+
+        Args:
+                name (str): plugin identifier
+                trigger (str): the trigger that caused the activation, for logging
+
+        Returns:
+                (boolean) True if the plugin was activated, False if it wasn't pending activation or activation failed
+        """
+        with self._lazy_plugins_mutex:
+            plugin = self._lazy_plugins.get(name)
+            if plugin is None or name in self._lazy_activating:
+                return False
+            self._lazy_activating.add(name)
+
+        try:
+            self.logger.info(
+                f"Activating plugin {plugin}"
+                + (f" on first {trigger}" if trigger else "")
+            )
+
+            try:
+                plugin.instance = _load_module(self._lazy_plugin_specs.pop(name))
+                plugin.lazy = False
+
+                if not plugin.check():
+                    raise PluginCantEnable(name, "Plugin did not pass check")
+
+                plugin.load()
+            except Exception:
+                self.logger.exception(
+                    f"There was an error while loading plugin {name}, disabling it"
+                )
+                self._disable_lazy_plugin(name, plugin)
+                return False
+
+            self.on_plugin_loaded(name, plugin)
+
+            # it was only enabled from its metadata so far, now that its hooks and
+            # implementation are known go through the full enabling procedure
+            self.enabled_plugins.pop(name, None)
+            self.disabled_plugins[name] = plugin
+            plugin.enabled = False
+
+            initialize = self._implementations_initialized
+            try:
+                enabled = self.enable_plugin(
+                    name,
+                    plugin=plugin,
+                    initialize_implementation=initialize,
+                    startup=True,
+                )
+            except Exception:
+                self.logger.exception(
+                    f"There was an error while enabling plugin {name}, disabling it"
+                )
+                enabled = False
+
+            if not enabled:
+                self._deactivate_plugin(name, plugin)
+                self._disable_lazy_plugin(name, plugin)
+                return False
+
+            if initialize:
+                self._lazy_initialized.add(name)
+            self.on_plugin_activated(name, plugin)
+
+            self.logger.debug(f"Activated plugin {name}: {plugin}")
+            return True
+        finally:
+            with self._lazy_plugins_mutex:
+                self._lazy_plugins.pop(name, None)
+                self._lazy_activating.discard(name)
+
+    def _disable_lazy_plugin(self, name, plugin):
+        plugin.lazy = False
+        plugin.enabled = False
+        self.enabled_plugins.pop(name, None)
+        self.disabled_plugins[name] = plugin
+
     def is_restart_needing_plugin(self, plugin):
         """Checks whether the plugin needs a restart on changes"""
         return (
@@ -1900,7 +2103,13 @@ class PluginManager:
         additional_pre_inits=None,
         additional_post_inits=None,
     ):
-        for name, plugin in self.enabled_plugins.items():
+        self._implementations_initialized = True
+
+        for name, plugin in list(self.enabled_plugins.items()):
+            if name in self._lazy_initialized:
+                # already initialized during its lazy activation
+                continue
+
             self.initialize_implementation_of_plugin(
                 name,
                 plugin,
@@ -2108,6 +2317,8 @@ class PluginManager:
 
         plugin_info = self.get_plugin_info(identifier, require_enabled=require_enabled)
         if plugin_info is not None:
+            if plugin_info.lazy and plugin_info.enabled:
+                self.activate_lazy_plugin(identifier, trigger="plugin lookup")
             return plugin_info.instance
         return None
 
@@ -2143,22 +2354,23 @@ class PluginManager:
             dict: A dict containing all registered handlers mapped by their plugin's identifier.
         """
 
-        if hook not in self.plugin_hooks:
+        self.activate_lazy_plugins(f"hook:{hook}")
+
+        if hook not in self._plugin_hooks:
             return {}
 
         result = OrderedDict()
-        for h in self.plugin_hooks[hook]:
-            result[h[0]] = time_this(
-                logtarget=self.plugin_timings_logtarget,
-                expand_logtarget=True,
-                message=self.plugin_timings_message,
-            )(h[1])
+        for _, name, callback in self._plugin_hooks[hook]:
+            result[name] = self.accounting.wrap(name, hook, callback)
         return result
 
     def get_implementations(self, *types, **kwargs):
         """
         Get all mixin implementations that implement *all* of the provided ``types``.
 
+        Lazy plugins declaring a matching ``implementation:<mixin name>`` trigger will be activated first,
+        unless ``activate_lazy`` is set to ``False``.
+
         Arguments:
             types (one or more type): The types a mixin implementation needs to implement in order to be returned.
 
@@ -2168,6 +2380,10 @@ class PluginManager:
 
         sorting_context = kwargs.get("sorting_context", None)
 
+        if kwargs.get("activate_lazy", True):
+            for t in types:
+                self.activate_lazy_plugins(f"implementation:{t.__name__}")
+
         result = None
 
         for t in types:
@@ -2234,7 +2450,9 @@ class PluginManager:
 
         assert callable(f)
         implementations = self.get_implementations(
-            *types, sorting_context=kwargs.get("sorting_context", None)
+            *types,
+            sorting_context=kwargs.get("sorting_context", None),
+            activate_lazy=kwargs.get("activate_lazy", True),
         )
         return list(filter(f, implementations))
 
@@ -2258,6 +2476,9 @@ class PluginManager:
             return None
         plugin = self.enabled_plugins[name]
 
+        if plugin.lazy:
+            self.activate_lazy_plugin(name, trigger="helper lookup")
+
         all_helpers = plugin.helpers
         if len(helpers):
             return {k: v for (k, v) in all_helpers.items() if k in helpers}
@@ -64,6 +64,11 @@ class OctoPrintPlugin(Plugin):
        The :class:`~octoprint.printer.PrinterInterface` instance. Injected by the plugin core system upon initialization
        of the implementation.
 
+    .. attribute:: _printers
+
+       The :class:`~octoprint.printer.registry.PrinterRegistry` instance holding the default printer and all additional
+       printers managed by the server. Injected by the plugin core system upon initialization of the implementation.
+
     .. attribute:: _app_session_manager
 
        The :class:`~octoprint.access.users.SessionManager` instance. Injected by the plugin core system upon initialization of
@@ -101,6 +106,7 @@ class OctoPrintPlugin(Plugin):
         self._slicing_manager = None
         self._file_manager = None
         self._printer = None
+        self._printers = None
         self._app_session_manager = None
         self._plugin_lifecycle_manager = None
         self._user_manager = None
@@ -1842,6 +1848,12 @@ class SettingsPlugin(OctoPrintPlugin):
            empty list (as fallback for restricted lists) or ``None`` values where necessary.
            Make sure to do your own restriction if you decide to fully overload this method.
 
+        .. note::
+
+           The Settings API caches its output until the settings change. If you inject properties that may change
+           without going through your plugin's settings, call :func:`~octoprint.plugin.PluginSettings.mark_changed`
+           on ``self._settings`` whenever they do.
+
         :return: the current settings of the plugin, as a dictionary
         """
         import copy
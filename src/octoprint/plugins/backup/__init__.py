@@ -27,6 +27,7 @@ except ImportError:
     zlib = None
 
 
+import contextlib
 import json
 import logging
 import os
@@ -43,6 +44,17 @@ import requests
 import sarge
 from flask_babel import gettext
 
+from octoprint.plugins.backup.archive import (
+    MANIFEST_FILE,
+    METADATA_FILE,
+    BackupWriter,
+    ManifestBuilder,
+    file_hash,
+    missing_requirements,
+    read_json_member,
+    read_manifest,
+    restore_references,
+)
 from octoprint.plugins.pluginmanager import DEFAULT_PLUGIN_REPOSITORY
 from octoprint.server.util.flask import credentials_checked_recently
 from octoprint.settings import valid_boolean_trues
@@ -99,7 +111,11 @@ class BackupPlugin(
     ##~~ SettingsPlugin
 
     def get_settings_defaults(self):
-        return {"path": None, "restore_unsupported": False}
+        return {
+            "path": None,
+            "restore_unsupported": False,
+            "compression_workers": None,
+        }
 
     def on_settings_load(self):
         config = super().on_settings_load()
@@ -112,7 +128,7 @@ class BackupPlugin(
         super().on_settings_save(data)
 
     def get_settings_restricted_paths(self):
-        return {"admin": [["path"], ["restore_unsupported"]]}
+        return {"admin": [["path"], ["restore_unsupported"], ["compression_workers"]]}
 
     ##~~ AssetPlugin
 
@@ -191,9 +207,17 @@ class BackupPlugin(
     def create_backup(self):
         data = flask.request.json
         exclude = data.get("exclude", [])
+        incremental = data.get("incremental", False) in valid_boolean_trues
+        base = data.get("base")
         filename = self._build_backup_filename(settings=self._settings)
 
-        self._start_backup(exclude, filename)
+        if base is not None:
+            try:
+                self._find_backup_base(self.backups_path, base)
+            except InvalidBaseBackup as exc:
+                flask.abort(400, description=str(exc))
+
+        self._start_backup(exclude, filename, incremental=incremental, base=base)
 
         response = flask.jsonify(started=True, name=filename)
         response.status_code = 201
@@ -203,7 +227,10 @@ class BackupPlugin(
     @no_firstrun_access
     @Permissions.ADMIN.require(403)
     def delete_backup(self, filename):
-        self._delete_backup(filename)
+        try:
+            self._delete_backup(filename)
+        except BackupInUse as exc:
+            flask.abort(409, description=str(exc))
 
         return NO_CONTENT
 
@@ -420,6 +447,8 @@ class BackupPlugin(
         )
         from octoprint.util import is_hidden_path
 
+        from .stream import BackupStreamHandler
+
         plugin_folder = self.backups_path
 
         def path_check(path):
@@ -443,7 +472,19 @@ class BackupPlugin(
                         Permissions.ADMIN,
                     ),
                 },
-            )
+            ),
+            (
+                r"/stream",
+                BackupStreamHandler,
+                {
+                    "start_backup": self._stream_backup,
+                    "access_validation": access_validation_factory(
+                        app,
+                        permission_and_fresh_credentials_validator,
+                        Permissions.ADMIN,
+                    ),
+                },
+            ),
         ]
 
     def bodysize_hook(self, current_max_body_sizes, *args, **kwargs):
@@ -451,7 +492,9 @@ class BackupPlugin(
         return [("POST", r"/restore", MAX_UPLOAD_SIZE)]
 
     # Exported plugin helpers
-    def create_backup_helper(self, exclude=None, filename=None):
+    def create_backup_helper(
+        self, exclude=None, filename=None, incremental=False, base=None
+    ):
         """
         .. versionadded:: 1.6.0
 
@@ -479,13 +522,17 @@ class BackupPlugin(
         :param list exclude: Names of data folders to exclude, defaults to None
         :param str filename: Name of backup to be created, if None (default) the backup
             name will be auto-generated. This should use a ``.zip`` extension.
+        :param bool incremental: Whether to create an incremental backup that only stores
+            files changed since its base backup, defaults to False (added in 1.12.0)
+        :param str base: Name of the backup to base an incremental backup on, if None
+            (default) the latest backup will be used (added in 1.12.0)
         """
         if exclude is None:
             exclude = []
         if not isinstance(exclude, list):
             exclude = list(exclude)
 
-        self._start_backup(exclude, filename=filename)
+        self._start_backup(exclude, filename=filename, incremental=incremental, base=base)
 
     def delete_backup_helper(self, filename):
         """
@@ -517,6 +564,10 @@ class BackupPlugin(
             for example the name from the events or other helpers.
 
         :param str filename: The name of the backup to delete
+
+        .. versionchanged:: 1.12.0
+
+           Raises an exception if the backup is still required by an incremental backup.
         """
         self._delete_backup(filename)
 
@@ -538,7 +589,20 @@ class BackupPlugin(
             default=None,
             help="Specify full path to backup file to be created",
         )
-        def backup_command(exclude, path):
+        @click.option(
+            "--incremental",
+            is_flag=True,
+            default=False,
+            help="Only store files changed since the latest (or --base) backup, referencing "
+            "everything else from there.",
+        )
+        @click.option(
+            "--base",
+            default=None,
+            help="Name of the backup to base an incremental backup on, must be located in "
+            "the same folder as the backup to be created.",
+        )
+        def backup_command(exclude, path, incremental, base):
             """
             Creates a new backup.
             """
@@ -564,6 +628,8 @@ class BackupPlugin(
                 settings=settings,
                 plugin_manager=cli_group.plugin_manager,
                 datafolder=datafolder,
+                incremental=incremental or base is not None,
+                base=base,
                 on_backup_start=on_backup_start,
             )
             click.echo("Done.")
@@ -701,7 +767,7 @@ class BackupPlugin(
 
     ##~~ helpers
 
-    def _start_backup(self, exclude, filename=None):
+    def _start_backup(self, exclude, filename=None, incremental=False, base=None):
         def on_backup_start(name, temporary_path, exclude):
             self._logger.info(
                 "Creating backup zip at {} (excluded: {})...".format(
@@ -741,6 +807,8 @@ class BackupPlugin(
                 "plugin_manager": self._plugin_manager,
                 "logger": self._logger,
                 "datafolder": self.backups_path,
+                "incremental": incremental or base is not None,
+                "base": base,
                 "on_backup_start": on_backup_start,
                 "on_backup_done": on_backup_done,
                 "on_backup_error": on_backup_error,
@@ -750,11 +818,63 @@ class BackupPlugin(
         thread.daemon = True
         thread.start()
 
+    def _stream_backup(self, exclude, output):
+        """
+        Starts creating a backup that's streamed to ``output``.
+
+        Args:
+            exclude (list): Names of data folders to exclude
+            output (StreamSink): The sink to stream the backup to
+
+        Returns:
+            str: the name of the backup
+        """
+        filename = self._build_backup_filename(settings=self._settings)
+
+        def on_backup_start(name, temporary_path, exclude):
+            self._logger.info(
+                "Streaming backup zip {} (excluded: {})...".format(
+                    name, ",".join(exclude) if len(exclude) else "-"
+                )
+            )
+
+        def on_backup_done(name, final_path, exclude):
+            self._logger.info("... done streaming backup zip.")
+
+        def run():
+            try:
+                self._create_backup(
+                    name=filename,
+                    exclude=exclude,
+                    settings=self._settings,
+                    plugin_manager=self._plugin_manager,
+                    logger=self._logger,
+                    datafolder=self.backups_path,
+                    output=output,
+                    on_backup_start=on_backup_start,
+                    on_backup_done=on_backup_done,
+                )
+            except Exception as exc:
+                if not isinstance(exc, BrokenPipeError):
+                    self._logger.exception("Error while streaming backup zip")
+                output.finish(error=exc)
+            else:
+                output.finish()
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+        return filename
+
     def _delete_backup(self, filename):
         """
         Delete the backup specified
         Args:
             filename (str): Name of backup to delete
+
+        Raises:
+            BackupInUse: the backup is required by incremental backups
         """
         backup_folder = self.backups_path
         full_path = os.path.realpath(os.path.join(backup_folder, filename))
@@ -763,6 +883,10 @@ class BackupPlugin(
             and os.path.exists(full_path)
             and not is_hidden_path(full_path)
         ):
+            dependents = self._get_dependent_backups(backup_folder, filename)
+            if dependents:
+                raise BackupInUse(filename, dependents)
+
             try:
                 os.remove(full_path)
             except Exception:
@@ -779,12 +903,17 @@ class BackupPlugin(
 
             version = "?"
             uncompressed = -1
+            base = None
+            requires = []
             try:
                 with zipfile.ZipFile(entry.path, "r") as zip:
                     uncompressed = sum([info.file_size for info in zip.filelist])
                     with zip.open("metadata.json") as m:
                         metadata = json.load(m)
                         version = metadata.get("version", "?")
+                        uncompressed = metadata.get("size", uncompressed)
+                        base = metadata.get("base")
+                        requires = metadata.get("requires", [])
             except Exception:
                 self._logger.exception(
                     f"Error reading uncompressed size and/or version from backup f{entry.name}"
@@ -797,6 +926,8 @@ class BackupPlugin(
                     "size": entry.stat().st_size,
                     "uncompressed": uncompressed,
                     "version": version,
+                    "base": base,
+                    "requires": requires,
                     "url": flask.url_for("index")
                     + "plugin/backup/download/"
                     + entry.name,
@@ -879,20 +1010,91 @@ class BackupPlugin(
         return None
 
     @classmethod
-    def _get_disk_size(cls, path, ignored=None):
+    def _collect_files(cls, source, target, ignored=None):
+        """
+        Collects all files below ``source`` that are to be backed up.
+
+        Returns:
+            list: tuples of file path, member name in the backup and stat result
+        """
         if ignored is None:
             ignored = []
 
-        if path in ignored:
-            return 0
+        if source in ignored:
+            return []
+
+        if os.path.isdir(source):
+            result = []
+            for entry in os.scandir(source):
+                result += cls._collect_files(
+                    entry.path, os.path.join(target, entry.name), ignored=ignored
+                )
+            return result
 
-        total = 0
-        for entry in os.scandir(path):
-            if entry.is_dir():
-                total += cls._get_disk_size(entry.path, ignored=ignored)
-            elif entry.is_file():
-                total += entry.stat().st_size
-        return total
+        elif os.path.isfile(source):
+            return [(source, target, os.stat(source))]
+
+        return []
+
+    @classmethod
+    def _find_backup_base(cls, datafolder, base=None):
+        """
+        Finds the backup to base an incremental backup on, either ``base`` or the latest backup
+        that contains a manifest.
+
+        Returns:
+            tuple: the name and manifest of the base backup, or ``None, None`` if there's none
+
+        Raises:
+            InvalidBaseBackup: ``base`` was given but doesn't exist or has no manifest
+        """
+        if base is not None:
+            path = os.path.realpath(os.path.join(datafolder, base))
+            if (
+                not path.startswith(os.path.realpath(datafolder) + os.sep)
+                or is_hidden_path(path)
+                or not os.path.isfile(path)
+            ):
+                raise InvalidBaseBackup(f"Base backup {base} does not exist")
+
+            manifest = read_manifest(path)
+            if manifest is None:
+                raise InvalidBaseBackup(f"Base backup {base} has no manifest")
+
+            return base, manifest
+
+        candidates = sorted(
+            (
+                entry
+                for entry in os.scandir(datafolder)
+                if entry.is_file()
+                and entry.name.endswith(".zip")
+                and not is_hidden_path(entry.path)
+            ),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in candidates:
+            manifest = read_manifest(entry.path)
+            if manifest is not None:
+                return entry.name, manifest
+
+        return None, None
+
+    @classmethod
+    def _get_dependent_backups(cls, datafolder, filename):
+        """Names of all backups in ``datafolder`` that reference content from ``filename``."""
+        dependents = []
+        for entry in os.scandir(datafolder):
+            if entry.name == filename or is_hidden_path(entry.path):
+                continue
+            if not entry.name.endswith(".zip"):
+                continue
+
+            metadata = read_json_member(entry.path, METADATA_FILE)
+            if isinstance(metadata, dict) and filename in metadata.get("requires", []):
+                dependents.append(entry.name)
+        return dependents
 
     @classmethod
     def _free_space(cls, path, size):
@@ -981,14 +1183,24 @@ class BackupPlugin(
         plugin_manager=None,
         logger=None,
         datafolder=None,
+        incremental=False,
+        base=None,
+        output=None,
         on_backup_start=None,
         on_backup_done=None,
         on_backup_error=None,
         on_backup_progress=None,
     ):
+        """
+        Creates a backup named ``name`` in ``datafolder``, or streams it to ``output`` if set.
+
+        Streamed backups are never incremental, as they would lack the backups they are based on.
+        """
         if logger is None:
             logger = logging.getLogger(__name__)
 
+        streaming = output is not None
+
         exclude_by_default = ("generated", "logs", "watched", "uploadtemp")
 
         with cls._backup_in_progress:
@@ -1053,22 +1265,49 @@ class BackupPlugin(
                     for folder in default_settings["folder"].keys()
                 ]
 
-                # check how many bytes we are about to backup
-                size = os.stat(configfile).st_size
+                # collect what we are about to backup in one go
+                files = cls._collect_files(
+                    configfile, "basedir/config.yaml", ignored=ignored_paths
+                )
                 for folder in default_settings["folder"].keys():
                     if folder in exclude or folder in exclude_by_default:
                         continue
-                    size += cls._get_disk_size(
+                    files += cls._collect_files(
                         settings.global_get_basefolder(folder),
-                        ignored=ignored_paths,
+                        "basedir/" + folder.replace("_", "/"),
+                        ignored=ignored_paths + additional_excludes,
                     )
-                size += cls._get_disk_size(
+                files += cls._collect_files(
                     basedir,
-                    ignored=defaults + ignored_paths,
+                    "basedir",
+                    ignored=defaults + ignored_paths + additional_excludes,
                 )
 
+                manifest = ManifestBuilder()
+                if incremental and not streaming:
+                    base_name, base_manifest = cls._find_backup_base(datafolder, base)
+                    if base_name is not None:
+                        logger.info(f"Creating incremental backup on top of {base_name}")
+                        manifest = ManifestBuilder(
+                            base=base_name, base_manifest=base_manifest
+                        )
+                    else:
+                        logger.info(
+                            "No backup with manifest found to base an incremental backup on, creating a full backup"
+                        )
+
+                # files unchanged since the base backup are referenced, not stored
+                pending = [
+                    (source, arcname, stat)
+                    for source, arcname, stat in files
+                    if not manifest.unchanged(arcname, stat)
+                ]
+                size = sum(stat.st_size for _, _, stat in pending)
+
                 # since we can't know the compression ratio beforehand, we assume we need the same amount of space
-                if not cls._free_space(os.path.dirname(temporary_path), size):
+                if not streaming and not cls._free_space(
+                    os.path.dirname(temporary_path), size
+                ):
                     raise InsufficientSpace()
 
                 compression = zipfile.ZIP_DEFLATED if zlib else zipfile.ZIP_STORED
@@ -1087,73 +1326,58 @@ class BackupPlugin(
                             )
 
                     if callable(on_backup_start):
-                        on_backup_start(name, temporary_path, exclude)
-
-                    with zipfile.ZipFile(
-                        temporary_path,
-                        mode="w",
-                        compression=compression,
-                        allowZip64=True,
-                    ) as zip:
+                        on_backup_start(
+                            name, None if streaming else temporary_path, exclude
+                        )
+
+                    with contextlib.ExitStack() as stack:
+                        if output is None:
+                            output = stack.enter_context(open(temporary_path, "wb"))
+                        zip = stack.enter_context(
+                            BackupWriter(
+                                output,
+                                compression=compression,
+                                workers=settings.get_int(["compression_workers"]),
+                            )
+                        )
+
                         backed_up_size = 0
 
                         def report_progress():
                             if callable(on_backup_progress):
-                                on_backup_progress(name, min(backed_up_size / size, 1.0))
-
-                        def add_to_zip(source, target, ignored=None):
-                            nonlocal backed_up_size
-
-                            if ignored is None:
-                                ignored = []
+                                on_backup_progress(
+                                    name, min(backed_up_size / max(size, 1), 1.0)
+                                )
 
-                            if source in ignored:
-                                return
+                        for source, arcname, stat in pending:
+                            try:
+                                if manifest.incremental:
+                                    digest = file_hash(source)
+                                    if not manifest.reference(arcname, stat, digest):
+                                        zip.write_file(source, arcname)
+                                        manifest.stored(arcname, stat, digest)
+                                else:
+                                    digest = zip.write_file(source, arcname)
+                                    manifest.stored(arcname, stat, digest)
+                            except FileNotFoundError:
+                                # vanished since we collected it, nothing to backup then
+                                continue
 
-                            if os.path.isdir(source):
-                                for entry in os.scandir(source):
-                                    add_to_zip(
-                                        entry.path,
-                                        os.path.join(target, entry.name),
-                                        ignored=ignored,
-                                    )
+                            backed_up_size += stat.st_size
+                            report_progress()
 
-                            elif os.path.isfile(source):
-                                zip.write(source, arcname=target)
-                                backed_up_size += os.stat(source).st_size
-                                report_progress()
+                        # add manifest & metadata
+                        zip.writestr(MANIFEST_FILE, json.dumps(manifest.to_dict()))
 
-                        # add metadata
                         metadata = {
                             "version": get_octoprint_version_string(),
                             "excludes": exclude,
+                            "size": manifest.size,
                         }
-                        zip.writestr("metadata.json", json.dumps(metadata))
-
-                        # backup current config file
-                        add_to_zip(
-                            configfile,
-                            "basedir/config.yaml",
-                            ignored=ignored_paths,
-                        )
-
-                        # backup configured folder paths
-                        for folder in default_settings["folder"].keys():
-                            if folder in exclude or folder in exclude_by_default:
-                                continue
-
-                            add_to_zip(
-                                settings.global_get_basefolder(folder),
-                                "basedir/" + folder.replace("_", "/"),
-                                ignored=ignored_paths + additional_excludes,
-                            )
-
-                        # backup anything else that might be lying around in our basedir
-                        add_to_zip(
-                            basedir,
-                            "basedir",
-                            ignored=defaults + ignored_paths + additional_excludes,
-                        )
+                        if manifest.incremental:
+                            metadata["base"] = manifest.base
+                            metadata["requires"] = manifest.requires
+                        zip.writestr(METADATA_FILE, json.dumps(metadata))
 
                         # add list of installed plugins
                         helpers = plugin_manager.get_helpers(
@@ -1167,7 +1391,10 @@ class BackupPlugin(
                             if len(plugins):
                                 zip.writestr("plugin_list.json", json.dumps(plugins))
 
-                    shutil.move(temporary_path, final_path)
+                    if streaming:
+                        final_path = None
+                    else:
+                        shutil.move(temporary_path, final_path)
 
                     if callable(on_backup_done):
                         on_backup_done(name, final_path, exclude)
@@ -1176,7 +1403,7 @@ class BackupPlugin(
 
                 except (Exception, KeyboardInterrupt):
                     backup_error = True
-                    if os.path.exists(temporary_path):
+                    if not streaming and os.path.exists(temporary_path):
                         os.remove(temporary_path)
                     raise
                 finally:
@@ -1310,12 +1537,27 @@ class BackupPlugin(
                                 on_restore_failed(path)
                             return False
 
+                        missing = missing_requirements(metadata, os.path.dirname(path))
+                        if missing:
+                            if callable(on_invalid_backup):
+                                on_invalid_backup(
+                                    "Backup is incremental and cannot be restored without the backup(s) {} it is based on, they need to be located next to it".format(
+                                        ", ".join(missing)
+                                    )
+                                )
+                            if callable(on_restore_failed):
+                                on_restore_failed(path)
+                            return False
+
                         # unzip to temporary folder
                         try:
                             with tempfile.TemporaryDirectory(dir=tmpfolder) as temp:
                                 temp = os.path.abspath(temp)
 
-                                needed = sum([info.file_size for info in zip.filelist])
+                                needed = max(
+                                    sum([info.file_size for info in zip.filelist]),
+                                    metadata.get("size", 0),
+                                )
                                 log_progress(
                                     f"Uncompressed backup size is {get_formatted_size(needed)}"
                                 )
@@ -1353,6 +1595,13 @@ class BackupPlugin(
                                 for abspath, date_time in dirs.items():
                                     os.utime(abspath, (date_time, date_time))
 
+                                # restore files referenced from other backups
+                                if MANIFEST_FILE in zip.namelist():
+                                    manifest = json.loads(zip.read(MANIFEST_FILE))
+                                    restore_references(
+                                        manifest, os.path.dirname(path), temp
+                                    )
+
                                 # sanity check
                                 configfile = os.path.join(temp, "basedir", "config.yaml")
                                 if not os.path.exists(configfile):
@@ -1727,6 +1976,21 @@ class InsufficientSpace(Exception):
     pass
 
 
+class InvalidBaseBackup(Exception):
+    pass
+
+
+class BackupInUse(Exception):
+    def __init__(self, name, dependents):
+        self.name = name
+        self.dependents = dependents
+
+    def __str__(self):
+        return "Backup {} is required by incremental backup(s) {}".format(
+            self.name, ", ".join(self.dependents)
+        )
+
+
 def _register_custom_events(*args, **kwargs):
     return ["backup_created"]
 
@@ -0,0 +1,774 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import binascii
+import collections
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import queue
+import shutil
+import struct
+import threading
+import time
+import zipfile
+
+from octoprint.util import is_hidden_path
+
+try:
+    import zlib
+except ImportError:
+    zlib = None
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+METADATA_FILE = "metadata.json"
+
+CHUNK_SIZE = 64 * 1024
+
+BLOCK_SIZE = 128 * 1024
+"""Size of the blocks compressed in parallel by :class:`BackupWriter`."""
+
+DICT_SIZE = 32 * 1024
+
+ZIP64_LIMIT = zipfile.ZIP64_LIMIT
+ZIP_FILECOUNT_LIMIT = zipfile.ZIP_FILECOUNT_LIMIT
+
+STORED_EXTENSIONS = frozenset(
+    (
+        # video
+        ".mp4",
+        ".mkv",
+        ".webm",
+        ".avi",
+        ".mov",
+        ".mpg",
+        ".mpeg",
+        # images
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".webp",
+        # archives & zip based formats
+        ".zip",
+        ".gz",
+        ".tgz",
+        ".bz2",
+        ".xz",
+        ".7z",
+        ".whl",
+        ".3mf",
+        ".ufp",
+    )
+)
+"""File extensions of already compressed formats that are stored without recompression."""
+
+
+def compress_type_for(path, default=zipfile.ZIP_DEFLATED):
+    """
+    Determines the compression to use for the file at ``path``.
+
+    Already compressed media and archives are stored as-is, deflating them again costs
+    a lot of CPU time for next to no gain.
+
+    Arguments:
+        path (str): path of the file
+        default (int): compression to use for anything else
+
+    Returns:
+        int: the ``zipfile`` compression constant to use
+
+    Examples:
+
+        >>> compress_type_for("timelapse/print.mp4") == zipfile.ZIP_STORED
+        True
+        >>> compress_type_for("uploads/SNAPSHOT.JPG") == zipfile.ZIP_STORED
+        True
+        >>> compress_type_for("uploads/benchy.gcode") == zipfile.ZIP_DEFLATED
+        True
+    """
+    if os.path.splitext(path)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return default
+
+
+def new_hash():
+    return hashlib.blake2b(digest_size=20)
+
+
+def file_hash(path):
+    """Hashes the contents of the file at ``path``."""
+    h = new_hash()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def default_workers():
+    """Number of compression workers to use if not configured: all cores but one."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _deflate_block(data, zdict, level):
+    # raw deflate, flushed to a byte boundary so blocks can simply be concatenated,
+    # primed with the tail of the previous block to not lose compression ratio
+    if zdict:
+        compressor = zlib.compressobj(
+            level,
+            zlib.DEFLATED,
+            -zlib.MAX_WBITS,
+            zlib.DEF_MEM_LEVEL,
+            zlib.Z_DEFAULT_STRATEGY,
+            zdict,
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+_FINAL_BLOCK = b"\x03\x00"  # empty final block, terminates the deflate stream
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_END_RECORD64 = struct.Struct("<4sQ2H2L4Q")
+_END_RECORD64_LOCATOR = struct.Struct("<4sLQL")
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+
+class BackupWriter:
+    """
+    Writes a zip archive to ``fileobj``, compressing members in parallel.
+
+    Members are split into blocks that are deflated by a pool of worker threads (``zlib`` releases the GIL
+    while compressing) and written in order as they complete, pigz style. Sizes and CRCs are written in data
+    descriptors after each member, so ``fileobj`` only needs to support ``write`` and may be a pipe or socket,
+    nothing is ever seeked or buffered beyond the blocks currently in flight.
+
+    Arguments:
+        fileobj: the file like object to write the archive to, must be empty
+        compression (int): ``zipfile.ZIP_DEFLATED`` or ``zipfile.ZIP_STORED``, defaults to the former if ``zlib``
+            is available
+        compresslevel (int): the deflate compression level
+        workers (int): number of compression workers, see :func:`default_workers` if not set
+    """
+
+    def __init__(self, fileobj, compression=None, compresslevel=None, workers=None):
+        if compression is None:
+            compression = zipfile.ZIP_DEFLATED if zlib else zipfile.ZIP_STORED
+        if compression not in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == zipfile.ZIP_DEFLATED and not zlib:
+            raise RuntimeError("Compression requires the zlib module")
+
+        if compresslevel is None and zlib:
+            compresslevel = zlib.Z_DEFAULT_COMPRESSION
+        if not workers:
+            workers = default_workers()
+
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.workers = workers
+
+        self._fileobj = fileobj
+        self._offset = 0
+        self._members = []
+        self._closed = False
+
+        self._pool = (
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="BackupWriter"
+            )
+            if workers > 1
+            else None
+        )
+        self._max_pending = 2 * workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown()
+
+    def write_file(self, source, arcname, compress_type=None):
+        """
+        Streams the file ``source`` into the archive as ``arcname``.
+
+        Arguments:
+            source (str): path of the file to add
+            arcname (str): name of the member to create
+            compress_type (int): compression to use, determined via :func:`compress_type_for` if not set
+
+        Returns:
+            str: the hash of the file's contents
+        """
+        if compress_type is None:
+            compress_type = compress_type_for(source, default=self.compression)
+
+        info = zipfile.ZipInfo.from_file(source, arcname=arcname, strict_timestamps=False)
+        with open(source, "rb") as f:
+            return self._write_member(info, f, compress_type)
+
+    def writestr(self, arcname, data, compress_type=None):
+        """
+        Writes ``data`` into the archive as ``arcname``.
+
+        Returns:
+            str: the hash of ``data``
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if compress_type is None:
+            compress_type = self.compression
+
+        info = zipfile.ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+        info.external_attr = 0o600 << 16
+        info.file_size = len(data)
+        return self._write_member(info, io.BytesIO(data), compress_type)
+
+    def close(self):
+        """Writes the central directory and thus finalizes the archive."""
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            start = self._offset
+            for info, zip64 in self._members:
+                self._write(self._central_header(info, zip64))
+            self._write_end_record(start, self._offset - start, len(self._members))
+        finally:
+            self._shutdown()
+
+    def _shutdown(self):
+        self._closed = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _write(self, data):
+        self._fileobj.write(data)
+        self._offset += len(data)
+        return len(data)
+
+    def _compress(self, data, zdict):
+        if self._pool is not None:
+            return self._pool.submit(_deflate_block, data, zdict, self.compresslevel)
+
+        future = concurrent.futures.Future()
+        future.set_result(_deflate_block(data, zdict, self.compresslevel))
+        return future
+
+    def _write_member(self, info, fileobj, compress_type):
+        if self._closed:
+            raise ValueError("Attempt to write to closed archive")
+
+        zip64 = info.file_size * 1.05 > ZIP64_LIMIT
+        deflate = compress_type == zipfile.ZIP_DEFLATED
+        if deflate and not zlib:
+            raise RuntimeError("Compression requires the zlib module")
+
+        info.compress_type = compress_type
+        info.flag_bits = _FLAG_DATA_DESCRIPTOR
+        try:
+            info.filename.encode("ascii")
+        except UnicodeEncodeError:
+            info.flag_bits |= _FLAG_UTF8
+        info.header_offset = self._offset
+        self._write(self._local_header(info, zip64))
+
+        h = new_hash()
+        crc = 0
+        size = 0
+        compress_size = 0
+        pending = collections.deque()
+        zdict = b""
+
+        while chunk := fileobj.read(BLOCK_SIZE):
+            h.update(chunk)
+            crc = binascii.crc32(chunk, crc)
+            size += len(chunk)
+
+            if deflate:
+                pending.append(self._compress(chunk, zdict))
+                zdict = (zdict + chunk)[-DICT_SIZE:]
+                while len(pending) > self._max_pending:
+                    compress_size += self._write(pending.popleft().result())
+            else:
+                compress_size += self._write(chunk)
+
+        while pending:
+            compress_size += self._write(pending.popleft().result())
+        if deflate:
+            compress_size += self._write(_FINAL_BLOCK)
+
+        if not zip64 and (size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT):
+            raise zipfile.LargeZipFile(f"{info.filename} grew too large while writing")
+
+        info.CRC = crc
+        info.file_size = size
+        info.compress_size = compress_size
+        self._write(
+            struct.pack(
+                "<4sLQQ" if zip64 else "<4sLLL",
+                b"PK\x07\x08",
+                crc,
+                compress_size,
+                size,
+            )
+        )
+
+        self._members.append((info, zip64))
+        return h.hexdigest()
+
+    @staticmethod
+    def _dos_date_time(info):
+        year, month, day, hour, minute, second = info.date_time
+        return (
+            (year - 1980) << 9 | month << 5 | day,
+            hour << 11 | minute << 5 | second // 2,
+        )
+
+    @staticmethod
+    def _encoded_filename(info):
+        return info.filename.encode("utf-8" if info.flag_bits & _FLAG_UTF8 else "ascii")
+
+    def _local_header(self, info, zip64):
+        dosdate, dostime = self._dos_date_time(info)
+        filename = self._encoded_filename(info)
+
+        # sizes follow in the data descriptor
+        if zip64:
+            extra = struct.pack("<HHQQ", 1, 16, 0, 0)
+            size = 0xFFFFFFFF
+            version = zipfile.ZIP64_VERSION
+        else:
+            extra = b""
+            size = 0
+            version = zipfile.DEFAULT_VERSION
+
+        return (
+            _LOCAL_HEADER.pack(
+                zipfile.stringFileHeader,
+                version,
+                0,
+                info.flag_bits,
+                info.compress_type,
+                dostime,
+                dosdate,
+                0,
+                size,
+                size,
+                len(filename),
+                len(extra),
+            )
+            + filename
+            + extra
+        )
+
+    def _central_header(self, info, zip64):
+        dosdate, dostime = self._dos_date_time(info)
+        filename = self._encoded_filename(info)
+
+        file_size = info.file_size
+        compress_size = info.compress_size
+        header_offset = info.header_offset
+
+        values = []
+        if file_size > ZIP64_LIMIT:
+            values.append(file_size)
+            file_size = 0xFFFFFFFF
+        if compress_size > ZIP64_LIMIT:
+            values.append(compress_size)
+            compress_size = 0xFFFFFFFF
+        if header_offset > ZIP64_LIMIT:
+            values.append(header_offset)
+            header_offset = 0xFFFFFFFF
+
+        if values:
+            extra = struct.pack(f"<HH{len(values)}Q", 1, 8 * len(values), *values)
+        else:
+            extra = b""
+
+        version = zipfile.ZIP64_VERSION if zip64 or values else zipfile.DEFAULT_VERSION
+
+        return (
+            _CENTRAL_HEADER.pack(
+                zipfile.stringCentralDir,
+                version,
+                info.create_system,
+                version,
+                0,
+                info.flag_bits,
+                info.compress_type,
+                dostime,
+                dosdate,
+                info.CRC,
+                compress_size,
+                file_size,
+                len(filename),
+                len(extra),
+                0,
+                0,
+                0,
+                info.external_attr,
+                header_offset,
+            )
+            + filename
+            + extra
+        )
+
+    def _write_end_record(self, start, size, count):
+        if count > ZIP_FILECOUNT_LIMIT or start > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            offset = self._offset
+            self._write(
+                _END_RECORD64.pack(
+                    zipfile.stringEndArchive64,
+                    _END_RECORD64.size - 12,
+                    zipfile.ZIP64_VERSION,
+                    zipfile.ZIP64_VERSION,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start,
+                )
+            )
+            self._write(
+                _END_RECORD64_LOCATOR.pack(
+                    zipfile.stringEndArchive64Locator, 0, offset, 1
+                )
+            )
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            start = min(start, 0xFFFFFFFF)
+
+        self._write(
+            _END_RECORD.pack(zipfile.stringEndArchive, 0, 0, count, count, size, start, 0)
+        )
+
+
+class StreamSink:
+    """
+    File like object handing everything written to it over to a consumer in another thread.
+
+    Writes are batched into chunks of ``chunk_size`` and passed on through a bounded queue, so the
+    writing side is throttled to the pace of the consumer. If the consumer goes away (by calling
+    :meth:`close`), further writes raise a ``BrokenPipeError``.
+
+    Arguments:
+        chunk_size (int): size of the chunks to hand over
+        maxsize (int): maximum number of chunks waiting for the consumer
+    """
+
+    _DONE = object()
+
+    def __init__(self, chunk_size=256 * 1024, maxsize=16):
+        self._chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._buffer = bytearray()
+        self._closed = threading.Event()
+        self._error = None
+
+    # producer side
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def finish(self, error=None):
+        """Signals the end of the stream to the consumer, optionally due to ``error``."""
+        try:
+            if error is None and self._buffer:
+                self._put(bytes(self._buffer))
+            self._buffer.clear()
+            self._error = error
+            self._put(self._DONE)
+        except BrokenPipeError:
+            pass
+
+    def _put(self, item):
+        while True:
+            if self._closed.is_set():
+                raise BrokenPipeError("Consumer of the stream went away")
+            try:
+                self._queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+    # consumer side
+
+    def get(self):
+        """
+        Returns the next chunk, blocking until one is available.
+
+        Returns:
+            bytes or None: the chunk, None on the end of the stream
+
+        Raises:
+            Exception: the error the stream was finished with
+        """
+        item = self._queue.get()
+        if item is self._DONE:
+            if self._error is not None:
+                raise self._error
+            return None
+        return item
+
+    def close(self):
+        """Signals that the consumer is gone."""
+        self._closed.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def read_json_member(path, member):
+    """
+    Reads the JSON member ``member`` from the backup at ``path``.
+
+    Returns:
+        object or None: the parsed contents, None if the backup or member doesn't exist or is invalid
+    """
+    try:
+        with zipfile.ZipFile(path, "r") as zip:
+            return json.loads(zip.read(member))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def read_manifest(path):
+    """
+    Reads the content manifest of the backup at ``path``.
+
+    Returns:
+        dict or None: the manifest, None if the backup has none (e.g. because it predates manifests)
+    """
+    manifest = read_json_member(path, MANIFEST_FILE)
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+class ManifestBuilder:
+    """
+    Builds the content manifest of a backup while it is being created.
+
+    The manifest maps every backed up file's member name to its ``size``, ``mtime`` and content
+    ``hash``, plus where its content is stored: ``source`` is the name of the backup containing the
+    content (``None`` for the backup itself) and ``path`` the member name within that backup.
+
+    If created on top of a base backup, files unchanged since then are referenced from the base backup's
+    chain instead of being stored again, and so are files whose content is already stored anywhere in
+    the chain or in this backup.
+
+    Arguments:
+        base (str): file name of the base backup, if any
+        base_manifest (dict): manifest of the base backup, if any
+    """
+
+    def __init__(self, base=None, base_manifest=None):
+        self.base = base
+        self.files = {}
+
+        self._base_files = {}
+        self._known = {}
+
+        if base is not None and base_manifest is not None:
+            for arcname, entry in base_manifest.get("files", {}).items():
+                entry = dict(entry)
+                if entry.get("source") is None:
+                    entry["source"] = base
+                self._base_files[arcname] = entry
+                self._known.setdefault(entry["hash"], (entry["source"], entry["path"]))
+
+    @property
+    def incremental(self):
+        return self.base is not None
+
+    @property
+    def size(self):
+        """Total size of all files in the manifest."""
+        return sum(entry["size"] for entry in self.files.values())
+
+    @property
+    def requires(self):
+        """Names of other backups this backup references content from."""
+        return sorted(
+            {
+                entry["source"]
+                for entry in self.files.values()
+                if entry["source"] is not None
+            }
+        )
+
+    def unchanged(self, arcname, stat):
+        """
+        Checks whether ``arcname`` is unchanged since the base backup based on its size and mtime,
+        and if so references it from there.
+
+        Returns:
+            bool: True if the file is unchanged and has been referenced, False otherwise
+        """
+        entry = self._base_files.get(arcname)
+        if (
+            entry is None
+            or entry["size"] != stat.st_size
+            or entry["mtime"] != stat.st_mtime
+        ):
+            return False
+
+        self.files[arcname] = entry
+        return True
+
+    def reference(self, arcname, stat, digest):
+        """
+        References already stored content with hash ``digest`` for ``arcname``.
+
+        Returns:
+            bool: True if the content is already stored and has been referenced, False otherwise
+        """
+        known = self._known.get(digest)
+        if known is None:
+            return False
+
+        source, path = known
+        self.files[arcname] = self._entry(stat, digest, source=source, path=path)
+        return True
+
+    def stored(self, arcname, stat, digest):
+        """Records that ``arcname`` with hash ``digest`` was stored in this backup."""
+        self.files[arcname] = self._entry(stat, digest, path=arcname)
+        self._known.setdefault(digest, (None, arcname))
+
+    def to_dict(self):
+        return {
+            "version": MANIFEST_VERSION,
+            "base": self.base,
+            "files": self.files,
+        }
+
+    @staticmethod
+    def _entry(stat, digest, source=None, path=None):
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": digest,
+            "source": source,
+            "path": path,
+        }
+
+
+def restore_references(manifest, folder, target):
+    """
+    Extracts all files referenced from other backups by ``manifest`` to ``target``.
+
+    Arguments:
+        manifest (dict): the manifest of the backup to restore
+        folder (str): folder containing the referenced backups
+        target (str): folder to extract to, the restored backup's own members are expected to already be there
+
+    Raises:
+        ValueError: the manifest references a backup that is not a plain file name within ``folder``
+    """
+    abstarget = os.path.abspath(target)
+
+    by_source = {}
+    for arcname, entry in manifest.get("files", {}).items():
+        if entry.get("source") is None and entry.get("path") == arcname:
+            continue
+        by_source.setdefault(entry.get("source"), []).append((arcname, entry))
+
+    for source, entries in by_source.items():
+        if source is None:
+            # deduplicated within the backup itself
+            for arcname, entry in entries:
+                _copy_file(entry["path"], abstarget, arcname, entry["mtime"])
+            continue
+
+        source_path = _backup_path(folder, source)
+        if source_path is None:
+            raise ValueError(f"Invalid backup reference in manifest: {source}")
+
+        with zipfile.ZipFile(source_path, "r") as zip:
+            for arcname, entry in entries:
+                path = _target_path(abstarget, arcname)
+                if path is None:
+                    continue
+
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with zip.open(entry["path"]) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                os.utime(path, (entry["mtime"], entry["mtime"]))
+
+
+def missing_requirements(metadata, folder):
+    """
+    Determines which of the backups the backup described by ``metadata`` requires are missing from ``folder``.
+
+    Returns:
+        list: names of missing backups
+    """
+    missing = []
+    for name in metadata.get("requires", []):
+        path = _backup_path(folder, name)
+        if path is None or not os.path.isfile(path):
+            missing.append(name)
+    return missing
+
+
+def _backup_path(folder, name):
+    if (
+        not isinstance(name, str)
+        or not name
+        or os.path.basename(name) != name
+        or is_hidden_path(name)
+    ):
+        return None
+
+    absfolder = os.path.realpath(folder)
+    path = os.path.realpath(os.path.join(absfolder, name))
+    if not path.startswith(absfolder + os.sep):
+        return None
+    return path
+
+
+def _target_path(abstarget, arcname):
+    path = os.path.abspath(os.path.join(abstarget, arcname))
+    if not path.startswith(abstarget + os.sep):
+        return None
+    return path
+
+
+def _copy_file(source, abstarget, arcname, mtime):
+    path = _target_path(abstarget, arcname)
+    if path is None:
+        return
+
+    realtarget = os.path.realpath(abstarget)
+    source = os.path.realpath(os.path.join(abstarget, source))
+    if not source.startswith(realtarget + os.sep) or not os.path.isfile(source):
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    shutil.copyfile(source, path)
+    os.utime(path, (mtime, mtime))
@@ -24,6 +24,24 @@
         return this.base.postJson(this.url + "backup", data, opts);
     };
 
+    OctoPrintBackupClient.prototype.createIncrementalBackup = function (
+        exclude,
+        base,
+        opts
+    ) {
+        exclude = exclude || [];
+
+        var data = {
+            exclude: exclude,
+            incremental: true
+        };
+        if (base) {
+            data.base = base;
+        }
+
+        return this.base.postJson(this.url + "backup", data, opts);
+    };
+
     OctoPrintBackupClient.prototype.deleteBackup = function (backup, opts) {
         return this.base.delete(this.url + "backup/" + backup, opts);
     };
@@ -50,6 +50,7 @@ $(function () {
         });
 
         self.excludeFromBackup = ko.observableArray([]);
+        self.incrementalBackup = ko.observable(false);
         self.restoreSupported = ko.observable(true);
         self.maxUploadSize = ko.observable(0);
         self.freeTempSpace = ko.observable(0);
@@ -356,7 +357,10 @@ $(function () {
 
         self.createBackup = function () {
             var excluded = self.excludeFromBackup();
-            OctoPrint.plugins.backup.createBackup(excluded).done(function () {
+            var request = self.incrementalBackup()
+                ? OctoPrint.plugins.backup.createIncrementalBackup(excluded)
+                : OctoPrint.plugins.backup.createBackup(excluded);
+            request.done(function () {
                 self.excludeFromBackup([]);
             });
         };
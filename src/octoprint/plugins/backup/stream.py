@@ -0,0 +1,75 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import logging
+
+import tornado.iostream
+import tornado.web
+from tornado.ioloop import IOLoop
+
+from octoprint.plugins.backup.archive import StreamSink
+from octoprint.server.util.tornado import (
+    CorsSupportMixin,
+    RequestlessExceptionLoggingMixin,
+)
+from octoprint.util import to_unicode
+
+
+class BackupStreamHandler(
+    RequestlessExceptionLoggingMixin, CorsSupportMixin, tornado.web.RequestHandler
+):
+    """
+    Streams a freshly created backup to the client, without storing it on disk first.
+
+    The backup is created in a separate thread by ``start_backup``, which will be called with the
+    list of folders to exclude (from the ``exclude`` query parameter) and a
+    :class:`~octoprint.plugins.backup.archive.StreamSink` to write the backup to, and is expected to
+    return the name of the backup. Chunks are fetched from the sink in the executor so the IOLoop
+    never blocks on the backup.
+
+    Arguments:
+        start_backup (function): Callback starting the backup
+        access_validation (function): Callback to call in the ``get`` method to validate access to the resource.
+    """
+
+    def initialize(self, start_backup=None, access_validation=None):
+        self._start_backup = start_backup
+        self._access_validation = access_validation
+        self._logger = logging.getLogger(__name__)
+
+    async def get(self, *args, **kwargs):
+        if self._access_validation is not None:
+            self._access_validation(self.request)
+
+        exclude = list(map(to_unicode, self.request.query_arguments.get("exclude", [])))
+
+        sink = StreamSink()
+        name = self._start_backup(exclude, sink)
+
+        self.set_status(200)
+        self.set_header("Content-Type", "application/zip")
+        self.set_header("Content-Disposition", f'attachment; filename="{name}"')
+
+        loop = IOLoop.current()
+        try:
+            while True:
+                try:
+                    chunk = await loop.run_in_executor(None, sink.get)
+                except Exception:
+                    self._logger.exception(f"Streaming backup {name} failed")
+
+                    # make sure the client doesn't mistake a truncated backup for a complete one
+                    self.request.connection.close()
+                    return
+
+                if chunk is None:
+                    break
+
+                self.write(chunk)
+                await self.flush()
+
+        except tornado.iostream.StreamClosedError:
+            self._logger.info(f"Client went away while streaming backup {name}")
+
+        finally:
+            sink.close()
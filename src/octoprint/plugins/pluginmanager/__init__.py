@@ -569,7 +569,16 @@ class PluginManagerPlugin(
         if plugin is None:
             return abort(404)
 
-        return jsonify(plugin=self._to_external_plugin(plugin))
+        return jsonify(
+            plugin=self._to_external_plugin(plugin),
+            accounting=self._plugin_manager.accounting.stats(plugin=key),
+        )
+
+    @octoprint.plugin.BlueprintPlugin.route("/accounting")
+    @Permissions.PLUGIN_PLUGINMANAGER_MANAGE.require(403)
+    def retrieve_plugin_accounting(self):
+        plugin = request.values.get("plugin")
+        return jsonify(accounting=self._plugin_manager.accounting.stats(plugin=plugin))
 
     def _orphan_response(self):
         return {"orphan_data": self._get_orphans()}
@@ -1265,6 +1274,11 @@ class PluginManagerPlugin(
             )
         )
 
+        if self._plugin_lifecycle_manager is not None:
+            self._plugin_lifecycle_manager.on_plugin_event(
+                "installed", new_plugin.key, new_plugin
+            )
+
         # noinspection PyUnresolvedReferences
         self._event_bus.fire(
             Events.PLUGIN_PLUGINMANAGER_INSTALL_PLUGIN,
@@ -1417,6 +1431,11 @@ class PluginManagerPlugin(
         )
         self._plugin_manager.log_all_plugins()
 
+        if self._plugin_lifecycle_manager is not None:
+            self._plugin_lifecycle_manager.on_plugin_event(
+                "installed", new_plugin.key, new_plugin
+            )
+
         # noinspection PyUnresolvedReferences
         self._event_bus.fire(
             Events.PLUGIN_PLUGINMANAGER_INSTALL_PLUGIN,
@@ -1656,6 +1675,11 @@ class PluginManagerPlugin(
 
         self._plugin_manager.reload_plugins()
 
+        if self._plugin_lifecycle_manager is not None:
+            self._plugin_lifecycle_manager.on_plugin_event(
+                "uninstalled", plugin.key, plugin
+            )
+
         # noinspection PyUnresolvedReferences
         self._event_bus.fire(
             Events.PLUGIN_PLUGINMANAGER_UNINSTALL_PLUGIN,
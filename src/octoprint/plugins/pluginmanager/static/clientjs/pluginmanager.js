@@ -24,6 +24,18 @@
         return this.base.get(url + (refresh ? "?refresh=true" : ""), opts);
     };
 
+    OctoPrintPluginManagerClient.prototype.getAccounting = function (plugin, opts) {
+        if (typeof plugin === "object") {
+            opts = plugin;
+            plugin = undefined;
+        }
+        var url = this.base.getBlueprintUrl("pluginmanager") + "accounting";
+        return this.base.get(
+            url + (plugin ? "?plugin=" + encodeURIComponent(plugin) : ""),
+            opts
+        );
+    };
+
     OctoPrintPluginManagerClient.prototype.getRepository = function (refresh, opts) {
         var url = this.base.getBlueprintUrl("pluginmanager") + "repository";
         return this.base.get(url + (refresh ? "?refresh=true" : ""), opts);
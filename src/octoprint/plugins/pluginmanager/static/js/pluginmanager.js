@@ -183,6 +183,21 @@ $(function () {
             0
         );
 
+        self.accounting = new ItemListHelper(
+            "plugin.pluginmanager.accounting",
+            {
+                total: function (a, b) {
+                    // sorts descending
+                    return b["total"] - a["total"];
+                }
+            },
+            {},
+            "total",
+            [],
+            [],
+            0
+        );
+
         self.selectedPlugins = ko.observableArray([]);
 
         self.uploadElement = $("#settings_plugin_pluginmanager_repositorydialog_upload");
@@ -750,6 +765,17 @@ $(function () {
             self.orphans.updateItems(orphans);
         };
 
+        self.fromAccountingResponse = function (data) {
+            self.accounting.updateItems(data);
+        };
+
+        self.formatMilliseconds = function (value) {
+            if (value >= 1000) {
+                return _.sprintf("%.2fs", value / 1000);
+            }
+            return _.sprintf("%.2fms", value);
+        };
+
         self.fromRepositoryResponse = function (data) {
             self.repositoryAvailable(data.available);
             if (data.available) {
@@ -871,6 +897,20 @@ $(function () {
             return deferred.promise();
         };
 
+        self.requestAccountingData = function () {
+            if (
+                !self.loginState.hasPermission(
+                    self.access.permissions.PLUGIN_PLUGINMANAGER_MANAGE
+                )
+            ) {
+                return $.Deferred().reject().promise();
+            }
+
+            return OctoPrint.plugins.pluginmanager.getAccounting().done(function (data) {
+                self.fromAccountingResponse(data.accounting);
+            });
+        };
+
         self.dataRepositoryDeferred = undefined;
         self.requestRepositoryData = function (options) {
             if (!_.isPlainObject(options)) {
@@ -2314,6 +2354,7 @@ $(function () {
             ) {
                 self.requestRepositoryData();
                 self.requestOrphanData();
+                self.requestAccountingData();
             }
         };
 
@@ -1,4 +1,5 @@
 import logging
+import struct
 
 from flask_babel import gettext
 
@@ -6,9 +7,53 @@ import octoprint.plugin
 from octoprint.logging.handlers import TriggeredRolloverLogHandler
 from octoprint.settings import valid_boolean_trues
 
+BINARY_LOG_RECORD = struct.Struct("<dI")
+"""Header of a record in the binary serial log: timestamp and length of the UTF-8 encoded message that follows."""
+
 
 class SerialLogHandler(TriggeredRolloverLogHandler):
-    pass
+    """
+    Handler for the serial log.
+
+    If ``binary`` is set, records are written as :data:`BINARY_LOG_RECORD` headers followed by the message,
+    without any formatting. See :func:`iter_binary_log` for reading such a log.
+    """
+
+    def __init__(self, *args, binary=False, **kwargs):
+        self.binary = binary
+        if binary:
+            kwargs["encoding"] = None
+        super().__init__(*args, **kwargs)
+        if binary:
+            self.terminator = b""
+
+    def _open(self):
+        if self.binary:
+            return open(self.baseFilename, self.mode + "b")
+        return super()._open()
+
+    def format(self, record):
+        if self.binary:
+            message = record.getMessage().encode("utf-8", errors="replace")
+            return BINARY_LOG_RECORD.pack(record.created, len(message)) + message
+        return super().format(record)
+
+
+def iter_binary_log(f):
+    """
+    Reads the binary serial log from the binary file like object ``f``.
+
+    Yields:
+        tuple: timestamp and message of each record
+    """
+    while header := f.read(BINARY_LOG_RECORD.size):
+        if len(header) < BINARY_LOG_RECORD.size:
+            break  # truncated
+        created, length = BINARY_LOG_RECORD.unpack(header)
+        message = f.read(length)
+        if len(message) < length:
+            break  # truncated
+        yield created, message.decode("utf-8", errors="replace")
 
 
 class SerialConnectorPlugin(
@@ -33,14 +78,18 @@ class SerialConnectorPlugin(
         from octoprint.logging import LOGGING_TIMED_MESSAGE_ONLY_FORMAT
 
         log_enabled = self._settings.get_boolean(["log"])
+        log_binary = self._settings.get(["logFormat"]) == "binary"
 
         serial_log_handler = SerialLogHandler(
             os.path.join(
-                self._settings.global_get_basefolder("logs"), "serial.log"
-            ),  # for backwards compatibility reasons we'll continue to use the name serial.log
+                self._settings.global_get_basefolder("logs"),
+                # for backwards compatibility reasons we'll continue to use the name serial.log
+                "serial.bin.log" if log_binary else "serial.log",
+            ),
             encoding="utf-8",
             backupCount=3,
             delay=True,
+            binary=log_binary,
         )
         serial_log_handler.setFormatter(
             logging.Formatter(LOGGING_TIMED_MESSAGE_ONLY_FORMAT)
@@ -236,6 +285,71 @@ class SerialConnectorPlugin(
     def is_template_autoescaped(self):
         return True
 
+    ##~~ CLI hook
+
+    def cli_commands_hook(self, cli_group, pass_octoprint_ctx, *args, **kwargs):
+        import time
+
+        import click
+
+        @click.command("decode_log")
+        @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+        def decode_log_command(path):
+            """
+            Converts a binary serial log to text.
+            """
+            with open(path, "rb") as f:
+                for created, message in iter_binary_log(f):
+                    timestamp = time.strftime(
+                        "%Y-%m-%d %H:%M:%S", time.localtime(created)
+                    )
+                    click.echo(f"{timestamp},{int(created % 1 * 1000):03d} - {message}")
+
+        @click.command("classify_log")
+        @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+        @click.option(
+            "--repeat",
+            type=int,
+            default=10,
+            show_default=True,
+            help="How often to replay the log.",
+        )
+        def classify_log_command(path, repeat):
+            """
+            Replays the received lines of a serial log through the line classifier.
+
+            Prints how the lines were classified and how long that took, as a
+            micro-benchmark for the monitor loop. Binary logs are detected by their
+            .bin.log extension.
+            """
+            from .line_classifier import received_lines, replay
+
+            if path.endswith(".bin.log"):
+                with open(path, "rb") as f:
+                    lines = list(
+                        received_lines(message for _, message in iter_binary_log(f))
+                    )
+            else:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    lines = list(received_lines(f))
+
+            if not lines:
+                click.echo("No received lines found in the log")
+                return
+
+            duration, counters = replay(lines, repeat=repeat)
+
+            total = repeat * len(lines)
+            click.echo(
+                f"Classified {len(lines)} lines {repeat} times in {duration:.3f}s, "
+                f"{duration / total * 1000000:.2f}µs per line, "
+                f"{total / duration:.0f} lines/s"
+            )
+            for line_class, count in counters.most_common():
+                click.echo(f"  {line_class}: {count} ({count / len(lines):.1%})")
+
+        return [decode_log_command, classify_log_command]
+
 
 __plugin_name__ = "Serial Connector"
 __plugin_author__ = "Gina Häußge"
@@ -249,3 +363,6 @@ __plugin_disabling_discouraged__ = gettext(
     "to printers based on serial communication."
 )
 __plugin_implementation__ = SerialConnectorPlugin()
+__plugin_hooks__ = {
+    "octoprint.cli.commands": __plugin_implementation__.cli_commands_hook,
+}
@@ -0,0 +1,526 @@
+"""
+Host side of Marlin's binary file transfer protocol (``BINARY_FILE_TRANSFER``).
+
+After ``M28 B1`` switched the firmware to binary mode, all data is exchanged in packets of
+the following format, with all multi byte values in little endian::
+
+    token 0xB5AD (2) | sync (1) | protocol << 4 | packet type (1) | payload size (2) | header checksum (2)
+    [ payload (size) | packet checksum (2) ]
+
+The header checksum covers sync, type and size, the packet checksum everything from the
+sync to the end of the payload. Both are Fletcher-16 checksums with modulo 255 arithmetic.
+Payload and packet checksum are only present for a non-empty payload.
+
+The firmware acknowledges every packet it received intact with ``ok<sync>`` and requests
+a resend of corrupted ones with ``rs<sync>``. Responses of the file transfer protocol follow
+the acknowledgement as ``PFT:<response>``.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import logging
+import queue
+import re
+import struct
+import time
+from collections import deque, namedtuple
+
+try:
+    import heatshrink2.core as heatshrink
+except ImportError:
+    heatshrink = None
+
+PACKET_TOKEN = 0xB5AD
+HEADER_SIZE = 8
+
+PROTOCOL_CONTROL = 0
+CONTROL_SYNC = 1
+CONTROL_CLOSE = 2
+
+PROTOCOL_FILE_TRANSFER = 1
+FILE_TRANSFER_QUERY = 0
+FILE_TRANSFER_OPEN = 1
+FILE_TRANSFER_CLOSE = 2
+FILE_TRANSFER_WRITE = 3
+FILE_TRANSFER_ABORT = 4
+
+PACKET_NAMES = {
+    (PROTOCOL_CONTROL, CONTROL_SYNC): "SYNC",
+    (PROTOCOL_CONTROL, CONTROL_CLOSE): "CLOSE",
+    (PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_QUERY): "QUERY",
+    (PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_OPEN): "OPEN",
+    (PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_CLOSE): "CLOSE FILE",
+    (PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_WRITE): "WRITE",
+    (PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_ABORT): "ABORT",
+}
+
+DEFAULT_WINDOW = 1
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_MAX_RETRIES = 10
+
+_response_regex = re.compile(
+    r"^(?:(?P<kind>ok|rs|fe)(?P<sync>\d+)|ss(?P<connection>\d+,\d+,\S+))$"
+)
+
+Packet = namedtuple("Packet", "sync protocol packet_type payload")
+"""A received packet. ``payload`` is ``None`` if the packet failed its checksum."""
+
+
+class BinaryTransferError(Exception):
+    pass
+
+
+class BinaryTransferUnavailable(BinaryTransferError):
+    """The printer couldn't be switched to the binary protocol, nothing was transferred."""
+
+    pass
+
+
+class BinaryTransferCancelled(BinaryTransferError):
+    pass
+
+
+def checksum(data, cs=0):
+    """Fletcher-16 checksum of ``data`` as used by the protocol, continuing from ``cs``."""
+    for b in data:
+        low = ((cs & 0xFF) + b) % 255
+        cs = ((((cs >> 8) + low) % 255) << 8) | low
+    return cs
+
+
+def build_packet(sync, protocol, packet_type, payload=b""):
+    header = struct.pack(
+        "<BBH", sync & 0xFF, (protocol & 0xF) << 4 | (packet_type & 0xF), len(payload)
+    )
+    header += struct.pack("<H", checksum(header))
+
+    packet = struct.pack("<H", PACKET_TOKEN) + header
+    if payload:
+        packet += payload + struct.pack("<H", checksum(payload, checksum(header)))
+    return packet
+
+
+def describe_packet(sync, protocol, packet_type, payload=b""):
+    name = PACKET_NAMES.get((protocol, packet_type), f"{protocol}:{packet_type}")
+    description = f"binary {name} #{sync}"
+    if payload:
+        description += f" ({len(payload)} bytes)"
+    return description
+
+
+class PacketReader:
+    """
+    Parses packets from a byte stream the way the firmware does, for the printer's side of
+    the protocol.
+    """
+
+    _token = struct.pack("<H", PACKET_TOKEN)
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Adds ``data`` to the stream and returns a list of all :class:`Packet` completed by it.
+
+        Packets with a corrupted header are returned with all fields set to ``None``.
+        """
+        self._buffer += data
+
+        packets = []
+        while True:
+            start = self._buffer.find(self._token)
+            if start < 0:
+                # the last byte might be the first half of the next token
+                del self._buffer[:-1]
+                break
+
+            del self._buffer[:start]
+            if len(self._buffer) < HEADER_SIZE:
+                break
+
+            header = bytes(self._buffer[2:6])
+            (header_checksum,) = struct.unpack_from("<H", self._buffer, 6)
+            if checksum(header) != header_checksum:
+                packets.append(Packet(None, None, None, None))
+                del self._buffer[:2]
+                continue
+
+            sync, meta, size = struct.unpack("<BBH", header)
+            length = HEADER_SIZE + size + 2 if size else HEADER_SIZE
+            if len(self._buffer) < length:
+                break
+
+            payload = bytes(self._buffer[HEADER_SIZE : HEADER_SIZE + size])
+            if size:
+                (packet_checksum,) = struct.unpack_from(
+                    "<H", self._buffer, HEADER_SIZE + size
+                )
+                if checksum(payload, checksum(self._buffer[2:HEADER_SIZE])) != (
+                    packet_checksum
+                ):
+                    payload = None
+
+            packets.append(Packet(sync, meta >> 4, meta & 0xF, payload))
+            del self._buffer[:length]
+
+        return packets
+
+
+class BinaryFileTransfer:
+    """
+    Transfers a file to the printer's SD card through the binary file transfer protocol.
+
+    :meth:`run` performs the whole transfer and blocks until it is done. While it is active,
+    all lines received from the printer need to be handed to :meth:`feed`.
+
+    Packets are sent go-back-N style: up to ``window`` packets may be unacknowledged at a
+    time, on a resend request or a timeout all of them get sent again. Marlin processes
+    packets one at a time from its receive buffer, so a window larger than 1 needs a
+    receive buffer large enough to hold that many packets.
+
+    Arguments:
+        write (callable): Writes a packet to the printer, called with the packet's bytes and
+            a short description of it for logging
+        source (iterable): The file's contents as ``bytes`` chunks
+        remote (str): Name of the file on the printer's SD card
+        window (int): Maximum number of unacknowledged packets
+        compression (bool): Whether to compress the data if the printer supports it,
+            requires the ``heatshrink2`` package
+        timeout (float): Time to wait for an acknowledgement before sending again, in s
+        max_retries (int): Maximum number of consecutive retries before giving up
+        encoding (str): Encoding to use for the file name
+        log (callable): Called with status messages about the transfer
+    """
+
+    def __init__(
+        self,
+        write,
+        source,
+        remote,
+        window=DEFAULT_WINDOW,
+        compression=True,
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=DEFAULT_MAX_RETRIES,
+        encoding="ascii",
+        log=None,
+    ):
+        self._logger = logging.getLogger(__name__)
+
+        self._write = write
+        self._source = source
+        self._remote = remote
+        self._window = max(1, window)
+        self._compression = compression
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._encoding = encoding
+        self._log = log if log is not None else self._logger.info
+
+        self._responses = queue.Queue()
+        self._cancelled = False
+
+        self._sync = 0
+        self._block_size = None
+        self._heatshrink = None
+
+        self.size = 0
+        """Size of the transferred file, in bytes."""
+
+        self.transferred = 0
+        """Transferred payload, in bytes. Less than ``size`` if compressed."""
+
+        self.packets = 0
+        """Number of sent packets, excluding resends."""
+
+        self.resends = 0
+        """Number of resent packets."""
+
+    @property
+    def compressed(self):
+        return self._heatshrink is not None
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def feed(self, line):
+        """
+        Hands a line received from the printer to the transfer.
+
+        Returns ``True`` if the line was a response of the binary protocol, ``False`` otherwise.
+        """
+        line = line.strip()
+        if line.startswith("PFT:"):
+            self._responses.put(("PFT", line[len("PFT:") :]))
+            return True
+
+        match = _response_regex.match(line)
+        if match is None:
+            return False
+
+        if match.group("connection"):
+            self._responses.put(("ss", match.group("connection")))
+        else:
+            self._responses.put((match.group("kind"), int(match.group("sync"))))
+        return True
+
+    def cancel(self):
+        self._cancelled = True
+        self._responses.put(("cancel", None))
+
+    def run(self, progress=None):
+        """
+        Runs the transfer.
+
+        Arguments:
+            progress (callable): Called without arguments whenever a packet of the file was
+                acknowledged
+
+        Raises:
+            BinaryTransferUnavailable: The printer couldn't be switched to the binary protocol
+            BinaryTransferCancelled: The transfer was cancelled through :meth:`cancel`
+            BinaryTransferError: The transfer failed
+        """
+        start = time.monotonic()
+        try:
+            try:
+                self._connect()
+                self._query()
+            except BinaryTransferCancelled:
+                raise
+            except BinaryTransferError as exc:
+                raise BinaryTransferUnavailable(str(exc)) from exc
+
+            self._open()
+            try:
+                self._transmit(
+                    PROTOCOL_FILE_TRANSFER,
+                    FILE_TRANSFER_WRITE,
+                    self._blocks(),
+                    window=self._window,
+                    progress=progress,
+                )
+
+                self._request(PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_CLOSE)
+                response = self._response()
+                if response != "success":
+                    raise BinaryTransferError(
+                        f"Printer could not save {self._remote}: {response}"
+                    )
+            except BinaryTransferError:
+                self._abort()
+                raise
+
+        finally:
+            self._disconnect()
+
+        duration = time.monotonic() - start
+        self._log(
+            "Transferred {} bytes in {:.1f}s ({:.1f} KB/s), sent {} packets, {} resends{}".format(
+                self.size,
+                duration,
+                self.size / duration / 1024 if duration else 0.0,
+                self.packets,
+                self.resends,
+                f", compressed to {self.transferred} bytes" if self.compressed else "",
+            )
+        )
+
+    ##~~ protocol steps
+
+    def _connect(self):
+        for _ in range(self._max_retries):
+            self._send(0, PROTOCOL_CONTROL, CONTROL_SYNC)
+            response = self._wait({"ss"})
+            if response is not None:
+                break
+        else:
+            raise BinaryTransferError("Printer did not answer the sync request")
+
+        sync, buffer_size, version = response[1].split(",")
+        self._sync = int(sync)
+        self._block_size = int(buffer_size)
+        self._log(
+            f"Switched to binary protocol version {version}, packet size {buffer_size} bytes"
+        )
+
+    def _query(self):
+        self._request(PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_QUERY)
+        response = self._response()
+
+        # version:<version>:compression:<none|heatshrink,<window>,<lookahead>>
+        fields = response.split(":")
+        info = dict(zip(fields[::2], fields[1::2]))
+        if "version" not in info:
+            raise BinaryTransferError(f"Unexpected query response: {response}")
+
+        compression = info.get("compression", "none").split(",")
+        if self._compression and compression[0] == "heatshrink" and len(compression) == 3:
+            if heatshrink is None:
+                self._logger.info(
+                    "Printer supports compressed file transfers, install heatshrink2 to make use of that"
+                )
+            else:
+                self._heatshrink = (int(compression[1]), int(compression[2]))
+
+    def _open(self):
+        payload = (
+            bytes([0, 1 if self.compressed else 0])
+            + self._remote.encode(self._encoding, errors="replace")
+            + b"\0"
+        )
+        self._request(PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_OPEN, payload)
+
+        response = self._response()
+        if response == "busy":
+            raise BinaryTransferError("Printer is busy with another file transfer")
+        elif response != "success":
+            raise BinaryTransferError(
+                f"Printer could not open {self._remote}: {response}"
+            )
+
+    def _abort(self):
+        try:
+            self._request(PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_ABORT, max_retries=2)
+            self._response()
+        except BinaryTransferError:
+            self._logger.warning("Could not abort the transfer on the printer")
+
+    def _disconnect(self):
+        try:
+            self._request(PROTOCOL_CONTROL, CONTROL_CLOSE, max_retries=2)
+        except BinaryTransferError:
+            self._logger.warning("Could not switch the printer back from binary mode")
+
+    ##~~ packet handling
+
+    def _blocks(self):
+        encoder = None
+        if self._heatshrink is not None:
+            window_sz2, lookahead_sz2 = self._heatshrink
+            encoder = heatshrink.Encoder(
+                heatshrink.Writer(window_sz2=window_sz2, lookahead_sz2=lookahead_sz2)
+            )
+
+        buffer = bytearray()
+        for chunk in self._source:
+            self.size += len(chunk)
+            if encoder is not None:
+                chunk = encoder.fill(chunk)
+            buffer += chunk
+
+            while len(buffer) >= self._block_size:
+                yield bytes(buffer[: self._block_size])
+                del buffer[: self._block_size]
+
+        if encoder is not None:
+            buffer += encoder.finish()
+
+        while buffer:
+            yield bytes(buffer[: self._block_size])
+            del buffer[: self._block_size]
+
+    def _request(self, protocol, packet_type, payload=b"", max_retries=None):
+        self._transmit(protocol, packet_type, [payload], max_retries=max_retries)
+
+    def _transmit(
+        self,
+        protocol,
+        packet_type,
+        payloads,
+        window=1,
+        progress=None,
+        max_retries=None,
+    ):
+        if max_retries is None:
+            max_retries = self._max_retries
+
+        payloads = iter(payloads)
+        pending = deque()
+        exhausted = False
+        retries = 0
+
+        while True:
+            while not exhausted and len(pending) < window:
+                payload = next(payloads, None)
+                if payload is None:
+                    exhausted = True
+                    break
+
+                sync = self._sync
+                self._sync = (self._sync + 1) % 256
+                pending.append(self._send(sync, protocol, packet_type, payload))
+
+                self.packets += 1
+                if (
+                    protocol == PROTOCOL_FILE_TRANSFER
+                    and packet_type == FILE_TRANSFER_WRITE
+                ):
+                    self.transferred += len(payload)
+
+            if not pending:
+                return
+
+            response = self._wait({"ok", "rs"})
+            if response is not None and response[0] == "ok":
+                # acknowledgements are cumulative, a lost one is covered by the next
+                syncs = [entry[0] for entry in pending]
+                if response[1] in syncs:
+                    for _ in range(syncs.index(response[1]) + 1):
+                        pending.popleft()
+                        if progress is not None:
+                            progress()
+                    retries = 0
+                continue
+
+            retries += 1
+            if retries > max_retries:
+                raise BinaryTransferError(
+                    f"Giving up after {max_retries} retries of packet #{pending[0][0]}"
+                )
+
+            if response is not None:
+                # resend request - everything before the requested packet got through
+                syncs = [entry[0] for entry in pending]
+                if response[1] in syncs:
+                    for _ in range(syncs.index(response[1])):
+                        pending.popleft()
+
+            for _sync, packet, description in pending:
+                self._write(packet, description)
+                self.resends += 1
+
+    def _send(self, sync, protocol, packet_type, payload=b""):
+        packet = build_packet(sync, protocol, packet_type, payload)
+        description = describe_packet(sync, protocol, packet_type, payload)
+        self._write(packet, description)
+        return sync, packet, description
+
+    def _response(self):
+        response = self._wait({"PFT"}, timeout=self._timeout * self._max_retries)
+        if response is None:
+            raise BinaryTransferError("Printer did not respond")
+        return response[1]
+
+    def _wait(self, kinds, timeout=None):
+        deadline = time.monotonic() + (timeout if timeout is not None else self._timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            try:
+                kind, value = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                return None
+
+            if kind == "cancel":
+                raise BinaryTransferCancelled("Transfer got cancelled")
+            elif kind == "fe":
+                raise BinaryTransferError(
+                    f"Printer reported a fatal error at packet #{value}"
+                )
+            elif kind in kinds:
+                return kind, value
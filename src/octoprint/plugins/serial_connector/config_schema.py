@@ -21,6 +21,11 @@ class InfoWarnNeverEnum(str, Enum):
     never = "never"
 
 
+class LogFormatEnum(str, Enum):
+    text = "text"
+    binary = "binary"
+
+
 class DisconnectCancelIgnoreEnum(str, Enum):
     disconnect = "disconnect"
     cancel = "cancel"
@@ -107,6 +112,9 @@ class SerialCapabilities(BaseModel):
     lfn_write: bool = True
     """Whether to enable long filename support for SD card writes if the firmware reports support for it."""
 
+    binary_file_transfer: bool = True
+    """Whether to transfer files to the printer's SD card with the binary file transfer protocol if the firmware reports support for it."""
+
 
 class SerialConfig(BaseModel):
     exclusive: bool = True
@@ -115,9 +123,15 @@ class SerialConfig(BaseModel):
     lowLatency: bool = False
     """Whether to request low latency mode on the serial port."""
 
+    bulkRead: bool = True
+    """Whether to read from the serial port in bulk, handing received lines over in batches. Only supported on platforms where the port has a file descriptor to wait on, e.g. Linux."""
+
     log: bool = False
     """Whether to log whole communication to ``serial.log`` (warning: might decrease performance)."""
 
+    logFormat: LogFormatEnum = "text"
+    """Format of the communication log. ``binary`` logs to ``serial.bin.log`` in a compact format that's cheaper to write, use ``octoprint plugins serial_connector:decode_log`` to convert it to text. Requires a restart."""
+
     timeout: SerialTimeoutConfig = SerialTimeoutConfig()
     """Timeouts used for the serial connection to the printer, you might want to adjust these if you are experiencing connection problems."""
 
@@ -185,6 +199,13 @@ class SerialConfig(BaseModel):
     """Size of log lines to keep for logging error context."""
 
     lastLineBufferSize: int = 50
+    """Minimum number of sent lines to keep for serving resend requests."""
+
+    lastLineBufferBytes: int = 65536
+    """Maximum size of the sent lines kept for serving resend requests, in bytes. Older lines beyond ``lastLineBufferSize`` are dropped once this is exceeded."""
+
+    lookaheadLines: int = 250
+    """Number of lines of a printed file to interpret ahead of the printer, for tracking layers and planned print time. Set to 0 to disable."""
 
     logResends: bool = True
     """Whether to log resends to octoprint.log or not. Invaluable debug tool without performance impact, leave on if possible please."""
@@ -276,6 +297,12 @@ class SerialConfig(BaseModel):
 
     capabilities: SerialCapabilities = SerialCapabilities()
 
+    binaryTransferWindow: int = 1
+    """Number of packets to send ahead of their acknowledgement during binary file transfers. Only increase this if the printer's receive buffer can hold that many packets."""
+
+    binaryTransferCompression: bool = True
+    """Whether to compress binary file transfers if the firmware supports it. Requires the ``heatshrink2`` package."""
+
     resendRatioThreshold: int = 10
     """Percentage of resend requests among all sent lines that should be considered critical."""
 
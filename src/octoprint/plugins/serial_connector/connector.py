@@ -1,6 +1,7 @@
 import copy
 import logging
 import os
+import time
 from gettext import gettext
 from typing import TYPE_CHECKING, Any
 
@@ -9,6 +10,7 @@ from octoprint.events import Events, eventManager
 from octoprint.filemanager import valid_file_type
 from octoprint.filemanager.destinations import FileDestinations
 from octoprint.filemanager.storage import StorageCapabilities
+from octoprint.logging import log_batch
 from octoprint.printer import (
     CommunicationHealth,
     ConnectedPrinterCapabilities,
@@ -24,8 +26,9 @@ from octoprint.printer.connection import (
     ConnectedPrinter,
     ConnectedPrinterState,
 )
-from octoprint.printer.job import JobProgress, PrintJob, UploadJob
+from octoprint.printer.job import JobProgress, PlannedMotion, PrintJob, UploadJob
 
+from .gcode_commands import GcodeCommandsMixin
 from .serial_comm import MachineCom, baudrateList, serialList
 
 if TYPE_CHECKING:
@@ -34,7 +37,7 @@ if TYPE_CHECKING:
     from octoprint.plugin import PluginManager, PluginSettings
 
 
-class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
+class ConnectedSerialPrinter(GcodeCommandsMixin, ConnectedPrinter, PrinterFilesMixin):
     connector = "serial"
     name = "Serial Connection"
 
@@ -152,9 +155,6 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
         if self._comm is not None:
             self._comm.close()
 
-    def emergency_stop(self, *args, **kwargs):
-        self.commands("M112", tags=kwargs.get("tags", set()))
-
     def job_on_hold(self, blocking=True, *args, **kwargs):
         if self._comm is None:
             raise RuntimeError("No connection to the printer")
@@ -189,6 +189,13 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
             critical=critical,
         )
 
+    @property
+    def poll_schedule(self) -> dict:
+        """The schedule of the connection's periodic tasks, for debugging purposes."""
+        if self._comm is None:
+            return {}
+        return self._comm.poll_schedule
+
     def commands(self, *commands, tags=None, force=False, **kwargs):
         """
         Sends one or more gcode commands to the printer.
@@ -216,7 +223,9 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
         event_name = name[0].upper() + name[1:]
 
         event_start = f"GcodeScript{event_name}Running"
-        payload = context.get("event", None) if isinstance(context, dict) else None
+        payload = self.event_payload(
+            context.get("event", None) if isinstance(context, dict) else None
+        )
 
         eventManager().fire(event_start, payload)
 
@@ -232,80 +241,6 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
         event_end = f"GcodeScript{event_name}Finished"
         eventManager().fire(event_end, payload)
 
-    def jog(self, axes, relative=True, speed=None, *args, **kwargs):
-        command = "G0 {}".format(
-            " ".join([f"{axis.upper()}{amt}" for axis, amt in axes.items()])
-        )
-
-        if speed is None:
-            speed = min(self._profile["axes"][axis]["speed"] for axis in axes)
-
-        if speed and not isinstance(speed, bool):
-            command += f" F{speed}"
-
-        if relative:
-            commands = ["G91", command, "G90"]
-        else:
-            commands = ["G90", command]
-
-        self.commands(*commands, tags=kwargs.get("tags", set()) | {"trigger:printer.jog"})
-
-    def home(self, axes, *args, **kwargs):
-        self.commands(
-            "G91",
-            "G28 {}".format(" ".join(f"{x.upper()}0" for x in axes)),
-            "G90",
-            tags=kwargs.get("tags", set()) | {"trigger:printer.home"},
-        )
-
-    def extrude(self, amount, speed=None, *args, **kwargs):
-        # Use specified speed (if any)
-        max_e_speed = self._profile["axes"]["e"]["speed"]
-
-        if speed is None:
-            # No speed was specified so default to value configured in printer profile
-            extrusion_speed = max_e_speed
-        else:
-            # Make sure that specified value is not greater than maximum as defined in printer profile
-            extrusion_speed = min([speed, max_e_speed])
-
-        self.commands(
-            "G91",
-            "M83",
-            f"G1 E{amount} F{extrusion_speed}",
-            "M82",
-            "G90",
-            tags=kwargs.get("tags", set()) | {"trigger:printer.extrude"},
-        )
-
-    def change_tool(self, tool, *args, **kwargs):
-        tool = int(tool[len("tool") :])
-        self.commands(
-            f"T{tool}",
-            tags=kwargs.get("tags", set()) | {"trigger:printer.change_tool"},
-        )
-
-    def set_temperature(self, heater, value, tags=None, *args, **kwargs):
-        if heater == "tool":
-            # set current tool, whatever that might be
-            self.commands(f"M104 S{value}", tags=tags)
-
-        elif heater.startswith("tool"):
-            # set specific tool
-            extruder_count = self._profile["extruder"]["count"]
-            shared_nozzle = self._profile["extruder"]["sharedNozzle"]
-            if extruder_count > 1 and not shared_nozzle:
-                toolNum = int(heater[len("tool") :])
-                self.commands(f"M104 T{toolNum} S{value}", tags=tags)
-            else:
-                self.commands(f"M104 S{value}", tags=tags)
-
-        elif heater == "bed":
-            self.commands(f"M140 S{value}", tags=tags)
-
-        elif heater == "chamber":
-            self.commands(f"M141 S{value}", tags=tags)
-
     def set_temperature_offset(self, offsets=None, tags=None, *args, **kwargs):
         if self._comm is None:
             return
@@ -319,18 +254,6 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
 
         return copy.deepcopy(self._comm.getOffsets())
 
-    def feed_rate(self, factor, tags=None, *args, **kwargs):
-        self.commands(
-            f"M220 S{factor}",
-            tags=tags,
-        )
-
-    def flow_rate(self, factor, tags=None, *args, **kwargs):
-        self.commands(
-            f"M221 S{factor}",
-            tags=tags,
-        )
-
     def set_job(
         self,
         job: PrintJob,
@@ -359,6 +282,7 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
             job.storage != FileDestinations.LOCAL,
             user=user,
             tags=tags,
+            time_index=job.time_index,
         )
 
     def supports_job(self, job: PrintJob) -> bool:
@@ -380,6 +304,18 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
         if self._comm is None:
             return None
 
+        planned = None
+        lookahead = self._comm.getPrintLookahead()
+        if lookahead is not None:
+            planned = PlannedMotion(
+                elapsed=lookahead.elapsed,
+                left=lookahead.left,
+                layer=lookahead.layer,
+                layer_count=lookahead.layer_count,
+                next_layer=lookahead.next_layer,
+                next_pause=lookahead.next_pause,
+            )
+
         return JobProgress(
             job=self.current_job,
             progress=self._comm.getPrintProgress(),
@@ -387,6 +323,7 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
             elapsed=self._comm.getPrintTime(),
             cleaned_elapsed=self._comm.getCleanedPrintTime(),
             left_estimate=self._comm.getPrintTimeLeft(),
+            planned=planned,
         )
 
     def get_file_position(self):
@@ -633,7 +570,16 @@ class ConnectedSerialPrinter(ConnectedPrinter, PrinterFilesMixin):
     # ~~ comm.MachineComPrintCallback implementation
 
     def on_comm_log(self, message):
-        self.log_lines(message)
+        self.on_comm_logs([(time.time(), message)])
+
+    def on_comm_logs(self, entries):
+        log_batch(self._serial_logger, logging.DEBUG, entries)
+        self._listener.on_printer_logs(
+            *[
+                util.to_unicode(message, "utf-8", errors="replace")
+                for _, message in entries
+            ]
+        )
 
     def on_comm_temperature_update(self, tools, bed, chamber, custom=None):
         if custom is None:
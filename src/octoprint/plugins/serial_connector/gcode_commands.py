@@ -0,0 +1,102 @@
+"""
+G-code for the printer controls, shared by the connectors talking G-code to the printer.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+
+class GcodeCommandsMixin:
+    """
+    Implements the printer controls of :class:`~octoprint.printer.connection.ConnectedPrinter`
+    on top of its ``commands`` method, using the connection's printer profile.
+    """
+
+    def emergency_stop(self, *args, **kwargs):
+        self.commands("M112", tags=kwargs.get("tags", set()))
+
+    def jog(self, axes, relative=True, speed=None, *args, **kwargs):
+        command = "G0 {}".format(
+            " ".join([f"{axis.upper()}{amt}" for axis, amt in axes.items()])
+        )
+
+        if speed is None:
+            speed = min(self._profile["axes"][axis]["speed"] for axis in axes)
+
+        if speed and not isinstance(speed, bool):
+            command += f" F{speed}"
+
+        if relative:
+            commands = ["G91", command, "G90"]
+        else:
+            commands = ["G90", command]
+
+        self.commands(*commands, tags=kwargs.get("tags", set()) | {"trigger:printer.jog"})
+
+    def home(self, axes, *args, **kwargs):
+        self.commands(
+            "G91",
+            "G28 {}".format(" ".join(f"{x.upper()}0" for x in axes)),
+            "G90",
+            tags=kwargs.get("tags", set()) | {"trigger:printer.home"},
+        )
+
+    def extrude(self, amount, speed=None, *args, **kwargs):
+        # Use specified speed (if any)
+        max_e_speed = self._profile["axes"]["e"]["speed"]
+
+        if speed is None:
+            # No speed was specified so default to value configured in printer profile
+            extrusion_speed = max_e_speed
+        else:
+            # Make sure that specified value is not greater than maximum as defined in printer profile
+            extrusion_speed = min([speed, max_e_speed])
+
+        self.commands(
+            "G91",
+            "M83",
+            f"G1 E{amount} F{extrusion_speed}",
+            "M82",
+            "G90",
+            tags=kwargs.get("tags", set()) | {"trigger:printer.extrude"},
+        )
+
+    def change_tool(self, tool, *args, **kwargs):
+        tool = int(tool[len("tool") :])
+        self.commands(
+            f"T{tool}",
+            tags=kwargs.get("tags", set()) | {"trigger:printer.change_tool"},
+        )
+
+    def set_temperature(self, heater, value, tags=None, *args, **kwargs):
+        if heater == "tool":
+            # set current tool, whatever that might be
+            self.commands(f"M104 S{value}", tags=tags)
+
+        elif heater.startswith("tool"):
+            # set specific tool
+            extruder_count = self._profile["extruder"]["count"]
+            shared_nozzle = self._profile["extruder"]["sharedNozzle"]
+            if extruder_count > 1 and not shared_nozzle:
+                toolNum = int(heater[len("tool") :])
+                self.commands(f"M104 T{toolNum} S{value}", tags=tags)
+            else:
+                self.commands(f"M104 S{value}", tags=tags)
+
+        elif heater == "bed":
+            self.commands(f"M140 S{value}", tags=tags)
+
+        elif heater == "chamber":
+            self.commands(f"M141 S{value}", tags=tags)
+
+    def feed_rate(self, factor, tags=None, *args, **kwargs):
+        self.commands(
+            f"M220 S{factor}",
+            tags=tags,
+        )
+
+    def flow_rate(self, factor, tags=None, *args, **kwargs):
+        self.commands(
+            f"M221 S{factor}",
+            tags=tags,
+        )
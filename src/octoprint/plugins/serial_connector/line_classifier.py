@@ -0,0 +1,190 @@
+"""
+Classification of lines received from the printer's firmware.
+
+The monitor loop of :class:`~octoprint.plugins.serial_connector.serial_comm.MachineCom`
+needs to figure out what kind of line it just received in order to decide how to handle
+it. Instead of running every line through a long chain of ``startswith`` and substring
+checks, :class:`LineClassifier` uses two precompiled regular expressions: one anchored
+one for the response prefixes (``ok``, ``wait``, ``busy:``, ``Resend``, ``Error:``, ...)
+and one that collects all tokens that identify the content of a line (position reports,
+temperature reports, capability reports, ...) in a single pass.
+
+Handlers of the ``octoprint.comm.protocol.gcode.received`` hook may declare the line
+prefixes they care about via :func:`received_prefixes`, they will then only be called
+for lines starting with one of those.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import re
+import time
+from collections import Counter
+
+LINE_EMPTY = "empty"
+LINE_OK = "ok"
+LINE_WAIT = "wait"
+LINE_BUSY = "busy"
+LINE_DEBUG = "debug"
+LINE_RESEND = "resend"
+LINE_ERROR = "error"
+LINE_POSITION = "position"
+LINE_TEMPERATURE = "temperature"
+LINE_TARGET_TEMPERATURE = "target_temperature"
+LINE_CAPABILITY = "capability"
+LINE_FIRMWARE = "firmware"
+LINE_INVALID_EXTRUDER = "invalid_extruder"
+LINE_OTHER = "other"
+
+PREFIX_CLASSES = (
+    LINE_OK,
+    LINE_WAIT,
+    LINE_BUSY,
+    LINE_DEBUG,
+    LINE_RESEND,
+    LINE_ERROR,
+)
+"""Line classes determined by the start of the line, in order of precedence."""
+
+CONTENT_CLASSES = (
+    LINE_POSITION,
+    LINE_TEMPERATURE,
+    LINE_TARGET_TEMPERATURE,
+    LINE_CAPABILITY,
+    LINE_FIRMWARE,
+    LINE_INVALID_EXTRUDER,
+    LINE_OTHER,
+)
+"""Line classes determined by the content of the line, in order of precedence."""
+
+_prefix_regex = re.compile(
+    r"(?P<ok>ok)"
+    r"|(?P<wait>wait$)"
+    r"|(?P<busy>(?:echo:)?busy:)"
+    r"|(?P<debug>//)"
+    r"|(?P<resend>(?i:resend|rs))"
+    r"|(?P<error>(?i:error:|fatal:)|!!)"
+)
+
+_content_regex = re.compile(
+    r"(?P<x>X:)"
+    r"|(?P<y>Y:)"
+    r"|(?P<z>Z:)"
+    r"|(?P<tool>(?:^| )T0?:)"
+    r"|(?P<bed>(?:^| )B:)"
+    r"|(?P<a>A:)"
+    r"|(?P<target>TargetExtr|TargetBed)"
+    r"|(?P<capability>^(?i:cap:))"
+    r"|(?P<firmware>NAME:|^NAME\.)"
+    r"|(?P<invalid_extruder>(?i:invalid extruder))"
+)
+
+_position_tokens = frozenset(("x", "y", "z"))
+
+
+def received_prefixes(*prefixes):
+    """
+    Decorator for handlers of the ``octoprint.comm.protocol.gcode.received`` hook that
+    declares the line prefixes the handler is interested in. The handler will then only
+    be called for received lines starting with one of ``prefixes``, saving a call for
+    every other line.
+
+    Example::
+
+        @received_prefixes("FIRMWARE_NAME:", "ok")
+        def detect_machine_type(comm, line, *args, **kwargs):
+            ...
+    """
+
+    def decorator(f):
+        f._received_prefixes = tuple(prefixes)
+        return f
+
+    return decorator
+
+
+def get_received_prefixes(hook):
+    """Returns the prefixes declared for ``hook`` via :func:`received_prefixes`, or ``None``."""
+    return getattr(hook, "_received_prefixes", None)
+
+
+class LineClassifier:
+    """
+    Classifies received lines and keeps count of the line classes seen.
+
+    Lines passed in are expected to be stripped of surrounding whitespace.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+
+    def classify(self, line):
+        """
+        Returns the class of ``line`` and counts it. Prefix classes take precedence,
+        all other lines are classified by content through :meth:`classify_content`.
+        """
+        if not line:
+            line_class = LINE_EMPTY
+        else:
+            match = _prefix_regex.match(line)
+            if match is not None:
+                line_class = match.lastgroup
+            else:
+                line_class = self.classify_content(line)
+
+        self.counters[line_class] += 1
+        return line_class
+
+    def classify_content(self, line):
+        """Returns the content class of ``line``, regardless of its prefix."""
+        tokens = {match.lastgroup for match in _content_regex.finditer(line)}
+        if not tokens:
+            return LINE_OTHER
+
+        if _position_tokens <= tokens:
+            return LINE_POSITION
+        elif "tool" in tokens or ("bed" in tokens and "a" not in tokens):
+            return LINE_TEMPERATURE
+        elif "target" in tokens:
+            return LINE_TARGET_TEMPERATURE
+        elif "capability" in tokens:
+            return LINE_CAPABILITY
+        elif "firmware" in tokens:
+            return LINE_FIRMWARE
+        elif "invalid_extruder" in tokens:
+            return LINE_INVALID_EXTRUDER
+        return LINE_OTHER
+
+    def reset(self):
+        self.counters.clear()
+
+
+def received_lines(messages):
+    """
+    Extracts the lines received from the printer from serial log ``messages``, as
+    logged by the connector (``<<< ...``). Messages may still contain the log's
+    timestamp prefix.
+    """
+    for message in messages:
+        _, marker, line = message.partition("<<< ")
+        if marker:
+            yield line.strip()
+
+
+def replay(lines, repeat=10):
+    """
+    Classifies ``lines`` ``repeat`` times, as a micro-benchmark for the classifier.
+
+    Returns:
+        tuple: the duration of all runs in seconds and the counters of a single run
+    """
+    classifier = LineClassifier()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        classifier.reset()
+        for line in lines:
+            classifier.classify(line)
+    duration = time.perf_counter() - start
+
+    return duration, classifier.counters
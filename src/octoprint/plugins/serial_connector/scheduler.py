@@ -0,0 +1,225 @@
+"""
+A single thread running all periodic tasks of a printer connection.
+
+:class:`PollScheduler` replaces one :class:`~octoprint.util.RepeatedTimer` thread per
+task with one thread per connection that sleeps until the next task is due. On top of
+that it adapts the schedule to what is happening on the line:
+
+  * :meth:`PollScheduler.notify` tells it that the data a task would poll for just
+    arrived anyway, e.g. through autoreporting, which postpones the task's next run by
+    a full interval.
+  * If the ``busy`` callable returns ``True`` when a task is due, the run is skipped
+    and the task's interval doubled, up to ``max_backoff`` times its regular interval,
+    until a run goes through again.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Union
+
+
+@dataclass
+class _PollTask:
+    name: str
+    function: Callable[[], None]
+    interval: Callable[[], float]
+    backoff: bool
+    due: float
+    factor: int = 1
+    runs: int = 0
+    skips: int = 0
+    notifications: int = 0
+
+    def current_interval(self) -> float:
+        return self.interval() * self.factor
+
+
+class PollScheduler(threading.Thread):
+    """
+    Arguments:
+        busy (callable): Returns whether the connection is too busy for running tasks
+            that may back off. Defaults to never being busy.
+        max_backoff (int): Maximum factor by which to stretch the interval of a task
+            while the connection is busy.
+        name (str): Name of the thread.
+    """
+
+    def __init__(
+        self,
+        busy: Callable[[], bool] = None,
+        max_backoff: int = 4,
+        name: str = "comm.poll_scheduler",
+    ):
+        threading.Thread.__init__(self, name=name)
+        self.daemon = True
+
+        self._logger = logging.getLogger(__name__)
+
+        self._busy = busy if busy is not None else lambda: False
+        self._max_backoff = max(1, max_backoff)
+
+        self._tasks: dict[str, _PollTask] = {}
+        self._condition = threading.Condition()
+        self._cancelled = False
+
+    def add(
+        self,
+        name: str,
+        function: Callable[[], None],
+        interval: Union[float, Callable[[], float]],
+        run_first: bool = False,
+        backoff: bool = True,
+    ) -> None:
+        """
+        Adds a task, replacing any existing task of the same ``name``.
+
+        Arguments:
+            name (str): Name of the task.
+            function (callable): Function to call when the task is due.
+            interval (float or callable): Interval between runs in seconds, or a callable
+                returning it. Callables are asked again for every run.
+            run_first (bool): Whether to run the task right away instead of after its
+                first interval.
+            backoff (bool): Whether the task backs off while the connection is busy.
+        """
+        if not callable(interval):
+            interval = lambda value=interval: value
+
+        now = time.monotonic()
+        task = _PollTask(
+            name=name,
+            function=function,
+            interval=interval,
+            backoff=backoff,
+            due=now,
+        )
+        if not run_first:
+            task.due = now + self._task_interval(task)
+
+        with self._condition:
+            self._tasks[name] = task
+            self._condition.notify()
+
+    def remove(self, name: str) -> None:
+        with self._condition:
+            self._tasks.pop(name, None)
+            self._condition.notify()
+
+    def notify(self, name: str) -> None:
+        """
+        Signals that the data task ``name`` polls for has just arrived, which
+        postpones its next run by a full interval. Unknown tasks are ignored.
+        """
+        task = self._tasks.get(name)
+        if task is None:
+            return
+
+        due = time.monotonic() + self._task_interval(task)
+        with self._condition:
+            task.notifications += 1
+            task.due = max(task.due, due)
+
+    @property
+    def schedule(self) -> dict[str, dict]:
+        """
+        The current schedule, for debugging purposes.
+
+        Maps task names to dicts with the current ``interval`` including backoff, the
+        backoff ``factor``, the seconds until the task is ``due`` next and the number of
+        ``runs``, ``skips`` and ``notifications`` so far.
+        """
+        now = time.monotonic()
+        with self._condition:
+            tasks = list(self._tasks.values())
+
+        return {
+            task.name: {
+                "interval": self._task_interval(task),
+                "factor": task.factor,
+                "due": max(0.0, task.due - now),
+                "runs": task.runs,
+                "skips": task.skips,
+                "notifications": task.notifications,
+            }
+            for task in tasks
+        }
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._condition:
+            self._cancelled = True
+            self._tasks.clear()
+            self._condition.notify()
+
+    def run(self):
+        while True:
+            with self._condition:
+                if self._cancelled:
+                    break
+
+                now = time.monotonic()
+                due = [task for task in self._tasks.values() if task.due <= now]
+                if not due:
+                    timeout = None
+                    if self._tasks:
+                        timeout = min(task.due for task in self._tasks.values()) - now
+                    self._condition.wait(timeout=timeout)
+                    continue
+
+            busy = None
+            for task in sorted(due, key=lambda t: t.due):
+                if self._cancelled:
+                    break
+                if self._tasks.get(task.name) is not task:
+                    # removed or replaced in the meantime
+                    continue
+                if task.backoff:
+                    if busy is None:
+                        busy = self._is_busy()
+                    if busy:
+                        self._back_off(task)
+                        continue
+                self._run_task(task)
+
+    def _is_busy(self) -> bool:
+        try:
+            return self._busy()
+        except Exception:
+            self._logger.exception("Error while checking whether the connection is busy")
+            return False
+
+    def _back_off(self, task: _PollTask) -> None:
+        task.skips += 1
+        if task.factor < self._max_backoff:
+            task.factor = min(task.factor * 2, self._max_backoff)
+            self._logger.debug(
+                f"Connection is busy, backing off task {task.name} to {task.factor}x its interval"
+            )
+        task.due = time.monotonic() + self._task_interval(task)
+
+    def _run_task(self, task: _PollTask) -> None:
+        try:
+            task.function()
+        except Exception:
+            self._logger.exception(f"Error while running task {task.name}")
+
+        task.runs += 1
+        task.factor = 1
+        task.due = time.monotonic() + self._task_interval(task)
+
+    def _task_interval(self, task: _PollTask) -> float:
+        try:
+            return task.current_interval()
+        except Exception:
+            self._logger.exception(
+                f"Error while determining interval of task {task.name}"
+            )
+            return 1.0
@@ -16,11 +16,13 @@ import logging
 import os
 import queue
 import re
+import selectors
 import threading
 import time
-from collections import deque, namedtuple
+import weakref
+from collections import Counter, deque, namedtuple
 from functools import partial
-from typing import IO, Union
+from typing import IO, Optional, Union
 
 import serial
 import wrapt
@@ -29,12 +31,35 @@ import octoprint.plugin
 from octoprint.events import Events, eventManager
 from octoprint.filemanager import valid_file_type
 from octoprint.filemanager.destinations import FileDestinations
+from octoprint.plugins.serial_connector.binary_transfer import (
+    BinaryFileTransfer,
+    BinaryTransferCancelled,
+    BinaryTransferError,
+    BinaryTransferUnavailable,
+)
+from octoprint.plugins.serial_connector.line_classifier import (
+    LINE_BUSY,
+    LINE_CAPABILITY,
+    LINE_DEBUG,
+    LINE_ERROR,
+    LINE_FIRMWARE,
+    LINE_INVALID_EXTRUDER,
+    LINE_OK,
+    LINE_POSITION,
+    LINE_RESEND,
+    LINE_TARGET_TEMPERATURE,
+    LINE_TEMPERATURE,
+    LINE_WAIT,
+    PREFIX_CLASSES,
+    LineClassifier,
+    get_received_prefixes,
+)
+from octoprint.plugins.serial_connector.scheduler import PollScheduler
 from octoprint.settings import settings
 from octoprint.systemcommands import system_command_manager
 from octoprint.util import (
     CountedEvent,
     PrependableQueue,
-    RepeatedTimer,
     ResettableTimer,
     TypeAlreadyInQueue,
     TypedQueue,
@@ -45,14 +70,36 @@ from octoprint.util import (
     get_bom,
     get_dos_filename,
     get_exception_string,
+    metrics,
     sanitize_ascii,
     to_unicode,
 )
 from octoprint.util.files import m20_timestamp_to_unix_timestamp
+from octoprint.util.gcodeInterpreter import GcodeLookahead, TimeIndex
 from octoprint.util.platform import get_os, set_close_exec
 
 _logger = logging.getLogger(__name__)
 
+_lines = metrics.counter(
+    "octoprint_serial_lines_total",
+    "Lines exchanged with the printer",
+    labelnames=("direction",),
+)
+_lines_sent = _lines.labels("sent")
+_lines_received = _lines.labels("received")
+_resend_requests = metrics.counter(
+    "octoprint_serial_resend_requests_total", "Resend requests received from the printer"
+)
+_line_processing_seconds = metrics.histogram(
+    "octoprint_serial_line_processing_seconds",
+    "Time needed to process and send a line from the send queue",
+)
+
+_send_queues = weakref.WeakSet()
+metrics.gauge(
+    "octoprint_serial_send_queue_depth", "Number of lines waiting in the send queue"
+).set_function(lambda: sum(q.qsize() for q in list(_send_queues)))
+
 # a bunch of regexes we'll need for the communication parsing...
 
 regex_float_pattern = r"[-+]?[0-9]*\.?[0-9]+"
@@ -466,6 +513,96 @@ class TemperatureRecord:
             return actual, target
 
 
+class LineHistory:
+    """
+    History of the encoded commands sent with line numbers, for serving resend requests.
+
+    Lines are looked up by line number in O(1). The memory used is bounded by the
+    total size of the stored commands: the oldest lines are dropped once ``max_bytes``
+    is exceeded, but ``min_lines`` lines are always kept. Line numbers are expected to
+    be consecutive, a line that doesn't follow the last one (e.g. after a line number
+    reset) starts a new history.
+
+    Arguments:
+        max_bytes (int): Maximum size of all stored commands, in bytes
+        min_lines (int): Number of lines to keep regardless of ``max_bytes``
+    """
+
+    def __init__(self, max_bytes, min_lines=0):
+        self.max_bytes = max_bytes
+        self.min_lines = min_lines
+
+        self._lines = {}
+        self._first = None
+        self._next = None
+        self._bytes = 0
+
+    def append(self, lineno, line):
+        if self._next is not None and lineno != self._next:
+            self.clear()
+
+        if self._first is None:
+            self._first = lineno
+        self._lines[lineno] = line
+        self._bytes += len(line)
+        self._next = lineno + 1
+
+        while self._bytes > self.max_bytes and len(self._lines) > self.min_lines:
+            self._bytes -= len(self._lines.pop(self._first))
+            self._first += 1
+
+    def get(self, lineno):
+        """Returns the command sent as line ``lineno``, or None if it's not in the history."""
+        return self._lines.get(lineno)
+
+    def clear(self):
+        self._lines.clear()
+        self._first = self._next = None
+        self._bytes = 0
+
+    @property
+    def first(self):
+        """Number of the oldest line in the history, None if empty."""
+        return self._first
+
+    @property
+    def size(self):
+        """Size of all stored commands, in bytes."""
+        return self._bytes
+
+    def __contains__(self, lineno):
+        return lineno in self._lines
+
+    def __len__(self):
+        return len(self._lines)
+
+
+RESEND_ERROR_TYPES = (
+    ("missing_checksum", ("no checksum", "missing checksum")),
+    ("missing_line_number", ("no line number", "missing linenumber")),
+    ("checksum", ("checksum",)),
+    ("line_number", ("line number", "linenumber", "expected line")),
+    ("format", ("format error",)),
+)
+"""Types of firmware errors preceding resend requests and the terms identifying them, in order of precedence."""
+
+
+def resend_error_type(error):
+    """
+    Returns the type of the firmware ``error`` that caused a resend request, see
+    :data:`RESEND_ERROR_TYPES`. ``none`` if there was no error, ``other`` if the error
+    is unknown.
+    """
+    if not error:
+        return "none"
+
+    error = error.lower()
+    for error_type, terms in RESEND_ERROR_TYPES:
+        if any(term in error for term in terms):
+            return error_type
+    return "other"
+
+
 class MachineCom:
     STATE_NONE = 0
     STATE_OPEN_SERIAL = 1
@@ -515,6 +652,7 @@ class MachineCom:
     CAPABILITY_CHAMBER_TEMP = "CHAMBER_TEMPERATURE"
     CAPABILITY_EXTENDED_M20 = "EXTENDED_M20"
     CAPABILITY_LFN_WRITE = "LFN_WRITE"
+    CAPABILITY_BINARY_FILE_TRANSFER = "BINARY_FILE_TRANSFER"
 
     CAPABILITY_SUPPORT_ENABLED = "enabled"
     CAPABILITY_SUPPORT_DETECTED = "detected"
@@ -522,6 +660,18 @@ class MachineCom:
 
     DETECTION_RETRIES = 3
 
+    LOG_FLUSH_INTERVAL = 0.1
+    """Interval in which logged lines are handed to the callback, in seconds."""
+
+    LOG_BUFFER_SIZE = 10000
+    """Maximum number of logged lines to buffer between flushes, older lines get dropped."""
+
+    POLL_BUSY_QUEUE_SIZE = 10
+    """Number of queued commands from which on polls back off until the queues have drained."""
+
+    POLL_MAX_BACKOFF = 4
+    """Maximum factor by which to stretch the polling intervals while the queues are busy."""
+
     def __init__(
         self,
         printer_profile,
@@ -564,6 +714,8 @@ class MachineCom:
         self._printer_profile = printer_profile
         self._state = self.STATE_NONE
         self._serial = None
+        self._received_lines = deque()
+        self._line_classifier = LineClassifier()
 
         self._detection_candidates = []
         self._detection_retry = self.DETECTION_RETRIES
@@ -665,11 +817,21 @@ class MachineCom:
             self.CAPABILITY_LFN_WRITE: self._settings.get_boolean(
                 ["capabilities", "lfn_write"]
             ),
+            self.CAPABILITY_BINARY_FILE_TRANSFER: self._settings.get_boolean(
+                ["capabilities", "binary_file_transfer"]
+            ),
         }
+        self._binary_transfer_window = self._settings.get_int(["binaryTransferWindow"])
+        self._binary_transfer_compression = self._settings.get_boolean(
+            ["binaryTransferCompression"]
+        )
 
-        last_line_count = self._settings.get_int(["lastLineBufferSize"])
-        self._lastLines = deque([], last_line_count)
+        self._lastLines = LineHistory(
+            self._settings.get_int(["lastLineBufferBytes"]),
+            min_lines=self._settings.get_int(["lastLineBufferSize"]),
+        )
         self._lastCommError = None
+        self._resend_statistics = Counter()
         self._lastResendNumber = None
         self._currentResendCount = 0
 
@@ -702,6 +864,14 @@ class MachineCom:
         terminal_log_size = self._settings.get_int(["terminalLogSize"])
         self._terminal_log = deque([], min(20, terminal_log_size))
 
+        # log lines are buffered and handed to the callback in batches by the log flusher,
+        # appending to and popping from a deque is thread safe, so logging doesn't need to lock
+        self._log_buffer = deque([], self.LOG_BUFFER_SIZE)
+        self._log_flush_mutex = threading.Lock()
+
+        # periodic tasks like log flushing and polling all run on one scheduler thread
+        self._scheduler = None
+
         self._error_handling = self._settings.get(["errorHandling"])
 
         self._log_resends = self._settings.get_boolean(["logResends"])
@@ -727,8 +897,7 @@ class MachineCom:
             name="comm.clear_to_send", minimum=None, maximum=self._ack_max
         )
         self._send_queue = SendQueue()
-        self._temperature_timer = None
-        self._sd_status_timer = None
+        _send_queues.add(self._send_queue)
 
         self._consecutive_not_sd_printing = 0
         self._consecutive_not_sd_printing_maximum = self._settings.get_int(
@@ -763,6 +932,10 @@ class MachineCom:
         self._received_message_hooks = self._plugin_manager.get_hooks(
             "octoprint.comm.protocol.gcode.received"
         )
+        self._received_message_prefixes = {
+            name: get_received_prefixes(hook)
+            for name, hook in self._received_message_hooks.items()
+        }
         self._error_message_hooks = self._plugin_manager.get_hooks(
             "octoprint.comm.protocol.gcode.error"
         )
@@ -855,6 +1028,7 @@ class MachineCom:
         # print job
         self._currentFile = None
         self._job_on_hold = CountedEvent()
+        self._binary_transfer = None
 
         # multithreading locks
         self._jobLock = threading.RLock()
@@ -881,6 +1055,14 @@ class MachineCom:
         self.monitoring_thread.start()
         self.sending_thread.start()
 
+        self._scheduler = PollScheduler(
+            busy=self._is_busy_for_polling, max_backoff=self.POLL_MAX_BACKOFF
+        )
+        self._scheduler.add(
+            "log_flush", self._flush_log, self.LOG_FLUSH_INTERVAL, backoff=False
+        )
+        self._scheduler.start()
+
     def __del__(self):
         self.close()
 
@@ -901,6 +1083,11 @@ class MachineCom:
     def transmitted_lines(self):
         return self._transmitted_lines
 
+    @property
+    def resend_statistics(self):
+        """Number of received resend requests by type of the firmware error preceding them."""
+        return dict(self._resend_statistics)
+
     @property
     def resend_ratio(self):
         if self._transmitted_lines:
@@ -961,7 +1148,28 @@ class MachineCom:
         message = to_unicode(message)
 
         self._terminal_log.append(message)
-        self._callback.on_comm_log(message)
+        self._log_buffer.append((time.time(), message))
+
+        if self._scheduler is None:
+            # not started or already closed, nothing will flush for us
+            self._flush_log()
+
+    def _flush_log(self):
+        with self._log_flush_mutex:
+            entries = []
+            try:
+                while True:
+                    entries.append(self._log_buffer.popleft())
+            except IndexError:
+                pass
+
+            if not entries:
+                return
+
+            try:
+                self._callback.on_comm_logs(entries)
+            except Exception:
+                self._logger.exception("Error while handing over log lines to callback")
 
     def _to_logfile_with_terminal(self, message=None, level=logging.INFO):
         log = "Last lines in terminal:\n" + "\n".join(
@@ -971,8 +1179,8 @@ class MachineCom:
             log = message + "\n| " + log
         self._logger.log(level, log)
 
-    def _addToLastLines(self, cmd):
-        self._lastLines.append(cmd)
+    def _addToLastLines(self, cmd, linenumber):
+        self._lastLines.append(linenumber, cmd)
 
     ##~~ getters
 
@@ -1096,7 +1304,8 @@ class MachineCom:
         return (
             self.isPrinting()
             or self.isPaused()
-            or self._state in {self.STATE_CANCELLING, self.STATE_PAUSING}
+            or self._state
+            in {self.STATE_CANCELLING, self.STATE_PAUSING, self.STATE_TRANSFERING_FILE}
         )
 
     def isSdReady(self):
@@ -1135,6 +1344,37 @@ class MachineCom:
             return None
         return self._currentFile.getRemainingPrintTime()
 
+    def getPrintLookahead(self):
+        if not isinstance(self._currentFile, PrintingGcodeFileInformation):
+            return None
+        return self._currentFile.lookahead
+
+    def _lookahead_factory(self, time_index=None):
+        lines = self._settings.get_int(["lookaheadLines"])
+        if not lines or lines <= 0:
+            return None
+
+        if time_index is not None:
+            time_index = TimeIndex.from_dict(time_index)
+
+        # same interpreter options as the file analysis, to match its time index
+        offsets = self._printer_profile["extruder"]["offsets"]
+        return partial(
+            GcodeLookahead,
+            lines=lines,
+            time_index=time_index,
+            pausing_commands=self._pausing_commands,
+            speedx=self._printer_profile["axes"]["x"]["speed"],
+            speedy=self._printer_profile["axes"]["y"]["speed"],
+            offsets=[(0, 0)] + [tuple(offset) for offset in offsets[1:]],
+            max_extruders=self._settings.global_get_int(
+                ["gcodeAnalysis", "maxExtruders"]
+            ),
+            g90_extruder=self._settings.global_get_boolean(
+                ["feature", "g90InfluencesExtruder"]
+            ),
+        )
+
     def getTemp(self):
         return self.last_temperature.tools
 
@@ -1239,17 +1479,12 @@ class MachineCom:
             return
         self._connection_closing = True
 
-        if self._temperature_timer is not None:
-            try:
-                self._temperature_timer.cancel()
-            except Exception:
-                pass
+        if self._binary_transfer is not None:
+            self._binary_transfer.cancel()
 
-        if self._sd_status_timer is not None:
-            try:
-                self._sd_status_timer.cancel()
-            except Exception:
-                pass
+        if self._scheduler is not None:
+            self._scheduler.remove("temperature_poll")
+            self._scheduler.remove("sd_status_poll")
 
         def deactivate_monitoring_and_send_queue():
             self._monitoring_active = False
@@ -1315,6 +1550,11 @@ class MachineCom:
         if self._settings.global_get_boolean(["feature", "sdSupport"]):
             self._sdFiles = {}
 
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            self._scheduler = None
+        self._flush_log()
+
     def setTemperatureOffset(self, offsets):
         self._tempOffsets.update(offsets)
 
@@ -1632,13 +1872,29 @@ class MachineCom:
                 )
             self._currentFile.start()
 
-            self.sendCommand(
-                "M28 %s" % remote,
-                tags=tags
-                | {
-                    "trigger:comm.start_file_transfer",
-                },
-            )
+            if not special and self._capability_supported(
+                self.CAPABILITY_BINARY_FILE_TRANSFER
+            ):
+                # switch the firmware to binary mode, the send loop then runs the transfer
+                # while it processes the marker, which keeps anything else from being sent
+                self.sendCommand(
+                    "M28 B1",
+                    tags=tags
+                    | {
+                        "trigger:comm.start_file_transfer",
+                    },
+                )
+                self.sendCommand(
+                    SendQueueMarker(partial(self._run_binary_file_transfer, remote, tags))
+                )
+            else:
+                self.sendCommand(
+                    "M28 %s" % remote,
+                    tags=tags
+                    | {
+                        "trigger:comm.start_file_transfer",
+                    },
+                )
             self._callback.on_comm_file_transfer_started(
                 filename,
                 remote,
@@ -1653,8 +1909,76 @@ class MachineCom:
             self._logger.info("Printer is not operational or not streaming")
             return
 
+        if self._binary_transfer is not None:
+            self._binary_transfer.cancel()
+            return
+
         self._finishFileTransfer(failed=True, tags=tags)
 
+    def _run_binary_file_transfer(self, remote, tags):
+        def source():
+            while True:
+                line, _, _ = self._currentFile.getNext()
+                if line is None:
+                    break
+                yield (line + "\n").encode(self._serial_encoding, errors="replace")
+
+        def write(packet, description):
+            self._log(">>> " + description)
+            self._do_write(packet)
+
+        transfer = BinaryFileTransfer(
+            write,
+            source(),
+            remote,
+            window=self._binary_transfer_window,
+            compression=self._binary_transfer_compression,
+            encoding=self._serial_encoding,
+            log=self._log,
+        )
+
+        self._binary_transfer = transfer
+        self._changeState(self.STATE_TRANSFERING_FILE)
+
+        failed = False
+        try:
+            transfer.run(progress=self._callback.on_comm_progress)
+
+        except BinaryTransferUnavailable as exc:
+            self._dual_log(
+                f"Could not use the binary file transfer protocol, falling back to regular streaming: {exc}",
+                level=logging.WARNING,
+            )
+            self._binary_transfer = None
+            self._changeState(self.STATE_OPERATIONAL)
+            self.sendCommand(
+                "M28 %s" % remote,
+                tags=tags
+                | {
+                    "trigger:comm.start_file_transfer",
+                },
+            )
+            return
+
+        except BinaryTransferCancelled:
+            self._log(f"Binary file transfer of {remote} cancelled")
+            failed = True
+
+        except BinaryTransferError as exc:
+            self._dual_log(
+                f"Binary file transfer of {remote} failed: {exc}", level=logging.ERROR
+            )
+            failed = True
+
+        finally:
+            self._binary_transfer = None
+
+        self._currentFile.close()
+        self._currentFile.done = True
+        self._finalizeFileTransfer(
+            self._currentFile.local_name, remote, self.getPrintTime(), failed
+        )
+
     def _finishFileTransfer(self, failed=False, tags=None):
         if tags is None:
             tags = set()
@@ -1675,24 +1999,28 @@ class MachineCom:
             local = self._currentFile.local_name
             elapsed = self.getPrintTime()
 
-            def finalize():
-                self._currentFile = None
-                self._changeState(self.STATE_OPERATIONAL)
+            self._sendCommand(
+                SendQueueMarker(
+                    partial(self._finalizeFileTransfer, local, remote, elapsed, failed)
+                )
+            )
 
-                if failed:
-                    self._callback.on_comm_file_transfer_failed(local, remote, elapsed)
-                else:
-                    self._callback.on_comm_file_transfer_done(local, remote, elapsed)
+    def _finalizeFileTransfer(self, local, remote, elapsed, failed):
+        self._currentFile = None
+        self._changeState(self.STATE_OPERATIONAL)
 
-                self.refreshSdFiles(
-                    tags={
-                        "trigger:comm.finish_file_transfer",
-                    }
-                )
+        if failed:
+            self._callback.on_comm_file_transfer_failed(local, remote, elapsed)
+        else:
+            self._callback.on_comm_file_transfer_done(local, remote, elapsed)
 
-            self._sendCommand(SendQueueMarker(finalize))
+        self.refreshSdFiles(
+            tags={
+                "trigger:comm.finish_file_transfer",
+            }
+        )
 
-    def selectFile(self, filename, sd, user=None, tags=None):
+    def selectFile(self, filename, sd, user=None, tags=None, time_index=None):
         if self.isBusy():
             return
 
@@ -1724,6 +2052,7 @@ class MachineCom:
                 offsets_callback=self.getOffsets,
                 current_tool_callback=self.getCurrentTool,
                 user=user,
+                lookahead=self._lookahead_factory(time_index),
             )
             self._callback.on_comm_file_selected(
                 filename, self._currentFile.getFilesize(), False, user=user
@@ -2379,6 +2708,8 @@ class MachineCom:
 
                 now = time.monotonic()
 
+                line_class = self._line_classifier.classify(line.strip().strip("\0"))
+
                 if line.strip() != "":
                     self._consecutive_timeouts = 0
                     self._timeout = self._get_new_communication_timeout()
@@ -2386,14 +2717,21 @@ class MachineCom:
                     if self._dwelling_until and now > self._dwelling_until:
                         self._dwelling_until = False
 
-                if self._resend_ok_timer and line and not line.startswith("ok"):
+                binary_transfer = self._binary_transfer
+                if binary_transfer is not None and (
+                    line.strip() == "" or binary_transfer.feed(line)
+                ):
+                    # the binary transfer handles its own responses and timeouts
+                    continue
+
+                if self._resend_ok_timer and line and line_class != LINE_OK:
                     # we got anything but an ok after a resend request - this means the ok after the resend request
                     # was in fact missing and we now need to trigger the timer
                     self._resend_ok_timer.cancel()
                     self._resendSimulateOk()
 
                 ##~~ busy protocol handling
-                if line.startswith("echo:busy:") or line.startswith("busy:"):
+                if line_class == LINE_BUSY:
                     # reset the ok timeout, the regular comm timeout has already been reset
                     self._ok_timeout = self._get_new_communication_timeout()
 
@@ -2438,7 +2776,7 @@ class MachineCom:
                         continue
 
                 ##~~ debugging output handling
-                elif line.startswith("//"):
+                elif line_class == LINE_DEBUG:
                     debugging_output = line[2:].strip()
                     if debugging_output.startswith("action:"):
                         action_command = debugging_output[len("action:") :].strip()
@@ -2575,7 +2913,8 @@ class MachineCom:
                     return stripped_line, stripped_line.lower()
 
                 ##~~ Error handling
-                line = self._handle_errors(line)
+                if line_class == LINE_ERROR:
+                    line = self._handle_errors(line)
                 line, lower_line = convert_line(line)
 
                 ##~~ SD file list
@@ -2657,8 +2996,8 @@ class MachineCom:
                 handled = False
 
                 # process oks
-                if line.startswith("ok") or (
-                    self.isPrinting() and supportWait and line == "wait"
+                if line_class == LINE_OK or (
+                    self.isPrinting() and supportWait and line_class == LINE_WAIT
                 ):
                     # ok only considered handled if it's alone on the line, might be
                     # a response to an M105 or an M114
@@ -2675,7 +3014,7 @@ class MachineCom:
                     handled = line == "wait" or line == "ok" or not needs_further_handling
 
                 # process resends
-                elif lower_line.startswith("resend") or lower_line.startswith("rs"):
+                elif line_class == LINE_RESEND:
                     self._handle_resend_request(line)
                     handled = True
 
@@ -2724,11 +3063,15 @@ class MachineCom:
                 }:
                     continue
 
+                if line_class in PREFIX_CLASSES:
+                    # we still need to know what's in there, e.g. for "ok T:..."
+                    line_class = self._line_classifier.classify_content(line)
+
                 # wait for the end of the firmware capability report (M115) then notify plugins and refresh sd list if deferred
                 if (
                     self._firmware_capabilities
                     and not self._firmware_capabilities_received
-                    and not lower_line.startswith("cap:")
+                    and line_class != LINE_CAPABILITY
                 ):
                     self._firmware_capabilities_received = True
 
@@ -2771,13 +3114,13 @@ class MachineCom:
                 elif (
                     self._firmware_info_received
                     and not self._firmware_info_sent
-                    and not lower_line.startswith("cap:")
+                    and line_class != LINE_CAPABILITY
                 ):
                     # we have received firmware information, but no capability report, trigger forwarding
                     self._send_firmware_info()
 
                 ##~~ position report processing
-                if "X:" in line and "Y:" in line and "Z:" in line:
+                if line_class == LINE_POSITION:
                     parsed = parse_position_line(line)
                     if parsed:
                         # we don't know T or F when printing from SD since
@@ -2834,13 +3177,7 @@ class MachineCom:
                         )
 
                 ##~~ temperature processing
-                elif (
-                    " T:" in line
-                    or line.startswith("T:")
-                    or " T0:" in line
-                    or line.startswith("T0:")
-                    or ((" B:" in line or line.startswith("B:")) and "A:" not in line)
-                ):
+                elif line_class == LINE_TEMPERATURE:
                     if (
                         not disable_external_heatup_detection
                         and not self._temperature_autoreporting
@@ -2853,6 +3190,7 @@ class MachineCom:
                         self._heatupWaitStartTime = time.monotonic()
 
                     self._processTemperatures(line)
+                    self._notify_scheduler("temperature_poll")
                     self._callback.on_comm_temperature_update(
                         self.last_temperature.tools,
                         self.last_temperature.bed,
@@ -2860,9 +3198,7 @@ class MachineCom:
                         self.last_temperature.custom,
                     )
 
-                elif supportRepetierTargetTemp and (
-                    "TargetExtr" in line or "TargetBed" in line
-                ):
+                elif supportRepetierTargetTemp and line_class == LINE_TARGET_TEMPERATURE:
                     matchExtr = regex_repetierTempExtr.match(line)
                     matchBed = regex_repetierTempBed.match(line)
 
@@ -2893,7 +3229,7 @@ class MachineCom:
                             pass
 
                 ##~~ Firmware capability report triggered by M115
-                elif lower_line.startswith("cap:"):
+                elif line_class == LINE_CAPABILITY:
                     parsed = parse_capability_line(lower_line)
                     if parsed is not None:
                         capability, enabled = parsed
@@ -2932,6 +3268,13 @@ class MachineCom:
                                 self._logger.info(
                                     "Firmware states that it supports writing long filenames"
                                 )
+                            elif (
+                                capability == self.CAPABILITY_BINARY_FILE_TRANSFER
+                                and enabled
+                            ):
+                                self._logger.info(
+                                    "Firmware states that it supports binary file transfers"
+                                )
 
                         # notify plugins
                         for name, hook in self._firmware_info_hooks[
@@ -2953,7 +3296,7 @@ class MachineCom:
                                 )
 
                 ##~~ firmware name & version
-                elif "NAME:" in line or line.startswith("NAME."):
+                elif line_class == LINE_FIRMWARE:
                     # looks like a response to M115
                     data = parse_firmware_line(line)
                     firmware_name = data.get("FIRMWARE_NAME")
@@ -3051,7 +3394,7 @@ class MachineCom:
                         self._firmware_name = firmware_name
 
                 ##~~ invalid extruder
-                elif "invalid extruder" in lower_line:
+                elif line_class == LINE_INVALID_EXTRUDER:
                     tool = None
 
                     match = regexes_parameters["intT"].search(line)
@@ -3076,7 +3419,7 @@ class MachineCom:
                             )
                             self._log("Warn: " + message)
                             self._logger.warning(message)
-                            eventManager().fire(
+                            self._fire_event(
                                 Events.INVALID_TOOL_REPORTED,
                                 {"tool": invalid_tool, "fallback": fallback_tool},
                             )
@@ -3129,6 +3472,7 @@ class MachineCom:
                         self._callback.on_comm_sd_files(self.getSdFiles())
                     elif "SD printing byte" in line:
                         # answer to M27, at least on Marlin, Repetier and Sprinter: "SD printing byte %d/%d"
+                        self._notify_scheduler("sd_status_poll")
                         match = regex_sdPrintingByte.search(line)
                         if match:
                             try:
@@ -3359,9 +3703,7 @@ class MachineCom:
                                 self._on_external_reset()
                                 self.cancelPrint(disable_log_position=True)
 
-                            eventManager().fire(
-                                Events.PRINTER_RESET, payload={"idle": idle}
-                            )
+                            self._fire_event(Events.PRINTER_RESET, payload={"idle": idle})
 
             except Exception:
                 self._logger.exception(
@@ -3371,7 +3713,7 @@ class MachineCom:
                 errorMsg = "See octoprint.log for details"
                 self._log(errorMsg)
                 self._errorValue = errorMsg
-                eventManager().fire(
+                self._fire_event(
                     Events.ERROR,
                     {
                         "error": self.getErrorString(),
@@ -3382,6 +3724,15 @@ class MachineCom:
                 self.close(is_error=True)
         self._dual_log("Connection closed, closing down monitor", level=logging.INFO)
 
+        if self._line_classifier.counters:
+            self._logger.debug(
+                "Received lines by class: "
+                + ", ".join(
+                    f"{line_class}={count}"
+                    for line_class, count in self._line_classifier.counters.most_common()
+                )
+            )
+
     def _send_firmware_info(self):
         if self._firmware_info_sent:
             return
@@ -3466,7 +3817,7 @@ class MachineCom:
             self._errorValue = (
                 "Too many consecutive timeouts, printer still connected and alive?"
             )
-            eventManager().fire(
+            self._fire_event(
                 Events.ERROR,
                 {"error": self._errorValue, "reason": "timeout", "connector": "serial"},
             )
@@ -3712,7 +4063,7 @@ class MachineCom:
 
                     if output is not None:
                         outputs[template_key] = output
-                eventManager().fire(
+                self._fire_event(
                     Events.REGISTERED_MESSAGE_RECEIVED,
                     {"key": feedback_key, "matched": matched_part, "outputs": outputs},
                 )
@@ -3825,15 +4176,19 @@ class MachineCom:
 
     def _onConnected(self):
         self._serial.timeout = self._get_communication_timeout_interval()
-        self._temperature_timer = RepeatedTimer(
-            self._get_temperature_timer_interval, self._poll_temperature, run_first=True
-        )
-        self._temperature_timer.start()
-
-        self._sd_status_timer = RepeatedTimer(
-            self._get_sd_status_timer_interval, self._poll_sd_status, run_first=True
-        )
-        self._sd_status_timer.start()
+        if self._scheduler is not None:
+            self._scheduler.add(
+                "temperature_poll",
+                self._poll_temperature,
+                self._get_temperature_timer_interval,
+                run_first=True,
+            )
+            self._scheduler.add(
+                "sd_status_poll",
+                self._poll_sd_status,
+                self._get_sd_status_timer_interval,
+                run_first=True,
+            )
 
         self._changeState(self.STATE_OPERATIONAL)
 
@@ -3854,10 +4209,23 @@ class MachineCom:
         else:
             self.initSdCard(tags={"trigger:comm.on_connected"})
 
-        payload = {"connector": "serial", "port": self._port, "baudrate": self._baudrate}
+        payload = self._event_payload(
+            {"connector": "serial", "port": self._port, "baudrate": self._baudrate}
+        )
         eventManager().fire(Events.CONNECTED, payload)
         self.sendGcodeScript("afterPrinterConnected", replacements={"event": payload})
 
+    def _event_payload(self, payload=None):
+        """Tags ``payload`` with the printer this connection belongs to, if any."""
+        from octoprint.printer.connection import ConnectedPrinter
+
+        if isinstance(self._callback, ConnectedPrinter):
+            return self._callback.event_payload(payload)
+        return payload
+
+    def _fire_event(self, event, payload=None):
+        eventManager().fire(event, self._event_payload(payload))
+
     def _on_external_reset(self):
         # hold queue processing, clear queues and acknowledgements, reset line number and last lines
         with self._send_queue.blocked():
@@ -3884,6 +4252,28 @@ class MachineCom:
 
         self._consecutive_not_sd_printing = 0
 
+    def _notify_scheduler(self, task):
+        scheduler = self._scheduler
+        if scheduler is not None:
+            scheduler.notify(task)
+
+    def _is_busy_for_polling(self):
+        return (
+            self._send_queue.qsize() + self._command_queue.qsize()
+            >= self.POLL_BUSY_QUEUE_SIZE
+        )
+
+    @property
+    def poll_schedule(self):
+        """
+        The schedule of the connection's periodic tasks, see
+        :attr:`~octoprint.plugins.serial_connector.scheduler.PollScheduler.schedule`.
+        """
+        scheduler = self._scheduler
+        if scheduler is None:
+            return {}
+        return scheduler.schedule
+
     def _get_temperature_timer_interval(self):
         busy_default = 4.0
         target_default = 2.0
@@ -4048,6 +4438,14 @@ class MachineCom:
                         "Platform doesn't support low latency mode on serial port"
                     )
 
+            if self._settings.get_boolean(["bulkRead"]):
+                if BulkReadlineWrapper.is_supported(serial_obj):
+                    return BulkReadlineWrapper(serial_obj)
+                else:
+                    self._logger.info(
+                        "Platform doesn't support bulk reads from serial port"
+                    )
+
             return BufferedReadlineWrapper(serial_obj)
 
         serial_factories = list(self._serial_factory_hooks.items()) + [
@@ -4082,6 +4480,7 @@ class MachineCom:
             if serial_obj is not None:
                 # first hook to succeed wins, but any can pass on to the next
                 self._serial = serial_obj
+                self._received_lines.clear()
                 self._clear_to_send.reset()
                 return True
 
@@ -4238,7 +4637,7 @@ class MachineCom:
             faq=payload.get("faq"),
             logs=payload.get("logs"),
         )
-        eventManager().fire(Events.ERROR, payload)
+        self._fire_event(Events.ERROR, payload)
 
         if close:
             if trigger_m112:
@@ -4272,7 +4671,14 @@ class MachineCom:
             return None
 
         try:
-            ret = self._serial.readline()
+            if not self._received_lines:
+                if isinstance(self._serial, BulkReadlineWrapper):
+                    # fetch a whole batch of lines at once, we'll work through it
+                    # on the next calls
+                    self._received_lines.extend(self._serial.read_lines())
+                else:
+                    self._received_lines.append(self._serial.readline())
+            ret = self._received_lines.popleft() if self._received_lines else b""
         except Exception as ex:
             if not self._connection_closing:
                 self._logger.exception("Unexpected error while reading from serial port")
@@ -4297,6 +4703,8 @@ class MachineCom:
             ret = ret.decode("latin1")
 
         if ret != "":
+            _lines_received.inc()
+
             try:
                 self._log(f"<<< {sanitize_ascii(ret)}")
             except ValueError as e:
@@ -4314,6 +4722,11 @@ class MachineCom:
                 )
 
         for name, hook in self._received_message_hooks.items():
+            prefixes = self._received_message_prefixes.get(name)
+            if prefixes is not None and not ret.lstrip().startswith(prefixes):
+                # the hook declared it isn't interested in this line
+                continue
+
             try:
                 ret = hook(self, ret)
             except Exception:
@@ -4415,6 +4828,8 @@ class MachineCom:
 
     def _handle_resend_request(self, line):
         self._received_resend_requests += 1
+        _resend_requests.inc()
+        self._resend_statistics[resend_error_type(self._lastCommError)] += 1
         self._reevaluate_resend_ratio()
 
         try:
@@ -4562,7 +4977,7 @@ class MachineCom:
                 # handled it.
                 return False
 
-            cmd = self._lastLines[-self._resendDelta].decode(self._serial_encoding)
+            cmd = self._lastLines.get(lineNumber).decode(self._serial_encoding)
             result = self._enqueue_for_sending(cmd, linenumber=lineNumber, resend=True)
 
             self._resendDelta -= 1
@@ -4578,11 +4993,7 @@ class MachineCom:
             return result
 
     def _resendCheckPossibility(self, lineno):
-        if (
-            self._resendDelta > len(self._lastLines)
-            or len(self._lastLines) == 0
-            or self._resendDelta < 0
-        ):
+        if self._resendDelta < 0 or lineno not in self._lastLines:
             error_text = "Should resend line {} but no sufficient history is available, can't resend".format(
                 lineno
             )
@@ -4644,7 +5055,7 @@ class MachineCom:
 
                 if gcode and gcode in gcodeToEvent:
                     # if this is a gcode bound to an event, trigger that now
-                    eventManager().fire(gcodeToEvent[gcode])
+                    self._fire_event(gcodeToEvent[gcode])
 
                 # process @ commands
                 if gcode is None and cmd.startswith("@"):
@@ -4782,6 +5193,8 @@ class MachineCom:
                         time.sleep(self._dwelling_until - now)
                         self._dwelling_until = False
 
+                    start = time.monotonic()
+
                     # fetch command, command type and optional linenumber and sent callback from queue
                     command, linenumber, command_type, on_sent, processed, tags = entry
 
@@ -4878,6 +5291,8 @@ class MachineCom:
                         tags=tags,
                     )
 
+                    _line_processing_seconds.observe(time.monotonic() - start)
+
                 finally:
                     # no matter _how_ we exit this block, we signal that we
                     # are done processing the last fetched queue entry
@@ -4934,67 +5349,11 @@ class MachineCom:
             return results
 
         # send it through the phase specific handlers provided by plugins
-        for name, hook in self._gcode_hooks[phase].items():
-            try:
-                new_results = []
-                for command, command_type, gcode, subcode, tags in results:
-                    hook_results = hook(
-                        self,
-                        phase,
-                        command,
-                        command_type,
-                        gcode,
-                        subcode=subcode,
-                        tags=tags,
-                    )
-
-                    normalized = _normalize_command_handler_result(
-                        command,
-                        command_type,
-                        gcode,
-                        subcode,
-                        tags,
-                        hook_results,
-                        tags_to_add={
-                            "source:rewrite",
-                            f"phase:{phase}",
-                            f"plugin:{name}",
-                        },
-                    )
-
-                    # make sure we don't allow multi entry results in anything but the queuing phase
-                    if phase != "queuing" and len(normalized) > 1:
-                        self._logger.error(
-                            "Error while processing hook {name} for phase {phase} and command {command}: "
-                            "Hook returned multi-entry result for phase {phase} and command {command}. "
-                            "That's not supported, if you need to do multi expansion of commands you "
-                            "need to do this in the queuing phase. Ignoring hook result and sending "
-                            "command as-is.".format(
-                                name=name,
-                                phase=phase,
-                                command=to_unicode(command, errors="replace"),
-                            ),
-                            extra={"plugin": name},
-                        )
-                        new_results.append((command, command_type, gcode, subcode, tags))
-                    else:
-                        new_results += normalized
-
-            except Exception:
-                self._logger.exception(
-                    "Error while processing hook {name} for phase {phase}:".format(
-                        name=name,
-                        phase=phase,
-                    ),
-                    extra={"plugin": name},
-                )
-
-            else:
-                if not new_results:
-                    # hook handler returned None or empty list for all commands, so
-                    # we'll stop here and return a full out empty result
-                    return []
-                results = new_results
+        results = apply_command_phase_hooks(
+            self._gcode_hooks[phase], self, phase, results, logger=self._logger
+        )
+        if not results:
+            return []
 
         # if it's a gcode command send it through the specific handler if it exists
         new_results = []
@@ -5115,21 +5474,12 @@ class MachineCom:
     def _do_increment_and_send_with_checksum(self, cmd):
         with self._line_mutex:
             linenumber = self._current_line
-            self._addToLastLines(cmd)
+            self._addToLastLines(cmd, linenumber)
             self._current_line += 1
             self._do_send_with_checksum(cmd, linenumber)
 
     def _do_send_with_checksum(self, command, linenumber):
-        command_to_send = (
-            b"N" + str(linenumber).encode(self._serial_encoding) + b" " + command
-        )
-        checksum = 0
-        for c in bytearray(command_to_send):
-            checksum ^= c
-        command_to_send = (
-            command_to_send + b"*" + str(checksum).encode(self._serial_encoding)
-        )
-        self._do_send_without_checksum(command_to_send)
+        self._do_send_without_checksum(add_line_checksum(command, linenumber))
 
     def _do_send_without_checksum(self, cmd, log=True):
         if self._serial is None:
@@ -5138,18 +5488,25 @@ class MachineCom:
         if log:
             self._log(">>> " + cmd.decode(self._serial_encoding))
 
-        cmd += b"\n"
+        self._do_write(cmd + b"\n")
+        self._transmitted_lines += 1
+        _lines_sent.inc()
+
+    def _do_write(self, data):
+        if self._serial is None:
+            return
+
         written = 0
         passes = 0
-        while written < len(cmd):
-            to_send = cmd[written:]
+        while written < len(data):
+            to_send = data[written:]
             old_written = written
 
             try:
                 result = self._serial.write(to_send)
                 if result is None or not isinstance(result, int):
                     # probably some plugin not returning the written bytes, assuming all of them
-                    written += len(cmd)
+                    written += len(data)
                 else:
                     written += result
             except serial.SerialTimeoutException:
@@ -5158,7 +5515,7 @@ class MachineCom:
                     result = self._serial.write(to_send)
                     if result is None or not isinstance(result, int):
                         # probably some plugin not returning the written bytes, assuming all of them
-                        written += len(cmd)
+                        written += len(data)
                     else:
                         written += result
                 except Exception as ex:
@@ -5214,8 +5571,6 @@ class MachineCom:
                 if passes > 1:
                     time.sleep((passes - 1) / 10)
 
-        self._transmitted_lines += 1
-
     ##~~ command handlers
 
     ## gcode
@@ -5237,7 +5592,7 @@ class MachineCom:
             if not self._validate_tool(new_tool):
                 message = self.NOT_SENDING_T.format(action="queuing", tool=new_tool)
                 self._log("Warn: " + message)
-                eventManager().fire(
+                self._fire_event(
                     Events.COMMAND_SUPPRESSED,
                     {
                         "command": cmd,
@@ -5277,7 +5632,7 @@ class MachineCom:
                 message = self.NOT_SENDING_T.format(action="sending", tool=new_tool)
                 self._log("Warn: " + message)
                 self._logger.warning(message)
-                eventManager().fire(
+                self._fire_event(
                     Events.COMMAND_SUPPRESSED,
                     {
                         "command": cmd,
@@ -5295,7 +5650,7 @@ class MachineCom:
             new_tool = int(toolMatch.group("value"))
             self._toolBeforeChange = self._currentTool
             self._currentTool = new_tool
-            eventManager().fire(
+            self._fire_event(
                 Events.TOOL_CHANGE,
                 {"old": self._toolBeforeChange, "new": self._currentTool},
             )
@@ -5311,7 +5666,7 @@ class MachineCom:
                 try:
                     z = float(match.group("value"))
                     if self._currentZ != z:
-                        eventManager().fire(
+                        self._fire_event(
                             Events.Z_CHANGE, {"new": z, "old": self._currentZ}
                         )
                         self._currentZ = z
@@ -5372,7 +5727,7 @@ class MachineCom:
             )
             self._log("Warn: " + message)
             self._logger.warning(message)
-            eventManager().fire(
+            self._fire_event(
                 Events.COMMAND_SUPPRESSED,
                 {"command": cmd, "message": message, "severity": "warn"},
             )
@@ -5391,7 +5746,7 @@ class MachineCom:
             )
             self._log("Warn: " + message)
             self._logger.warning(message)
-            eventManager().fire(
+            self._fire_event(
                 Events.COMMAND_SUPPRESSED,
                 {"command": cmd, "message": message, "severity": "warn"},
             )
@@ -5619,7 +5974,7 @@ class MachineCom:
         # fire the M112 event since we sent it and we're going to prevent the caller from seeing it
         gcode = "M112"
         if gcode in gcodeToEvent:
-            eventManager().fire(gcodeToEvent[gcode])
+            self._fire_event(gcodeToEvent[gcode])
 
     def _gcode_M112_queuing(self, *args, **kwargs):
         self._trigger_emergency_stop()
@@ -5789,7 +6144,7 @@ class MachineCom:
                 )
                 self._log("Info: " + message)
                 self._logger.info(message)
-                eventManager().fire(
+                self._fire_event(
                     Events.COMMAND_SUPPRESSED,
                     {
                         "command": cmd,
@@ -5805,7 +6160,7 @@ class MachineCom:
                 )
                 self._log("Info: " + message)
                 self._logger.info(message)
-                eventManager().fire(
+                self._fire_event(
                     Events.COMMAND_SUPPRESSED,
                     {
                         "command": cmd,
@@ -5833,6 +6188,15 @@ class MachineComPrintCallback:
     def on_comm_log(self, message):
         pass
 
+    def on_comm_logs(self, entries):
+        """
+        Called with batches of logged lines, as a list of ``(timestamp, message)`` tuples.
+
+        Calls :meth:`on_comm_log` for each line by default.
+        """
+        for _, message in entries:
+            self.on_comm_log(message)
+
     def on_comm_temperature_update(self, temp, bedTemp, chamberTemp, customTemp):
         pass
 
@@ -6014,6 +6378,9 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
     """
     Encapsulates information regarding an ongoing direct print. Takes care of the needed file handle and ensures
     that the file is closed in case of an error.
+
+    If a ``lookahead`` factory is provided, a :class:`~octoprint.util.gcodeInterpreter.GcodeLookahead` created
+    through it with the file's path and print start position follows the print.
     """
 
     def __init__(
@@ -6023,6 +6390,7 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
         current_tool_callback=None,
         user=None,
         close_on_eof=True,
+        lookahead=None,
     ):
         if isinstance(path_or_file, str):
             filename = path_or_file
@@ -6059,6 +6427,14 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
         self._progress_m73 = None
         self._print_time_left_m73 = None
 
+        self._lookahead_factory = lookahead
+        self._lookahead = None
+        self._lookahead_start = None
+
+    @property
+    def lookahead(self) -> Optional[GcodeLookahead]:
+        return self._lookahead
+
     def getProgress(self) -> float:
         """
         The current progress of the file.
@@ -6088,6 +6464,7 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
             self._handle.seek(offset)
             self._pos = self._handle.tell()
             self._read_lines = 0
+            self._restart_lookahead()
 
     def start(self):
         """
@@ -6113,6 +6490,7 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
                     self._pos += len(bom)
                 self._start_pos = self._pos
             self._read_lines = 0
+            self._restart_lookahead()
 
     def close(self):
         """
@@ -6126,6 +6504,7 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
                 except Exception:
                     pass
             self._handle = None
+            self._stop_lookahead()
 
     def getNext(self):
         """
@@ -6168,6 +6547,7 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
                         self.close()
                     processed = self._process(line, offsets, current_tool)
                 self._read_lines += 1
+                self._advance_lookahead()
                 return processed, self._pos, self._read_lines
             except Exception as e:
                 self.close()
@@ -6177,6 +6557,31 @@ class PrintingGcodeFileInformation(PrintingFileInformation):
     def _process(self, line, offsets, current_tool):
         return process_gcode_line(line, offsets=offsets, current_tool=current_tool)
 
+    def _restart_lookahead(self):
+        # the lookahead is only created with the next line, so that start & seek don't do the work twice
+        self._stop_lookahead()
+        if self._lookahead_factory is not None:
+            self._lookahead_start = self._pos
+
+    def _stop_lookahead(self):
+        lookahead, self._lookahead = self._lookahead, None
+        self._lookahead_start = None
+        if lookahead is not None:
+            lookahead.close()
+
+    def _advance_lookahead(self):
+        try:
+            if self._lookahead_start is not None:
+                start, self._lookahead_start = self._lookahead_start, None
+                self._lookahead = self._lookahead_factory(self._filename, pos=start)
+            if self._lookahead is not None:
+                self._lookahead.advance(self._pos)
+        except Exception:
+            self._logger.exception(
+                f"Error while looking ahead in {self._filename}, disabling lookahead for this print"
+            )
+            self._stop_lookahead()
+
     def _report_stats(self):
         duration = time.monotonic() - self._start_time
         self._logger.info(f"Finished in {duration:.3f} s.")
@@ -6881,6 +7286,31 @@ def parse_position_line(line):
     return None
 
 
+def add_line_checksum(command, linenumber):
+    """
+    Prefixes the encoded ``command`` with the line number ``linenumber`` and appends
+    the XOR checksum of the resulting line, as expected by the firmware.
+
+    Examples:
+        >>> add_line_checksum(b"M110 N0", 0)
+        b'N0 M110 N0*125'
+        >>> add_line_checksum(b"M105", 12)
+        b'N12 M105*20'
+
+    Arguments:
+        command (bytes): the encoded command
+        linenumber (int): the line number to send the command with
+
+    Returns:
+        bytes: the command line to send
+    """
+    line = b"N" + str(linenumber).encode("ascii") + b" " + command
+    checksum = 0
+    for c in line:
+        checksum ^= c
+    return line + b"*" + str(checksum).encode("ascii")
+
+
 def gcode_command_for_cmd(cmd):
     """
     Tries to parse the provided ``cmd`` and extract the GCODE command identifier from it (e.g. "G0" for "G0 X10.0").
@@ -7089,6 +7519,93 @@ def _normalize_command_handler_result(
     return result
 
 
+def apply_command_phase_hooks(hooks, comm, phase, results, logger=None):
+    """
+    Runs command ``results`` through the ``octoprint.comm.protocol.gcode.<phase>`` hooks.
+
+    This is the part of the command phase processing that is shared between all
+    connectors speaking G-code, the connector itself is passed on to the hook handlers
+    as ``comm``.
+
+    Arguments:
+        hooks (dict): the registered hook handlers for ``phase``, by plugin name
+        comm: the connector processing the commands
+        phase (str): the command phase, ``queuing``, ``queued``, ``sending`` or ``sent``
+        results (list): 5-tuples of ``command``, ``command_type``, ``gcode``,
+            ``subcode`` and ``tags`` to process
+        logger (logging.Logger): logger to log hook errors to
+
+    Returns:
+        list: the processed results, empty if the commands are to be suppressed
+    """
+    if logger is None:
+        logger = _logger
+
+    for name, hook in hooks.items():
+        try:
+            new_results = []
+            for command, command_type, gcode, subcode, tags in results:
+                hook_results = hook(
+                    comm,
+                    phase,
+                    command,
+                    command_type,
+                    gcode,
+                    subcode=subcode,
+                    tags=tags,
+                )
+
+                normalized = _normalize_command_handler_result(
+                    command,
+                    command_type,
+                    gcode,
+                    subcode,
+                    tags,
+                    hook_results,
+                    tags_to_add={
+                        "source:rewrite",
+                        f"phase:{phase}",
+                        f"plugin:{name}",
+                    },
+                )
+
+                # make sure we don't allow multi entry results in anything but the queuing phase
+                if phase != "queuing" and len(normalized) > 1:
+                    logger.error(
+                        "Error while processing hook {name} for phase {phase} and command {command}: "
+                        "Hook returned multi-entry result for phase {phase} and command {command}. "
+                        "That's not supported, if you need to do multi expansion of commands you "
+                        "need to do this in the queuing phase. Ignoring hook result and sending "
+                        "command as-is.".format(
+                            name=name,
+                            phase=phase,
+                            command=to_unicode(command, errors="replace"),
+                        ),
+                        extra={"plugin": name},
+                    )
+                    new_results.append((command, command_type, gcode, subcode, tags))
+                else:
+                    new_results += normalized
+
+        except Exception:
+            logger.exception(
+                "Error while processing hook {name} for phase {phase}:".format(
+                    name=name,
+                    phase=phase,
+                ),
+                extra={"plugin": name},
+            )
+
+        else:
+            if not new_results:
+                # hook handler returned None or empty list for all commands, so
+                # we'll stop here and return a full out empty result
+                return []
+            results = new_results
+
+    return results
+
+
 class QueueMarker:
     def __init__(self, callback=None):
         self.callback = callback
@@ -7138,6 +7655,95 @@ class BufferedReadlineWrapper(wrapt.ObjectProxy):
         return b""
 
 
+class BulkReadlineWrapper(BufferedReadlineWrapper):
+    """
+    Serial port wrapper that waits for the port's file descriptor to become readable
+    and then reads everything available in one go, splitting off all complete lines
+    at once.
+
+    ``read_lines`` returns all received complete lines as a batch, so a flood of
+    autoreports, ``busy:`` messages or position reports costs one wake-up and one
+    read per batch instead of per line (or even per byte).
+
+    Only available for ports that expose a file descriptor, see ``is_supported``.
+    """
+
+    CHUNK_SIZE = 4096
+
+    @classmethod
+    def is_supported(cls, obj):
+        return isinstance(getattr(obj, "fd", None), int) and hasattr(os, "read")
+
+    def __init__(self, obj):
+        BufferedReadlineWrapper.__init__(self, obj)
+        self._lines = deque()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(obj.fd, selectors.EVENT_READ)
+
+        # pyserial's posix implementation allows cancelling a pending read through a pipe
+        self._abort_fd = getattr(obj, "pipe_abort_read_r", None)
+        if self._abort_fd is not None:
+            self._selector.register(self._abort_fd, selectors.EVENT_READ)
+
+    def readline(self, terminator=serial.LF):
+        if not self._lines:
+            self._lines.extend(self.read_lines(terminator=terminator))
+        return self._lines.popleft() if self._lines else b""
+
+    def read_lines(self, terminator=serial.LF):
+        """
+        Returns all complete lines that are available, waiting up to the port's timeout
+        for at least one line to arrive. Returns an empty list on timeout.
+        """
+        if self._lines:
+            lines = list(self._lines)
+            self._lines.clear()
+            return lines
+
+        lines = self._split_lines(terminator)
+        if lines:
+            return lines
+
+        timeout = serial.Timeout(self._timeout)
+        while True:
+            for key, _ in self._selector.select(timeout.time_left()):
+                if key.fd == self._abort_fd:
+                    os.read(self._abort_fd, 1000)
+                    return []
+
+                try:
+                    data = os.read(key.fd, self.CHUNK_SIZE)
+                except BlockingIOError:
+                    continue
+
+                if not data:
+                    raise serial.SerialException(
+                        "device reports readiness to read but returned no data "
+                        "(device disconnected or multiple access on port?)"
+                    )
+                self._buffered += data
+
+            lines = self._split_lines(terminator)
+            if lines or timeout.expired():
+                return lines
+
+    def close(self):
+        try:
+            self._selector.close()
+        finally:
+            self.__wrapped__.close()
+
+    def _split_lines(self, terminator):
+        end = self._buffered.rfind(terminator)
+        if end < 0:
+            return []
+
+        end += len(terminator)
+        data = bytes(self._buffered[:end])
+        del self._buffered[:end]
+        return [line + terminator for line in data.split(terminator)[:-1]]
+
+
 # --- Test code for speed testing the comm layer via command line follows
 
 
@@ -0,0 +1,78 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+from flask_babel import gettext
+
+import octoprint.plugin
+
+
+class TcpConnectorPlugin(
+    octoprint.plugin.SettingsPlugin,
+    octoprint.plugin.TemplatePlugin,
+):
+    def initialize(self):
+        from .connector import ConnectedTcpPrinter
+
+        ConnectedTcpPrinter._plugin_manager = self._plugin_manager
+        ConnectedTcpPrinter._plugin_settings = self._settings
+
+    ##~~ SettingsPlugin mixin
+
+    def get_settings_defaults(self):
+        from .config_schema import TcpConfig
+
+        return TcpConfig().model_dump()
+
+    ##~~ TemplatePlugin mixin
+
+    def get_template_configs(self):
+        return [
+            {
+                "type": "connection_options",
+                "name": gettext("TCP Connection"),
+                "connector": "tcp",
+                "template": "tcp_connector_connection_option.jinja2",
+                "custom_bindings": True,
+            },
+        ]
+
+    def get_template_vars(self):
+        return {"port": self._settings.get_int(["port"])}
+
+    def is_template_autoescaped(self):
+        return True
+
+    ##~~ CLI hook
+
+    def cli_commands_hook(self, cli_group, pass_octoprint_ctx, *args, **kwargs):
+        import click
+
+        @click.command("loopback")
+        @click.option("--host", default="127.0.0.1", show_default=True)
+        @click.option("--port", type=int, default=2323, show_default=True)
+        def loopback_command(host, port):
+            """
+            Runs a stand-in printer to connect to with the TCP connector.
+            """
+            import asyncio
+
+            from .loopback import LoopbackPrinter
+
+            click.echo(f"Listening on {host}:{port}, press Ctrl+C to stop")
+            try:
+                asyncio.run(LoopbackPrinter(host=host, port=port).serve_forever())
+            except KeyboardInterrupt:
+                pass
+
+        return [loopback_command]
+
+
+__plugin_name__ = "TCP Connector"
+__plugin_author__ = "The OctoPrint Project"
+__plugin_description__ = "A printer connector plugin to support network attached printers talking G-code over TCP"
+__plugin_license__ = "AGPLv3"
+__plugin_pythoncompat__ = ">=3.10,<4"
+__plugin_implementation__ = TcpConnectorPlugin()
+__plugin_hooks__ = {
+    "octoprint.cli.commands": __plugin_implementation__.cli_commands_hook,
+}
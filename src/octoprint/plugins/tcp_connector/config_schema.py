@@ -0,0 +1,31 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+from octoprint.schema import BaseModel
+
+
+class TcpTimeoutConfig(BaseModel):
+    connection: float = 10.0
+    """Timeout for establishing the connection to the printer, in seconds."""
+
+    communication: float = 30.0
+    """Timeout after which to consider an unacknowledged command lost and continue sending, in seconds."""
+
+    temperature: float = 5.0
+    """Interval in which to query the temperatures, in seconds."""
+
+
+class TcpConfig(BaseModel):
+    port: int = 23
+    """Default TCP port to connect to if none is given with the connection parameters."""
+
+    encoding: str = "ascii"
+    """Encoding to use for the communication with the printer."""
+
+    lastLineBufferSize: int = 50
+    """Minimum number of sent lines to keep for serving resend requests."""
+
+    lastLineBufferBytes: int = 65536
+    """Maximum size of the sent lines kept for serving resend requests, in bytes."""
+
+    timeout: TcpTimeoutConfig = TcpTimeoutConfig()
@@ -0,0 +1,567 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import asyncio
+import collections
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from octoprint.events import Events, eventManager
+from octoprint.filemanager import valid_file_type
+from octoprint.filemanager.destinations import FileDestinations
+from octoprint.plugins.serial_connector.gcode_commands import GcodeCommandsMixin
+from octoprint.plugins.serial_connector.line_classifier import (
+    LINE_ERROR,
+    LINE_FIRMWARE,
+    LINE_OK,
+    LINE_RESEND,
+    LINE_TEMPERATURE,
+    LineClassifier,
+)
+from octoprint.plugins.serial_connector.serial_comm import (
+    LineHistory,
+    add_line_checksum,
+    apply_command_phase_hooks,
+    gcode_and_subcode_for_cmd,
+    parse_firmware_line,
+    parse_resend_line,
+    parse_temperature_line,
+    process_gcode_line,
+    resend_error_type,
+)
+from octoprint.printer import (
+    CommunicationHealth,
+    ErrorInformation,
+    FirmwareInformation,
+    UnknownScript,
+)
+from octoprint.printer.async_connection import AsyncConnectedPrinter
+from octoprint.printer.connection import ConnectedPrinterState
+from octoprint.printer.job import JobProgress, PrintJob
+from octoprint.settings import settings
+
+if TYPE_CHECKING:
+    from octoprint.plugin import PluginManager, PluginSettings
+
+TEMPERATURE_KEYS = {"B": "bed", "C": "chamber"}
+"""Keys of the heaters other than tools in parsed temperature reports and their names."""
+
+
+class ConnectedTcpPrinter(GcodeCommandsMixin, AsyncConnectedPrinter):
+    """
+    Talks G-code to a printer over a plain TCP (raw or telnet style) connection.
+
+    All lines are sent with line numbers and checksums, the next line is only sent
+    once the previous one has been acknowledged with an ``ok``. Resend requests are
+    served from a :class:`~octoprint.plugins.serial_connector.serial_comm.LineHistory`
+    and commands pass the same ``octoprint.comm.protocol.gcode.<phase>`` hooks as
+    with the serial connector. Received lines are classified with the serial
+    connector's :class:`~octoprint.plugins.serial_connector.line_classifier.LineClassifier`.
+
+    Everything runs as tasks on the shared event loop: one reading from and one writing
+    to the connection, and one polling the temperatures.
+    """
+
+    connector = "tcp"
+    name = "TCP Connection"
+
+    # injected by plugin
+    _plugin_settings: "PluginSettings" = None
+    _plugin_manager: "PluginManager" = None
+    # /injected
+
+    @classmethod
+    def connection_preconditions_met(cls, params: dict[str, Any]) -> bool:
+        return bool(params.get("host"))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._host = kwargs.get("host")
+        self._port = int(kwargs.get("port") or self._plugin_settings.get_int(["port"]))
+        self._encoding = self._plugin_settings.get(["encoding"])
+
+        self._reader = None
+        self._writer = None
+
+        self._commands = collections.deque()
+        self._work = asyncio.Event()
+        self._clear_to_send = asyncio.Event()
+
+        self._current_line = 0
+        self._line_history = LineHistory(
+            self._plugin_settings.get_int(["lastLineBufferBytes"]),
+            min_lines=self._plugin_settings.get_int(["lastLineBufferSize"]),
+        )
+        self._resend_from = None
+        self._classifier = LineClassifier()
+        self._current_tool = 0
+
+        self._transmitted_lines = 0
+        self._received_resends = 0
+
+        self._job_file = None
+        self._job_pos = 0
+        self._job_size = 0
+        self._job_started = None
+        self._job_progress = 0
+
+        self._gcode_hooks = {
+            phase: self._plugin_manager.get_hooks(
+                f"octoprint.comm.protocol.gcode.{phase}"
+            )
+            for phase in ("queuing", "queued", "sending", "sent")
+        }
+        self._received_hooks = self._plugin_manager.get_hooks(
+            "octoprint.comm.protocol.gcode.received"
+        )
+
+    @property
+    def connection_parameters(self):
+        parameters = super().connection_parameters
+        parameters.update({"host": self._host, "port": self._port})
+        return parameters
+
+    @property
+    def communication_health(self) -> CommunicationHealth:
+        return CommunicationHealth(
+            errors=self._received_resends, total=self._transmitted_lines, critical=False
+        )
+
+    def is_ready(self, *args, **kwargs):
+        return self.is_operational() and not self.is_printing()
+
+    def repair_communication(self, *args, **kwargs):
+        self.call_soon(self._clear_to_send.set)
+
+    ##~~ connection
+
+    async def run(self):
+        timeout = self._plugin_settings.get_float(["timeout", "connection"])
+
+        self._log(f"Connecting to {self._host}:{self._port}")
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port), timeout
+        )
+        self._log(f"Connected to {self._host}:{self._port}, waiting for the printer")
+
+        self._clear_to_send.set()
+        self._queue_command("M110 N0", command_type="lineno_reset")
+        self._queue_command("M115", command_type="firmware_info")
+
+        tasks = [
+            asyncio.create_task(self._receive_lines()),
+            asyncio.create_task(self._send_lines()),
+            asyncio.create_task(self._poll_temperatures()),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def cleanup(self):
+        self._close_job_file()
+
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+            self._writer = self._reader = None
+
+    def _on_connected(self):
+        self.set_state(ConnectedPrinterState.OPERATIONAL)
+
+        payload = self.event_payload(
+            {"connector": self.connector, "host": self._host, "port": self._port}
+        )
+        eventManager().fire(Events.CONNECTED, payload)
+        self.script(
+            "afterPrinterConnected", context={"event": payload}, must_be_set=False
+        )
+
+    ##~~ sending
+
+    def commands(self, *commands, tags=None, force=False, **kwargs):
+        """
+        Sends one or more gcode commands to the printer.
+        """
+        if len(commands) == 1 and isinstance(commands[0], (list, tuple)):
+            commands = commands[0]
+
+        for command in commands:
+            self._queue_command(command, tags=tags)
+
+    def script(
+        self, name, context=None, must_be_set=True, part_of_job=False, *args, **kwargs
+    ):
+        if name is None or not name:
+            raise ValueError("name must be set")
+
+        if context is None:
+            context = {}
+        context.update({"printer_profile": self._profile})
+
+        script = settings().loadScript("gcode", name, context=context)
+        if script is None:
+            if must_be_set:
+                raise UnknownScript(name)
+            return
+
+        tags = (kwargs.get("tags") or set()) | {"source:script", f"script:{name}"}
+        for line in script.split("\n"):
+            self._queue_command(line, tags=tags)
+
+    def _queue_command(self, command, command_type=None, tags=None):
+        command = process_gcode_line(command)
+        if not command:
+            return
+
+        if command.startswith("@"):
+            self._logger.debug(f"Not sending host command {command}, not supported")
+            return
+
+        for entry in self._process_command_phase(
+            "queuing", command, command_type=command_type, tags=tags
+        ):
+            self.call_soon(self._enqueue, entry)
+            self._process_command_phase("queued", *entry)
+
+    def _enqueue(self, entry):
+        self._commands.append(entry)
+        self._work.set()
+
+    def _process_command_phase(
+        self, phase, command, command_type=None, gcode=None, subcode=None, tags=None
+    ):
+        if gcode is None:
+            gcode, subcode = gcode_and_subcode_for_cmd(command)
+        return apply_command_phase_hooks(
+            self._gcode_hooks[phase],
+            self,
+            phase,
+            [(command, command_type, gcode, subcode, tags)],
+            logger=self._logger,
+        )
+
+    def _next_command(self):
+        if self._commands:
+            return self._commands.popleft()
+
+        if self.state != ConnectedPrinterState.PRINTING or self._job_file is None:
+            return None
+
+        while True:
+            raw = self._job_file.readline()
+            if not raw:
+                self._on_job_done()
+                return None
+
+            self._job_pos += len(raw)
+            self._report_job_progress()
+
+            line = process_gcode_line(raw.decode(self._encoding, errors="replace"))
+            if not line:
+                continue
+
+            results = self._process_command_phase(
+                "queuing", line, tags={"source:file", f"filepos:{self._job_pos}"}
+            )
+            if results:
+                self._commands.extend(results[1:])
+                return results[0]
+
+    async def _send_lines(self):
+        while True:
+            await self._clear_to_send.wait()
+
+            if self._resend_from is not None:
+                await self._resend_line()
+                continue
+
+            entry = self._next_command()
+            if entry is None:
+                self._work.clear()
+                await self._work.wait()
+                continue
+
+            for (
+                command,
+                command_type,
+                gcode,
+                subcode,
+                tags,
+            ) in self._process_command_phase("sending", *entry):
+                self._clear_to_send.clear()
+                await self._send_line(command, gcode)
+                self._process_command_phase(
+                    "sent", command, command_type, gcode, subcode, tags
+                )
+
+    async def _send_line(self, command, gcode):
+        encoded = command.encode(self._encoding, errors="replace")
+
+        if gcode == "M110":
+            _, _, parameter = command.partition(" N")
+            try:
+                self._current_line = int(parameter.split()[0]) if parameter else 0
+            except ValueError:
+                self._current_line = 0
+            self._line_history.clear()
+
+        linenumber = self._current_line
+        self._line_history.append(linenumber, encoded)
+        self._current_line += 1
+
+        await self._write(add_line_checksum(encoded, linenumber))
+
+    async def _resend_line(self):
+        linenumber = self._resend_from
+        encoded = self._line_history.get(linenumber)
+        if encoded is None:
+            self.set_error(
+                f"Printer requested line {linenumber} but no sufficient history is available",
+                "resend",
+                consequence="disconnect",
+            )
+            raise ConnectionError("Resend request could not be served")
+
+        self._resend_from = (
+            linenumber + 1 if linenumber + 1 < self._current_line else None
+        )
+        self._clear_to_send.clear()
+        await self._write(add_line_checksum(encoded, linenumber))
+
+    async def _write(self, line):
+        self._log(">>> " + line.decode(self._encoding, errors="replace"))
+        self._writer.write(line + b"\n")
+        await self._writer.drain()
+        self._transmitted_lines += 1
+
+    async def _poll_temperatures(self):
+        interval = self._plugin_settings.get_float(["timeout", "temperature"])
+        while True:
+            await asyncio.sleep(interval)
+            if not self.is_operational():
+                continue
+            if any(entry[1] == "temperature_poll" for entry in self._commands):
+                continue
+            self._queue_command(
+                "M105",
+                command_type="temperature_poll",
+                tags={"trigger:connector.poll_temperatures"},
+            )
+
+    ##~~ receiving
+
+    async def _receive_lines(self):
+        timeout = self._plugin_settings.get_float(["timeout", "communication"])
+
+        # asyncio.wait instead of asyncio.wait_for, as the latter may swallow a
+        # cancellation that coincides with a received line before Python 3.12
+        read = None
+        while True:
+            if read is None:
+                read = asyncio.ensure_future(self._reader.readline())
+
+            try:
+                done, _ = await asyncio.wait({read}, timeout=timeout)
+            except asyncio.CancelledError:
+                read.cancel()
+                raise
+
+            if not done:
+                if not self._clear_to_send.is_set():
+                    self._log("Communication timeout while waiting for an ok, continuing")
+                    self._clear_to_send.set()
+                continue
+
+            raw = read.result()
+            read = None
+
+            if not raw:
+                raise ConnectionError("Connection closed by the printer")
+
+            line = raw.decode(self._encoding, errors="replace").strip()
+            self._log(f"<<< {line}")
+            self._process_line(line)
+
+    def _process_line(self, line):
+        for name, hook in self._received_hooks.items():
+            try:
+                line = hook(self, line)
+            except Exception:
+                self._logger.exception(
+                    f"Error while processing hook {name}:", extra={"plugin": name}
+                )
+            if line is None:
+                return
+
+        line_class = self._classifier.classify(line)
+        if line_class == LINE_OK:
+            if self._classifier.classify_content(line) == LINE_TEMPERATURE:
+                self._on_temperatures(line)
+            self._on_ok()
+
+        elif line_class == LINE_TEMPERATURE:
+            self._on_temperatures(line)
+
+        elif line_class == LINE_RESEND:
+            self._on_resend(line)
+
+        elif line_class == LINE_ERROR:
+            self._on_error(line)
+
+        elif line_class == LINE_FIRMWARE:
+            data = parse_firmware_line(line)
+            self.firmware_info = FirmwareInformation(
+                name=data.get("FIRMWARE_NAME", "Unknown"), data=data
+            )
+
+    def _on_ok(self):
+        if self.state == ConnectedPrinterState.CONNECTING:
+            self._on_connected()
+        self._clear_to_send.set()
+
+    def _on_resend(self, line):
+        linenumber = parse_resend_line(line)
+        if linenumber is None or linenumber >= self._current_line:
+            return
+
+        self._received_resends += 1
+        self._resend_from = linenumber
+
+    def _on_error(self, line):
+        error = line.split(":", 1)[-1].strip() if ":" in line else line
+        if resend_error_type(error) != "other":
+            # will be followed by a resend request
+            return
+
+        printing = self.is_printing()
+        self.error_info = ErrorInformation(
+            error=error, reason="firmware", consequence="cancel" if printing else None
+        )  # this will call the listener
+        if printing:
+            self.cancel_print()
+
+    def _on_temperatures(self, line):
+        max_tool, parsed = parse_temperature_line(line, self._current_tool)
+
+        temperatures = {}
+        for key, value in parsed.items():
+            if key.startswith("T"):
+                temperatures[f"tool{key[1:]}"] = value
+            elif key in TEMPERATURE_KEYS:
+                temperatures[TEMPERATURE_KEYS[key]] = value
+
+        if temperatures:
+            self._listener.on_printer_temperature_update(temperatures)
+
+    ##~~ jobs
+
+    def supports_job(self, job: PrintJob) -> bool:
+        return (
+            valid_file_type(job.path, type="machinecode")
+            and job.storage == FileDestinations.LOCAL
+            and job.path_on_disk is not None
+            and os.path.isfile(job.path_on_disk)
+        )
+
+    def set_job(self, job: PrintJob, user=None, *args, **kwargs):
+        if not self.is_ready():
+            self._logger.info(
+                "Cannot change job: printer not connected or currently busy"
+            )
+            return
+        super().set_job(job, user=user)
+
+    @property
+    def job_progress(self) -> JobProgress:
+        if self._job is None:
+            return None
+
+        elapsed = time.monotonic() - self._job_started if self._job_started else 0.0
+        return JobProgress(
+            job=self._job,
+            progress=self._job_pos / self._job_size if self._job_size else 0.0,
+            pos=self._job_pos,
+            elapsed=elapsed,
+            cleaned_elapsed=elapsed,
+        )
+
+    def start_print(self, pos=None, user=None, tags=None, *args, **kwargs):
+        if self._job is None:
+            raise ValueError("No file selected for printing")
+        self.call_soon(self._start_print, pos, user)
+
+    def pause_print(self, user=None, tags=None, *args, **kwargs):
+        self.call_soon(self._pause_print, True, user)
+
+    def resume_print(self, user=None, tags=None, *args, **kwargs):
+        self.call_soon(self._pause_print, False, user)
+
+    def cancel_print(self, user=None, tags=None, *args, **kwargs):
+        self.call_soon(self._cancel_print, user)
+
+    def _start_print(self, pos, user):
+        if not self.is_ready():
+            return
+
+        self._job_file = open(self._job.path_on_disk, "rb")
+        self._job_size = os.fstat(self._job_file.fileno()).st_size
+        self._job_pos = pos or 0
+        self._job_file.seek(self._job_pos)
+        self._job_started = time.monotonic()
+        self._job_progress = 0
+
+        self.set_state(ConnectedPrinterState.STARTING)
+        self._listener.on_printer_job_started(user=user)
+        self.set_state(ConnectedPrinterState.PRINTING)
+        self._work.set()
+
+    def _pause_print(self, pause, user):
+        if pause and self.state == ConnectedPrinterState.PRINTING:
+            self.set_state(ConnectedPrinterState.PAUSED)
+            self._listener.on_printer_job_paused(user=user)
+
+        elif not pause and self.state == ConnectedPrinterState.PAUSED:
+            self._listener.on_printer_job_resumed(user=user)
+            self.set_state(ConnectedPrinterState.PRINTING)
+            self._work.set()
+
+    def _cancel_print(self, user):
+        if not self.is_printing():
+            return
+
+        self.set_state(ConnectedPrinterState.CANCELLING)
+        self._close_job_file()
+        self._listener.on_printer_job_cancelled(user=user)
+        self.set_state(ConnectedPrinterState.OPERATIONAL)
+
+    def _on_job_done(self):
+        self._close_job_file()
+        self.set_state(ConnectedPrinterState.FINISHING)
+        self._listener.on_printer_job_done()
+        self.set_state(ConnectedPrinterState.OPERATIONAL)
+
+    def _report_job_progress(self):
+        progress = self._job_pos * 100 // self._job_size if self._job_size else 0
+        if progress != self._job_progress:
+            self._job_progress = progress
+            self._listener.on_printer_job_progress()
+
+    def _close_job_file(self):
+        if self._job_file is not None:
+            self._job_file.close()
+            self._job_file = None
+
+    ##~~ logging
+
+    def _log(self, message):
+        self._listener.on_printer_logs(message)
@@ -0,0 +1,155 @@
+"""
+A stand-in for a network attached printer, listening on a local TCP port.
+
+:class:`LoopbackPrinter` speaks just enough Marlin flavoured G-code to drive the
+TCP connector during development and in tests: it checks line numbers and checksums,
+requests resends and reports temperatures and firmware information.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import asyncio
+import re
+
+regex_line = re.compile(r"^N(?P<n>\d+) (?P<command>.*)\*(?P<checksum>\d+)$")
+regex_parameter = re.compile(r"(?P<key>[A-Z])(?P<value>[-+]?[0-9]*\.?[0-9]+)")
+
+
+class LoopbackPrinter:
+    """
+    Arguments:
+        host (str): address to listen on
+        port (int): port to listen on, ``0`` picks a free one
+        firmware_name (str): name to report in response to ``M115``
+        corrupt_lines (set): line numbers to treat as received with a wrong checksum,
+            once each
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        firmware_name="Loopback Marlin",
+        corrupt_lines=None,
+    ):
+        self.host = host
+        self.port = port
+        self.firmware_name = firmware_name
+        self.corrupt_lines = set(corrupt_lines or ())
+
+        self.received = []
+        """The commands received, without line numbers and checksums."""
+
+        self.temperatures = {"T": [21.0, 0.0], "B": [21.0, 0.0]}
+
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.host, self.port
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def _handle(self, reader, writer):
+        expected = 0
+
+        def respond(*lines):
+            writer.write("".join(line + "\n" for line in lines).encode("ascii"))
+
+        try:
+            while raw := await reader.readline():
+                line = raw.decode("ascii", errors="replace").strip()
+                if not line:
+                    continue
+
+                match = regex_line.match(line)
+                if match is None:
+                    respond(
+                        f"Error:No Line Number with checksum, Last Line: {expected - 1}",
+                        f"Resend: {expected}",
+                        "ok",
+                    )
+                    continue
+
+                linenumber = int(match.group("n"))
+                command = match.group("command")
+
+                checksum = 0
+                for c in line[: line.rindex("*")].encode("ascii"):
+                    checksum ^= c
+
+                if linenumber in self.corrupt_lines:
+                    self.corrupt_lines.discard(linenumber)
+                    checksum = -1
+
+                if checksum != int(match.group("checksum")):
+                    respond(
+                        f"Error:checksum mismatch, Last Line: {expected - 1}",
+                        f"Resend: {expected}",
+                        "ok",
+                    )
+                    continue
+
+                if command.startswith("M110"):
+                    expected = linenumber
+                elif linenumber != expected:
+                    respond(
+                        f"Error:Line Number is not Last Line Number+1, Last Line: {expected - 1}",
+                        f"Resend: {expected}",
+                        "ok",
+                    )
+                    continue
+
+                expected = linenumber + 1
+                self.received.append(command)
+                respond(*self._process(command))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _process(self, command):
+        code, _, arguments = command.partition(" ")
+        parameters = {
+            match.group("key"): float(match.group("value"))
+            for match in regex_parameter.finditer(arguments)
+        }
+
+        if code == "M105":
+            return [f"ok {self._temperature_report()}"]
+
+        elif code == "M115":
+            return [f"FIRMWARE_NAME:{self.firmware_name} PROTOCOL_VERSION:1.0", "ok"]
+
+        elif code in ("M104", "M109") and "S" in parameters:
+            self.temperatures["T"] = [parameters["S"], parameters["S"]]
+
+        elif code in ("M140", "M190") and "S" in parameters:
+            self.temperatures["B"] = [parameters["S"], parameters["S"]]
+
+        return ["ok"]
+
+    def _temperature_report(self):
+        return " ".join(
+            f"{key}:{actual:.1f} /{target:.1f}"
+            for key, (actual, target) in self.temperatures.items()
+        )
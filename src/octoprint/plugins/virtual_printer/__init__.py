@@ -62,6 +62,7 @@ class VirtualPrinterPlugin(
                 "EMERGENCY_PARSER": True,
                 "EXTENDED_M20": False,
                 "LFN_WRITE": False,
+                "BINARY_FILE_TRANSFER": False,
             },
             "m115ReportArea": False,
             "m114FormatString": "X:{x} Y:{y} Z:{z} E:{e[current]} Count: A:{a} B:{b} C:{c}",
@@ -145,6 +146,82 @@ class VirtualPrinterPlugin(
         else:
             return []
 
+    def cli_commands_hook(self, cli_group, pass_octoprint_ctx, *args, **kwargs):
+        import click
+
+        from .benchmark import (
+            DEFAULT_LINES,
+            DEFAULT_RESEND_RATIO,
+            DEFAULT_SWEEP_RATIOS,
+            SCENARIOS,
+        )
+
+        @click.command("benchmark")
+        @click.option(
+            "--scenario",
+            "scenarios",
+            type=click.Choice(SCENARIOS),
+            multiple=True,
+            help="Scenario to run, may be given multiple times. Defaults to all.",
+        )
+        @click.option(
+            "--lines",
+            type=click.IntRange(min=1),
+            default=DEFAULT_LINES,
+            show_default=True,
+            help="Number of lines per scenario.",
+        )
+        @click.option(
+            "--resend-ratio",
+            type=click.IntRange(0, 100),
+            default=DEFAULT_RESEND_RATIO,
+            show_default=True,
+            help="Percentage of lines the virtual printer requests a resend for.",
+        )
+        @click.option(
+            "--sweep-ratio",
+            "sweep_ratios",
+            type=click.IntRange(0, 100),
+            multiple=True,
+            help="Resend ratio to run the resends scenario with, may be given multiple "
+            "times. Defaults to {}.".format(", ".join(map(str, DEFAULT_SWEEP_RATIOS))),
+        )
+        @click.option(
+            "--output",
+            type=click.Path(dir_okay=False, writable=True),
+            help="File to write the JSON report to instead of stdout.",
+        )
+        def benchmark_command(scenarios, lines, resend_ratio, sweep_ratios, output):
+            """
+            Benchmarks the serial communication against the virtual printer.
+
+            Runs the communication layer against a virtual printer over a pty and
+            reports throughput, send latencies, CPU time and resend recovery times
+            per scenario as JSON.
+            """
+            import sys
+
+            from .benchmark import Benchmark
+
+            report = Benchmark(
+                lines=lines,
+                resend_ratio=resend_ratio,
+                sweep_ratios=sweep_ratios or DEFAULT_SWEEP_RATIOS,
+            ).run(scenarios=scenarios or SCENARIOS)
+
+            result = report.model_dump_json(indent=2)
+            if output:
+                with open(output, "w", encoding="utf-8") as f:
+                    f.write(result)
+            else:
+                click.echo(result)
+
+            if not all(scenario.completed for scenario in report.results):
+                click.echo("Not all scenarios completed!", err=True)
+                sys.exit(-1)
+
+        return [benchmark_command]
+
 
 __plugin_name__ = "Virtual Printer"
 __plugin_author__ = "Gina Häußge, based on work by Daid Braam"
@@ -166,4 +243,5 @@ def __plugin_load__():
     __plugin_hooks__ = {
         "octoprint.comm.transport.serial.factory": plugin.virtual_printer_factory,
         "octoprint.comm.transport.serial.additional_port_names": plugin.get_additional_port_names,
+        "octoprint.cli.commands": plugin.cli_commands_hook,
     }
@@ -0,0 +1,589 @@
+"""
+End-to-end communication throughput benchmark.
+
+Drives :class:`~octoprint.plugins.serial_connector.serial_comm.MachineCom` against the
+virtual printer over a pty pair, so that the full serial stack including actual serial
+I/O is exercised. The virtual printer runs in a separate process, so the measured CPU time
+is that of the communication layer alone.
+
+Both sides use the default settings of their respective plugins in a temporary base folder,
+not the configuration of the current instance, to keep results comparable across machines
+and releases.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import copy
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from pydantic import BaseModel
+
+from octoprint.plugins.serial_connector.serial_comm import (
+    MachineCom,
+    MachineComPrintCallback,
+    parse_resend_line,
+)
+
+SCENARIOS = ("print", "sd_stream", "sd_binary", "burst", "resends")
+"""
+Available scenarios: printing from OctoPrint, streaming a file to SD, transferring a file to SD
+with the binary file transfer protocol, command bursts, printing at increasing resend ratios.
+"""
+
+DEFAULT_LINES = 5000
+DEFAULT_RESEND_RATIO = 1
+DEFAULT_SWEEP_RATIOS = (1, 5, 10, 20)
+
+OPERATIONAL_TIMEOUT = 30.0
+SETTLE_TIME = 2.0
+
+_line_number = re.compile(r"N(\d+)\s")
+
+
+class LatencyStats(BaseModel):
+    p50: Optional[float] = None
+    """Median, in ms."""
+
+    p90: Optional[float] = None
+    """90th percentile, in ms."""
+
+    p99: Optional[float] = None
+    """99th percentile, in ms."""
+
+    max: Optional[float] = None
+    """Maximum, in ms."""
+
+
+class ScenarioResult(BaseModel):
+    scenario: str
+    """Name of the scenario."""
+
+    completed: bool
+    """Whether the scenario completed within its timeout."""
+
+    lines: int
+    """
+    Number of lines sent to the printer, including resent lines. For binary file transfers
+    the number of lines in the transferred file.
+    """
+
+    duration: float
+    """Wall clock duration of the scenario, in s."""
+
+    lines_per_second: float
+    """Throughput, in lines per second."""
+
+    cpu_per_1000_lines: Optional[float] = None
+    """CPU time (user + system) used by OctoPrint per 1000 sent lines, in ms."""
+
+    send_latency: LatencyStats
+    """Time from sending a line or binary packet to its acknowledgement, in ms."""
+
+    resends: int
+    """Number of resend requests received."""
+
+    resend_recovery: LatencyStats
+    """Time from a resend request until new lines are sent again, in ms."""
+
+    resend_ratio: Optional[int] = None
+    """Percentage of lines the virtual printer requested a resend for, if different from the report's."""
+
+    resend_errors: dict[str, int] = {}
+    """Number of resend requests by type of the firmware error preceding them."""
+
+
+class BenchmarkReport(BaseModel):
+    octoprint: str
+    """OctoPrint version."""
+
+    python: str
+    """Python version."""
+
+    platform: str
+    """Platform the benchmark ran on."""
+
+    timestamp: float
+    """Start of the benchmark run."""
+
+    lines: int
+    """Number of lines per scenario."""
+
+    resend_ratio: int
+    """Percentage of lines for which the virtual printer requested a resend."""
+
+    results: list[ScenarioResult] = []
+
+
+def percentile(values, p):
+    """
+    Nearest rank percentile ``p`` (0 to 100) of ``values``, None for no values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    rank = min(len(values), max(1, math.ceil(p / 100 * len(values))))
+    return values[rank - 1]
+
+
+def latency_stats(values):
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return LatencyStats(
+        p50=ms(percentile(values, 50)),
+        p90=ms(percentile(values, 90)),
+        p99=ms(percentile(values, 99)),
+        max=ms(max(values) if values else None),
+    )
+
+
+class LineTracker:
+    """
+    Derives send latencies and resend recovery times from the communication log.
+
+    Works on the timestamped ``>>>`` and ``<<<`` lines the communication layer hands to
+    ``on_comm_logs``, so it doesn't need to hook into ``MachineCom`` itself.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._mutex:
+            self.sent = 0
+            self.resends = 0
+            self.latencies = []
+            self.recoveries = []
+
+            self._pending = deque()
+            self._max_line = 0
+            self._resend_started = None
+            self._resend_target = None
+
+    @property
+    def idle(self):
+        """Whether all sent lines have been acknowledged."""
+        with self._mutex:
+            return not self._pending
+
+    def feed(self, timestamp, message):
+        with self._mutex:
+            if message.startswith(">>> "):
+                self.sent += 1
+                self._pending.append(timestamp)
+
+                match = _line_number.match(message, 4)
+                if match and "M110" in message:
+                    # line numbers are reset, anything before is history
+                    self._max_line = int(match.group(1))
+                    self._resend_started = None
+
+                elif match:
+                    line = int(match.group(1))
+                    if self._resend_started is not None and line > self._resend_target:
+                        self.recoveries.append(timestamp - self._resend_started)
+                        self._resend_started = None
+                    self._max_line = max(self._max_line, line)
+
+            elif message.startswith("<<< "):
+                line = message[4:].strip()
+                lower = line.lower()
+                if lower.startswith("ok"):
+                    if self._pending:
+                        self.latencies.append(timestamp - self._pending.popleft())
+
+                elif (
+                    lower.startswith("resend") or lower.startswith("rs")
+                ) and parse_resend_line(line) is not None:
+                    self.resends += 1
+
+                    # whatever was in flight will be resent and tracked again
+                    self._pending.clear()
+
+                    if self._resend_started is None:
+                        self._resend_started = timestamp
+                        self._resend_target = self._max_line
+
+
+def _serve_virtual_printer(conn, basedir, overrides):
+    """
+    Runs the virtual printer behind the master side of a new pty pair.
+
+    Sends the path of the slave side through ``conn`` and serves until anything is
+    received on ``conn``.
+    """
+    import tty
+
+    from octoprint.plugin import PluginSettings, plugin_manager
+    from octoprint.settings import Settings
+    from octoprint.util import dict_merge
+
+    from . import VirtualPrinterPlugin
+    from .virtual import VirtualPrinter
+
+    # no third party plugins in here to keep results comparable
+    plugin_manager(init=True, plugin_folders=[], plugin_entry_points=[])
+
+    settings = Settings(basedir=basedir)
+    plugin_settings = PluginSettings(
+        settings,
+        "virtual_printer",
+        defaults=dict_merge(VirtualPrinterPlugin().get_settings_defaults(), overrides),
+    )
+
+    data_folder = os.path.join(basedir, "data", "virtual_printer")
+    os.makedirs(data_folder, exist_ok=True)
+
+    printer = VirtualPrinter(
+        plugin_settings, None, data_folder=data_folder, read_timeout=0.1
+    )
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+
+    stopped = threading.Event()
+
+    def to_printer():
+        while not stopped.is_set():
+            try:
+                data = os.read(master, 4096)
+            except OSError:
+                break
+            while data and not stopped.is_set():
+                try:
+                    written = printer.write(data)
+                except Exception:
+                    # rx buffer stayed full, the sender will run into a timeout
+                    break
+                data = data[written:]
+
+    def from_printer():
+        while not stopped.is_set():
+            line = printer.readline()
+            if line:
+                if not line.endswith(b"\n"):
+                    # the printer hands out lines, the serial line needs terminators
+                    line += b"\n"
+                try:
+                    os.write(master, line)
+                except OSError:
+                    break
+
+    for target in (to_printer, from_printer):
+        threading.Thread(target=target, daemon=True).start()
+
+    conn.send(os.ttyname(slave))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+
+        if message is None:
+            break
+
+        command, value = message
+        if command == "resend_ratio":
+            # noinspection PyProtectedMember
+            printer._calculate_resend_every_n(value)
+            conn.send(True)
+
+    stopped.set()
+    printer.close()
+    os.close(master)
+    os.close(slave)
+
+
+class Benchmark:
+    """
+    Runs the benchmark scenarios.
+
+    Arguments:
+        lines (int): Number of lines per scenario
+        resend_ratio (int): Percentage of lines the virtual printer will request a resend for
+        sweep_ratios (list): Resend ratios to run the ``resends`` scenario with, one result each
+        timeout (float): Timeout per scenario, in s, defaults to a second per 10 lines but at least 60s
+    """
+
+    def __init__(
+        self,
+        lines=DEFAULT_LINES,
+        resend_ratio=DEFAULT_RESEND_RATIO,
+        sweep_ratios=DEFAULT_SWEEP_RATIOS,
+        timeout=None,
+    ):
+        self._lines = lines
+        self._resend_ratio = resend_ratio
+        self._sweep_ratios = list(sweep_ratios)
+        self._timeout = timeout if timeout is not None else max(60.0, lines / 10)
+
+        self._logger = logging.getLogger(__name__)
+
+        self._tracker = LineTracker()
+        self._done = threading.Event()
+        self._operational = threading.Event()
+        self._failed = threading.Event()
+
+        self._comm = None
+
+    def run(self, scenarios=SCENARIOS):
+        """Runs ``scenarios`` and returns the :class:`BenchmarkReport`."""
+        from octoprint import __version__
+
+        report = BenchmarkReport(
+            octoprint=__version__,
+            python=platform.python_version(),
+            platform=platform.platform(),
+            timestamp=time.time(),
+            lines=self._lines,
+            resend_ratio=self._resend_ratio,
+        )
+
+        with tempfile.TemporaryDirectory(prefix="octoprint-benchmark-") as basedir:
+            path = os.path.join(basedir, "benchmark.gcode")
+            self._write_gcode(path)
+
+            ctx = multiprocessing.get_context("spawn")
+            conn, child_conn = ctx.Pipe()
+            printer = ctx.Process(
+                target=_serve_virtual_printer,
+                args=(
+                    child_conn,
+                    os.path.join(basedir, "printer"),
+                    {
+                        "resend_ratio": self._resend_ratio,
+                        "simulated_errors": [],
+                        "capabilities": {"BINARY_FILE_TRANSFER": True},
+                    },
+                ),
+                daemon=True,
+            )
+            printer.start()
+
+            try:
+                if not conn.poll(OPERATIONAL_TIMEOUT):
+                    raise RuntimeError("Virtual printer did not come up")
+                port = conn.recv()
+                self._connect(port, os.path.join(basedir, "octoprint"))
+
+                for scenario in scenarios:
+                    self._logger.info(f"Running scenario {scenario}...")
+                    if scenario == "resends":
+                        results = []
+                        for ratio in self._sweep_ratios:
+                            self._set_resend_ratio(conn, ratio)
+                            results.append(
+                                self._run_scenario(scenario, path, resend_ratio=ratio)
+                            )
+                            if self._failed.is_set():
+                                break
+                        self._set_resend_ratio(conn, self._resend_ratio)
+                    else:
+                        results = [self._run_scenario(scenario, path)]
+
+                    for result in results:
+                        self._logger.info(
+                            f"Scenario {scenario}: {result.lines_per_second:.1f} lines/s"
+                        )
+                    report.results += results
+
+                    if self._failed.is_set():
+                        break
+
+            finally:
+                if self._comm is not None:
+                    self._comm.close(wait=False)
+                if printer.is_alive():
+                    conn.send(None)
+                printer.join(timeout=10)
+                if printer.is_alive():
+                    printer.kill()
+
+        return report
+
+    def _write_gcode(self, path):
+        # tiny fast moves, so the virtual printer's simulated move durations don't
+        # dominate what is supposed to be a benchmark of the communication
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(self._lines):
+                f.write(
+                    "G1 X{:.3f} Y10.000 E{:.5f} F30000\n".format(
+                        10 + (i % 2) * 0.1, i * 0.001
+                    )
+                )
+
+    def _connect(self, port, basedir):
+        from octoprint.plugin import OctoPrintPlugin, PluginSettings, plugin_manager
+        from octoprint.plugin.core import PluginManager
+        from octoprint.plugins.serial_connector.config_schema import SerialConfig
+        from octoprint.printer.profile import PrinterProfileManager
+        from octoprint.settings import Settings
+
+        try:
+            plugin_manager()
+        except ValueError:
+            # not running inside OctoPrint, but the file manager needs a plugin manager
+            plugin_manager(init=True, plugin_folders=[], plugin_entry_points=[])
+
+        settings = Settings(basedir=basedir)
+        plugin_settings = PluginSettings(
+            settings, "serial_connector", defaults=SerialConfig().model_dump()
+        )
+
+        self._comm = MachineCom(
+            copy.deepcopy(PrinterProfileManager.default),
+            port=port,
+            baudrate=115200,
+            callback=_BenchmarkCallback(self),
+            settings=plugin_settings,
+            plugin_manager=PluginManager([], [OctoPrintPlugin], []),
+        )
+        self._comm.start()
+
+        if not self._operational.wait(OPERATIONAL_TIMEOUT) or self._failed.is_set():
+            raise RuntimeError(f"Could not connect to the virtual printer on {port}")
+
+        # let the initial chatter (firmware info, SD list, ...) pass
+        time.sleep(SETTLE_TIME)
+
+    def _set_resend_ratio(self, conn, ratio):
+        conn.send(("resend_ratio", ratio))
+        if not conn.poll(OPERATIONAL_TIMEOUT):
+            raise RuntimeError("Virtual printer did not acknowledge the new resend ratio")
+        conn.recv()
+
+    def _wait_until_ready(self):
+        deadline = time.monotonic() + OPERATIONAL_TIMEOUT
+        while self._comm.isBusy() or not self._comm.isOperational():
+            if self._failed.is_set() or time.monotonic() > deadline:
+                raise RuntimeError("Virtual printer did not become ready")
+            time.sleep(0.05)
+
+    def _run_scenario(self, scenario, path, resend_ratio=None):
+        self._wait_until_ready()
+
+        # don't let late log lines of the previous scenario leak into this one
+        self._comm._flush_log()
+        self._tracker.reset()
+        self._done.clear()
+
+        resend_statistics = self._comm.resend_statistics
+
+        start = time.monotonic()
+        cpu_start = time.process_time()
+
+        if scenario in ("print", "resends"):
+            self._comm.selectFile(path, False)
+            self._comm.startPrint()
+            completed = self._done.wait(self._timeout)
+
+        elif scenario in ("sd_stream", "sd_binary"):
+            # the virtual printer supports both, so pick the protocol to use
+            self._comm._capability_support[MachineCom.CAPABILITY_BINARY_FILE_TRANSFER] = (
+                scenario == "sd_binary"
+            )
+            self._comm.startFileTransfer(path, "benchmark.gcode", "bench.gco")
+            completed = self._done.wait(self._timeout)
+
+            # give the printer the chance to acknowledge the final M29
+            while completed and not self._tracker.idle:
+                if time.monotonic() - start > self._timeout:
+                    completed = False
+                    break
+                time.sleep(0.01)
+
+        elif scenario == "burst":
+            with open(path, encoding="utf-8") as f:
+                commands = [line.strip() for line in f]
+            for command in commands[:-1]:
+                self._comm.sendCommand(command)
+            self._comm.sendCommand(commands[-1], on_sent=self._done.set)
+
+            completed = self._done.wait(self._timeout)
+            while completed and not self._tracker.idle:
+                if time.monotonic() - start > self._timeout:
+                    completed = False
+                    break
+                time.sleep(0.01)
+
+        else:
+            raise ValueError(f"Unknown scenario: {scenario}")
+
+        duration = time.monotonic() - start
+        cpu = time.process_time() - cpu_start
+
+        if not completed:
+            self._logger.warning(f"Scenario {scenario} did not finish in time")
+            if self._comm.isStreaming():
+                self._comm.cancelFileTransfer()
+            elif self._comm.isPrinting():
+                self._comm.cancelPrint()
+
+        # make sure all log lines of the scenario have been handed to the tracker
+        self._comm._flush_log()
+
+        tracker = self._tracker
+        lines = self._lines if scenario == "sd_binary" else tracker.sent
+        return ScenarioResult(
+            scenario=scenario,
+            completed=completed and not self._failed.is_set(),
+            lines=lines,
+            duration=round(duration, 3),
+            lines_per_second=round(lines / duration, 1) if duration else 0.0,
+            cpu_per_1000_lines=round(cpu * 1000 * 1000 / lines, 3) if lines else None,
+            send_latency=latency_stats(tracker.latencies),
+            resends=tracker.resends,
+            resend_recovery=latency_stats(tracker.recoveries),
+            resend_ratio=resend_ratio,
+            resend_errors={
+                error_type: count - resend_statistics.get(error_type, 0)
+                for error_type, count in self._comm.resend_statistics.items()
+                if count > resend_statistics.get(error_type, 0)
+            },
+        )
+
+
+class _BenchmarkCallback(MachineComPrintCallback):
+    def __init__(self, benchmark):
+        self._benchmark = benchmark
+
+    def on_comm_logs(self, entries):
+        for timestamp, message in entries:
+            self._benchmark._tracker.feed(timestamp, message)
+
+    def on_comm_state_change(self, state):
+        if state == MachineCom.STATE_OPERATIONAL:
+            self._benchmark._operational.set()
+        elif state in (MachineCom.STATE_ERROR, MachineCom.STATE_CLOSED_WITH_ERROR):
+            self._benchmark._failed.set()
+            self._benchmark._operational.set()
+            self._benchmark._done.set()
+
+    def on_comm_progress(self, *args, **kwargs):
+        pass
+
+    def on_comm_print_job_done(self, *args, **kwargs):
+        self._benchmark._done.set()
+
+    def on_comm_print_job_failed(self, *args, **kwargs):
+        self._benchmark._failed.set()
+        self._benchmark._done.set()
+
+    def on_comm_file_transfer_done(self, *args, **kwargs):
+        self._benchmark._done.set()
+
+    def on_comm_file_transfer_failed(self, *args, **kwargs):
+        self._benchmark._failed.set()
+        self._benchmark._done.set()
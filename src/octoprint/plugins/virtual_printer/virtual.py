@@ -15,6 +15,7 @@ from typing import Any, Optional
 from serial import SerialTimeoutException
 
 from octoprint.plugin import plugin_manager
+from octoprint.plugins.serial_connector import binary_transfer
 from octoprint.util import RepeatedTimer, get_dos_filename, to_bytes, to_unicode
 from octoprint.util.files import unix_timestamp_to_m20_timestamp
 
@@ -133,6 +134,7 @@ class VirtualPrinter:
         self._writingToSdHandle = None
         self._writingToSdFile = None
         self._newSdFilePos = None
+        self._binaryStream = None
 
         self._heatingUp = False
 
@@ -275,6 +277,10 @@ class VirtualPrinter:
             self._writingToSdFile = None
             self._newSdFilePos = None
 
+            if self._binaryStream is not None:
+                self._binaryStream.close()
+            self._binaryStream = None
+
             self._heatingUp = False
 
             self.current_line = 0
@@ -373,7 +379,11 @@ class VirtualPrinter:
                 data = to_bytes(data, encoding="ascii", errors="replace")
                 self.incoming.task_done()
             except queue.Empty:
-                if self._sendWait and time.monotonic() > next_wait_timeout:
+                if (
+                    self._sendWait
+                    and self._binaryStream is None
+                    and time.monotonic() > next_wait_timeout
+                ):
                     self._send("wait")
                     recalculate_next_wait_timeout()
                 continue
@@ -383,6 +393,12 @@ class VirtualPrinter:
                     break
 
             if data is not None:
+                if self._binaryStream is not None:
+                    self._binaryStream.feed(buf + data)
+                    buf = b""
+                    recalculate_next_wait_timeout()
+                    continue
+
                 buf += data
                 nl = buf.find(b"\n") + 1
                 if nl > 0:
@@ -683,6 +699,15 @@ class VirtualPrinter:
     def _gcode_M28(self, data: str) -> None:
         if self._sdCardReady:
             filename = data.split(None, 1)[1].strip()
+            if filename == "B1" and self._capabilities.get("BINARY_FILE_TRANSFER"):
+                self._send("echo:Switching to Binary Protocol")
+                self._binaryStream = VirtualBinaryStream(
+                    self._send,
+                    self._virtualSd,
+                    self._leaveBinaryMode,
+                    resend_every_n=self._resend_every_n,
+                )
+                return
             self._writeSdFile(filename)
 
     # noinspection PyUnusedLocal
@@ -2019,6 +2044,9 @@ class VirtualPrinter:
         self._writingToSdFile = None
         self._send("Done saving file")
 
+    def _leaveBinaryMode(self):
+        self._binaryStream = None
+
     def _sdPrintingWorker(self):
         self._selectedSdFilePos = 0
         try:
@@ -2162,8 +2190,10 @@ class VirtualPrinter:
 
     def _processBuffer(self):
         while self.buffered is not None:
+            # keep our own reference, close() might reset the queue while we are moving
+            buffered = self.buffered
             try:
-                line = self.buffered.get(timeout=0.5)
+                line = buffered.get(timeout=0.5)
             except queue.Empty:
                 continue
 
@@ -2171,7 +2201,7 @@ class VirtualPrinter:
                 continue
 
             self._performMove(line)
-            self.buffered.task_done()
+            buffered.task_done()
 
         self._logger.info("Closing down buffer loop")
 
@@ -2220,7 +2250,10 @@ class VirtualPrinter:
             if self.incoming is None or self.outgoing is None:
                 return 0
 
-            if b"M112" in data and self._supportM112:
+            if self._binaryStream is not None:
+                u_data = f"<{len(data)} bytes of binary data>"
+
+            elif b"M112" in data and self._supportM112:
                 self._seriallog.info(f"<<< {u_data}")
                 self._kill()
                 return len(data)
@@ -2457,6 +2490,172 @@ class VirtualEEPROM:
         return self._eeprom
 
 
+class VirtualBinaryStream:
+    """
+    Printer side of the binary file transfer protocol, modeled on Marlin's implementation.
+
+    Arguments:
+        send (callable): Sends a line to the host
+        folder (str): Folder of the virtual SD card
+        on_close (callable): Called when the host switches back to regular communication
+        resend_every_n (int): Simulate a corrupted packet every n received packets, 0 to disable
+    """
+
+    BUFFER_SIZE = 512
+    VERSION = "0.1.0"
+    FILE_TRANSFER_VERSION = "0.1"
+
+    HEATSHRINK_WINDOW = 8
+    HEATSHRINK_LOOKAHEAD = 4
+
+    def __init__(self, send, folder, on_close, resend_every_n=0):
+        self._send = send
+        self._folder = folder
+        self._on_close = on_close
+        self._resend_every_n = resend_every_n
+
+        self._reader = binary_transfer.PacketReader()
+        self._sync = 0
+        self._retrying = False
+        self._received = 0
+
+        self._file = None
+        self._handle = None
+        self._decoder = None
+
+    def feed(self, data: bytes) -> None:
+        for packet in self._reader.feed(data):
+            self._received += 1
+
+            if (
+                packet.payload is not None
+                and packet.protocol == binary_transfer.PROTOCOL_CONTROL
+                and packet.packet_type == binary_transfer.CONTROL_SYNC
+            ):
+                # the sync request doesn't need to match the current sync
+                self._send(f"ss{self._sync},{self.BUFFER_SIZE},{self.VERSION}")
+
+            elif packet.payload is None or (
+                self._resend_every_n and self._received % self._resend_every_n == 0
+            ):
+                self._send(f"echo:Packet({packet.sync}) corrupt")
+                self._requestResend()
+
+            elif packet.sync == self._sync:
+                self._sync = (self._sync + 1) % 256
+                self._retrying = False
+                self._send(f"ok{packet.sync}")
+                self._dispatch(packet)
+
+            elif packet.sync == (self._sync - 1) % 256:
+                # our ok must have gotten lost, acknowledge again and drop the duplicate
+                self._send(f"ok{packet.sync}")
+
+            elif not self._retrying:
+                self._send("echo:Datastream packet out of order")
+                self._requestResend()
+
+            # else: sent before our resend request was processed, drop it
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._closeFile(abort=True)
+
+    def _requestResend(self):
+        self._retrying = True
+        self._send(f"rs{self._sync}")
+
+    def _dispatch(self, packet):
+        if packet.protocol == binary_transfer.PROTOCOL_CONTROL:
+            if packet.packet_type == binary_transfer.CONTROL_CLOSE:
+                self.close()
+                self._on_close()
+            return
+
+        if packet.protocol != binary_transfer.PROTOCOL_FILE_TRANSFER:
+            return
+
+        if packet.packet_type == binary_transfer.FILE_TRANSFER_QUERY:
+            compression = (
+                f"heatshrink,{self.HEATSHRINK_WINDOW},{self.HEATSHRINK_LOOKAHEAD}"
+                if binary_transfer.heatshrink is not None
+                else "none"
+            )
+            self._send(
+                f"PFT:version:{self.FILE_TRANSFER_VERSION}:compression:{compression}"
+            )
+
+        elif packet.packet_type == binary_transfer.FILE_TRANSFER_OPEN:
+            self._send(f"PFT:{self._openFile(packet.payload)}")
+
+        elif packet.packet_type == binary_transfer.FILE_TRANSFER_WRITE:
+            if self._handle is not None:
+                data = packet.payload
+                if self._decoder is not None:
+                    data = self._decoder.fill(data)
+                self._handle.write(data)
+
+        elif packet.packet_type == binary_transfer.FILE_TRANSFER_CLOSE:
+            self._send(f"PFT:{self._closeFile()}")
+
+        elif packet.packet_type == binary_transfer.FILE_TRANSFER_ABORT:
+            self.close()
+            self._send("PFT:success")
+
+    def _openFile(self, payload):
+        if self._handle is not None:
+            return "busy"
+
+        compressed = len(payload) > 1 and payload[1]
+        if compressed and binary_transfer.heatshrink is None:
+            return "fail"
+
+        filename = to_unicode(payload[2:].split(b"\0", 1)[0], errors="replace")
+        if filename.startswith("/"):
+            filename = filename[1:]
+
+        file = os.path.join(self._folder, filename)
+        try:
+            self._handle = open(file, "wb")
+        except Exception:
+            return "fail"
+        self._file = file
+
+        if compressed:
+            heatshrink = binary_transfer.heatshrink
+            self._decoder = heatshrink.Encoder(
+                heatshrink.Reader(
+                    window_sz2=self.HEATSHRINK_WINDOW,
+                    lookahead_sz2=self.HEATSHRINK_LOOKAHEAD,
+                )
+            )
+        return "success"
+
+    def _closeFile(self, abort=False):
+        if self._handle is None:
+            return "ioerror"
+
+        try:
+            if self._decoder is not None and not abort:
+                self._handle.write(self._decoder.finish())
+            self._handle.close()
+
+            if abort:
+                os.remove(self._file)
+            else:
+                # same ancient date as for files written through M28
+                st = os.stat(self._file)
+                os.utime(self._file, (st.st_atime, 946684800))
+        except Exception:
+            return "ioerror"
+        finally:
+            self._handle = None
+            self._decoder = None
+            self._file = None
+
+        return "success"
+
+
 # noinspection PyUnresolvedReferences
 class CharCountingQueue(queue.Queue):
     def __init__(self, maxsize, name=None):
@@ -2472,27 +2671,26 @@ class CharCountingQueue(queue.Queue):
         self.not_full.acquire()
 
         try:
-            if not self._will_it_fit(item) and partial:
-                space_left = self.maxsize - self._qsize()
-                if space_left:
-                    item = item[:space_left]
-
             if not block:
-                if not self._will_it_fit(item):
+                if not self._will_it_fit(item, partial=partial):
                     raise queue.Full
             elif timeout is None:
-                while not self._will_it_fit(item):
+                while not self._will_it_fit(item, partial=partial):
                     self.not_full.wait()
             elif timeout < 0:
                 raise ValueError("'timeout' must be a positive number")
             else:
                 endtime = time.monotonic() + timeout
-                while not self._will_it_fit(item):
+                while not self._will_it_fit(item, partial=partial):
                     remaining = endtime - time.monotonic()
                     if remaining <= 0:
                         raise queue.Full
                     self.not_full.wait(remaining)
 
+            if partial:
+                # only put as much as there is space left for
+                item = item[: self.maxsize - self._qsize()]
+
             self._put(item)
             self.unfinished_tasks += 1
             self.not_empty.notify()
@@ -2519,5 +2717,9 @@ class CharCountingQueue(queue.Queue):
         self._size -= self._len(item)
         return item
 
-    def _will_it_fit(self, item):
-        return self.maxsize - self._qsize() >= self._len(item)
+    def _will_it_fit(self, item, partial=False):
+        space_left = self.maxsize - self._qsize()
+        if partial:
+            # anything fits partially as long as there's space left
+            return space_left > 0
+        return space_left >= self._len(item)
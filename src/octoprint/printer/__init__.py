@@ -52,6 +52,21 @@ from octoprint.util import deprecated, natural_key
 if TYPE_CHECKING:
     from .connection import ConnectedPrinter
 
+DEFAULT_PRINTER = "default"
+"""Identifier of the server's main printer."""
+
+
+def tag_event_payload(identifier: str, payload: dict = None) -> Optional[dict]:
+    """
+    Returns the event ``payload`` tagged with the identifier of the ``printer`` it concerns.
+
+    Payloads of events concerning the :data:`DEFAULT_PRINTER` are returned untouched, so
+    single printer setups see the same events as before.
+    """
+    if identifier == DEFAULT_PRINTER:
+        return payload
+    return dict(payload or {}, printer=identifier)
+
 
 class CommunicationHealth(BaseModel):
     errors: int
@@ -769,6 +784,15 @@ class PrinterFilesMixin:
 
 
 class PrinterMixin(CommonPrinterMixin):
+    @property
+    def identifier(self) -> str:
+        """
+        Identifier of the printer, unique within the server. The server's main printer is
+        identified by :data:`DEFAULT_PRINTER`, additional printers are managed through
+        :class:`~octoprint.printer.registry.PrinterRegistry`.
+        """
+        return DEFAULT_PRINTER
+
     def connect(
         self,
         connector: str = None,
@@ -0,0 +1,218 @@
+"""
+This module provides the base for implementing printer connectors on top of asyncio.
+
+Connectors based on :class:`AsyncConnectedPrinter` don't get threads of their own for
+reading from, writing to and polling the printer. Instead, all of them share a single
+:class:`EventLoopThread` and implement the connection as a coroutine, :meth:`AsyncConnectedPrinter.run`.
+That makes them a good fit for network attached printers, which might be plenty and
+which mostly wait on I/O anyhow.
+
+The synchronous :class:`~octoprint.printer.connection.ConnectedPrinter` API is called
+from arbitrary threads, implementations hand work over to the event loop through
+:meth:`AsyncConnectedPrinter.call_soon` and :meth:`AsyncConnectedPrinter.submit`.
+Listener callbacks on the other hand are called from the event loop, so they must not
+block.
+
+.. autoclass:: AsyncConnectedPrinter
+   :members:
+
+.. autoclass:: EventLoopThread
+   :members:
+
+.. autofunction:: get_event_loop_thread
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Coroutine
+
+from octoprint.printer import ErrorInformation
+from octoprint.printer.connection import (
+    CLOSED_STATES,
+    ConnectedPrinter,
+    ConnectedPrinterState,
+)
+
+
+class EventLoopThread:
+    """
+    A daemon thread running an asyncio event loop, started on first use.
+
+    Arguments:
+        name (str): name of the thread
+    """
+
+    def __init__(self, name: str = "AsyncConnectedPrinter"):
+        self._name = name
+        self._loop = None
+        self._thread = None
+        self._mutex = threading.Lock()
+
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop, starts the thread if it isn't running yet."""
+        with self._mutex:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._loop,), name=self._name, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_current(self) -> bool:
+        """Whether the caller is running on this event loop's thread."""
+        return self._thread is threading.current_thread()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedules ``coro`` on the event loop, returns a future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback, *args) -> None:
+        """Schedules ``callback`` to be called with ``args`` on the event loop."""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float = None) -> None:
+        """Stops the event loop and waits for the thread to finish."""
+        with self._mutex:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None:
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _run(self, loop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    loop.run_until_complete(
+                        asyncio.gather(*tasks, return_exceptions=True)
+                    )
+            except Exception:
+                self._logger.exception("Error while shutting down the event loop")
+            loop.close()
+
+
+_event_loop_thread = EventLoopThread()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Returns the event loop thread shared by all :class:`AsyncConnectedPrinter` connections."""
+    return _event_loop_thread
+
+
+class AsyncConnectedPrinter(ConnectedPrinter):
+    """
+    Base for connectors that talk to the printer from a coroutine.
+
+    :meth:`connect` starts :meth:`run` as a task on the shared event loop, :meth:`disconnect`
+    cancels it. Once the task is done, :meth:`cleanup` is awaited and the connection ends
+    up in state ``CLOSED``, or ``CLOSED_WITH_ERROR`` if :meth:`run` raised an exception.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._loop_thread = get_event_loop_thread()
+        self._task = None
+        self._error = None
+
+    async def run(self) -> None:
+        """Talks to the printer until the connection is closed, to be implemented by subclasses."""
+        raise NotImplementedError()
+
+    async def cleanup(self) -> None:
+        """Releases whatever :meth:`run` left open, called after it ended for whatever reason."""
+        pass
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop_thread.loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedules ``coro`` on the connection's event loop, see :meth:`EventLoopThread.submit`."""
+        return self._loop_thread.submit(coro)
+
+    def call_soon(self, callback, *args) -> None:
+        """
+        Calls ``callback`` with ``args`` on the connection's event loop, right away if
+        the caller already is on it.
+        """
+        if self._loop_thread.is_current():
+            callback(*args)
+        else:
+            self._loop_thread.call_soon(callback, *args)
+
+    def connect(self, *args, **kwargs):
+        if self._task is not None and not self._task.done():
+            return
+
+        self._error = None
+        self.set_state(ConnectedPrinterState.CONNECTING)
+        self._task = self.submit(self._main())
+
+    def disconnect(self, *args, **kwargs):
+        if self._task is None or self._task.done():
+            return
+        self._task.cancel()
+
+    def get_error(self):
+        return self._error or ""
+
+    def set_error(self, error: str, reason: str, consequence: str = None) -> None:
+        """Records an error, the connection will be closed with it once :meth:`run` ends."""
+        self._error = error
+        self.error_info = ErrorInformation(
+            error=error, reason=reason, consequence=consequence
+        )  # this will call the listener
+
+    async def _main(self):
+        try:
+            await self.run()
+        except asyncio.CancelledError:
+            self._logger.info(f"Connection to printer closed ({self.connector})")
+        except Exception as exc:
+            self._logger.exception(f"Error on connection to printer ({self.connector})")
+            if self._error is None:
+                self.set_error(str(exc), "connection")
+        finally:
+            try:
+                await self.cleanup()
+            except Exception:
+                self._logger.exception("Error while cleaning up the connection")
+
+            self._on_closed()
+
+    def _on_closed(self):
+        if self.state in CLOSED_STATES:
+            return
+
+        if self._error is not None:
+            self.set_state(ConnectedPrinterState.CLOSED_WITH_ERROR, error=self._error)
+        else:
+            self.set_state(ConnectedPrinterState.CLOSED)
+
+        self.firmware_info = None
+        self.error_info = None
+        super().set_job(None)
@@ -29,10 +29,12 @@ from typing import Any, Optional, Union, cast
 
 from octoprint.events import Events, eventManager
 from octoprint.printer import (
+    DEFAULT_PRINTER,
     ConnectedPrinterMixin,
     ErrorInformation,
     FirmwareInformation,
     PrinterMixin,
+    tag_event_payload,
 )
 from octoprint.printer.job import PrintJob, UploadJob
 
@@ -268,6 +270,17 @@ class ConnectedPrinter(ConnectedPrinterMixin, metaclass=ConnectedPrinterRegistra
 
         self._logger = logging.getLogger(__name__)
 
+    @property
+    def printer_identifier(self) -> str:
+        """Identifier of the printer this connection belongs to."""
+        if isinstance(self._owner, PrinterMixin):
+            return self._owner.identifier
+        return DEFAULT_PRINTER
+
+    def event_payload(self, payload: dict = None) -> Optional[dict]:
+        """Tags the ``payload`` of an event fired for this connection with its printer."""
+        return tag_event_payload(self.printer_identifier, payload)
+
     @property
     def current_job(self) -> PrintJob:
         return self._job
@@ -290,7 +303,7 @@ class ConnectedPrinter(ConnectedPrinterMixin, metaclass=ConnectedPrinterRegistra
         if self._firmware_info:
             eventManager().fire(
                 Events.FIRMWARE_DATA,
-                self._firmware_info.model_dump(exclude_none=True),
+                self.event_payload(self._firmware_info.model_dump(exclude_none=True)),
             )
             self._listener.on_printer_firmware_info(self._firmware_info)
 
@@ -307,7 +320,7 @@ class ConnectedPrinter(ConnectedPrinterMixin, metaclass=ConnectedPrinterRegistra
                 payload["connector"] = self.connector
             else:
                 payload["connector"] = "unknown"
-            eventManager().fire(Events.ERROR, payload=payload)
+            eventManager().fire(Events.ERROR, payload=self.event_payload(payload))
             self._listener.on_printer_error(self._error_info)
 
     @property
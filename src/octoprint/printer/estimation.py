@@ -3,6 +3,8 @@ __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agp
 __copyright__ = "Copyright (C) 2014 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
 
+import collections
+
 from octoprint.settings import settings
 
 
@@ -13,6 +15,12 @@ class PrintTimeEstimator:
     Subclass this and register via the octoprint.printer.estimation.factory hook to provide your own implementation.
     """
 
+    PLAN_WINDOW = 300.0
+    """Print time over which to compare actual to planned progress, in seconds."""
+
+    PLAN_MINIMUM = 30.0
+    """Planned print time from which on to correct the plan by the actual progress, in seconds."""
+
     def __init__(self, job_type, job_status_interval: float = 1.0):
         self.stats_weighing_until = settings().getFloat(
             ["estimation", "printTime", "statsWeighingUntil"]
@@ -54,6 +62,20 @@ class PrintTimeEstimator:
             rolling_window=rolling_window, countdown=countdown, threshold=threshold
         )
 
+        self._planned = None
+        self._plan_samples = collections.deque()
+
+    def update_plan(self, planned):
+        """
+        Provides the job's progress in terms of planned motion, if the connector tracks it.
+
+        Called before every :meth:`estimate`.
+
+        Args:
+            planned (octoprint.printer.job.PlannedMotion or None): planned motion at the current position
+        """
+        self._planned = planned
+
     def estimate(
         self,
         progress,
@@ -96,6 +118,10 @@ class PrintTimeEstimator:
              a configured amount of minutes or are further in the file than a configured percentage, we
              also use the dumb estimate for now.
 
+        All of this is skipped if the connector follows the print with a lookahead and the printed file's
+        time index is known, see :meth:`update_plan`. Then the remaining planned motion is used instead,
+        see :meth:`estimate_from_plan`.
+
         Yes, all this still produces horribly inaccurate results. But we have to do this live during the print and
         hence can't produce to much computational overhead, we do not have any insight into the firmware implementation
         with regards to planner setup and acceleration settings, we might not even have access to the printed file's
@@ -120,6 +146,11 @@ class PrintTimeEstimator:
         if not progress or not printTime or not cleanedPrintTime:
             return None, None
 
+        if self._planned is not None:
+            printTimeLeft = self.estimate_from_plan(self._planned, cleanedPrintTime)
+            if printTimeLeft is not None:
+                return printTimeLeft, "lookahead"
+
         dumbTotalPrintTime = printTime / progress
         estimatedTotalPrintTime = self.estimate_total(progress, cleanedPrintTime)
         totalPrintTime = estimatedTotalPrintTime
@@ -183,6 +214,37 @@ class PrintTimeEstimator:
 
         return printTimeLeft, printTimeLeftOrigin
 
+    def estimate_from_plan(self, planned, cleanedPrintTime):
+        """
+        Estimates the print time left from the planned motion left, corrected by how actual
+        and planned print time compared over the last :attr:`PLAN_WINDOW` seconds. The
+        planning doesn't know about acceleration and firmware settings, so this factor is
+        usually above 1.
+
+        Args:
+            planned (octoprint.printer.job.PlannedMotion): planned motion at the current position
+            cleanedPrintTime (float): Print time elapsed minus the time needed for getting up to temperature
+
+        Returns:
+            (float or None) estimated print time left, None if the plan doesn't tell
+        """
+        if planned.left is None or planned.elapsed is None:
+            return None
+
+        samples = self._plan_samples
+        samples.append((cleanedPrintTime, planned.elapsed))
+        while len(samples) > 1 and cleanedPrintTime - samples[0][0] > self.PLAN_WINDOW:
+            samples.popleft()
+
+        actual = cleanedPrintTime - samples[0][0]
+        plan = planned.elapsed - samples[0][1]
+
+        factor = 1.0
+        if plan >= self.PLAN_MINIMUM and actual > 0:
+            factor = actual / plan
+
+        return planned.left * factor
+
     def estimate_total(self, progress, printTime):
         if not progress or not printTime or not self._data:
             return None
@@ -1,6 +1,8 @@
 import datetime
 from typing import Optional
 
+from pydantic import Field
+
 from octoprint.schema import BaseModel
 
 
@@ -26,6 +28,8 @@ class PrintJob(BaseModel):
     duration_estimate: Optional[DurationEstimate] = None
     filament_estimate: dict[str, FilamentEstimate] = {}
     path_on_disk: Optional[str] = None
+    time_index: Optional[dict] = Field(default=None, exclude=True, repr=False)
+    """Time index from the file's analysis, see :class:`~octoprint.util.gcodeInterpreter.TimeIndex`."""
 
     params: Optional[dict] = None
 
@@ -44,6 +48,25 @@ class UploadJob(PrintJob):
     pass
 
 
+class PlannedMotion(BaseModel):
+    """Progress in terms of the planned motion of the job's file, see :class:`~octoprint.util.gcodeInterpreter.GcodeLookahead`."""
+
+    elapsed: Optional[float] = None
+    """Planned print time up to the current position, in seconds."""
+
+    left: Optional[float] = None
+    """Planned print time from the current position to the end, in seconds."""
+
+    layer: Optional[int] = None
+    layer_count: Optional[int] = None
+
+    next_layer: Optional[float] = None
+    """Planned time until the next layer starts, in seconds."""
+
+    next_pause: Optional[float] = None
+    """Planned time until the next pausing command, in seconds."""
+
+
 class JobProgress(BaseModel):
     job: PrintJob
     progress: float
@@ -51,3 +74,4 @@ class JobProgress(BaseModel):
     elapsed: float
     cleaned_elapsed: float
     left_estimate: Optional[float] = None
+    planned: Optional[PlannedMotion] = None
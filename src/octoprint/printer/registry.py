@@ -0,0 +1,116 @@
+"""
+This module holds the registry of all printers managed by the server.
+
+The server's main printer is always registered under :data:`~octoprint.printer.DEFAULT_PRINTER`,
+additional printers can be added from the ``printerConnection.additional`` configuration.
+All printers share the server's file manager, analysis queue and printer profiles, so
+running several printers only costs a :class:`~octoprint.printer.standard.Printer` and a
+connection per printer instead of a whole server each.
+
+.. autoclass:: PrinterRegistry
+   :members:
+
+.. autoclass:: UnknownPrinter
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import re
+import threading
+from collections.abc import Callable, Iterator
+
+from octoprint.printer import DEFAULT_PRINTER, PrinterMixin
+
+_valid_identifier = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+
+class UnknownPrinter(Exception):
+    def __init__(self, identifier):
+        super().__init__(f"Unknown printer: {identifier}")
+        self.identifier = identifier
+
+
+class PrinterRegistry:
+    """
+    Printers managed by the server, by identifier.
+
+    Arguments:
+        default (PrinterMixin): the server's main printer
+        factory (callable): creates an additional printer for the identifier passed to it
+    """
+
+    def __init__(
+        self, default: PrinterMixin, factory: Callable[[str], PrinterMixin] = None
+    ):
+        self._printers = {DEFAULT_PRINTER: default}
+        self._names = {DEFAULT_PRINTER: None}
+        self._factory = factory
+        self._mutex = threading.RLock()
+
+    @property
+    def default(self) -> PrinterMixin:
+        return self._printers[DEFAULT_PRINTER]
+
+    def add(self, identifier: str, name: str = None) -> PrinterMixin:
+        """
+        Creates and registers an additional printer.
+
+        Identifiers must consist of lower case letters, digits, ``-`` and ``_``.
+
+        Raises:
+            ValueError: the identifier is invalid or already taken, or there's no factory
+        """
+        if not _valid_identifier.match(identifier):
+            raise ValueError(f"Invalid printer identifier: {identifier!r}")
+        if self._factory is None:
+            raise ValueError("No factory for additional printers available")
+
+        with self._mutex:
+            if identifier in self._printers:
+                raise ValueError(f"Printer {identifier} already exists")
+            printer = self._factory(identifier)
+            self._printers[identifier] = printer
+            self._names[identifier] = name
+            return printer
+
+    def get(self, identifier: str = None) -> PrinterMixin:
+        """
+        Returns the printer registered for ``identifier``, the default printer if it's
+        ``None``.
+
+        Raises:
+            UnknownPrinter: there's no printer registered for ``identifier``
+        """
+        if identifier is None:
+            identifier = DEFAULT_PRINTER
+
+        try:
+            return self._printers[identifier]
+        except KeyError:
+            raise UnknownPrinter(identifier) from None
+
+    def get_name(self, identifier: str) -> str:
+        """Returns the configured name of the printer, or its identifier if it has none."""
+        if identifier not in self._names:
+            raise UnknownPrinter(identifier)
+        return self._names[identifier] or identifier
+
+    @property
+    def identifiers(self) -> list[str]:
+        with self._mutex:
+            return list(self._printers)
+
+    def items(self) -> list[tuple[str, PrinterMixin]]:
+        with self._mutex:
+            return list(self._printers.items())
+
+    def __contains__(self, identifier) -> bool:
+        return identifier in self._printers
+
+    def __iter__(self) -> Iterator[PrinterMixin]:
+        with self._mutex:
+            return iter(list(self._printers.values()))
+
+    def __len__(self) -> int:
+        return len(self._printers)
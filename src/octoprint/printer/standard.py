@@ -27,9 +27,11 @@ from octoprint.filemanager.analysis import AnalysisQueue
 from octoprint.filemanager.storage.printer import PrinterFileStorage
 from octoprint.plugin import ProgressPlugin, plugin_manager
 from octoprint.printer import (
+    DEFAULT_PRINTER,
     PrinterCallback,
     PrinterFilesMixin,
     PrinterMixin,
+    tag_event_payload,
 )
 from octoprint.printer.connection import (
     PRINTING_STATES,
@@ -80,6 +82,10 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
     """
     Default implementation of the :class:`PrinterInterface`. Encapsulates the :class:`~octoprint.printer.connection.ConnectedPrinter`,
     registers itself as a callback for it and forwards calls as necessary.
+
+    Additional printers besides the server's main one share the file manager and analysis queue
+    with it, but don't touch the profile manager's current selection and don't mount their
+    printer storage into the file manager. Events they fire are tagged with their ``identifier``.
     """
 
     def __init__(
@@ -87,9 +93,13 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         file_manager: FileManager,
         analysis_queue: AnalysisQueue,
         printer_profile_manager,
+        identifier: str = DEFAULT_PRINTER,
     ):
         from collections import deque
 
+        self._identifier = identifier
+        self._is_default = identifier == DEFAULT_PRINTER
+
         self._logger = logging.getLogger(__name__)
         self._logger_job = logging.getLogger(f"{__name__}.job")
 
@@ -102,6 +112,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         self._analysis_queue = analysis_queue
         self._file_manager = file_manager
         self._printer_profile_manager = printer_profile_manager
+        self._printer_profile = None
 
         self._temps = DataHistory(
             cutoff=settings().getInt(["temperature", "cutoff"]) * 60
@@ -219,6 +230,25 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             "octoprint.printer.handle_connect"
         )
 
+    @property
+    def identifier(self) -> str:
+        return self._identifier
+
+    def _fire_event(self, event, payload=None):
+        eventManager().fire(event, payload=tag_event_payload(self._identifier, payload))
+
+    def _is_own_event(self, payload):
+        if not isinstance(payload, dict):
+            return self._is_default
+        return payload.get("printer", DEFAULT_PRINTER) == self._identifier
+
+    def _current_profile(self):
+        if self._is_default:
+            return self._printer_profile_manager.get_current_or_default()
+        elif self._printer_profile is None:
+            return self._printer_profile_manager.get_default()
+        return self._printer_profile
+
     def _create_estimator(self, job_type=None):
         if job_type is None:
             with self._selected_job_mutex:
@@ -396,11 +426,15 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
     # ~~ connection events
 
     def _on_event_Connected(self, event, data):
+        if not self._is_own_event(data):
+            return
         self._markings.append(
             {"type": "connected", "label": "Connected", "time": time.time()}
         )
 
     def _on_event_Disconnected(self, event, data):
+        if not self._is_own_event(data):
+            return
         self._markings.append(
             {"type": "disconnected", "label": "Disconnected", "time": time.time()}
         )
@@ -408,6 +442,8 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
     # ~~ chart marking insertions
 
     def _on_event_ChartMarked(self, event, data):
+        if not self._is_own_event(data):
+            return
         self._markings.append(
             {
                 "type": data.get("type", "unknown"),
@@ -479,9 +515,20 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                     extra={"plugin": name},
                 )
 
-        eventManager().fire(Events.CONNECTING, {"connector": connector})
-        self._printer_profile_manager.select(profile)
-        printer_profile = self._printer_profile_manager.get_current_or_default()
+        self._fire_event(Events.CONNECTING, {"connector": connector})
+        if self._is_default:
+            self._printer_profile_manager.select(profile)
+            printer_profile = self._printer_profile_manager.get_current_or_default()
+        else:
+            if isinstance(profile, dict):
+                printer_profile = profile
+            elif profile is not None:
+                printer_profile = self._printer_profile_manager.get(profile)
+            else:
+                printer_profile = None
+            if printer_profile is None:
+                printer_profile = self._printer_profile_manager.get_default()
+            self._printer_profile = printer_profile
 
         connector_class = ConnectedPrinter.find(connector)
         try:
@@ -502,18 +549,19 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         """
         Closes the connection to the printer.
         """
-        self._file_manager.remove_storage(FileDestinations.PRINTER)
+        if self._is_default:
+            self._file_manager.remove_storage(FileDestinations.PRINTER)
 
         payload = {"connector": "unknown"}
         if self._connection and self._connection.connector:
             payload["connector"] = self._connection.connector
 
-        eventManager().fire(Events.DISCONNECTING, payload=payload)
+        self._fire_event(Events.DISCONNECTING, payload=payload)
         if self._connection is not None:
             self._connection.disconnect()
             self._connection = None
         else:
-            eventManager().fire(Events.DISCONNECTED)
+            self._fire_event(Events.DISCONNECTED)
 
     @property
     def current_connection(self) -> Optional[ConnectedPrinter]:
@@ -1049,8 +1097,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         return self._connection is not None and self._connection.is_ready()
 
     def log_lines(self, *lines, **kwargs):
-        for line in lines:
-            self._add_log(line)
+        self._add_logs(lines)
 
     # ~~ printer storage
 
@@ -1124,7 +1171,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         self._streamingFailedCallback = on_failure
 
         def sd_upload_started(local_filename, remote_filename):
-            eventManager().fire(
+            self._fire_event(
                 Events.TRANSFER_STARTED,
                 {"local": local_filename, "remote": remote_filename},
             )
@@ -1135,7 +1182,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                 "remote": remote_filename,
                 "time": elapsed,
             }
-            eventManager().fire(Events.TRANSFER_DONE, payload)
+            self._fire_event(Events.TRANSFER_DONE, payload)
             if callable(self._streamingFinishedCallback):
                 self._streamingFinishedCallback(
                     remote_filename, remote_filename, FileDestinations.PRINTER
@@ -1147,7 +1194,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                 "remote": remote_filename,
                 "time": elapsed,
             }
-            eventManager().fire(Events.TRANSFER_FAILED, payload)
+            self._fire_event(Events.TRANSFER_FAILED, payload)
             if callable(self._streamingFailedCallback):
                 self._streamingFailedCallback(
                     remote_filename, remote_filename, FileDestinations.PRINTER
@@ -1257,11 +1304,9 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                                     time.time(),
                                     payload["time"],
                                     False,
-                                    self._printer_profile_manager.get_current_or_default()[
-                                        "id"
-                                    ],
+                                    self._current_profile()["id"],
                                 )
-                                eventManager().fire(Events.PRINT_FAILED, payload)
+                                self._fire_event(Events.PRINT_FAILED, payload)
 
                             thread = threading.Thread(target=finalize)
                             thread.daemon = True
@@ -1276,7 +1321,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                     self._logger.exception("Error while pausing the analysis queue")
 
         if state == ConnectedPrinterState.PRINTING and state != old_state:
-            eventManager().fire(
+            self._fire_event(
                 Events.CHART_MARKED,
                 {"type": "printing", "label": "Printing"},
             )
@@ -1295,12 +1340,14 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             self._update_progress_data()
             self._set_offsets(None)
             self._add_temperature_data()
-            self._printer_profile_manager.deselect()
+            if self._is_default:
+                self._printer_profile_manager.deselect()
+            self._printer_profile = None
 
             payload = {"connector": "unknown"}
             if connector:
                 payload["connector"] = connector
-            eventManager().fire(Events.DISCONNECTED, payload=payload)
+            self._fire_event(Events.DISCONNECTED, payload=payload)
 
         self._set_state(state, state_string=state_str, error_string=error_str)
 
@@ -1310,7 +1357,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                 job=job,
                 action_user=user,
             )
-            eventManager().fire(Events.FILE_SELECTED, payload)
+            self._fire_event(Events.FILE_SELECTED, payload)
             self._logger_job.info(
                 "Print job selected - origin: {}, path: {}, owner: {}, user: {}".format(
                     payload.get("origin"),
@@ -1322,7 +1369,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         else:
             with self._selected_job_mutex:
                 if self._selected_job is not None:
-                    eventManager().fire(Events.FILE_DESELECTED)
+                    self._fire_event(Events.FILE_DESELECTED)
                     self._logger_job.info(
                         "Print job deselected - user: {}".format(user if user else "n/a")
                     )
@@ -1353,8 +1400,8 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         self._stateMonitor.trigger_progress_update()
         payload = self._payload_for_print_job_event(action_user=user)
         if payload:
-            eventManager().fire(Events.PRINT_STARTED, payload)
-            eventManager().fire(
+            self._fire_event(Events.PRINT_STARTED, payload)
+            self._fire_event(
                 Events.CHART_MARKED,
                 {"type": "print", "label": "Start"},
             )
@@ -1392,7 +1439,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             action_user=user,
         )
         if payload:
-            eventManager().fire(Events.PRINT_PAUSED, payload)
+            self._fire_event(Events.PRINT_PAUSED, payload)
             self._logger_job.info(
                 "Print job paused - origin: {}, path: {}, owner: {}, user: {}, fileposition: {}, position: {}".format(
                     payload.get("origin"),
@@ -1403,7 +1450,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                     payload.get("position"),
                 )
             )
-            eventManager().fire(
+            self._fire_event(
                 Events.CHART_MARKED,
                 {"type": "pause", "label": "Pause"},
             )
@@ -1418,8 +1465,8 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
     def on_printer_job_resumed(self, suppress_script=False, user=None):
         payload = self._payload_for_print_job_event(action_user=user)
         if payload:
-            eventManager().fire(Events.PRINT_RESUMED, payload)
-            eventManager().fire(
+            self._fire_event(Events.PRINT_RESUMED, payload)
+            self._fire_event(
                 Events.CHART_MARKED,
                 {"type": "resume", "label": "Resume"},
             )
@@ -1450,7 +1497,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         if payload:
             job_progress = self._connection.job_progress if self._connection else None
             payload["time"] = job_progress.elapsed if job_progress else 0
-            eventManager().fire(
+            self._fire_event(
                 Events.CHART_MARKED,
                 {"type": "done", "label": "Done"},
             )
@@ -1468,7 +1515,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                 )
             )
 
-            eventManager().fire(Events.PRINT_DONE, payload)
+            self._fire_event(Events.PRINT_DONE, payload)
             self._logger_job.info(
                 "Print job done - origin: {}, path: {}, owner: {}".format(
                     payload.get("origin"),
@@ -1492,7 +1539,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                     time.time(),
                     payload["time"],
                     True,
-                    self._printer_profile_manager.get_current_or_default()["id"],
+                    self._current_profile()["id"],
                 )
 
             thread = threading.Thread(target=log_print)
@@ -1530,8 +1577,8 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         if payload:
             payload["time"] = job_progress.elapsed if job_progress else 0
 
-            eventManager().fire(Events.PRINT_CANCELLED, payload)
-            eventManager().fire(
+            self._fire_event(Events.PRINT_CANCELLED, payload)
+            self._fire_event(
                 Events.CHART_MARKED,
                 {"type": "cancel", "label": "Cancel"},
             )
@@ -1563,9 +1610,9 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                     time.time(),
                     payload["time"],
                     False,
-                    self._printer_profile_manager.get_current_or_default()["id"],
+                    self._current_profile()["id"],
                 )
-                eventManager().fire(Events.PRINT_FAILED, payload)
+                self._fire_event(Events.PRINT_FAILED, payload)
 
             thread = threading.Thread(target=finalize)
             thread.daemon = True
@@ -1584,7 +1631,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             # only send full position reports onwards
             payload = {"reason": reason}
             payload.update(position)
-            eventManager().fire(Events.POSITION_UPDATE, payload)
+            self._fire_event(Events.POSITION_UPDATE, payload)
 
     def on_printer_temperature_update(self, temperatures):
         self._add_temperature_data(temperatures)
@@ -1593,7 +1640,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         payload = {"connector": "unknown"}
         if self._connection and self._connection.connector:
             payload["connector"] = self._connection.connector
-        eventManager().fire(Events.PRINTER_CONTROLS_CHANGED, payload=payload)
+        self._fire_event(Events.PRINTER_CONTROLS_CHANGED, payload=payload)
 
     def on_printer_logs(self, *lines):
         self.log_lines(*lines)
@@ -1610,11 +1657,13 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             self._logger.exception("Error while trying to persist print recovery data")
 
     def on_printer_files_available(self, available):
-        if available:
-            storage = PrinterFileStorage(self._connection)
-            self._file_manager.add_storage(FileDestinations.PRINTER, storage)
-        else:
-            self._file_manager.remove_storage(FileDestinations.PRINTER)
+        # the file manager only knows a single printer storage, the default printer's
+        if self._is_default:
+            if available:
+                storage = PrinterFileStorage(self._connection)
+                self._file_manager.add_storage(FileDestinations.PRINTER, storage)
+            else:
+                self._file_manager.remove_storage(FileDestinations.PRINTER)
 
         self._stateMonitor.set_state(
             self._dict(
@@ -1624,13 +1673,13 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             )
         )
 
-        eventManager().fire(Events.UPDATED_FILES, {"type": "printables"})
+        self._fire_event(Events.UPDATED_FILES, {"type": "printables"})
 
     def on_printer_files_refreshed(self, files):
-        eventManager().fire(Events.UPDATED_FILES, {"type": "printables"})
+        self._fire_event(Events.UPDATED_FILES, {"type": "printables"})
 
     def on_printer_files_upload_start(self, job: UploadJob):
-        eventManager().fire(
+        self._fire_event(
             Events.TRANSFER_STARTED,
             {
                 "local": job.path,
@@ -1662,14 +1711,14 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         }  # TODO local is deprecated as of 2.0.0, remove in 3.0.0
 
         if failed:
-            eventManager().fire(Events.TRANSFER_FAILED, payload)
+            self._fire_event(Events.TRANSFER_FAILED, payload)
             if callable(self._streamingFailedCallback):
                 self._streamingFailedCallback(
                     job.path, job.path, FileDestinations.PRINTER
                 )
                 self._streamingFailedCallback = self._streamingFinishedCallback = None
         else:
-            eventManager().fire(Events.TRANSFER_DONE, payload)
+            self._fire_event(Events.TRANSFER_DONE, payload)
             if callable(self._streamingFinishedCallback):
                 self._streamingFinishedCallback(
                     job.path, job.path, FileDestinations.PRINTER
@@ -1707,7 +1756,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         if event_payload:
             if payload is not None:
                 event_payload.update(**payload)
-            eventManager().fire(event, event_payload)
+            self._fire_event(event, event_payload)
 
         return event_payload
 
@@ -1737,12 +1786,16 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
         }
         if self._connection and self._connection.connector:
             payload["connector"] = self._connection.connector
-        eventManager().fire(Events.PRINTER_STATE_CHANGED, payload)
+        self._fire_event(Events.PRINTER_STATE_CHANGED, payload)
 
     def _add_log(self, log):
         self._log.append(log)
         self._stateMonitor.add_log(log)
 
+    def _add_logs(self, logs):
+        self._log.extend(logs)
+        self._stateMonitor.add_logs(logs)
+
     def _add_message(self, message):
         self._messages.append(message)
         self._stateMonitor.add_message(message)
@@ -1774,6 +1827,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             printTime = None
             cleanedPrintTime = None
             printTimeLeft = None
+            planned = None
         else:
             job_progress = self._connection.job_progress
             if not job_progress:
@@ -1783,6 +1837,7 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             printTime = job_progress.elapsed
             cleanedPrintTime = job_progress.cleaned_elapsed
             printTimeLeft = job_progress.left_estimate
+            planned = job_progress.planned
 
         if printTimeLeft is None:
             # no print time estimation from printer, let's do our own
@@ -1812,6 +1867,8 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
                             )
 
                     try:
+                        if isinstance(estimator, PrintTimeEstimator):
+                            estimator.update_plan(planned)
                         printTimeLeft, printTimeLeftOrigin = estimator.estimate(
                             progress,
                             printTime,
@@ -1829,13 +1886,27 @@ class Printer(PrinterMixin, ConnectedPrinterListenerMixin):
             # we have an estimate from the printer/connector, let's trust that
             printTimeLeftOrigin = "printer"
 
-        return self._dict(
-            completion=progress * 100 if progress is not None else None,
-            filepos=filepos,
-            printTime=int(printTime) if printTime is not None else None,
-            printTimeLeft=int(printTimeLeft) if printTimeLeft is not None else None,
-            printTimeLeftOrigin=printTimeLeftOrigin,
-        )
+        data = {
+            "completion": progress * 100 if progress is not None else None,
+            "filepos": filepos,
+            "printTime": int(printTime) if printTime is not None else None,
+            "printTimeLeft": int(printTimeLeft) if printTimeLeft is not None else None,
+            "printTimeLeftOrigin": printTimeLeftOrigin,
+        }
+
+        if planned is not None:
+            data.update(
+                currentLayer=planned.layer,
+                layerCount=planned.layer_count,
+                nextLayerIn=int(planned.next_layer)
+                if planned.next_layer is not None
+                else None,
+                nextPauseIn=int(planned.next_pause)
+                if planned.next_pause is not None
+                else None,
+            )
+
+        return self._dict(**data)
 
     def _update_health_data_callback(self):
         NO_RESULT = self._dict(count=0, transmitted=0, ratio=0, critical=False)
@@ -2116,7 +2187,14 @@ class StateMonitor:
         self._change_event.set()
 
     def add_log(self, log):
-        self._on_add_log(log)
+        self.add_logs((log,))
+
+    def add_logs(self, logs):
+        if not logs:
+            return
+
+        for log in logs:
+            self._on_add_log(log)
         with self._health_lock:
             self._health_dirty = True
         self._change_event.set()
@@ -57,8 +57,17 @@ class ApiProgressInfo(BaseModel):
     * ``average``: based on the average total from past prints of the same model against the same printer profile
     * ``mixed-analysis``: mixture of ``estimate`` and ``analysis``
     * ``mixed-average``: mixture of ``estimate`` and ``average``
+    * ``lookahead``: based on the planned motion left in the file, corrected by the progress so far
     * ``printer``: estimate by printer
     """
+    currentLayer: Optional[int] = None
+    """Current layer, counted from 1, if known"""
+    layerCount: Optional[int] = None
+    """Number of layers, if known"""
+    nextLayerIn: Optional[int] = None
+    """Planned time until the next layer starts in seconds, if known"""
+    nextPauseIn: Optional[int] = None
+    """Planned time until the next pausing command in seconds, if one is coming up shortly"""
 
 
 class ApiJobResponse(BaseModel):
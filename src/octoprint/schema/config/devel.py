@@ -48,6 +48,26 @@ class DevelCacheConfig(BaseModel):
     """Whether to enable the preemptive cache."""
 
 
+class DevelProfilerConfig(BaseModel):
+    enabled: bool = False
+    """
+    Whether to continuously sample the stacks of all threads. The aggregated samples
+    are included in the system info bundle as folded stacks for flame graph tools.
+    """
+
+    interval: float = 0.05
+    """Seconds between two samples."""
+
+    window: int = 10
+    """Minutes of samples to keep."""
+
+    maxStacks: int = 5000
+    """Maximum number of unique stacks to keep per minute."""
+
+    maxOverhead: float = 1.0
+    """Maximum CPU usage of the profiler in percent, the sampling interval gets stretched as needed."""
+
+
 class DevelConfig(BaseModel):
     stylesheet: StylesheetEnum = StylesheetEnum.css
     """
@@ -74,6 +94,9 @@ class DevelConfig(BaseModel):
     pluginTimings: bool = False
     """Whether to enable the creation of `plugin_timings.log`."""
 
+    profiler: DevelProfilerConfig = DevelProfilerConfig()
+    """Settings for the built-in sampling profiler."""
+
     enableRateLimiter: bool = True
     """Enable or disable the rate limiter. Careful, disabling this reduces security (**SECURITY IMPACT!**)."""
 
@@ -18,3 +18,16 @@ class PluginsConfig(BaseModel):
 
     flags: dict[str, list[str]] = Field({}, alias="_flags")
     """Configured flags for plugins by plugin identifier."""
+
+    lazy_activation: bool = Field(True, alias="_lazyActivation")
+    """Whether to defer importing plugins that declare activation triggers until the first of those triggers fires. Disable to import all plugins during startup."""
+
+    budgets: dict[str, float] = Field(
+        {
+            "octoprint.comm.protocol.*": 5.0,
+            "EventHandlerPlugin.on_event": 100.0,
+            "ProgressPlugin.on_print_progress": 50.0,
+        },
+        alias="_budgets",
+    )
+    """Maximum time in ms a single call into a plugin may take on hot paths before a warning gets logged, by hook name or mixin method (e.g. ``EventHandlerPlugin.on_event``). Wildcards are supported."""
@@ -1,7 +1,7 @@
 __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
 __copyright__ = "Copyright (C) 2025 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
-from typing import Any
+from typing import Any, Optional
 
 from octoprint.schema import BaseModel
 
@@ -11,6 +11,25 @@ class PreferredConnection(BaseModel):
     parameters: dict[str, Any] = {}
 
 
+class AdditionalPrinter(BaseModel):
+    id: str
+    """Identifier of the printer, lower case letters, digits, ``-`` and ``_``."""
+
+    name: Optional[str] = None
+    """Display name of the printer."""
+
+    profile: Optional[str] = None
+    """Printer profile to connect with, the default profile if unset."""
+
+    autoconnect: bool = False
+    """Whether to connect to the printer on startup."""
+
+    connection: PreferredConnection = PreferredConnection(
+        connector="serial", parameters={"port": None, "baudrate": None}
+    )
+    """Connection to use for the printer."""
+
+
 class PrinterConnectionConfig(BaseModel):
     autorefresh: bool = True
     autorefreshInterval: int = 1
@@ -20,3 +39,6 @@ class PrinterConnectionConfig(BaseModel):
     preferred: PreferredConnection = PreferredConnection(
         connector="serial", parameters={"port": None, "baudrate": None}
     )
+
+    additional: list[AdditionalPrinter] = []
+    """Additional printers to manage from this server next to the default one. They share file storage and analysis with it."""
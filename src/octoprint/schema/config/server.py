@@ -174,6 +174,63 @@ class IpCheckConfig(BaseModel):
     """Additional non-local subnets to consider trusted, in CIDR notation, e.g. ``192.168.1.0/24``."""
 
 
+class RequestLaneConfig(BaseModel):
+    name: str
+    """Name of the lane, used for its worker threads and in metrics."""
+
+    workers: Optional[int] = None
+    """Number of worker threads handling the requests in this lane. If unset, the default of Python's ``ThreadPoolExecutor`` will be used."""
+
+    queue: Optional[int] = None
+    """Maximum number of requests waiting for a free worker, further requests will be answered with a ``503 Service Unavailable``. If unset, the queue is unlimited."""
+
+    routes: list[str] = []
+    """Endpoints (e.g. ``api.controlJob`` or ``plugin.backup.*``) or paths (starting with ``/``, e.g. ``/api/plugin/pluginmanager``) of requests to handle in this lane. Wildcards are supported."""
+
+
+class RequestLanesConfig(BaseModel):
+    lanes: list[RequestLaneConfig] = [
+        {
+            "name": "control",
+            "workers": 2,
+            "queue": 16,
+            "routes": [
+                "api.controlJob",
+                "api.printerCommand",
+                "api.printerToolCommand",
+                "api.printerBedCommand",
+                "api.printerChamberCommand",
+                "api.printerPrintheadCommand",
+                "api.connectionCommand",
+            ],
+        },
+        {
+            "name": "bulk",
+            "workers": 2,
+            "queue": 16,
+            "routes": [
+                "api.readGcodeFiles",
+                "api.readGcodeFilesForOrigin",
+                "api.uploadGcodeFile",
+                "api.gcodeFileCommand",
+                "api.deleteGcodeFile",
+                "plugin.backup.*",
+                "plugin.pluginmanager.upload_file",
+                "/api/plugin/pluginmanager",
+                "/api/plugin/softwareupdate",
+            ],
+        },
+        {"name": "default", "queue": 128},
+    ]
+    """
+    Lanes to route requests to, each with its own pool of worker threads and queue limit. Requests are routed to the
+    first lane matching their endpoint or path, requests not matching any lane are handled by the last lane.
+    """
+
+    retryAfter: int = 5
+    """Seconds after which clients should retry requests rejected due to a full lane."""
+
+
 class SameSiteEnum(str, Enum):
     strict = "Strict"
     lax = "Lax"
@@ -268,6 +325,12 @@ class ServerConfig(BaseModel):
     maxSize: int = CONST_100KB
     """Maximum size of requests other than file uploads in bytes, defaults to 100KB."""
 
+    requestLanes: RequestLanesConfig = RequestLanesConfig()
+    """
+    Worker pools handling requests to the web application, so that long running requests (file operations, backups,
+    plugin installs) can't delay latency critical ones (job and printer control).
+    """
+
     commands: CommandsConfig = CommandsConfig()
     """Commands to restart/shutdown octoprint or the system it's running on."""
 
@@ -13,6 +13,7 @@ import pathlib
 import re
 import signal
 import sys
+import threading
 import time
 import uuid  # noqa: F401
 from collections import OrderedDict, defaultdict
@@ -26,6 +27,7 @@ from flask import (  # noqa: F401
     current_app,
     g,
     make_response,
+    render_template,
     request,
     session,
 )
@@ -81,6 +83,7 @@ debug = False
 safe_mode = False
 
 printer = None
+printers = None
 printerProfileManager = None
 fileManager = None
 slicingManager = None
@@ -93,6 +96,7 @@ loginManager = None
 pluginManager = None
 pluginLifecycleManager = None
 preemptiveCache = None
+translationBundles = None
 jsonEncoder = None
 jsonDecoder = None
 connectivityChecker = None
@@ -124,6 +128,7 @@ import octoprint.timelapse  # noqa: E402
 # only import further octoprint stuff down here, as it might depend on things defined above to be initialized already
 from octoprint import __branch__, __display_version__, __revision__, __version__
 from octoprint.printer.profile import PrinterProfileManager
+from octoprint.printer.registry import PrinterRegistry
 from octoprint.printer.standard import Printer
 from octoprint.server.util import (
     corsRequestHandler,
@@ -132,7 +137,9 @@ from octoprint.server.util import (
     requireLoginRequestHandler,
 )
 from octoprint.server.util.flask import PreemptiveCache, validate_session_signature
+from octoprint.server.util.i18n import TranslationBundles
 from octoprint.settings import settings
+from octoprint.util import metrics
 
 VERSION = __version__
 BRANCH = __branch__
@@ -142,6 +149,15 @@ REVISION = __revision__
 LOCALES = []
 LANGUAGES = set()
 
+_request_seconds = metrics.histogram(
+    "octoprint_http_request_duration_seconds",
+    "Time needed to handle a request, per blueprint",
+    labelnames=("blueprint",),
+)
+metrics.gauge("octoprint_threads", "Number of active threads").set_function(
+    threading.active_count
+)
+
 
 @identity_loaded.connect_via(app)
 def on_identity_loaded(sender, identity):
@@ -324,6 +340,7 @@ class Server:
         global babel
 
         global printer
+        global printers
         global printerProfileManager
         global fileManager
         global slicingManager
@@ -425,7 +442,7 @@ class Server:
         components.update({"user_manager": userManager})
 
         self._setup_printer(components)
-        components.update({"printer": printer})
+        components.update({"printer": printer, "printers": printers})
 
         self._setup_plugin_manager(components)
 
@@ -466,6 +483,8 @@ class Server:
         self._start_printer_autoconnect()
         self._start_connector_autorefresh()
         self._start_watched_observer()
+        self._start_translation_bundles()
+        self._start_sampling_profiler()
         self._call_startup_plugins()
         self._trigger_after_startup()
 
@@ -630,6 +649,9 @@ class Server:
 
             if hasattr(g, "start_time"):
                 end_time = time.monotonic()
+                _request_seconds.labels(request.blueprint or "app").observe(
+                    end_time - g.start_time
+                )
                 duration_ms = int((end_time - g.start_time) * 1000)
                 response.headers.add("Server-Timing", f"app;dur={duration_ms}")
 
@@ -656,6 +678,7 @@ class Server:
         global LOCALES
         global LANGUAGES
         global safe_mode
+        global translationBundles
 
         dirs = []
         if not safe_mode:
@@ -687,6 +710,17 @@ class Server:
             LOCALES = babel.list_translations()
         LANGUAGES = get_available_locale_identifiers(LOCALES)
 
+        def render_translation_bundle(catalog):
+            with app.app_context():
+                return render_template("i18n.js.jinja2", catalog=catalog)
+
+        translationBundles = TranslationBundles(
+            os.path.join(self._settings.getBaseFolder("generated"), "i18n"),
+            os.path.join(app.root_path, "translations"),
+            self._settings.getBaseFolder("translations", check_writable=False),
+            render_translation_bundle,
+        )
+
     def _setup_analysis_queue(self):
         global analysisQueue
 
@@ -1011,6 +1045,7 @@ class Server:
         global fileManager
         global printerProfileManager
         global printer
+        global printers
 
         # create printer instance
         printer_factories = self._plugin_manager.get_hooks("octoprint.printer.factory")
@@ -1028,6 +1063,21 @@ class Server:
         else:
             printer = Printer(fileManager, analysisQueue, printerProfileManager)
 
+        # additional printers share file storage, analysis and profiles with the default one
+        printers = PrinterRegistry(
+            printer,
+            factory=lambda identifier: Printer(
+                fileManager, analysisQueue, printerProfileManager, identifier=identifier
+            ),
+        )
+        for entry in self._settings.get(["printerConnection", "additional"]):
+            try:
+                printers.add(entry["id"], name=entry.get("name"))
+            except ValueError as exc:
+                self._logger.error(f"Could not add additional printer: {exc}")
+            else:
+                self._logger.info(f"Added additional printer {entry['id']}")
+
     def _setup_plugin_manager(self, components):
         from octoprint import (
             init_blocklist_compat_overlay,
@@ -1048,6 +1098,7 @@ class Server:
             octoprint_plugin_inject_factory,
             settings_plugin_inject_factory,
         ]
+        self._plugin_manager.on_plugin_activated = self._on_plugin_activated
         self._plugin_manager.initialize_implementations()
 
         init_settings_plugin_config_migration_and_cleanup(self._plugin_manager)
@@ -1070,6 +1121,33 @@ class Server:
             lambda name, plugin: slicingManager.reload_slicers(),
         )
 
+        # the settings change with the enabled plugins
+        pluginLifecycleManager.add_callback(
+            ["enabled", "disabled"],
+            lambda name, plugin: self._settings.bump_generation(),
+        )
+
+        # and so do the translations
+        pluginLifecycleManager.add_callback(
+            ["enabled", "disabled", "installed", "uninstalled"],
+            lambda name, plugin: translationBundles.rebuild(),
+        )
+
+    def _on_plugin_activated(self, name, plugin):
+        # templates and startup methods are taken care of by the lifecycle callbacks
+        # for enabled plugins, activation goes through enabling the plugin
+        implementation = plugin.implementation
+        if implementation is None:
+            return
+
+        if (
+            isinstance(implementation, octoprint.plugin.AssetPlugin)
+            and assets is not None
+        ):
+            self._logger.warning(
+                f"Plugin {name} was activated after assets were bundled, its assets won't be available. Add an implementation:AssetPlugin trigger to activate it in time."
+            )
+
     def _setup_jinja2(self):
         import re
 
@@ -1200,7 +1278,7 @@ class Server:
 
     def _register_template_plugins(self):
         template_plugins = self._plugin_manager.get_implementations(
-            octoprint.plugin.TemplatePlugin
+            octoprint.plugin.TemplatePlugin, activate_lazy=False
         )
         for plugin in template_plugins:
             try:
@@ -1792,7 +1870,7 @@ class Server:
         registrators = []
 
         blueprint_plugins = octoprint.plugin.plugin_manager().get_implementations(
-            octoprint.plugin.BlueprintPlugin
+            octoprint.plugin.BlueprintPlugin, activate_lazy=False
         )
         for plugin in blueprint_plugins:
             blueprint, prefix = self._prepare_blueprint_plugin(plugin)
@@ -1805,8 +1883,71 @@ class Server:
                 )
             )
 
+        # lazy plugins get a placeholder that activates them on the first request
+        for name, plugin_info in self._plugin_manager.lazy_plugins.items():
+            if "blueprint" not in plugin_info.activation:
+                continue
+
+            blueprint, prefix = self._prepare_lazy_blueprint_plugin(name)
+
+            blueprints.append(blueprint)
+            api_endpoints.append(prefix)
+            registrators.append(
+                functools.partial(register_plugin_blueprint, name, blueprint, prefix)
+            )
+
         return blueprints, api_endpoints, registrators
 
+    def _prepare_lazy_blueprint_plugin(self, name):
+        from flask import abort
+
+        from octoprint.server.util.flask import LateBlueprintDispatcher
+
+        url_prefix = f"/plugin/{name}"
+        dispatchers = {}
+        mutex = threading.Lock()
+
+        def dispatcher():
+            with mutex:
+                if name not in dispatchers:
+                    self._plugin_manager.activate_lazy_plugin(name, trigger="blueprint")
+
+                    plugin_info = self._plugin_manager.get_plugin_info(name)
+                    implementation = (
+                        plugin_info.get_implementation(octoprint.plugin.BlueprintPlugin)
+                        if plugin_info is not None
+                        else None
+                    )
+                    prepared = (
+                        self._prepare_blueprint_plugin(implementation)
+                        if implementation is not None
+                        else None
+                    )
+                    if prepared is None:
+                        return None
+
+                    blueprint, _ = prepared
+                    dispatchers[name] = LateBlueprintDispatcher(blueprint, url_prefix)
+
+                return dispatchers[name]
+
+        def dispatch(path=""):
+            late = dispatchers.get(name)
+            if late is None:
+                late = dispatcher()
+            if late is None:
+                abort(404)
+            return late.dispatch()
+
+        methods = ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+        blueprint = Blueprint(name, name)
+        blueprint.add_url_rule("/", "dispatch", view_func=dispatch, methods=methods)
+        blueprint.add_url_rule(
+            "/<path:path>", "dispatch_path", view_func=dispatch, methods=methods
+        )
+
+        return blueprint, url_prefix
+
     def _prepare_blueprint_plugin(self, plugin):
         name = plugin._identifier
         blueprint = plugin.get_blueprint()
@@ -1829,6 +1970,17 @@ class Server:
         if plugin.is_blueprint_protected():
             blueprint.before_request(requireLoginRequestHandler)
 
+        def record_request(exception):
+            if hasattr(g, "start_time"):
+                self._plugin_manager.accounting.record(
+                    name,
+                    "BlueprintPlugin.request",
+                    (time.monotonic() - g.start_time) * 1000,
+                    exception=exception is not None,
+                )
+
+        blueprint.teardown_request(record_request)
+
         url_prefix = f"/plugin/{name}"
         return blueprint, url_prefix
 
@@ -1874,7 +2026,7 @@ class Server:
 
     def _check_simple_api_plugins(self):
         api_plugins = octoprint.plugin.plugin_manager().get_implementations(
-            octoprint.plugin.SimpleApiPlugin
+            octoprint.plugin.SimpleApiPlugin, activate_lazy=False
         )
         for plugin in api_plugins:
             name = plugin._identifier
@@ -1918,8 +2070,6 @@ class Server:
     def _get_server_handlers(
         self, added_headers=None, removed_headers=None, enable_cors=False
     ):
-        from concurrent.futures import ThreadPoolExecutor
-
         download_handler_kwargs = {"as_attachment": True, "allow_client_caching": False}
 
         ##~~ Permission validators
@@ -2163,6 +2313,7 @@ class Server:
                         self._settings.getBaseFolder("generated"), "webassets"
                     ),
                     "is_pre_compressed": True,
+                    "immutable": True,
                 },
             ),
             # online indicators - text file with "online" as content and a transparent gif
@@ -2230,11 +2381,12 @@ class Server:
                 {
                     "fallback": util.tornado.WsgiInputContainer(
                         app.wsgi_app,
-                        executor=ThreadPoolExecutor(
-                            thread_name_prefix="WsgiRequestHandler"
-                        ),
                         headers=added_headers,
                         removed_headers=removed_headers,
+                        lanes=self._get_request_lanes(),
+                        retry_after=self._settings.getInt(
+                            ["server", "requestLanes", "retryAfter"]
+                        ),
                     ),
                     "path": uploadtemp,
                     "file_prefix": "octoprint-file-upload-",
@@ -2246,6 +2398,36 @@ class Server:
 
         return server_routes
 
+    def _get_request_lanes(self):
+        lanes = []
+        for config in self._settings.get(["server", "requestLanes", "lanes"]) or []:
+            try:
+                lanes.append(
+                    util.tornado.RequestLane(
+                        config["name"],
+                        workers=config.get("workers"),
+                        queue=config.get("queue"),
+                        routes=config.get("routes"),
+                    )
+                )
+            except Exception:
+                self._logger.exception(
+                    f"Invalid request lane configuration, ignoring it: {config!r}"
+                )
+
+        if not lanes:
+            lanes.append(util.tornado.RequestLane("default"))
+
+        self._logger.info(
+            "Handling requests in lanes: {}".format(
+                ", ".join(
+                    f"{lane.name} (workers: {lane.workers or 'default'}, queue: {lane.queue or 'unlimited'})"
+                    for lane in lanes
+                )
+            )
+        )
+        return util.tornado.RequestLaneRouter(lanes, url_map=app.url_map)
+
     def _get_header_transforms(self):
         added = {
             "X-Robots-Tag": "noindex, nofollow, noimageindex",
@@ -2341,36 +2523,48 @@ class Server:
         fileManager.process_backlog()
 
     def _start_printer_autoconnect(self):
-        if not self._settings.getBoolean(["printerConnection", "autoconnect"]):
-            return
+        if self._settings.getBoolean(["printerConnection", "autoconnect"]):
+            self._autoconnect_printer(
+                printer,
+                self._settings.get(["printerConnection", "preferred", "connector"]),
+                self._settings.get(["printerConnection", "preferred", "parameters"]),
+                printerProfileManager.get_default(),
+            )
 
+        for entry in self._settings.get(["printerConnection", "additional"]):
+            if not entry.get("autoconnect") or entry["id"] not in printers:
+                continue
+
+            connection = entry.get("connection", {})
+            self._autoconnect_printer(
+                printers.get(entry["id"]),
+                connection.get("connector"),
+                connection.get("parameters", {}),
+                entry.get("profile"),
+            )
+
+    def _autoconnect_printer(self, target, connector_name, params, profile):
         from octoprint.printer.connection import ConnectedPrinter
 
         try:
-            connector_name = self._settings.get(
-                ["printerConnection", "preferred", "connector"]
-            )
             connector = ConnectedPrinter.find(connector_name)
             if connector_name is None or not connector:
                 return
 
             self._logger.info(
-                f"Auto-connect on startup is configured, trying to connect to the printer via connector {connector_name}..."
+                f"Auto-connect on startup is configured, trying to connect to the printer {target.identifier} via connector {connector_name}..."
             )
 
-            params = self._settings.get(["printerConnection", "preferred", "parameters"])
-
             if not connector.connection_preconditions_met(params):
                 self._logger.warning(
                     f"Preconditions for auto-connecting to {connector_name} not met by the default parameters"
                 )
                 return
 
-            printer_profile = printerProfileManager.get_default()
-            printer.connect(connector_name, parameters=params, profile=printer_profile)
+            target.connect(connector_name, parameters=params, profile=profile)
         except Exception:
             self._logger.exception(
-                "Something went wrong while attempting to automatically connect to the printer"
+                f"Something went wrong while attempting to automatically connect to the printer {target.identifier}"
             )
 
     def _start_connector_autorefresh(self):
@@ -2450,6 +2644,24 @@ class Server:
         except Exception:
             self._logger.exception("Error starting watched folder observer")
 
+    def _start_translation_bundles(self):
+        # builds in the background, anything requested before it's done gets built on demand
+        translationBundles.rebuild(locales=LANGUAGES)
+
+    def _start_sampling_profiler(self):
+        if not self._settings.getBoolean(["devel", "profiler", "enabled"]):
+            return
+
+        from octoprint.util.profiler import start_profiler
+
+        start_profiler(
+            interval=self._settings.getFloat(["devel", "profiler", "interval"]),
+            window=self._settings.getInt(["devel", "profiler", "window"]),
+            max_stacks=self._settings.getInt(["devel", "profiler", "maxStacks"]),
+            max_overhead=self._settings.getFloat(["devel", "profiler", "maxOverhead"])
+            / 100,
+        )
+
     def _trigger_after_startup(self):
         from tornado.ioloop import IOLoop
 
@@ -2816,6 +3028,7 @@ class Server:
             self._plugin_manager,
             connectivityChecker,
             session,
+            printers=printers,
         )
 
     def _check_for_root(self):
@@ -2876,6 +3089,8 @@ class Server:
 
         from werkzeug.test import EnvironBuilder
 
+        from octoprint.util.files import get_compression_encodings
+
         # we clean up entries from our preemptive cache settings that haven't been
         # accessed longer than server.preemptiveCache.until days
         preemptive_cache_timeout = settings().getInt(
@@ -2980,6 +3195,13 @@ class Server:
 
                         builder = EnvironBuilder(**kwargs)
                         environ = builder.get_environ()
+
+                        # also warm up the compressed variant browsers will ask for
+                        environ.setdefault(
+                            "HTTP_ACCEPT_ENCODING",
+                            ", ".join(get_compression_encodings()),
+                        )
+
                         with app.request_context(environ):
                             g.preemptive_recording_active = True
                             g.preemptive_recording_view = plugin if plugin else "_default"
@@ -3028,11 +3250,21 @@ class LifecycleManager:
             return on_plugin_event
 
         for event in ("loaded", "unloaded", "enabled", "disabled"):
-            wrap_plugin_event(event, on_plugin_event_factory(event))
+            setattr(
+                self._plugin_manager,
+                "on_plugin_" + event,
+                wrap_plugin_event(event, on_plugin_event_factory(event)),
+            )
 
     def on_plugin_event(self, event, name, plugin):
         for lifecycle_callback in self._plugin_lifecycle_callbacks[event]:
-            lifecycle_callback(name, plugin)
+            try:
+                lifecycle_callback(name, plugin)
+            except Exception:
+                self._logger.exception(
+                    f"Error while calling lifecycle callback for {event} of plugin {name}",
+                    extra={"plugin": name},
+                )
 
     def add_callback(self, events, callback):
         if isinstance(events, str):
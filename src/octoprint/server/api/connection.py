@@ -7,15 +7,17 @@ from typing import Optional
 from flask import abort, jsonify, request
 
 from octoprint.access.permissions import Permissions
+from octoprint.printer import DEFAULT_PRINTER
 from octoprint.printer.connection import ConnectedPrinter
 from octoprint.schema import BaseModel
-from octoprint.server import NO_CONTENT, printer, printerProfileManager
+from octoprint.server import NO_CONTENT, printerProfileManager
 from octoprint.server.api import api
 from octoprint.server.util.flask import (
     api_version_matches,
     api_versioned,
     get_json_command_from_request,
     no_firstrun_access,
+    requested_printer,
 )
 from octoprint.settings import settings, valid_boolean_trues
 
@@ -93,7 +95,7 @@ class ConnectionStateResponse_pre_2_0_0(BaseModel):
 @api_versioned
 @Permissions.STATUS.require(403)
 def connectionState():  # pre 2.0.0
-    connection_state = printer.connection_state
+    connection_state = requested_printer.connection_state
 
     state = connection_state.pop("state")
     profile = connection_state.pop("profile", None)
@@ -114,7 +116,7 @@ def connectionState():  # pre 2.0.0
 @connectionState.version(">=2.0.0")
 @Permissions.STATUS.require(403)
 def connectionState_2_0_0():  # 2.0.0+
-    connection_state = printer.connection_state
+    connection_state = requested_printer.connection_state
 
     connector = connection_state.pop("connector", None)
     profile = connection_state.pop("profile", None)
@@ -198,7 +200,12 @@ def connectionCommand():
         # check if we also need to update the settings
         settings_dirty = False
 
-        if "save" in data and data["save"] in valid_boolean_trues:
+        if (
+            "save" in data
+            and data["save"] in valid_boolean_trues
+            and requested_printer.identifier == DEFAULT_PRINTER
+        ):
+            # the preferred connection settings are the default printer's
             settings().set(
                 ["printerConnection", "preferred", "connector"], connector_name
             )
@@ -216,15 +223,15 @@ def connectionCommand():
             settings().save()
 
         # connect
-        printer.connect(
+        requested_printer.connect(
             connector=connector_name, parameters=parameters, profile=printerProfile
         )
 
     elif command == "disconnect":
-        printer.disconnect()
+        requested_printer.disconnect()
 
     elif command == "repair" or command == "fake_ack":
-        printer.repair_communication()
+        requested_printer.repair_communication()
 
     return NO_CONTENT
 
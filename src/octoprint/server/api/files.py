@@ -36,7 +36,7 @@ from octoprint.server import (
     current_user,
     eventManager,
     fileManager,
-    printer,
+    printers,
     slicingManager,
 )
 from octoprint.server.api import api
@@ -45,6 +45,7 @@ from octoprint.server.util.flask import (
     api_versioned,
     get_json_command_from_request,
     no_firstrun_access,
+    requested_printer,
     with_revalidation_checking,
 )
 from octoprint.settings import settings, valid_boolean_trues
@@ -57,6 +58,9 @@ _file_cache_mutex = threading.RLock()
 
 _DATA_FORMAT_VERSION = "v3"
 
+# analysis results that are only of use to the server and too large to include in file listings
+_INTERNAL_ANALYSIS_KEYS = {"timeIndex"}
+
 _logger = logging.getLogger(__name__)
 
 
@@ -604,7 +608,11 @@ def _analyse_and_convert_recursively(
                         ),
                         estimatedPrintTime=entry.metadata.analysis.estimatedPrintTime,
                         filament=_to_filament_use(entry.metadata.analysis.filament),
-                        **entry.metadata.analysis.additional,
+                        **{
+                            key: value
+                            for key, value in entry.metadata.analysis.additional.items()
+                            if key not in _INTERNAL_ANALYSIS_KEYS
+                        },
                     )
 
                 # convert history
@@ -700,14 +708,18 @@ def _verifyFolderExists(origin, foldername):
 
 
 def _isBusy(target, path):
-    currentOrigin, currentPath = _getCurrentFile()
-    if (
-        currentPath is not None
-        and currentOrigin == target
-        and fileManager.file_in_path(target, path, currentPath)
-        and (printer.is_printing() or printer.is_paused())
-    ):
-        return True
+    # file storage is shared between all printers, so check all of them
+    for current in printers:
+        if not (current.is_printing() or current.is_paused()):
+            continue
+
+        currentOrigin, currentPath = _getCurrentFile(current)
+        if (
+            currentPath is not None
+            and currentOrigin == target
+            and fileManager.file_in_path(target, path, currentPath)
+        ):
+            return True
 
     return any(
         target == busy_storage and fileManager.file_in_path(target, path, busy_path)
@@ -768,8 +780,8 @@ def uploadGcodeFile(target):
             to_select = select_request
             to_print = print_request
             if (to_select or to_print) and not (
-                printer.is_operational()
-                and not (printer.is_printing() or printer.is_paused())
+                requested_printer.is_operational()
+                and not (requested_printer.is_printing() or requested_printer.is_paused())
             ):
                 # can't select or print files if not operational or ready
                 to_select = to_print = False
@@ -800,7 +812,7 @@ def uploadGcodeFile(target):
             futureFullPathInStorage = fileManager.path_in_storage(target, futureFullPath)
 
             if (
-                str(printer.active_job) == f"{target}:{futureFullPathInStorage}"
+                str(requested_printer.active_job) == f"{target}:{futureFullPathInStorage}"
             ):  # this should no longer require to be a full path in storage
                 abort(
                     409,
@@ -822,7 +834,10 @@ def uploadGcodeFile(target):
                     description="File already exists, cannot overwrite due to a lack of permissions",
                 )
 
-            reselect = str(printer.current_job) == f"{target}:{futureFullPathInStorage}"
+            reselect = (
+                str(requested_printer.current_job)
+                == f"{target}:{futureFullPathInStorage}"
+            )
 
             upload_done = False
 
@@ -851,7 +866,7 @@ def uploadGcodeFile(target):
                 to_select or to_print or reselect
             ):
                 job = fileManager.create_job(target, added_file, owner=user)
-                printer.set_job(job, print_after_select=to_print)
+                requested_printer.set_job(job, print_after_select=to_print)
 
             if userdata is not None:
                 # upload included userdata, add this now to the metadata
@@ -1026,7 +1041,7 @@ def gcodeFileCommand(storage, path=""):
                         description="Cannot select file for printing, not a machinecode file",
                     )
 
-                if not printer.is_ready():
+                if not requested_printer.is_ready():
                     abort(
                         409,
                         description="Printer is already printing, cannot select a new file",
@@ -1035,7 +1050,7 @@ def gcodeFileCommand(storage, path=""):
                 start_print = False
                 if "print" in data and data["print"] in valid_boolean_trues:
                     with Permissions.PRINT.require(403):
-                        if not printer.is_operational():
+                        if not requested_printer.is_operational():
                             abort(
                                 409,
                                 description="Printer is not operational, cannot directly start printing",
@@ -1044,11 +1059,11 @@ def gcodeFileCommand(storage, path=""):
 
                 params = data.get("params", {})
                 job = fileManager.create_job(storage, path, owner=user, params=params)
-                printer.set_job(job, print_after_select=start_print)
+                requested_printer.set_job(job, print_after_select=start_print)
 
         elif command == "unselect":
             with Permissions.FILES_SELECT.require(403):
-                if not printer.is_ready():
+                if not requested_printer.is_ready():
                     return make_response(
                         "Printer is already printing, cannot unselect current file", 409
                     )
@@ -1064,7 +1079,7 @@ def gcodeFileCommand(storage, path=""):
                         "Only the currently selected file can be unselected", 400
                     )
 
-                printer.set_job(None)
+                requested_printer.set_job(None)
 
         elif command == "slice":
             with Permissions.SLICE.require(403):
@@ -1102,7 +1117,7 @@ def gcodeFileCommand(storage, path=""):
                 cores = os.cpu_count()
                 if (
                     slicer_instance.get_slicer_properties().get("same_device", True)
-                    and (printer.is_printing() or printer.is_paused())
+                    and (requested_printer.is_printing() or requested_printer.is_paused())
                     and (cores is None or cores < 2)
                 ):
                     # slicer runs on same device as OctoPrint, slicing while printing is hence disabled
@@ -1148,7 +1163,7 @@ def gcodeFileCommand(storage, path=""):
                 if (
                     currentFilename == full_path
                     and currentOrigin == storage
-                    and (printer.is_printing() or printer.is_paused())
+                    and (requested_printer.is_printing() or requested_printer.is_paused())
                 ):
                     abort(
                         409,
@@ -1181,7 +1196,7 @@ def gcodeFileCommand(storage, path=""):
 
                 select_after_slicing = False
                 if "select" in data and data["select"] in valid_boolean_trues:
-                    if not printer.is_operational():
+                    if not requested_printer.is_operational():
                         abort(
                             409,
                             description="Printer is not operational, cannot directly select for printing",
@@ -1190,7 +1205,7 @@ def gcodeFileCommand(storage, path=""):
 
                 print_after_slicing = False
                 if "print" in data and data["print"] in valid_boolean_trues:
-                    if not printer.is_operational():
+                    if not requested_printer.is_operational():
                         abort(
                             409,
                             description="Printer is not operational, cannot directly start printing",
@@ -1204,7 +1219,12 @@ def gcodeFileCommand(storage, path=""):
                 for key in override_keys:
                     overrides[key[len("profile.") :]] = data[key]
 
-                def slicing_done(target, path, select_after_slicing, print_after_slicing):
+                # the callback runs on the slicer's thread, outside of the request
+                printer = requested_printer._get_current_object()
+
+                def slicing_done(
+                    target, path, select_after_slicing, print_after_slicing, printer
+                ):
                     if select_after_slicing or print_after_slicing:
                         job = fileManager.create_job(target, path, owner=user)
                         printer.set_job(job, print_after_select=print_after_slicing)
@@ -1227,6 +1247,7 @@ def gcodeFileCommand(storage, path=""):
                             full_path,
                             select_after_slicing,
                             print_after_slicing,
+                            printer,
                         ),
                     )
                 except octoprint.slicing.UnknownProfile:
@@ -1448,14 +1469,7 @@ def gcodeFileCommand(storage, path=""):
                                 )
 
                             # deselect the file if it's currently selected
-                            currentOrigin, currentFilename = _getCurrentFile()
-                            if (
-                                currentOrigin is not None
-                                and currentOrigin == storage
-                                and currentFilename is not None
-                                and path == currentFilename
-                            ):
-                                printer.set_job(None)
+                            _deselectFile(storage, path)
 
                             if dst_storage == storage:
                                 # we explicitly use new_path instead of sanitized_destination below, to make renaming work in same storage
@@ -1555,13 +1569,7 @@ def deleteGcodeFile(filename, target):
             abort(409, description="Trying to delete a file that is currently in use")
 
         # deselect the file if it's currently selected
-        currentOrigin, currentPath = _getCurrentFile()
-        if (
-            currentPath is not None
-            and currentOrigin == target
-            and filename == currentPath
-        ):
-            printer.set_job(None)
+        _deselectFile(target, filename)
 
         # delete it
         try:
@@ -1580,13 +1588,7 @@ def deleteGcodeFile(filename, target):
             )
 
         # deselect the file if it's currently selected
-        currentOrigin, currentPath = _getCurrentFile()
-        if (
-            currentPath is not None
-            and currentOrigin == target
-            and fileManager.file_in_path(target, filename, currentPath)
-        ):
-            printer.set_job(None)
+        _deselectFile(target, filename, in_path=True)
 
         # delete it
         try:
@@ -1629,8 +1631,23 @@ def _abortWithException(error):
         abort(500, description=str(error).split(":")[0])
 
 
-def _getCurrentFile():
-    currentJob = printer.get_current_job()
+def _deselectFile(target, path, in_path=False):
+    # file storage is shared between all printers, so deselect on all of them
+    for current in printers:
+        currentOrigin, currentPath = _getCurrentFile(current)
+        if currentPath is None or currentOrigin != target:
+            continue
+
+        if currentPath == path or (
+            in_path and fileManager.file_in_path(target, path, currentPath)
+        ):
+            current.set_job(None)
+
+
+def _getCurrentFile(current=None):
+    if current is None:
+        current = requested_printer
+    currentJob = current.get_current_job()
     if (
         currentJob is not None
         and "file" in currentJob
@@ -6,19 +6,20 @@ from flask import abort, jsonify, request
 
 from octoprint.access.permissions import Permissions
 from octoprint.schema.api import job as apischema
-from octoprint.server import NO_CONTENT, current_user, printer
+from octoprint.server import NO_CONTENT, current_user
 from octoprint.server.api import api
 from octoprint.server.util.flask import (
     api_versioned,
     get_json_command_from_request,
     no_firstrun_access,
+    requested_printer,
 )
 
 
 @api.route("/job", methods=["POST"])
 @no_firstrun_access
 def controlJob():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
     valid_commands = {"start": [], "restart": [], "pause": [], "cancel": []}
@@ -27,7 +28,7 @@ def controlJob():
     if response is not None:
         return response
 
-    activePrintjob = printer.is_printing() or printer.is_paused()
+    activePrintjob = requested_printer.is_printing() or requested_printer.is_paused()
 
     tags = {"source:api", "api:job"}
     user = current_user.get_name()
@@ -40,14 +41,14 @@ def controlJob():
                     409,
                     description="Printer already has an active print job, did you mean 'restart'?",
                 )
-            printer.start_print(tags=tags, user=user, params=params)
+            requested_printer.start_print(tags=tags, user=user, params=params)
         elif command == "restart":
-            if not printer.is_paused():
+            if not requested_printer.is_paused():
                 abort(
                     409,
                     description="Printer does not have an active print job or is not paused",
                 )
-            printer.start_print(tags=tags, user=user, params=params)
+            requested_printer.start_print(tags=tags, user=user, params=params)
         elif command == "pause":
             if not activePrintjob:
                 abort(
@@ -56,11 +57,11 @@ def controlJob():
                 )
             action = data.get("action", "toggle")
             if action == "toggle":
-                printer.toggle_pause_print(tags=tags, user=user, params=params)
+                requested_printer.toggle_pause_print(tags=tags, user=user, params=params)
             elif action == "pause":
-                printer.pause_print(tags=tags, user=user, params=params)
+                requested_printer.pause_print(tags=tags, user=user, params=params)
             elif action == "resume":
-                printer.resume_print(tags=tags, user=user, params=params)
+                requested_printer.resume_print(tags=tags, user=user, params=params)
             else:
                 abort(400, description="Unknown action")
         elif command == "cancel":
@@ -69,7 +70,7 @@ def controlJob():
                     409,
                     description="Printer is neither printing nor paused, 'cancel' command cannot be performed",
                 )
-            printer.cancel_print(tags=tags, user=user, params=params)
+            requested_printer.cancel_print(tags=tags, user=user, params=params)
     return NO_CONTENT
 
 
@@ -105,7 +106,7 @@ def jobState_post_2_0_0():
 
 
 def _get_api_job_response() -> apischema.ApiJobResponse:
-    current_data = printer.get_current_data()
+    current_data = requested_printer.get_current_data()
 
     file_data = current_data["job"].get("file", {})
 
@@ -12,6 +12,7 @@ from flask_babel import Locale
 
 from octoprint.access.permissions import Permissions
 from octoprint.plugin import plugin_manager
+from octoprint.server import translationBundles
 from octoprint.server.api import api
 from octoprint.server.util.flask import no_firstrun_access
 from octoprint.settings import settings
@@ -146,6 +147,8 @@ def uploadLanguagePack():
     if not _validate_and_install_language_pack(upload_path, target_path):
         abort(400, description="Invalid language pack archive")
 
+    translationBundles.rebuild()
+
     return getInstalledLanguagePacks()
 
 
@@ -165,6 +168,8 @@ def deleteInstalledLanguagePack(locale, pack):
 
         shutil.rmtree(target_path)
 
+    translationBundles.rebuild()
+
     return getInstalledLanguagePacks()
 
 
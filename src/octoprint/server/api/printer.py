@@ -7,23 +7,43 @@ import re
 from flask import Response, abort, jsonify, request
 
 from octoprint.access.permissions import Permissions
-from octoprint.printer import UnknownScript
-from octoprint.server import NO_CONTENT, fileManager, printer, printerProfileManager
+from octoprint.printer import DEFAULT_PRINTER, UnknownScript
+from octoprint.server import NO_CONTENT, fileManager, printerProfileManager, printers
 from octoprint.server.api import api
 from octoprint.server.util.flask import (
     api_version_matches,
     get_json_command_from_request,
     no_firstrun_access,
+    requested_printer,
 )
 from octoprint.settings import settings, valid_boolean_trues
 
+# ~~ Printers
+
+
+@api.route("/printers", methods=["GET"])
+@Permissions.STATUS.require(403)
+def printerList():
+    result = []
+    for identifier, target in printers.items():
+        result.append(
+            {
+                "id": identifier,
+                "name": printers.get_name(identifier),
+                "default": identifier == DEFAULT_PRINTER,
+                "state": target.get_state_string(),
+            }
+        )
+    return jsonify(printers=result)
+
+
 # ~~ Printer
 
 
 @api.route("/printer", methods=["GET"])
 @Permissions.STATUS.require(403)
 def printerState():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
     # process excludes
@@ -43,8 +63,9 @@ def printerState():
     # add temperature information
     if "temperature" not in excludes:
         processor = lambda x: x
-        heated_bed = printerProfileManager.get_current_or_default()["heatedBed"]
-        heated_chamber = printerProfileManager.get_current_or_default()["heatedChamber"]
+        printer_profile = _get_printer_profile()
+        heated_bed = printer_profile["heatedBed"]
+        heated_chamber = printer_profile["heatedChamber"]
         if not heated_bed and not heated_chamber:
             processor = _keep_tools
         elif not heated_bed:
@@ -61,11 +82,11 @@ def printerState():
         storage_key = "sd"
 
     if storage_key not in excludes and settings().getBoolean(["feature", "sdSupport"]):
-        result.update({storage_key: {"ready": printer.is_storage_mounted()}})
+        result.update({storage_key: {"ready": requested_printer.is_storage_mounted()}})
 
     # add state information
     if "state" not in excludes:
-        state = printer.get_current_data()["state"]
+        state = requested_printer.get_current_data()["state"]
         result.update({"state": state})
 
     return jsonify(result)
@@ -78,7 +99,7 @@ def printerState():
 @no_firstrun_access
 @Permissions.CONTROL.require(403)
 def printerToolCommand():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
     valid_commands = {
@@ -103,7 +124,7 @@ def printerToolCommand():
         if not isinstance(tool, str) or re.match(validation_regex_specific, tool) is None:
             abort(400, description="tool is invalid")
 
-        printer.change_tool(tool, tags=tags)
+        requested_printer.change_tool(tool, tags=tags)
 
     ##~~ temperature
     elif command == "target":
@@ -120,7 +141,7 @@ def printerToolCommand():
 
         # perform the actual temperature commands
         for tool in validated_values.keys():
-            printer.set_temperature(tool, validated_values[tool], tags=tags)
+            requested_printer.set_temperature(tool, validated_values[tool], tags=tags)
 
     ##~~ temperature offset
     elif command == "offset":
@@ -136,11 +157,11 @@ def printerToolCommand():
             validated_values[tool] = value
 
         # set the offsets
-        printer.set_temperature_offset(validated_values)
+        requested_printer.set_temperature_offset(validated_values)
 
     ##~~ extrusion
     elif command == "extrude":
-        if printer.is_printing():
+        if requested_printer.is_printing():
             # do not extrude when a print job is running
             abort(409, description="Printer is currently printing")
 
@@ -148,14 +169,14 @@ def printerToolCommand():
         speed = data.get("speed", None)
         if not isinstance(amount, (int, float)):
             abort(400, description="amount is invalid")
-        printer.extrude(amount, speed=speed, tags=tags)
+        requested_printer.extrude(amount, speed=speed, tags=tags)
 
     elif command == "flowrate":
         factor = data["factor"]
         if not isinstance(factor, (int, float)):
             abort(400, description="factor is invalid")
         try:
-            printer.flow_rate(factor, tags=tags)
+            requested_printer.flow_rate(factor, tags=tags)
         except ValueError:
             abort(400, description="factor is invalid")
 
@@ -166,7 +187,7 @@ def printerToolCommand():
 @no_firstrun_access
 @Permissions.STATUS.require(403)
 def printerToolState():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
     return jsonify(_get_temperature_data(_keep_tools))
@@ -179,10 +200,10 @@ def printerToolState():
 @no_firstrun_access
 @Permissions.CONTROL.require(403)
 def printerBedCommand():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
-    if not printerProfileManager.get_current_or_default()["heatedBed"]:
+    if not _get_printer_profile()["heatedBed"]:
         abort(409, description="Printer does not have a heated bed")
 
     valid_commands = {"target": ["target"], "offset": ["offset"]}
@@ -201,7 +222,7 @@ def printerBedCommand():
             abort(400, description="target is invalid")
 
         # perform the actual temperature command
-        printer.set_temperature("bed", target, tags=tags)
+        requested_printer.set_temperature("bed", target, tags=tags)
 
     ##~~ temperature offset
     elif command == "offset":
@@ -212,7 +233,7 @@ def printerBedCommand():
             abort(400, description="offset is invalid")
 
         # set the offsets
-        printer.set_temperature_offset({"bed": offset})
+        requested_printer.set_temperature_offset({"bed": offset})
 
     return NO_CONTENT
 
@@ -221,10 +242,10 @@ def printerBedCommand():
 @no_firstrun_access
 @Permissions.STATUS.require(403)
 def printerBedState():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
-    if not printerProfileManager.get_current_or_default()["heatedBed"]:
+    if not _get_printer_profile()["heatedBed"]:
         abort(409, description="Printer does not have a heated bed")
 
     data = _get_temperature_data(_keep_bed)
@@ -241,10 +262,10 @@ def printerBedState():
 @no_firstrun_access
 @Permissions.CONTROL.require(403)
 def printerChamberCommand():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
-    if not printerProfileManager.get_current_or_default()["heatedChamber"]:
+    if not _get_printer_profile()["heatedChamber"]:
         abort(409, description="Printer does not have a heated chamber")
 
     valid_commands = {"target": ["target"], "offset": ["offset"]}
@@ -263,7 +284,7 @@ def printerChamberCommand():
             abort(400, description="target is invalid")
 
         # perform the actual temperature command
-        printer.set_temperature("chamber", target, tags=tags)
+        requested_printer.set_temperature("chamber", target, tags=tags)
 
     ##~~ temperature offset
     elif command == "offset":
@@ -274,7 +295,7 @@ def printerChamberCommand():
             abort(400, description="offset is invalid")
 
         # set the offsets
-        printer.set_temperature_offset({"chamber": offset})
+        requested_printer.set_temperature_offset({"chamber": offset})
 
     return NO_CONTENT
 
@@ -283,10 +304,10 @@ def printerChamberCommand():
 @no_firstrun_access
 @Permissions.STATUS.require(403)
 def printerChamberState():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
-    if not printerProfileManager.get_current_or_default()["heatedChamber"]:
+    if not _get_printer_profile()["heatedChamber"]:
         abort(409, description="Printer does not have a heated chamber")
 
     data = _get_temperature_data(_keep_chamber)
@@ -308,7 +329,9 @@ def printerPrintheadCommand():
     if response is not None:
         return response
 
-    if not printer.is_operational() or (printer.is_printing() and command != "feedrate"):
+    if not requested_printer.is_operational() or (
+        requested_printer.is_printing() and command != "feedrate"
+    ):
         # do not jog when a print job is running or we don't have a connection
         abort(409, description="Printer is not operational or currently printing")
 
@@ -330,7 +353,9 @@ def printerPrintheadCommand():
         speed = data.get("speed", None)
 
         # execute the jog commands
-        printer.jog(validated_values, relative=not absolute, speed=speed, tags=tags)
+        requested_printer.jog(
+            validated_values, relative=not absolute, speed=speed, tags=tags
+        )
 
     ##~~ home command
     elif command == "home":
@@ -342,14 +367,14 @@ def printerPrintheadCommand():
             validated_values.append(axis)
 
         # execute the home command
-        printer.home(validated_values, tags=tags)
+        requested_printer.home(validated_values, tags=tags)
 
     elif command == "feedrate":
         factor = data["factor"]
         if not isinstance(factor, (int, float)):
             abort(400, description="factor is invalid")
         try:
-            printer.feed_rate(factor, tags=tags)
+            requested_printer.feed_rate(factor, tags=tags)
         except ValueError:
             abort(400, description="factor is invalid")
 
@@ -367,7 +392,11 @@ def printerStorageCommand():
     if not settings().getBoolean(["feature", "sdSupport"]):
         abort(404, description="Printer storage support is disabled")
 
-    if not printer.is_operational() or printer.is_printing() or printer.is_paused():
+    if (
+        not requested_printer.is_operational()
+        or requested_printer.is_printing()
+        or requested_printer.is_paused()
+    ):
         abort(409, description="Printer is not operational or currently busy")
 
     valid_commands = {"init": [], "refresh": [], "release": []}
@@ -378,11 +407,11 @@ def printerStorageCommand():
     tags = {"source:api", "api:printer.sd", "api:printer.storage"}
 
     if command == "init":
-        printer.mount_storage(tags=tags)
+        requested_printer.mount_storage(tags=tags)
     elif command == "refresh":
         fileManager.list_storage_entries(["printer"], force_refresh=True)
     elif command == "release":
-        printer.unmount_storage(tags=tags)
+        requested_printer.unmount_storage(tags=tags)
 
     return NO_CONTENT
 
@@ -395,7 +424,7 @@ def printerStorageState():
     if not settings().getBoolean(["feature", "sdSupport"]):
         abort(404, description="Printer storage support is disabled")
 
-    return jsonify(ready=printer.is_storage_mounted())
+    return jsonify(ready=requested_printer.is_storage_mounted())
 
 
 ##~~ Commands
@@ -405,7 +434,7 @@ def printerStorageState():
 @no_firstrun_access
 @Permissions.CONTROL.require(403)
 def printerCommand():
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
     data = request.get_json()
@@ -441,7 +470,7 @@ def printerCommand():
                     commandToSend = command % parameters
             commandsToSend.append(commandToSend)
 
-        printer.commands(commandsToSend, tags=tags)
+        requested_printer.commands(commandsToSend, tags=tags)
 
     elif "script" in data:
         script_name = data["script"]
@@ -450,7 +479,7 @@ def printerCommand():
             context["context"] = data["context"]
 
         try:
-            printer.script(script_name, context=context, tags=tags)
+            requested_printer.script(script_name, context=context, tags=tags)
         except UnknownScript:
             abort(404, description="Unknown script")
 
@@ -461,18 +490,27 @@ def printerCommand():
 @no_firstrun_access
 @Permissions.CONTROL.require(403)
 def getCustomControls():
-    controls = printer.get_additional_controls()
+    controls = requested_printer.get_additional_controls()
     return jsonify(controls=[control.model_dump() for control in controls])
 
 
+def _get_printer_profile():
+    if requested_printer.identifier != DEFAULT_PRINTER:
+        # additional printers don't select their profile in the profile manager
+        profile = requested_printer.connection_state.get("profile")
+        if profile:
+            return profile
+    return printerProfileManager.get_current_or_default()
+
+
 def _get_temperature_data(preprocessor):
-    if not printer.is_operational():
+    if not requested_printer.is_operational():
         abort(409, description="Printer is not operational")
 
-    tempData = printer.get_current_temperatures()
+    tempData = requested_printer.get_current_temperatures()
 
     if "history" in request.values and request.values["history"] in valid_boolean_trues:
-        history = printer.get_temperature_history()
+        history = requested_printer.get_temperature_history()
 
         limit = 300
         if "limit" in request.values and str(request.values["limit"]).isnumeric():
@@ -489,7 +527,7 @@ def _get_temperature_data(preprocessor):
 @no_firstrun_access
 @Permissions.STATUS.require(403)
 def getLastPrinterError():
-    error_info = printer.error_info
+    error_info = requested_printer.error_info
     if error_info is None:
         return jsonify(error="", reason="")
 
@@ -2,11 +2,13 @@ __author__ = "Gina Häußge <osd@foosel.net>"
 __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
 __copyright__ = "Copyright (C) 2014 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
+import json
 import logging
 import re
+import threading
 from typing import Any
 
-from flask import abort, jsonify, request
+from flask import abort, current_app, g, jsonify, request
 from flask_login import current_user
 
 import octoprint.plugin
@@ -69,19 +71,7 @@ def _etag(lm=None):
     if lm is None:
         lm = _lastmodified()
 
-    plugins = sorted(octoprint.plugin.plugin_manager().enabled_plugins)
-    plugin_settings = _get_plugin_settings()
-
-    from collections import OrderedDict
-
-    sorted_plugin_settings = OrderedDict()
-    for key in sorted(plugin_settings.keys()):
-        sorted_plugin_settings[key] = plugin_settings.get(key, {})
-
-    if current_user is not None and not current_user.is_anonymous:
-        roles = sorted(current_user.permissions, key=lambda x: x.key)
-    else:
-        roles = []
+    anonymous, needs = _user_key()
 
     import hashlib
 
@@ -91,31 +81,98 @@ def _etag(lm=None):
         value = value.encode("utf-8")
         hash.update(value)
 
-    # last modified timestamp
+    # last modified timestamp, in case config.yaml got edited behind our back
     hash_update(str(lm))
 
-    # effective config from config.yaml + overlays
-    hash_update(repr(settings().effective))
-
-    # might duplicate settings().effective, but plugins might also inject additional keys into the settings
-    # output that are not stored in config.yaml
-    hash_update(repr(sorted_plugin_settings))
+    # changes to the settings, overlays, scripts, enabled plugins and anything plugins
+    # inject into their settings
+    hash_update(str(settings().generation))
 
-    # if the list of plugins changes, the settings structure changes too
-    hash_update(repr(plugins))
-
-    # and likewise if the role of the user changes
-    hash_update(repr(roles))
+    # the permissions of the user also change the output
+    hash_update(repr(anonymous))
+    hash_update(repr(sorted(map(repr, needs))))
 
     # or if the user reauthenticates
     hash_update(repr(credentials_checked_recently()))
 
-    # also if the settings api version changes
+    # also if the settings api version or the requested api version changes
     hash_update(str(SETTINGS_API_VERSION))
+    hash_update(repr(api_version_matches(">=2.0.0")))
+
+    # and of course if serial ports or webcams come or go
+    hash_update(_live_data_key())
 
     return hash.hexdigest()
 
 
+def _user_key():
+    """
+    Whether the current user is anonymous and the needs they satisfy, which covers all
+    permission checks while rendering the settings, including those of plugins.
+    """
+    if current_user is None:
+        return True, frozenset()
+    return current_user.is_anonymous, frozenset(current_user.needs)
+
+
+def _live_data():
+    """
+    The parts of the output that don't come from the settings and can change at any
+    time, the available serial ports and the webcams provided by plugins. Determined
+    once per request.
+    """
+    if "settings_live_data" not in g:
+        connection_options = {}
+        if not api_version_matches(">=2.0.0"):
+            from octoprint.printer.connection import ConnectedPrinter
+
+            serial_connector = ConnectedPrinter.find("serial")
+            if serial_connector:
+                connection_options = serial_connector.connection_options()
+
+        g.settings_live_data = {
+            "connection_options": connection_options,
+            "webcams": get_webcams_as_dicts(),
+        }
+    return g.settings_live_data
+
+
+def _live_data_key():
+    return json.dumps(_live_data(), sort_keys=True, default=str)
+
+
+_settings_cache = {}
+_settings_cache_generation = None
+_settings_cache_lock = threading.Lock()
+
+
+def _cached_settings(key, factory):
+    """
+    Caches the serialized settings per settings generation and ``key``, which must
+    capture everything else the output depends on.
+    """
+    global _settings_cache_generation
+
+    generation = (settings().generation, _lastmodified())
+
+    with _settings_cache_lock:
+        if generation != _settings_cache_generation:
+            _settings_cache.clear()
+            _settings_cache_generation = generation
+
+        body = _settings_cache.get(key)
+        if body is not None:
+            return body
+
+    body = factory()
+
+    with _settings_cache_lock:
+        if generation == _settings_cache_generation:
+            _settings_cache[key] = body
+
+    return body
+
+
 @api.route("/settings", methods=["GET"])
 @with_revalidation_checking(
     etag_factory=_etag,
@@ -131,6 +188,26 @@ def getSettings():
     ):
         abort(403)
 
+    # everything the output depends on besides the settings themselves
+    key = (
+        api_version_matches(">=2.0.0"),
+        settings().getBoolean(["server", "firstRun"])
+        and not userManager.has_been_customized(),
+        _live_data_key(),
+    ) + _user_key()
+
+    def render():
+        return jsonify(_get_settings()).get_data()
+
+    if request.values.get("force", "false") in valid_boolean_trues:
+        body = render()
+    else:
+        body = _cached_settings(key, render)
+
+    return current_app.response_class(body, mimetype="application/json")
+
+
+def _get_settings():
     s = settings()
 
     # NOTE: Remember to adjust the docs of the data model on the Settings API if anything
@@ -282,7 +359,7 @@ def getSettings():
         settings().getBoolean(["server", "firstRun"])
         and not userManager.has_been_customized()
     ):
-        webcamsDict = get_webcams_as_dicts()
+        webcamsDict = _live_data()["webcams"]
         data["webcam"] = {
             "webcamEnabled": s.getBoolean(["webcam", "webcamEnabled"]),
             "timelapseEnabled": s.getBoolean(["webcam", "timelapseEnabled"]),
@@ -354,7 +431,7 @@ def getSettings():
             ),
         }
 
-    return jsonify(data)
+    return data
 
 
 def _get_plugin_settings():
@@ -1001,15 +1078,9 @@ def _saveSettings(data):
 
 
 def _get_serial_settings():
-    from octoprint.printer.connection import ConnectedPrinter
-
     s = settings()
 
-    serial_connector = ConnectedPrinter.find("serial")
-    if serial_connector:
-        connection_options = serial_connector.connection_options()
-    else:
-        connection_options = {}
+    connection_options = _live_data()["connection_options"]
 
     preferred_connection_connector = s.get(
         ["printerConnection", "preferred", "connector"]
@@ -1025,6 +1096,7 @@ def _get_serial_settings():
         "baudrate": preferred_connection_params.get("baudrate"),
         "exclusive": s.getBoolean(["plugins", "serial_connector", "exclusive"]),
         "lowLatency": s.getBoolean(["plugins", "serial_connector", "lowLatency"]),
+        "bulkRead": s.getBoolean(["plugins", "serial_connector", "bulkRead"]),
         "portOptions": connection_options.get("port", []),
         "baudrateOptions": connection_options.get("baudrate", []),
         "autoconnect": s.getBoolean(["printerConnection", "autoconnect"]),
@@ -1186,6 +1258,9 @@ def _get_serial_settings():
         "capLfnWrite": s.getBoolean(
             ["plugins", "serial_connector", "capabilities", "lfn_write"]
         ),
+        "capBinaryFileTransfer": s.getBoolean(
+            ["plugins", "serial_connector", "capabilities", "binary_file_transfer"]
+        ),
         "resendRatioThreshold": s.getInt(
             ["plugins", "serial_connector", "resendRatioThreshold"]
         ),
@@ -1219,6 +1294,8 @@ def _set_serial_settings(data: dict[str, Any]):
         s.setBoolean(["plugins", "serial_connector", "exclusive"], data["exclusive"])
     if "lowLatency" in data:
         s.setBoolean(["plugins", "serial_connector", "lowLatency"], data["lowLatency"])
+    if "bulkRead" in data:
+        s.setBoolean(["plugins", "serial_connector", "bulkRead"], data["bulkRead"])
     if "timeoutConnection" in data:
         s.setFloat(
             ["plugins", "serial_connector", "timeout", "connection"],
@@ -1510,6 +1587,11 @@ def _set_serial_settings(data: dict[str, Any]):
             ["plugins", "serial_connector", "capabilities", "lfn_write"],
             data["capLfnWrite"],
         )
+    if "capBinaryFileTransfer" in data:
+        s.setBoolean(
+            ["plugins", "serial_connector", "capabilities", "binary_file_transfer"],
+            data["capBinaryFileTransfer"],
+        )
     if "resendRatioThreshold" in data:
         s.setInt(
             ["plugins", "serial_connector", "resendRatioThreshold"],
@@ -7,7 +7,7 @@ import re
 import shutil
 import threading
 
-from flask import abort, jsonify, request, url_for
+from flask import abort, jsonify, make_response, request, url_for
 from flask_babel import gettext
 
 from octoprint.access.permissions import Permissions
@@ -65,6 +65,31 @@ def getSystemInfo():
     return jsonify(systeminfo=systeminfo)
 
 
+@api.route("/system/profile", methods=["GET"])
+@no_firstrun_access
+@Permissions.SYSTEM.require(403)
+def getSamplingProfile():
+    from octoprint.util.profiler import get_profiler
+
+    profiler = get_profiler()
+    if profiler is None:
+        abort(404, description="The sampling profiler is not enabled")
+
+    if "stats" in request.values:
+        return jsonify(**profiler.stats())
+
+    minutes = None
+    if "minutes" in request.values:
+        try:
+            minutes = float(request.values["minutes"])
+        except ValueError:
+            abort(400, description="minutes must be a number")
+
+    response = make_response(profiler.folded(minutes=minutes))
+    response.headers["Content-Type"] = "text/plain; charset=utf-8"
+    return response
+
+
 @api.route("/system/startup", methods=["GET"])
 @no_firstrun_access
 @Permissions.SYSTEM.require(403)
@@ -22,6 +22,7 @@ import flask.templating
 import flask_assets
 import flask_login
 import netaddr
+import pylru
 import tornado.web
 import webassets.updater
 import webassets.utils
@@ -625,6 +626,81 @@ class PrefixAwareJinjaEnvironment(flask.templating.Environment):
         return templates
 
 
+# ~~ dispatcher for blueprints created while already serving
+
+
+class LateBlueprintDispatcher:
+    """
+    Dispatches requests to a blueprint that only became available after the app started serving requests.
+
+    Flask doesn't allow registering blueprints at that point anymore, so the blueprint is registered on a
+    private shadow app solely for building its URL map, and requests are then matched and dispatched from a
+    catch-all route of the main app. The blueprint's own request, teardown and error handlers are honored,
+    ``url_for`` for the blueprint's endpoints is not available.
+
+    Arguments:
+        blueprint (flask.Blueprint): the blueprint to dispatch to
+        url_prefix (str): the URL prefix under which the catch-all route is registered
+    """
+
+    def __init__(self, blueprint, url_prefix):
+        shadow = flask.Flask(blueprint.import_name)
+        shadow.register_blueprint(blueprint, url_prefix=url_prefix)
+
+        self._blueprint = blueprint
+        self._url_map = shadow.url_map
+        self._view_functions = shadow.view_functions
+
+    def dispatch(self):
+        error = None
+        try:
+            try:
+                endpoint, values = self._url_map.bind_to_environ(
+                    flask.request.environ
+                ).match()
+
+                for f in self._blueprint.before_request_funcs.get(None, []):
+                    rv = f()
+                    if rv is not None:
+                        return self._finalize(rv)
+
+                rv = self._view_functions[endpoint](**values)
+            except Exception as e:
+                handler = self._find_error_handler(e)
+                if handler is None:
+                    raise
+                rv = handler(e)
+
+            return self._finalize(rv)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # like flask, only pass on exceptions no error handler took care of
+            for f in reversed(self._blueprint.teardown_request_funcs.get(None, [])):
+                f(error)
+
+    def _finalize(self, rv):
+        response = flask.current_app.make_response(rv)
+        for f in reversed(self._blueprint.after_request_funcs.get(None, [])):
+            response = f(response)
+        return response
+
+    def _find_error_handler(self, e):
+        from werkzeug.exceptions import HTTPException
+
+        spec = self._blueprint.error_handler_spec.get(None, {})
+        codes = (e.code, None) if isinstance(e, HTTPException) else (None,)
+        for code in codes:
+            handlers = spec.get(code)
+            if not handlers:
+                continue
+            for cls in type(e).__mro__:
+                if cls in handlers:
+                    return handlers[cls]
+        return None
+
+
 # ~~ passive login helper
 
 _cached_local_networks = None
@@ -1340,6 +1416,85 @@ def with_client_revalidation(f):
     return decorated_function
 
 
+_compressible_mimetypes = (
+    "application/javascript",
+    "application/json",
+    "application/x-javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# compressed response bodies by etag and encoding
+_compressed = pylru.lrucache(32)
+_compressed_mutex = threading.Lock()
+
+
+def with_compression(f):
+    """
+    Compresses successful textual responses on the fly, with the preferred content
+    encoding acceptable to the client. Responses that have an ETag only get
+    compressed once per ETag and encoding.
+    """
+
+    @functools.wraps(f)
+    def decorated_function(*args, **kwargs):
+        r = f(*args, **kwargs)
+
+        if isinstance(r, flask.Response):
+            r = compress_response(r)
+
+        return r
+
+    return decorated_function
+
+
+def compress_response(response):
+    from octoprint.util.files import (
+        compress,
+        get_acceptable_encodings,
+        get_compression_encodings,
+    )
+
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not (
+            response.mimetype.startswith("text/")
+            or response.mimetype in _compressible_mimetypes
+        )
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    encodings = get_acceptable_encodings(
+        flask.request.headers.get("Accept-Encoding", ""), get_compression_encodings()
+    )
+    if not encodings:
+        return response
+    encoding = encodings[0]
+
+    etag, _ = response.get_etag()
+    key = (flask.request.path, etag, encoding) if etag else None
+
+    data = None
+    if key is not None:
+        with _compressed_mutex:
+            data = _compressed.get(key)
+
+    if data is None:
+        data = compress(response.get_data(), encoding)
+        if key is not None:
+            with _compressed_mutex:
+                _compressed[key] = data
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
 def with_revalidation_checking(
     etag_factory=None, lastmodified_factory=None, condition=None, unless=None
 ):
@@ -1734,6 +1889,29 @@ def get_remote_address(request):
     return request.remote_addr
 
 
+def get_requested_printer():
+    """
+    Returns the printer addressed by the current request through its ``printer`` query
+    parameter, the default printer if there is none. Aborts with a 404 for unknown printers.
+    """
+    from octoprint.printer.registry import UnknownPrinter
+
+    identifier = flask.request.args.get("printer")
+    if octoprint.server.printers is None:
+        if identifier is None:
+            return octoprint.server.printer
+        flask.abort(404, description=f"Unknown printer: {identifier}")
+
+    try:
+        return octoprint.server.printers.get(identifier)
+    except UnknownPrinter as exc:
+        flask.abort(404, description=str(exc))
+
+
+requested_printer = LocalProxy(get_requested_printer)
+"""Proxy to the printer addressed by the current request, see :func:`get_requested_printer`."""
+
+
 def get_json_command_from_request(request, valid_commands):
     data = request.get_json()
 
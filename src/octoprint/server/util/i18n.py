@@ -0,0 +1,298 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import hashlib
+import logging
+import os
+import re
+import threading
+
+import octoprint.plugin
+import octoprint.util.files
+from octoprint.util import atomic_write, dict_merge
+from octoprint.util.files import (
+    PRECOMPRESSED_VARIANTS,
+    get_precompressed_variant,
+    write_precompressed_variants,
+)
+
+BUNDLE_FORMAT = 1
+
+_valid_name = re.compile(r"^[A-Za-z0-9_@-]+$")
+
+
+def get_translation_files(locale, domain, core_path, user_path):
+    """
+    Returns the paths of all ``.po`` files that might contribute to the translations
+    of ``domain`` in ``locale``, in merge order. Not all of them necessarily exist.
+    """
+
+    def get_po_path(basedir, locale, domain):
+        return os.path.join(basedir, locale, "LC_MESSAGES", f"{domain}.po")
+
+    po_files = []
+
+    user_plugin_path = os.path.join(user_path, "_plugins")
+
+    # plugin translations
+    plugins = octoprint.plugin.plugin_manager().enabled_plugins
+    for name, plugin in plugins.items():
+        dirs = [
+            os.path.join(user_plugin_path, name),
+            os.path.join(plugin.location, "translations"),
+        ]
+        for dirname in dirs:
+            po_files.append(get_po_path(dirname, locale, domain))
+
+    # core translations
+    dirs = [user_path, core_path]
+    for dirname in dirs:
+        po_files.append(get_po_path(dirname, locale, domain))
+
+    return po_files
+
+
+def read_translations(po_files, locale, domain):
+    """
+    Reads and merges the messages from the provided ``.po`` files.
+
+    Returns:
+        tuple: the merged messages and the plural expression
+    """
+    from babel.messages.pofile import read_po
+
+    messages = {}
+    plural_expr = None
+
+    def messages_from_po(path, locale, domain):
+        messages = {}
+        with open(path, encoding="utf-8") as f:
+            catalog = read_po(f, locale=locale, domain=domain)
+
+            for message in catalog:
+                message_id = message.id
+                if isinstance(message_id, (list, tuple)):
+                    message_id = message_id[0]
+                if message.string:
+                    messages[message_id] = message.string
+
+        return messages, catalog.plural_expr
+
+    for po_file in po_files:
+        if not os.path.exists(po_file):
+            continue
+        po_messages, plural_expr = messages_from_po(po_file, locale, domain)
+        if po_messages is not None:
+            messages = dict_merge(messages, po_messages, in_place=True)
+
+    return messages, plural_expr
+
+
+class TranslationBundle:
+    """
+    A pre-rendered translation catalog.
+
+    Attributes:
+        etag (str): fingerprint of the sources the bundle was built from
+        lastmodified (float): newest modification time of the sources, or None
+        path (str): path of the rendered bundle, pre-compressed variants live next
+            to it. None for bundles without any sources.
+        data (bytes): the rendered bundle if it wasn't written to disk
+    """
+
+    def __init__(self, etag, lastmodified=None, path=None, data=None):
+        self.etag = etag
+        self.lastmodified = lastmodified
+        self.path = path
+        self.data = data
+
+    def variant(self, accept_encoding):
+        """
+        Returns the path and content encoding of the preferred pre-compressed variant
+        acceptable according to ``accept_encoding``, or None if there's none.
+        """
+        if self.path is None:
+            return None
+        return get_precompressed_variant(self.path, accept_encoding)
+
+    def read(self, path=None):
+        """Reads the bundle, or the variant at ``path``."""
+        if path is None:
+            path = self.path
+        if path is None:
+            return self.data
+
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class TranslationBundles:
+    """
+    Builds and keeps track of the translation bundles served to the frontend.
+
+    Merging the ``.po`` files of core and all plugins is expensive, so bundles get
+    built once per locale and domain, rendered and compressed into ``folder`` and
+    then served as they are. Bundles are named after a fingerprint of their sources,
+    so they survive restarts and change whenever a translation gets added, removed
+    or updated.
+
+    Arguments:
+        folder (str): folder to write the bundles to
+        core_path (str): folder of the bundled core translations
+        user_path (str): folder of the installed language packs
+        renderer (callable): renders a catalog dict to the bundle's source
+    """
+
+    def __init__(self, folder, core_path, user_path, renderer):
+        self._logger = logging.getLogger(__name__)
+
+        self._folder = folder
+        self._core_path = core_path
+        self._user_path = user_path
+        self._renderer = renderer
+
+        self._bundles = {}
+        self._mutex = threading.RLock()
+
+    def get(self, locale, domain):
+        """
+        Returns the :class:`TranslationBundle` for ``locale`` and ``domain``, building
+        it first if necessary.
+
+        Raises:
+            ValueError: if locale or domain are not valid names
+        """
+        if not _valid_name.match(locale) or not _valid_name.match(domain):
+            raise ValueError(f"Invalid locale or domain: {locale}/{domain}")
+
+        bundle = self._bundles.get((locale, domain))
+        if bundle is None:
+            with self._mutex:
+                bundle = self._bundles.get((locale, domain))
+                if bundle is None:
+                    bundle = self._build(locale, domain)
+        return bundle
+
+    def build(self, locales, domains=("messages",)):
+        """Builds the bundles for all combinations of ``locales`` and ``domains``."""
+        for locale in locales:
+            for domain in domains:
+                try:
+                    self.get(locale, domain)
+                except Exception:
+                    self._logger.exception(
+                        f"Error while building translation bundle for {locale}/{domain}"
+                    )
+
+    def rebuild(self, locales=None, domains=("messages",)):
+        """
+        Forgets all known bundles and builds them, or the provided ``locales``,
+        again in the background. Unchanged bundles are reused from disk.
+        """
+        with self._mutex:
+            if locales is None:
+                locales = {locale for locale, _ in self._bundles}
+            self._bundles.clear()
+
+        thread = threading.Thread(
+            target=self.build,
+            args=(sorted(locales), domains),
+            name="TranslationBundleBuilder",
+        )
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _build(self, locale, domain):
+        if locale == "en":
+            files = []
+        else:
+            files = [
+                path
+                for path in get_translation_files(
+                    locale, domain, self._core_path, self._user_path
+                )
+                if os.path.isfile(path)
+            ]
+
+        etag, lastmodified = self._fingerprint(locale, domain, files)
+
+        if not files:
+            # nothing to merge and nothing worth persisting, and we don't want to
+            # fill the disk with bundles for arbitrary locales
+            bundle = TranslationBundle(
+                etag, data=self._render(locale, domain, {}, None).encode("utf-8")
+            )
+            self._bundles[(locale, domain)] = bundle
+            return bundle
+
+        folder = os.path.join(self._folder, locale)
+        path = os.path.join(folder, f"{domain}-{etag}.js")
+
+        if not os.path.isfile(path) or not os.path.isfile(path + ".gz"):
+            self._logger.debug(f"Building translation bundle for {locale}/{domain}")
+
+            messages, plural_expr = read_translations(files, locale, domain)
+            data = self._render(locale, domain, messages, plural_expr).encode("utf-8")
+
+            os.makedirs(folder, exist_ok=True)
+            with atomic_write(path, mode="wb") as f:
+                f.write(data)
+            write_precompressed_variants(path, data)
+
+            self._remove_outdated(folder, domain, path)
+
+        bundle = TranslationBundle(etag, lastmodified=lastmodified, path=path)
+        self._bundles[(locale, domain)] = bundle
+        return bundle
+
+    def _render(self, locale, domain, messages, plural_expr):
+        return self._renderer(
+            {
+                "messages": messages,
+                "plural_expr": plural_expr,
+                "locale": locale,
+                "domain": domain,
+            }
+        )
+
+    def _remove_outdated(self, folder, domain, path):
+        keep = [os.path.basename(path)] + [
+            os.path.basename(path) + extension for _, extension in PRECOMPRESSED_VARIANTS
+        ]
+        for entry in os.scandir(folder):
+            if entry.name.startswith(f"{domain}-") and entry.name not in keep:
+                try:
+                    os.remove(entry.path)
+                except Exception:
+                    self._logger.exception(
+                        f"Error while removing outdated translation bundle {entry.path}"
+                    )
+
+    @staticmethod
+    def _fingerprint(locale, domain, files):
+        from octoprint import __version__
+
+        hash = hashlib.sha1()
+
+        def hash_update(value):
+            hash.update(str(value).encode("utf-8"))
+            hash.update(b"\0")
+
+        hash_update(BUNDLE_FORMAT)
+        hash_update(__version__)
+        hash_update(locale)
+        hash_update(domain)
+        hash_update(octoprint.util.files.brotli is not None)
+
+        lastmodified = None
+        for path in files:
+            stat = os.stat(path)
+            hash_update(path)
+            hash_update(stat.st_mtime_ns)
+            hash_update(stat.st_size)
+
+            if lastmodified is None or stat.st_mtime > lastmodified:
+                lastmodified = stat.st_mtime
+
+        return hash.hexdigest(), lastmodified
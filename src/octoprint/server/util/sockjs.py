@@ -6,6 +6,7 @@ import logging
 import re
 import threading
 import time
+import weakref
 
 import wrapt
 
@@ -23,11 +24,21 @@ from octoprint.access.groups import GroupChangeListener
 from octoprint.access.permissions import Permissions
 from octoprint.access.users import LoginStatusListener, SessionUser
 from octoprint.events import Events
+from octoprint.printer import DEFAULT_PRINTER
 from octoprint.settings import settings
-from octoprint.util import RepeatedTimer
+from octoprint.util import RepeatedTimer, metrics
 from octoprint.util.json import dumps as json_dumps
 from octoprint.util.version import get_python_version_string
 
+_clients = metrics.gauge("octoprint_sockjs_clients", "Number of connected clients")
+_message_bytes = metrics.counter(
+    "octoprint_sockjs_message_bytes_total",
+    "Size of the messages exchanged with clients",
+    labelnames=("direction",),
+)
+_sent_bytes = _message_bytes.labels("sent")
+_received_bytes = _message_bytes.labels("received")
+
 
 class ThreadSafeSession(octoprint.vendor.sockjs.tornado.session.Session):
     def __init__(self, conn, server, session_id, expiry=None):
@@ -65,11 +76,154 @@ class ThreadSafeSession(octoprint.vendor.sockjs.tornado.session.Session):
 
 class JsonEncodingSessionWrapper(wrapt.ObjectProxy):
     def send_message(self, msg, stats=True, binary=False):
-        self.send_jsonified(
-            json_dumps(octoprint.vendor.sockjs.tornado.util.bytes_to_str(msg)),
-            stats,
+        data = json_dumps(octoprint.vendor.sockjs.tornado.util.bytes_to_str(msg))
+        _sent_bytes.inc(len(data))
+        self.send_jsonified(data, stats)
+
+
+class TerminalFilterSet:
+    """
+    A combination of terminal filters, shared by all connections subscribed to it.
+
+    Every line is only matched once against the combined regex of the set no matter how many
+    connections are using it, the verdicts are cached for the connections that follow.
+
+    Use :meth:`for_names` to get the shared set for a list of configured filter names.
+
+    Arguments:
+        filters (tuple): tuples of name and regex of the filters in the set
+    """
+
+    _cache_size = 1000
+
+    _sets = weakref.WeakValueDictionary()
+    _sets_mutex = threading.Lock()
+
+    @classmethod
+    def for_names(cls, names):
+        """
+        Returns the shared filter set for the configured ``terminalFilters`` named ``names``.
+
+        Unknown names are ignored.
+        """
+        names = set(names)
+        filters = tuple(
+            sorted(
+                (entry["name"], entry["regex"])
+                for entry in settings().get(["terminalFilters"])
+                if entry.get("name") in names
+            )
         )
 
+        with cls._sets_mutex:
+            filter_set = cls._sets.get(filters)
+            if filter_set is None:
+                filter_set = cls._sets[filters] = cls(filters)
+            return filter_set
+
+    def __init__(self, filters):
+        self.filters = filters
+
+        patterns = []
+        for name, regex in filters:
+            try:
+                re.compile(regex)
+            except re.error:
+                logging.getLogger(__name__).warning(
+                    f"Terminal filter {name} has a regex not supported by the server, ignoring it: {regex}"
+                )
+            else:
+                patterns.append(f"(?:{regex})")
+
+        self._regex = re.compile("|".join(patterns)) if patterns else None
+        self._verdicts = {}
+
+    def matches(self, line):
+        """Whether ``line`` is matched by the set and thus to be filtered out."""
+        if self._regex is None:
+            return False
+
+        try:
+            return self._verdicts[line]
+        except KeyError:
+            pass
+
+        result = self._regex.search(line) is not None
+        if len(self._verdicts) >= self._cache_size:
+            self._verdicts.clear()
+        self._verdicts[line] = result
+        return result
+
+    def filter(self, lines):
+        """
+        Filters ``lines``.
+
+        Returns:
+            tuple: the remaining lines and the number of lines filtered out
+        """
+        result = [line for line in lines if not self.matches(line)]
+        return result, len(lines) - len(result)
+
+
+class AdditionalPrinterForwarder(octoprint.printer.PrinterCallback):
+    """
+    Forwards the state of one of the server's additional printers to a
+    :class:`PrinterStateConnection` that subscribed to it.
+
+    Temperatures, logs and messages are collected between state updates and sent along
+    with the next one, updates arriving faster than the connection's rate limit are dropped.
+    """
+
+    def __init__(self, connection, printer):
+        self._connection = connection
+        self._printer = printer
+
+        self._mutex = threading.Lock()
+        self._temperatures = []
+        self._logs = []
+        self._messages = []
+        self._last_current = 0
+
+    @property
+    def printer(self):
+        return self._printer
+
+    def on_printer_add_temperature(self, data):
+        with self._mutex:
+            self._temperatures.append(data)
+
+    def on_printer_add_log(self, data):
+        with self._mutex:
+            self._logs.append(data)
+
+    def on_printer_add_message(self, data):
+        with self._mutex:
+            self._messages.append(data)
+
+    def on_printer_send_initial_data(self, data):
+        self._connection.send_printer_state("history", self._printer, data)
+
+    def on_printer_send_current_data(self, data):
+        now = time.time()
+        with self._mutex:
+            if now - self._last_current < self._connection.rate_limit:
+                return
+            self._last_current = now
+
+            temperatures, self._temperatures = self._temperatures, []
+            logs, self._logs = self._logs, []
+            messages, self._messages = self._messages, []
+
+        data.update(
+            {
+                "temps": temperatures,
+                "logs": logs,
+                "messages": messages,
+                "markings": list(self._printer.get_markings()),
+            }
+        )
+        self._connection.send_printer_state("current", self._printer, data)
+
 
 class PrinterStateConnection(
     octoprint.vendor.sockjs.tornado.SockJSConnection,
@@ -123,6 +277,7 @@ class PrinterStateConnection(
         pluginManager,
         connectivityChecker,
         session,
+        printers=None,
     ):
         if isinstance(session, octoprint.vendor.sockjs.tornado.session.Session):
             session = JsonEncodingSessionWrapper(session)
@@ -142,6 +297,8 @@ class PrinterStateConnection(
         self._unauthed_backlog_mutex = threading.RLock()
 
         self._printer = printer
+        self._printers = printers
+        self._printer_forwarders = {}
         self._fileManager = fileManager
         self._analysisQueue = analysisQueue
         self._userManager = userManager
@@ -173,7 +330,14 @@ class PrinterStateConnection(
         self._initial_data_sent = False
 
         self._subscriptions_active = False
-        self._subscriptions = {"state": False, "plugins": [], "events": []}
+        self._subscriptions = {
+            "state": False,
+            "plugins": [],
+            "events": [],
+            "printers": [],
+        }
+
+        self._terminal_filters = None
 
         self._keep_alive = RepeatedTimer(
             60, self._keep_alive_callback, condition=lambda: self._authed
@@ -212,6 +376,7 @@ class PrinterStateConnection(
         self._pluginManager.register_message_receiver(self.on_plugin_message)
         self._remoteAddress = self._get_remote_address(info)
         self._logger.info("New connection from client: %s" % self._remoteAddress)
+        _clients.inc()
 
         self._userManager.register_login_status_listener(self)
         self._groupManager.register_listener(self)
@@ -273,12 +438,15 @@ class PrinterStateConnection(
         )
 
         self._logger.info("Client connection closed: %s" % self._remoteAddress)
+        _clients.dec()
 
         self._on_logout()
         self._remoteAddress = None
         self._pluginManager.unregister_message_receiver(self.on_plugin_message)
 
     def on_message(self, message):
+        _received_bytes.inc(len(message))
+
         try:
             import json
 
@@ -338,6 +506,26 @@ class PrinterStateConnection(
                     )
                 )
 
+        elif "terminalFilters" in message:
+            names = message["terminalFilters"]
+            if not isinstance(names, list) or not all(
+                isinstance(name, str) for name in names
+            ):
+                self._logger.warning(
+                    "Got invalid terminal filters from client {}, ignoring: {!r}".format(
+                        self._remoteAddress, names
+                    )
+                )
+            else:
+                old_filters = self._terminal_filters
+                self._terminal_filters = (
+                    TerminalFilterSet.for_names(names) if names else None
+                )
+
+                if self._terminal_filters is not old_filters and self._initial_data_sent:
+                    # resend the history so the client sees it filtered by the new set
+                    self._printer.send_initial_callback(self)
+
         elif "subscribe" in message:
             if not self._subscriptions_active:
                 self._subscriptions_active = True
@@ -380,6 +568,12 @@ class PrinterStateConnection(
                 plugins = list_or_boolean(subscribe.get("plugins", []))
                 events = list_or_boolean(subscribe.get("events", []))
 
+                printers = subscribe.get("printers", [])
+                if not isinstance(printers, list) or not all(
+                    isinstance(printer, str) for printer in printers
+                ):
+                    raise ValueError("printers must be a list of printer identifiers")
+
             except ValueError as e:
                 self._logger.warning(
                     "Got invalid subscription message from client {}, ignoring: {!r} ({}) ".format(
@@ -391,6 +585,10 @@ class PrinterStateConnection(
                 self._subscriptions["state"] = state
                 self._subscriptions["plugins"] = plugins
                 self._subscriptions["events"] = events
+                self._subscriptions["printers"] = printers
+
+                if self._registered:
+                    self._register_printer_forwarders()
 
                 if state and state != old_state:
                     # state is requested and was changed from previous state
@@ -465,6 +663,7 @@ class PrinterStateConnection(
 
         data.update(
             {
+                "printer": DEFAULT_PRINTER,
                 "serverTime": time.time(),
                 "temps": temperatures,
                 "busyFiles": busy_files,
@@ -472,12 +671,15 @@ class PrinterStateConnection(
             }
         )
         if self._user.has_permission(Permissions.MONITOR_TERMINAL):
+            logs, filtered = self._filter_terminal(self._filter_logs(logs))
             data.update(
                 {
-                    "logs": self._filter_logs(logs),
+                    "logs": logs,
                     "messages": self._filter_messages(messages),
                 }
             )
+            if filtered is not None:
+                data["logsFiltered"] = filtered
         self._emit("current", payload=data)
 
     def on_printer_send_initial_data(self, data):
@@ -488,14 +690,75 @@ class PrinterStateConnection(
 
         data_to_send = dict(data)
 
+        data_to_send["printer"] = DEFAULT_PRINTER
         data_to_send["serverTime"] = time.time()
         if self._user.has_permission(Permissions.MONITOR_TERMINAL):
-            data_to_send["logs"] = self._filter_logs(data_to_send.get("logs", []))
+            logs, filtered = self._filter_terminal(
+                self._filter_logs(data_to_send.get("logs", []))
+            )
+            data_to_send["logs"] = logs
             data_to_send["messages"] = self._filter_messages(
                 data_to_send.get("messages", [])
             )
+            if filtered is not None:
+                data_to_send["logsFiltered"] = filtered
         self._emit("history", payload=data_to_send)
 
+    @property
+    def rate_limit(self):
+        """Minimum interval between two state updates sent to the client, in seconds."""
+        return self._base_rate_limit * self._throttle_factor
+
+    def send_printer_state(self, type, printer, data):
+        """
+        Sends ``current`` or ``history`` ``data`` of one of the additional printers the client
+        subscribed to, tagged with the printer's identifier.
+        """
+        if not self._user.has_permission(Permissions.STATUS):
+            return
+
+        data = dict(data)
+        data["printer"] = printer.identifier
+        data["serverTime"] = time.time()
+        if self._user.has_permission(Permissions.MONITOR_TERMINAL):
+            if self._subscriptions["state"]:
+                # apply the log and message filters of the state subscription, if any
+                data["logs"] = self._filter_logs(data.get("logs", []))
+                data["messages"] = self._filter_messages(data.get("messages", []))
+        else:
+            data.pop("logs", None)
+            data.pop("messages", None)
+        self._emit(type, payload=data)
+
+    def _register_printer_forwarders(self):
+        wanted = set()
+        if self._printers is not None:
+            for identifier in self._subscriptions["printers"]:
+                if identifier == DEFAULT_PRINTER:
+                    continue
+                if identifier not in self._printers:
+                    self._logger.warning(
+                        f"Client {self._remoteAddress} subscribed to unknown printer {identifier}, ignoring"
+                    )
+                    continue
+                wanted.add(identifier)
+
+        for identifier in set(self._printer_forwarders) - wanted:
+            forwarder = self._printer_forwarders.pop(identifier)
+            forwarder.printer.unregister_callback(forwarder)
+
+        for identifier in wanted - set(self._printer_forwarders):
+            printer = self._printers.get(identifier)
+            forwarder = AdditionalPrinterForwarder(self, printer)
+            self._printer_forwarders[identifier] = forwarder
+            printer.register_callback(forwarder)
+            printer.send_initial_callback(forwarder)
+
+    def _unregister_printer_forwarders(self):
+        for forwarder in self._printer_forwarders.values():
+            forwarder.printer.unregister_callback(forwarder)
+        self._printer_forwarders.clear()
+
     def _filter_state_subscription(self, sub, values):
         if not self._subscriptions_active or self._subscriptions["state"][sub] is True:
             return values
@@ -511,6 +774,12 @@ class PrinterStateConnection(
     def _filter_messages(self, messages):
         return self._filter_state_subscription("messages", messages)
 
+    def _filter_terminal(self, logs):
+        terminal_filters = self._terminal_filters
+        if terminal_filters is None:
+            return logs, None
+        return terminal_filters.filter(logs)
+
     def sendEvent(self, type, payload=None):
         permissions = self._event_permissions.get(type, self._event_permissions["*"])
         permissions = [x(self._user) if callable(x) else x for x in permissions]
@@ -638,6 +907,7 @@ class PrinterStateConnection(
         # printer
         self._printer.register_callback(self)
         self._printer.send_initial_callback(self)
+        self._register_printer_forwarders()
 
         # files
         self._fileManager.register_slicingprogress_callback(self)
@@ -667,6 +937,7 @@ class PrinterStateConnection(
         """Unregister this socket from the system"""
 
         self._printer.unregister_callback(self)
+        self._unregister_printer_forwarders()
         self._fileManager.unregister_slicingprogress_callback(self)
         octoprint.timelapse.unregister_callback(self)
         for event in octoprint.events.all_events():
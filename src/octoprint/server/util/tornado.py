@@ -4,6 +4,8 @@ __copyright__ = "Copyright (C) 2014 The OctoPrint Project - Released under terms
 
 import asyncio
 import collections
+import fnmatch
+import functools
 import io
 import logging
 import mimetypes
@@ -11,6 +13,9 @@ import os
 import re
 import secrets
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 from urllib.parse import urlparse
 
@@ -34,6 +39,24 @@ from zipstream.ng import ZIP_DEFLATED, ZipStream
 
 import octoprint.util
 import octoprint.util.net
+from octoprint.util import metrics
+from octoprint.util.files import PRECOMPRESSED_VARIANTS, get_precompressed_variant
+
+_lane_waiting = metrics.gauge(
+    "octoprint_http_lane_waiting_requests",
+    "HTTP requests waiting for a free worker, by request lane",
+    labelnames=("lane",),
+)
+_lane_wait_seconds = metrics.histogram(
+    "octoprint_http_lane_queue_wait_seconds",
+    "Time HTTP requests spent waiting for a free worker, by request lane",
+    labelnames=("lane",),
+)
+_lane_rejected = metrics.counter(
+    "octoprint_http_lane_rejected_total",
+    "HTTP requests rejected due to a full request lane",
+    labelnames=("lane",),
+)
 
 
 # Tornado 6.5.x needs _chars_are_bytes hack to work around regression, see tornadoweb/tornado#3502
@@ -842,6 +865,160 @@ def _validate_multipart_body(
         ) from exc
 
 
+class RequestLane:
+    """
+    A bounded pool of worker threads handling the WSGI requests routed to it by a
+    :class:`RequestLaneRouter`.
+
+    Arguments:
+        name (str): name of the lane, used for naming its threads and in metrics
+        workers (int): number of worker threads, defaults to the default of
+            ``concurrent.futures.ThreadPoolExecutor``
+        queue (int): maximum number of requests waiting for a free worker on top of
+            the ones being handled, unlimited if None
+        routes (list): endpoints (e.g. ``api.controlJob`` or ``plugin.backup.*``) or,
+            if starting with ``/``, paths (e.g. ``/api/plugin/pluginmanager``) handled
+            by this lane, wildcards are supported
+    """
+
+    def __init__(self, name, workers=None, queue=None, routes=None):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.routes = list(routes) if routes else []
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"WsgiRequestHandler-{name}"
+        )
+
+        self._waiting = 0
+        self._running = 0
+        self._mutex = threading.Lock()
+
+        _lane_waiting.labels(name).set_function(lambda: self._waiting)
+        self._wait_seconds = _lane_wait_seconds.labels(name)
+        self._rejected = _lane_rejected.labels(name)
+
+    @property
+    def waiting(self):
+        return self._waiting
+
+    @property
+    def running(self):
+        return self._running
+
+    def matches(self, endpoint, path):
+        for route in self.routes:
+            if route.startswith("/"):
+                if fnmatch.fnmatchcase(path, route):
+                    return True
+            elif endpoint is not None and fnmatch.fnmatchcase(endpoint, route):
+                return True
+        return False
+
+    def submit(self, f, *args):
+        """
+        Submits the request handled by ``f`` to the lane's workers.
+
+        The request counts as running from the moment a worker picks it up until
+        :meth:`finish` is called, so that streaming its response through :meth:`run`
+        is accounted for as well. If ``f`` raises, the request is finished right away.
+
+        Returns:
+            concurrent.futures.Future: the future of the call, or None if the lane's
+                queue is full
+        """
+        with self._mutex:
+            if (
+                self.queue is not None
+                and self._waiting + self._running
+                >= self.executor._max_workers + self.queue
+            ):
+                self._rejected.inc()
+                return None
+            self._waiting += 1
+
+        queued = time.monotonic()
+
+        def run():
+            with self._mutex:
+                self._waiting -= 1
+                self._running += 1
+            self._wait_seconds.observe(time.monotonic() - queued)
+            try:
+                return f(*args)
+            except BaseException:
+                self.finish()
+                raise
+
+        try:
+            return self.executor.submit(run)
+        except Exception:
+            with self._mutex:
+                self._waiting -= 1
+            raise
+
+    def run(self, f, *args):
+        """
+        Runs ``f`` on the lane's workers as part of a request already submitted
+        through :meth:`submit`, e.g. to read the next chunk of its response.
+
+        Returns:
+            concurrent.futures.Future: the future of the call
+        """
+        return self.executor.submit(f, *args)
+
+    def finish(self):
+        """Marks a request submitted through :meth:`submit` as done."""
+        with self._mutex:
+            self._running -= 1
+
+
+class RequestLaneRouter:
+    """
+    Routes requests to the first of the provided :class:`RequestLane` instances that
+    matches either their endpoint, as determined through the ``url_map`` of the Flask
+    application, or their path. Requests not matching any lane go to the last one.
+
+    Arguments:
+        lanes (list): the lanes to route to
+        url_map (werkzeug.routing.Map): the application's URL map to look up endpoints
+            in, only paths will be matched if None
+        cache_size (int): number of routing decisions to cache
+    """
+
+    def __init__(self, lanes, url_map=None, cache_size=1024):
+        if not lanes:
+            raise ValueError("At least one request lane is required")
+
+        self.lanes = list(lanes)
+        self.url_map = url_map
+
+        self._route = functools.lru_cache(maxsize=cache_size)(self._route)
+
+    def __call__(self, method, path):
+        """Returns the :class:`RequestLane` to handle ``method`` requests to ``path``."""
+        return self._route(method, path)
+
+    def _route(self, method, path):
+        endpoint = self._endpoint(method, path)
+        for lane in self.lanes:
+            if lane.matches(endpoint, path):
+                return lane
+        return self.lanes[-1]
+
+    def _endpoint(self, method, path):
+        if self.url_map is None:
+            return None
+
+        try:
+            endpoint, _ = self.url_map.bind("localhost").match(path, method=method)
+            return endpoint
+        except Exception:
+            # not found, method not allowed, redirect - let the app handle that
+            return None
+
+
 class WsgiInputContainer:
     """
     A WSGI container for use with Tornado that allows supplying the request body to be used for ``wsgi.input`` in the
@@ -863,6 +1040,10 @@ class WsgiInputContainer:
 
     Additionally, some headers can be added or removed from the response by supplying ``forced_headers`` and
     ``removed_headers`` arguments. ``forced_headers`` will be added to the response, ``removed_headers`` will be removed.
+
+    If a :class:`RequestLaneRouter` is supplied as ``lanes``, requests will be handled by the workers of the lane they
+    get routed to instead of ``executor``. Requests routed to a lane with a full queue will be answered with a
+    ``503 Service Unavailable`` and a ``Retry-After`` header of ``retry_after`` seconds.
     """
 
     def __init__(
@@ -872,9 +1053,13 @@ class WsgiInputContainer:
         headers=None,
         forced_headers=None,
         removed_headers=None,
+        lanes=None,
+        retry_after=5,
     ):
         self.wsgi_application = wsgi_application
         self.executor = dummy_executor if executor is None else executor
+        self.lanes = lanes
+        self.retry_after = retry_after
 
         if headers is None:
             headers = {}
@@ -913,12 +1098,29 @@ class WsgiInputContainer:
 
         try:
             loop = IOLoop.current()
-            app_response = await loop.run_in_executor(
-                self.executor,
-                self.wsgi_application,
-                self.environ(request, body),
-                start_response,
-            )
+            lane = None
+
+            if self.lanes is not None:
+                lane = self.lanes(
+                    request.method,
+                    tornado.escape.url_unescape(request.path, plus=False),
+                )
+                app_future = lane.submit(
+                    self.wsgi_application, self.environ(request, body), start_response
+                )
+                if app_future is None:
+                    self._reject(request)
+                    return
+
+                app_response = await asyncio.wrap_future(app_future)
+            else:
+                app_response = await loop.run_in_executor(
+                    self.executor,
+                    self.wsgi_application,
+                    self.environ(request, body),
+                    start_response,
+                )
+
             try:
                 app_response_iter = iter(app_response)
 
@@ -929,13 +1131,19 @@ class WsgiInputContainer:
                         return None
 
                 while True:
-                    chunk = await loop.run_in_executor(self.executor, next_chunk)
+                    if lane is not None:
+                        # streaming the response still occupies the lane
+                        chunk = await asyncio.wrap_future(lane.run(next_chunk))
+                    else:
+                        chunk = await loop.run_in_executor(self.executor, next_chunk)
                     if chunk is None:
                         break
                     response.append(chunk)
             finally:
                 if hasattr(app_response, "close"):
                     app_response.close()
+                if lane is not None:
+                    lane.finish()
             body = b"".join(response)
             if not data:
                 raise Exception("WSGI app did not call start_response")
@@ -1048,6 +1256,23 @@ class WsgiInputContainer:
             environ["HTTP_" + key.replace("-", "_").upper()] = value
         return environ
 
+    def _reject(self, request):
+        body = b"Too many requests, please try again later"
+
+        start_line = tornado.httputil.ResponseStartLine(
+            "HTTP/1.1", 503, "Service Unavailable"
+        )
+        header_obj = tornado.httputil.HTTPHeaders()
+        header_obj.add("Content-Type", "text/plain; charset=UTF-8")
+        header_obj.add("Content-Length", str(len(body)))
+        header_obj.add("Retry-After", str(self.retry_after))
+        for header, value in self.forced_headers.items():
+            header_obj.add(header, value)
+
+        request.connection.write_headers(start_line, header_obj, chunk=body)
+        request.connection.finish()
+        self._log(503, request)
+
     def _log(self, status_code, request):
         access_log = logging.getLogger("tornado.access")
 
@@ -1316,8 +1541,12 @@ class LargeResponseHandler(
            called with the requested path as parameter.
        mime_type_guesser (function): Callback to guess the mime type to use for the content type encoding of the
            response. Will be called with the requested path on disk as parameter.
-       is_pre_compressed (bool): if the file is expected to be pre-compressed, i.e, if there is a file in the same
-           directory with the same name, but with '.gz' appended and gzip-encoded
+       is_pre_compressed (bool): if the file is expected to be pre-compressed, i.e, if there are files in the same
+           directory with the same name, but with '.br' or '.gz' appended and Brotli or gzip-encoded, as written by
+           :func:`octoprint.util.files.write_precompressed_variants`. The preferred variant acceptable to the client
+           will be served.
+       immutable (bool): Whether to allow clients to cache versioned requests, i.e. requests with a query string,
+           indefinitely. Only set this if the query string changes whenever the requested file does.
     """
 
     def initialize(
@@ -1333,6 +1562,7 @@ class LargeResponseHandler(
         mime_type_guesser=None,
         is_pre_compressed=False,
         stream_body=False,
+        immutable=False,
     ):
         tornado.web.StaticFileHandler.initialize(
             self, os.path.abspath(path), default_filename
@@ -1346,11 +1576,12 @@ class LargeResponseHandler(
         self._mime_type_guesser = mime_type_guesser
         self._is_pre_compressed = is_pre_compressed
         self._stream_body = stream_body
+        self._immutable = immutable
+
+        self._precompressed_extension = None
 
     def should_use_precompressed(self):
-        return self._is_pre_compressed and "gzip" in self.request.headers.get(
-            "Accept-Encoding", ""
-        )
+        return self._precompressed_extension is not None
 
     def get(self, path, include_body=True):
         if self._access_validation is not None:
@@ -1358,11 +1589,19 @@ class LargeResponseHandler(
         if self._path_validation is not None:
             self._path_validation(path)
 
-        if self.should_use_precompressed():
-            if os.path.exists(os.path.join(self.root, path + ".gz")):
-                self.set_header("Content-Encoding", "gzip")
-                path = path + ".gz"
-            else:
+        if self._is_pre_compressed:
+            self.set_header("Vary", "Accept-Encoding")
+
+            accept_encoding = self.request.headers.get("Accept-Encoding", "")
+            variant = get_precompressed_variant(
+                os.path.join(self.root, path), accept_encoding
+            )
+            if variant is not None:
+                _, encoding = variant
+                self._precompressed_extension = dict(PRECOMPRESSED_VARIANTS)[encoding]
+                self.set_header("Content-Encoding", encoding)
+                path = path + self._precompressed_extension
+            elif "gzip" in accept_encoding:
                 logging.getLogger(__name__).warning(
                     "Precompressed assets expected but {}.gz does not exist "
                     "in {}, using plain file instead.".format(path, self.root)
@@ -1427,14 +1666,18 @@ class LargeResponseHandler(
         if not self._allow_client_caching:
             self.set_header("Cache-Control", "max-age=0, must-revalidate, private")
             self.set_header("Expires", "-1")
+        elif self._immutable and self.request.query:
+            self.set_header("Cache-Control", "public, max-age=31536000, immutable")
 
         self.set_header("X-Original-Content-Length", str(self.get_content_size()))
 
     @property
     def original_absolute_path(self):
         """The path of the uncompressed file corresponding to the compressed file"""
-        if self._is_pre_compressed:
-            return self.absolute_path.rstrip(".gz")
+        if self._precompressed_extension and self.absolute_path.endswith(
+            self._precompressed_extension
+        ):
+            return self.absolute_path[: -len(self._precompressed_extension)]
         return self.absolute_path
 
     def compute_etag(self):
@@ -1443,6 +1686,10 @@ class LargeResponseHandler(
         else:
             etag = str(self.get_content_version(self.absolute_path))
 
+        if self._precompressed_extension:
+            # variants need to be told apart
+            etag = etag.strip('"') + self._precompressed_extension
+
         if not etag.endswith('"'):
             etag = f'"{etag}"'
         return etag
@@ -2,7 +2,6 @@ __author__ = "Gina Häußge <gina@octoprint.org>"
 __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
 __copyright__ = "Copyright (C) 2017 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
-import gzip
 import logging
 import os
 import re
@@ -17,6 +16,11 @@ from webassets.filter.rjsmin import rjsmin
 from webassets.merge import BaseHunk, MemoryHunk
 from webassets.version import Manifest
 
+from octoprint.util.files import (
+    PRECOMPRESSED_VARIANTS,
+    write_precompressed_variants,
+)
+
 
 def replace_url(source_url, output_url, url):
     # If path is an absolute one, keep it
@@ -118,6 +122,11 @@ class RJSMinExtended(Filter):
 
 
 class GzipFile(Filter):
+    """
+    Writes pre-compressed variants of the output next to it, gzip and, if available,
+    Brotli.
+    """
+
     name = "gzip"
     options = {}
 
@@ -128,23 +137,23 @@ class GzipFile(Filter):
         # webassets requires us to output a "str", but we can't do that since gzip
         # provides binary outputs.
         #
-        # We work around that by outputting the gzipped file to another path
+        # We work around that by outputting the compressed files to other paths
         output_path = kwargs.get("output_path", None)
         if output_path:
-            gzipped_output_path = output_path + ".gz"
             try:
-                with gzip.open(gzipped_output_path, "wb", 9) as f:
-                    f.write(data.encode("utf8"))
+                write_precompressed_variants(output_path, data.encode("utf8"))
             except Exception:
                 logging.getLogger(__name__).exception(
-                    f"Error writing gzipped output of {output_path} to {gzipped_output_path}"
+                    f"Error writing compressed output of {output_path}"
                 )
-                try:
-                    os.remove(gzipped_output_path)
-                except Exception:
-                    logging.getLogger(__name__).exception(
-                        f"Error removing broken .gz from {gzipped_output_path}"
-                    )
+                for _, extension in PRECOMPRESSED_VARIANTS:
+                    try:
+                        if os.path.exists(output_path + extension):
+                            os.remove(output_path + extension)
+                    except Exception:
+                        logging.getLogger(__name__).exception(
+                            f"Error removing broken {extension} from {output_path}"
+                        )
 
 
 class ChainedHunk(BaseHunk):
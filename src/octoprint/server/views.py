@@ -39,6 +39,7 @@ from octoprint.server import (  # noqa: F401
     groupManager,
     pluginManager,
     preemptiveCache,
+    translationBundles,
     userManager,
 )
 from octoprint.server.util import (
@@ -50,7 +51,7 @@ from octoprint.server.util import (
 from octoprint.server.util.csrf import add_csrf_cookie
 from octoprint.server.util.flask import credentials_checked_recently
 from octoprint.settings import settings, valid_boolean_trues
-from octoprint.util import sv, to_bytes, to_unicode
+from octoprint.util import metrics, sv, to_bytes, to_unicode
 from octoprint.util.version import get_octoprint_version, get_python_version_string
 
 from . import util
@@ -61,6 +62,11 @@ _templates = {}
 _plugin_names = None
 _plugin_vars = None
 
+# settings generation the template data per locale was fetched at, and how often
+# it actually changed since
+_templates_generation = {}
+_templates_version = defaultdict(int)
+
 _valid_id_re = re.compile("[a-z_]+")
 _valid_div_re = re.compile("[a-zA-Z_-]+")
 
@@ -528,6 +534,7 @@ def index():
         reauthentication_timeout,
         connectivityChecker.online,
         wizard_active(_templates.get(locale)),
+        _templates_version[locale],
     ] + sorted(
         "{}:{}".format(to_unicode(k, errors="replace"), to_unicode(v, errors="replace"))
         for k, v in _plugin_vars.items()
@@ -681,6 +688,7 @@ def index():
             )
             or util.flask.cache_check_status_code(response, _valid_status_for_cache),
         )(decorated_view)
+        decorated_view = util.flask.with_compression(decorated_view)
         decorated_view = util.flask.with_client_revalidation(decorated_view)
         decorated_view = util.flask.conditional(
             check_etag_and_lastmodified, NOT_MODIFIED
@@ -894,11 +902,13 @@ def fetch_template_data(refresh=False):
 
     locale = _locale_str(g.locale)
 
+    generation = settings().generation
     if (
         not refresh
         and _templates.get(locale) is not None
         and _plugin_names is not None
         and _plugin_vars is not None
+        and _templates_generation.get(locale) == generation
     ):
         return _templates[locale], _plugin_names, _plugin_vars
 
@@ -1596,7 +1606,16 @@ def fetch_template_data(refresh=False):
                 templates[t]["order"], sorted_missing
             )
 
+    if (
+        _templates.get(locale) != templates
+        or _plugin_names != plugin_names
+        or _plugin_vars != plugin_vars
+    ):
+        # only now rendered pages are outdated
+        _templates_version[locale] += 1
+
     _templates[locale] = templates
+    _templates_generation[locale] = generation
     _plugin_names = plugin_names
     _plugin_vars = plugin_vars
 
@@ -1737,38 +1756,37 @@ def robotsTxt():
     return send_from_directory(app.static_folder, "robots.txt")
 
 
+@app.route("/metrics")
+@Permissions.METRICS.require(403)
+def metricsExport():
+    response = make_response(metrics.registry().render())
+    response.headers["Content-Type"] = metrics.CONTENT_TYPE
+    return util.flask.add_non_caching_response_headers(response)
+
+
 @app.route("/i18n/<string:locale>/<string:domain>.js")
 @util.flask.conditional(lambda: _check_etag_and_lastmodified_for_i18n(), NOT_MODIFIED)
-@util.flask.etagged(
-    lambda _: _compute_etag_for_i18n(
-        request.view_args["locale"], request.view_args["domain"]
-    )
-)
-@util.flask.lastmodified(
-    lambda _: _compute_date_for_i18n(
-        request.view_args["locale"], request.view_args["domain"]
-    )
-)
+@util.flask.etagged(lambda _: _get_translation_bundle().etag)
+@util.flask.lastmodified(lambda _: _compute_date_for_i18n())
 def localeJs(locale, domain):
-    messages = {}
-    plural_expr = None
+    bundle = _get_translation_bundle()
+    if bundle is None:
+        abort(404)
 
-    if locale != "en":
-        messages, plural_expr = _get_translations(locale, domain)
-
-    catalog = {
-        "messages": messages,
-        "plural_expr": plural_expr,
-        "locale": locale,
-        "domain": domain,
-    }
-
-    from flask import Response
+    variant = bundle.variant(request.headers.get("Accept-Encoding", ""))
+    if variant is not None:
+        path, encoding = variant
+    else:
+        path, encoding = None, None
 
-    return Response(
-        render_template("i18n.js.jinja2", catalog=catalog),
+    response = Response(
+        bundle.read(path=path),
         content_type="application/x-javascript; charset=utf-8",
     )
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
 
 
 @app.route("/plugin_assets/<string:name>/<path:filename>")
@@ -1776,31 +1794,28 @@ def plugin_assets(name, filename):
     return redirect(url_for("plugin." + name + ".static", filename=filename))
 
 
-def _compute_etag_for_i18n(locale, domain, files=None, lastmodified=None):
-    if files is None:
-        files = _get_all_translationfiles(locale, domain)
-    if lastmodified is None:
-        lastmodified = _compute_date(files)
-    if lastmodified and not isinstance(lastmodified, str):
-        from werkzeug.http import http_date
-
-        lastmodified = http_date(lastmodified)
-
-    import hashlib
+def _get_translation_bundle():
+    if "translation_bundle" not in g:
+        try:
+            g.translation_bundle = translationBundles.get(
+                request.view_args["locale"], request.view_args["domain"]
+            )
+        except ValueError:
+            g.translation_bundle = None
+    return g.translation_bundle
 
-    hash = hashlib.sha1()
 
-    def hash_update(value):
-        hash.update(value.encode("utf-8"))
+def _compute_date_for_i18n():
+    from datetime import datetime
 
-    hash_update(",".join(sorted(files)))
-    if lastmodified:
-        hash_update(lastmodified)
-    return hash.hexdigest()
+    from octoprint.util.tz import UTC_TZ
 
+    lastmodified = _get_translation_bundle().lastmodified
+    if not lastmodified:
+        return None
 
-def _compute_date_for_i18n(locale, domain):
-    return _compute_date(_get_all_translationfiles(locale, domain))
+    # we set the micros to 0 since microseconds are not speced for HTTP
+    return datetime.fromtimestamp(lastmodified, tz=UTC_TZ).replace(microsecond=0)
 
 
 def _compute_date(files):
@@ -1831,14 +1846,13 @@ def _compute_date(files):
 
 
 def _check_etag_and_lastmodified_for_i18n():
-    locale = request.view_args["locale"]
-    domain = request.view_args["domain"]
+    bundle = _get_translation_bundle()
+    if bundle is None:
+        return False
 
-    etag_ok = util.flask.check_etag(
-        _compute_etag_for_i18n(request.view_args["locale"], request.view_args["domain"])
-    )
+    etag_ok = util.flask.check_etag(bundle.etag)
 
-    lastmodified = _compute_date_for_i18n(locale, domain)
+    lastmodified = _compute_date_for_i18n()
     lastmodified_ok = lastmodified is None or util.flask.check_lastmodified(lastmodified)
 
     return etag_ok and lastmodified_ok
@@ -1857,66 +1871,11 @@ def _get_all_assets():
 
 
 def _get_all_translationfiles(locale, domain):
-    from flask import current_app
-
-    def get_po_path(basedir, locale, domain):
-        return os.path.join(basedir, locale, "LC_MESSAGES", f"{domain}.po")
+    from octoprint.server.util.i18n import get_translation_files
 
-    po_files = []
-
-    user_base_path = os.path.join(
-        settings().getBaseFolder("translations", check_writable=False)
+    return get_translation_files(
+        locale,
+        domain,
+        os.path.join(app.root_path, "translations"),
+        settings().getBaseFolder("translations", check_writable=False),
     )
-    user_plugin_path = os.path.join(user_base_path, "_plugins")
-
-    # plugin translations
-    plugins = octoprint.plugin.plugin_manager().enabled_plugins
-    for name, plugin in plugins.items():
-        dirs = [
-            os.path.join(user_plugin_path, name),
-            os.path.join(plugin.location, "translations"),
-        ]
-        for dirname in dirs:
-            po_files.append(get_po_path(dirname, locale, domain))
-
-    # core translations
-    base_path = os.path.join(current_app.root_path, "translations")
-
-    dirs = [user_base_path, base_path]
-    for dirname in dirs:
-        po_files.append(get_po_path(dirname, locale, domain))
-
-    return po_files
-
-
-def _get_translations(locale, domain):
-    from babel.messages.pofile import read_po
-
-    from octoprint.util import dict_merge
-
-    messages = {}
-    plural_expr = None
-
-    def messages_from_po(path, locale, domain):
-        messages = {}
-        with open(path, encoding="utf-8") as f:
-            catalog = read_po(f, locale=locale, domain=domain)
-
-            for message in catalog:
-                message_id = message.id
-                if isinstance(message_id, (list, tuple)):
-                    message_id = message_id[0]
-                if message.string:
-                    messages[message_id] = message.string
-
-        return messages, catalog.plural_expr
-
-    po_files = _get_all_translationfiles(locale, domain)
-    for po_file in po_files:
-        if not os.path.exists(po_file):
-            continue
-        po_messages, plural_expr = messages_from_po(po_file, locale, domain)
-        if po_messages is not None:
-            messages = dict_merge(messages, po_messages, in_place=True)
-
-    return messages, plural_expr
@@ -693,17 +693,18 @@ class Settings:
 
         assert isinstance(default_settings, dict)
 
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._last_config_hash = None
+        self._last_effective_hash = None
+
         self._map = HierarchicalChainMap({}, default_settings)
         self.load_overlays(overlays)
 
         self._dirty = False
         self._dirty_time = 0
-        self._last_config_hash = None
-        self._last_effective_hash = None
         self._mtime = None
 
-        self._lock = threading.RLock()
-
         self._get_preprocessors = {"controls": self._process_custom_controls}
         self._set_preprocessors = {}
         self._path_update_callbacks = defaultdict(list)
@@ -995,11 +996,34 @@ class Settings:
         self._last_config_hash = None
         self._last_effective_hash = None
 
+    def _changed(self):
+        with self._lock:
+            self._generation += 1
+            self._forget_hashes()
+
     def _mark_dirty(self):
         with self._lock:
             self._dirty = True
             self._dirty_time = time.time()
-            self._forget_hashes()
+            self._changed()
+
+    @property
+    def generation(self):
+        """
+        Returns:
+            (int) A counter that increases with every change to the settings, be it through ``set`` or ``remove``,
+                (re)loading ``config.yaml``, adding or removing overlays, saving scripts or :meth:`bump_generation`.
+                Comparing it is a cheap way to find out whether anything derived from the settings needs to be
+                rebuilt.
+        """
+        return self._generation
+
+    def bump_generation(self):
+        """
+        Increases :attr:`generation` for changes that don't go through the settings themselves but still change
+        what is derived from them, e.g. plugins getting enabled or disabled.
+        """
+        self._changed()
 
     @property
     def effective(self):
@@ -1096,7 +1120,7 @@ class Settings:
         if migrate:
             self._migrate_config()
 
-        self._forget_hashes()
+        self._changed()
 
     def load_overlays(self, overlays, migrate=True):
         for overlay in overlays:
@@ -1181,6 +1205,7 @@ class Settings:
             self._map.insert_map(-1, overlay)
         else:
             self._map.insert_map(1, overlay)
+        self._changed()
 
         return key
 
@@ -1194,6 +1219,7 @@ class Settings:
 
         if index > -1:
             self._map.delete_map(index + 1)
+            self._changed()
 
             self._logger.debug(
                 f"Removing all deprecation marks for (recursive) paths in this overlay: {overlay}"
@@ -2414,6 +2440,7 @@ class Settings:
             os.makedirs(path)
         with atomic_write(filename, mode="wt", max_permissions=0o666) as f:
             f.write(script)
+        self._changed()
 
 
 def _default_basedir(applicationName):
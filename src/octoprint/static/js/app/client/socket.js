@@ -102,6 +102,14 @@
         this.sendMessage("auth", userId + ":" + session);
     };
 
+    OctoPrintSocketClient.prototype.sendTerminalFilters = function (names) {
+        // remembered so they can be resent whenever the socket (re)connects
+        this.terminalFilters = names;
+        if (this.socket && this.socket.readyState === SockJS.OPEN) {
+            this.sendMessage("terminalFilters", names);
+        }
+    };
+
     OctoPrintSocketClient.prototype.sendMessage = function (type, payload) {
         var data = {};
         data[type] = payload;
@@ -129,6 +137,9 @@
         var onOpen = function () {
             self.reconnecting = false;
             self.reconnectTrial = 0;
+            if (self.terminalFilters !== undefined) {
+                self.sendMessage("terminalFilters", self.terminalFilters);
+            }
             self.onConnected();
         };
 
@@ -256,6 +256,11 @@ $(function () {
                 case "estimate": {
                     return gettext("Based on the calculated estimate (best accuracy)");
                 }
+                case "lookahead": {
+                    return gettext(
+                        "Based on the planned motion left in the file and the progress so far (good accuracy)"
+                    );
+                }
                 case "printer": {
                     return gettext(
                         "Based on information received from your printer (best accuracy)"
@@ -280,6 +285,7 @@ $(function () {
                 case "average":
                 case "mixed-average":
                 case "estimate":
+                case "lookahead":
                 case "printer": {
                     return "text-success";
                 }
@@ -30,7 +30,7 @@ $(function () {
         self.autoscrollEnabled = ko.observable(true);
 
         self.filters = self.settings.terminalFilters;
-        self.filterRegex = ko.observable();
+        self.filteredLineCount = ko.observable(0);
 
         self.cmdHistory = [];
         self.cmdHistoryIdx = -1;
@@ -56,29 +56,8 @@ $(function () {
         });
 
         self.displayedLines = ko.pureComputed(function () {
-            if (!self.enableFancyFunctionality()) {
-                return self.log();
-            }
-
-            var regex = self.filterRegex();
-            var lineVisible = function (entry) {
-                return regex === undefined || !entry.line.match(regex);
-            };
-
-            var filtered = false;
-            var result = [];
-            var lines = self.log();
-            _.each(lines, function (entry) {
-                if (lineVisible(entry)) {
-                    result.push(entry);
-                    filtered = false;
-                } else if (!filtered) {
-                    result.push(self._toInternalFormat("[...]", "filtered"));
-                    filtered = true;
-                }
-            });
-
-            return result;
+            // filtering happens server side, filtered lines are already marked in the log
+            return self.log();
         });
 
         self.plainLogOutput = ko.pureComputed(function () {
@@ -93,18 +72,15 @@ $(function () {
                 return;
             }
 
-            var regex = self.filterRegex();
-            var lineVisible = function (entry) {
-                return regex === undefined || !entry.line.match(regex);
-            };
-
             var lines = self.log();
-            var total = lines.length;
-            var displayed = _.filter(lines, lineVisible).length;
-            var filtered = total - displayed;
+            var displayed = _.filter(lines, function (entry) {
+                return entry.display !== "filtered";
+            }).length;
+            var filtered = self.filteredLineCount();
+            var total = displayed + filtered;
 
             if (filtered > 0) {
-                if (total > self.upperLimit()) {
+                if (lines.length > self.upperLimit()) {
                     return _.sprintf(
                         gettext(
                             "showing %(displayed)d lines (%(filtered)d of %(total)d total lines filtered, buffer full)"
@@ -120,7 +96,7 @@ $(function () {
                     );
                 }
             } else {
-                if (total > self.upperLimit()) {
+                if (lines.length > self.upperLimit()) {
                     return _.sprintf(
                         gettext("showing %(displayed)d lines (buffer full)"),
                         {displayed: displayed}
@@ -141,7 +117,7 @@ $(function () {
 
         self.activeFilters = ko.observableArray([]);
         self.activeFilters.subscribe(function (e) {
-            self.updateFilterRegex();
+            self.updateFilters();
         });
 
         self.blocklist = [];
@@ -204,7 +180,7 @@ $(function () {
             self._processStateData(data.state);
 
             var start = new Date().getTime();
-            self._processCurrentLogData(data.logs);
+            self._processCurrentLogData(data.logs, data.logsFiltered);
             var end = new Date().getTime();
             var difference = end - start;
 
@@ -221,10 +197,10 @@ $(function () {
 
         self.fromHistoryData = function (data) {
             self._processStateData(data.state);
-            self._processHistoryLogData(data.logs);
+            self._processHistoryLogData(data.logs, data.logsFiltered);
         };
 
-        self._processCurrentLogData = function (data) {
+        self._processCurrentLogData = function (data, filtered) {
             if (!data) return;
 
             var length = self.log().length;
@@ -250,6 +226,10 @@ $(function () {
                 return;
             }
 
+            if (filtered) {
+                self.filteredLineCount(self.filteredLineCount() + filtered);
+            }
+
             if (!self.fancyFunctionality()) {
                 // lite version of the terminal - text output only
                 self.plainLogLines(
@@ -259,7 +239,11 @@ $(function () {
                 return;
             }
 
-            var newLog = self.log().concat(
+            var newLog = self.log();
+            if (filtered && !self._endsWithFilteredMarker(newLog)) {
+                newLog = newLog.concat([self._toInternalFormat("[...]", "filtered")]);
+            }
+            newLog = newLog.concat(
                 _.map(newData, function (line) {
                     return self._toInternalFormat(line);
                 })
@@ -277,14 +261,26 @@ $(function () {
             self.updateOutput();
         };
 
-        self._processHistoryLogData = function (data) {
+        self._processHistoryLogData = function (data, filtered) {
             if (!data) return;
 
+            var log = _.map(data, function (line) {
+                return self._toInternalFormat(line);
+            });
+            if (filtered) {
+                log.unshift(self._toInternalFormat("[...]", "filtered"));
+            }
+
+            self.filteredLineCount(filtered || 0);
             self.plainLogLines(data);
-            self.log(_.map(data, self._toInternalFormat));
+            self.log(log);
             self.updateOutput();
         };
 
+        self._endsWithFilteredMarker = function (log) {
+            return log.length > 0 && log[log.length - 1].display === "filtered";
+        };
+
         self._toInternalFormat = function (line, display, type) {
             if (display === undefined) {
                 display = "line";
@@ -317,14 +313,18 @@ $(function () {
             self.isLoading(data.flags.loading);
         };
 
-        self.updateFilterRegex = function () {
-            var filterRegexStr = self.activeFilters().join("|").trim();
-            if (filterRegexStr === "") {
-                self.filterRegex(undefined);
-            } else {
-                self.filterRegex(new RegExp(filterRegexStr));
-            }
-            self.updateOutput();
+        self.updateFilters = function () {
+            // the server filters the log for us, it only needs to know the names of the active filters
+            var active = self.activeFilters();
+            var names = _.map(
+                _.filter(self.filters(), function (filter) {
+                    return _.contains(active, filter.regex());
+                }),
+                function (filter) {
+                    return filter.name();
+                }
+            );
+            OctoPrint.socket.sendTerminalFilters(names);
         };
 
         self.updateOutput = function () {
@@ -1,7 +1,6 @@
 __author__ = "Gina Häußge <osd@foosel.net>"
 __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
 
-import collections
 import datetime
 import fnmatch
 import glob
@@ -23,7 +22,7 @@ from octoprint.plugin import plugin_manager
 from octoprint.schema.config.webcam import RenderAfterPrintEnum, TimelapseTypeEnum
 from octoprint.settings import settings
 from octoprint.util import get_fully_qualified_classname as fqcn
-from octoprint.util import sv
+from octoprint.util import sv, yaml
 from octoprint.util.commandline import CommandlineCaller
 from octoprint.webcams import WebcamNotAbleToTakeSnapshotException, get_snapshot_webcam
 
@@ -68,6 +67,10 @@ _job_lock = threading.RLock()
 # cached valid timelapse extensions
 _extensions = None
 
+# catalog of unrendered timelapses
+_catalog = None
+_catalog_mutex = threading.Lock()
+
 # rendering queue
 _rendering_queue = queue.Queue()
 _rendering_queue_processing_enabled = threading.Event()
@@ -251,26 +254,7 @@ def get_unrendered_timelapses():
 
     delete_old_unrendered_timelapses()
 
-    basedir = settings().getBaseFolder("timelapse_tmp", check_writable=False)
-    jobs = collections.defaultdict(
-        lambda: {"count": 0, "size": None, "bytes": 0, "date": None, "timestamp": None}
-    )
-
-    for entry in os.scandir(basedir):
-        if not fnmatch.fnmatch(entry.name, "*.jpg"):
-            continue
-
-        prefix = _extract_prefix(entry.name)
-        if prefix is None:
-            continue
-
-        jobs[prefix]["count"] += 1
-        jobs[prefix]["bytes"] += entry.stat().st_size
-        if (
-            jobs[prefix]["timestamp"] is None
-            or entry.stat().st_mtime < jobs[prefix]["timestamp"]
-        ):
-            jobs[prefix]["timestamp"] = entry.stat().st_mtime
+    jobs = unrendered_catalog().jobs()
 
     with _job_lock:
         global current_render_job
@@ -289,6 +273,8 @@ def get_unrendered_timelapses():
             job["rendering"] = currently_rendering
             job["processing"] = currently_recording or currently_rendering
             del job["timestamp"]
+            del job["changed"]
+            del job["last"]
 
             return job
 
@@ -308,16 +294,20 @@ def delete_unrendered_timelapse(name):
 
     basedir = settings().getBaseFolder("timelapse_tmp")
     with _cleanup_lock:
+        prefixes = set()
         for entry in os.scandir(basedir):
             try:
                 if fnmatch.fnmatch(entry.name, pattern):
                     os.remove(entry.path)
+                    prefixes.add(_extract_prefix(entry.name))
             except Exception:
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.exception(
                         f"Error while processing file {entry.name} during cleanup"
                     )
 
+        unrendered_catalog().discard(prefixes)
+
 
 def render_unrendered_timelapse(name, gcode=None, postfix=None, fps=None):
     capture_dir = settings().getBaseFolder("timelapse_tmp")
@@ -355,15 +345,181 @@ def render_unrendered_timelapse(name, gcode=None, postfix=None, fps=None):
 def delete_old_unrendered_timelapses():
     global _cleanup_lock
 
-    basedir = settings().getBaseFolder("timelapse_tmp")
     clean_after_days = settings().getInt(["webcam", "cleanTmpAfterDays"])
     cutoff = time.time() - clean_after_days * 24 * 60 * 60
 
     prefixes_to_clean = []
 
     with _cleanup_lock:
-        for entry in os.scandir(basedir):
+        for prefix, job in unrendered_catalog().jobs().items():
             try:
+                # delete if both creation and modification time of a frame are older than the cutoff
+                if job["changed"] < cutoff:
+                    prefixes_to_clean.append(prefix)
+            except Exception:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.exception(
+                        f"Error while processing timelapse {prefix} during cleanup"
+                    )
+
+        for prefix in prefixes_to_clean:
+            delete_unrendered_timelapse(prefix)
+            logger.info(f"Deleted old unrendered timelapse {prefix}")
+
+
+def unrendered_catalog():
+    """Returns the :class:`TimelapseCatalog` of the configured capture folder."""
+    global _catalog
+
+    capture_dir = settings().getBaseFolder("timelapse_tmp", check_writable=False)
+    with _catalog_mutex:
+        if _catalog is None or _catalog.capture_dir != capture_dir:
+            _catalog = TimelapseCatalog(
+                capture_dir,
+                path=os.path.join(
+                    settings().getBaseFolder("data"), "timelapse_catalog.yaml"
+                ),
+            )
+        return _catalog
+
+
+class TimelapseCatalog:
+    """
+    Index of the unrendered timelapses in the capture folder.
+
+    Keeps frame count, byte total and age per job so that listing the unrendered
+    timelapses doesn't have to stat every single captured frame. The catalog is
+    updated as frames get captured and jobs get rendered or deleted, and is
+    persisted to ``path`` together with the capture folder's modification time.
+    If the folder was changed behind the catalog's back, e.g. while OctoPrint
+    wasn't running, it gets rescanned once.
+
+    Arguments:
+        capture_dir (str): The folder the frames are captured to.
+        path (str): Where to persist the catalog, should be outside of ``capture_dir``.
+            If None, the catalog is kept in memory only.
+        save_delay (float): Seconds to wait before persisting changes.
+    """
+
+    VERSION = 1
+
+    def __init__(self, capture_dir, path=None, save_delay=10.0):
+        self.capture_dir = capture_dir
+        self.path = path
+        self.save_delay = save_delay
+
+        self._logger = logging.getLogger(__name__ + ".catalog")
+
+        self._jobs = None
+        self._mtime = None
+        self._lock = threading.RLock()
+        self._save_timer = None
+
+    def jobs(self):
+        """Returns a copy of the catalog, mapping job prefixes to their data."""
+        with self._lock:
+            mtime = self._capture_dir_mtime()
+            if self._jobs is None or mtime is None or mtime != self._mtime:
+                self._refresh(mtime)
+            return {prefix: dict(job) for prefix, job in self._jobs.items()}
+
+    def record(self, filename):
+        """Adds a freshly captured frame to the catalog."""
+        name = os.path.basename(filename)
+        prefix = _extract_prefix(name)
+        if prefix is None:
+            return
+
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._jobs is None:
+                # not loaded yet, will be picked up on first access
+                return
+
+            number = self._frame_number(prefix, name)
+            job = self._jobs.get(prefix)
+            if job is not None and number is not None and number <= job["last"]:
+                # already seen by a rescan
+                return
+
+            self._add_frame(self._jobs, prefix, number, stat)
+            self._mtime = self._capture_dir_mtime()
+            self._schedule_save()
+
+    def discard(self, prefixes):
+        """Removes the jobs with the provided prefixes from the catalog."""
+        with self._lock:
+            if self._jobs is None:
+                return
+
+            for prefix in prefixes:
+                self._jobs.pop(prefix, None)
+            self._mtime = self._capture_dir_mtime()
+            self._schedule_save()
+
+    def save(self):
+        with self._lock:
+            self._save_timer = None
+            if self.path is None or self._jobs is None or self._mtime is None:
+                return
+
+            data = {
+                "version": self.VERSION,
+                "mtime": self._mtime,
+                "jobs": {prefix: dict(job) for prefix, job in self._jobs.items()},
+            }
+
+        try:
+            with util.atomic_write(self.path, mode="wt", max_permissions=0o666) as f:
+                yaml.save_to_file(data, file=f)
+        except Exception:
+            self._logger.exception(
+                f"Error while persisting timelapse catalog to {self.path}"
+            )
+
+    def _refresh(self, mtime):
+        if self._jobs is None and mtime is not None and self._load(mtime):
+            self._mtime = mtime
+            return
+
+        self._jobs = self._scan()
+        self._mtime = mtime
+        self._schedule_save()
+
+    def _load(self, mtime):
+        if self.path is None or not os.path.isfile(self.path):
+            return False
+
+        try:
+            data = yaml.load_from_file(path=self.path)
+        except Exception:
+            self._logger.exception(
+                f"Error while loading timelapse catalog from {self.path}"
+            )
+            return False
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.VERSION
+            or data.get("mtime") != mtime
+            or not isinstance(data.get("jobs"), dict)
+        ):
+            return False
+
+        self._jobs = data["jobs"]
+        return True
+
+    def _scan(self):
+        jobs = {}
+        for entry in os.scandir(self.capture_dir):
+            try:
+                if not fnmatch.fnmatch(entry.name, "*.jpg"):
+                    continue
+
                 prefix = _extract_prefix(entry.name)
                 if prefix is None:
                     # might be an old tmp_00000.jpg kinda frame. we can't
@@ -372,21 +528,53 @@ def delete_old_unrendered_timelapses():
                         os.remove(entry.path)
                     continue
 
-                if prefix in prefixes_to_clean:
-                    continue
-
-                # delete if both creation and modification time are older than the cutoff
-                if max(entry.stat().st_ctime, entry.stat().st_mtime) < cutoff:
-                    prefixes_to_clean.append(prefix)
+                self._add_frame(
+                    jobs, prefix, self._frame_number(prefix, entry.name), entry.stat()
+                )
             except Exception:
                 if logger.isEnabledFor(logging.DEBUG):
                     logger.exception(
-                        f"Error while processing file {entry.name} during cleanup"
+                        f"Error while processing file {entry.name} during scan"
                     )
+        return jobs
 
-        for prefix in prefixes_to_clean:
-            delete_unrendered_timelapse(prefix)
-            logger.info(f"Deleted old unrendered timelapse {prefix}")
+    def _schedule_save(self):
+        if self.path is None or self._mtime is None or self._save_timer is not None:
+            return
+
+        self._save_timer = threading.Timer(self.save_delay, self.save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def _capture_dir_mtime(self):
+        try:
+            return os.stat(self.capture_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _frame_number(prefix, name):
+        try:
+            return int(os.path.splitext(name)[0][len(prefix) + 1 :])
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _add_frame(jobs, prefix, number, stat):
+        job = jobs.setdefault(
+            prefix,
+            {"count": 0, "bytes": 0, "timestamp": None, "changed": None, "last": -1},
+        )
+        changed = max(stat.st_ctime, stat.st_mtime)
+
+        job["count"] += 1
+        job["bytes"] += stat.st_size
+        if job["timestamp"] is None or stat.st_mtime < job["timestamp"]:
+            job["timestamp"] = stat.st_mtime
+        if job["changed"] is None or changed < job["changed"]:
+            job["changed"] = changed
+        if number is not None and number > job["last"]:
+            job["last"] = number
 
 
 def _create_render_start_handler(name, gcode=None):
@@ -921,6 +1109,7 @@ class Timelapse:
 
         # handle events and onerror call
         if err is None:
+            unrendered_catalog().record(filename)
             eventManager().fire(Events.CAPTURE_DONE, {"file": filename})
             return True
         else:
@@ -958,6 +1147,7 @@ class Timelapse:
                 )
                 self._image_number += 1
                 shutil.copyfile(filename, newFile)
+                unrendered_catalog().record(newFile)
 
     def clean_capture_dir(self):
         if not os.path.isdir(self._capture_dir):
@@ -2,12 +2,19 @@ __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agp
 __copyright__ = "Copyright (C) 2021 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
 import datetime
+import gzip
 import itertools
 import logging
 import os.path
 import re
 import string
 
+try:
+    import brotli
+except ImportError:
+    # optional, without it we only provide gzip variants
+    brotli = None
+
 _UNPRINTABLE_ASCII = "".join(chr(c) for c in range(128) if chr(c) not in string.printable)
 _STRIPPED_FILE_NAME_CHARS = ";|&?$*<>" + _UNPRINTABLE_ASCII
 _STRIPPED_FILE_NAME_RE = re.compile(
@@ -289,6 +296,121 @@ def silent_remove(file):
         pass
 
 
+# pre-compressed variants in order of preference, as content encoding and file extension
+PRECOMPRESSED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def write_precompressed_variants(path, data):
+    """
+    Writes pre-compressed variants of ``data``, the content of ``path``, next to it:
+    gzip as ``<path>.gz`` and, if the ``brotli`` module is available, Brotli as
+    ``<path>.br``.
+
+    Arguments:
+        path (string): The path of the uncompressed file
+        data (bytes): The uncompressed content
+    """
+    from octoprint.util import atomic_write
+
+    with atomic_write(path + ".gz", mode="wb") as f:
+        f.write(gzip.compress(data, 9))
+
+    if brotli is not None:
+        with atomic_write(path + ".br", mode="wb") as f:
+            f.write(brotli.compress(data))
+    else:
+        # don't leave an outdated variant around
+        silent_remove(path + ".br")
+
+
+def get_acceptable_encodings(accept_encoding, encodings):
+    """
+    Filters ``encodings`` down to those acceptable according to the provided
+    ``Accept-Encoding`` header value and orders them by the client's q-values,
+    falling back to the order of ``encodings`` for equal q-values.
+
+    Arguments:
+        accept_encoding (string): The value of the request's ``Accept-Encoding`` header
+        encodings (list): The available content encodings, in order of preference
+
+    Returns:
+        list: The acceptable content encodings, in order of preference
+    """
+    accepted = {}
+    for entry in (accept_encoding or "").split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+
+    qualities = {
+        encoding: accepted.get(encoding, accepted.get("*", 0)) for encoding in encodings
+    }
+    return sorted(
+        (encoding for encoding in encodings if qualities[encoding] > 0),
+        key=lambda encoding: qualities[encoding],
+        reverse=True,
+    )
+
+
+def get_precompressed_variant(path, accept_encoding):
+    """
+    Determines the preferred existing pre-compressed variant of ``path`` as written by
+    :func:`write_precompressed_variants` that is acceptable to the client.
+
+    Arguments:
+        path (string): The path of the uncompressed file
+        accept_encoding (string): The value of the request's ``Accept-Encoding`` header
+
+    Returns:
+        tuple: path and content encoding of the variant, or ``None`` if there's no
+            acceptable variant
+    """
+    extensions = dict(PRECOMPRESSED_VARIANTS)
+    for encoding in get_acceptable_encodings(accept_encoding, list(extensions)):
+        if os.path.isfile(path + extensions[encoding]):
+            return path + extensions[encoding], encoding
+
+    return None
+
+
+def get_compression_encodings():
+    """Returns the content encodings :func:`compress` supports, in order of preference."""
+    if brotli is not None:
+        return ["br", "gzip"]
+    return ["gzip"]
+
+
+def compress(data, encoding):
+    """
+    Compresses ``data`` on the fly with one of the content encodings returned by
+    :func:`get_compression_encodings`. Uses moderate compression levels, for
+    compressing once and serving many times see :func:`write_precompressed_variants`.
+
+    Arguments:
+        data (bytes): The data to compress
+        encoding (string): The content encoding to use
+
+    Returns:
+        bytes: The compressed data
+    """
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=6)
+    elif encoding == "gzip":
+        return gzip.compress(data, 6)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
 def search_through_file(path, term, regex=False):
     if regex:
         pattern = term
@@ -4,7 +4,9 @@ __copyright__ = "Copyright (C) 2013 David Braam, Gina Häußge - Released under
 
 
 import base64
+import bisect
 import codecs
+import collections
 import io
 import logging
 import math
@@ -224,7 +226,7 @@ regex_command = re.compile(
 
 
 class gcode:
-    def __init__(self, incl_layers=False, progress_callback=None):
+    def __init__(self, incl_layers=False, progress_callback=None, incl_time_index=False):
         self._logger = logging.getLogger(__name__)
         self.extrusionAmount = [0]
         self.extrusionVolume = [0]
@@ -240,8 +242,17 @@ class gcode:
         self._incl_layers = incl_layers
         self._layers = []
         self._current_layer = None
+        self._layer_count = 0
+        self._layer_z = None
+
+        self._incl_time_index = incl_time_index
+        self._time_index = None
 
     def _track_layer(self, pos, arc=None):
+        if self._layer_z != pos.z:
+            self._layer_z = pos.z
+            self._layer_count += 1
+
         if not self._incl_layers:
             return
 
@@ -338,6 +349,48 @@ class gcode:
         max_extruders=10,
         g90_extruder=False,
     ):
+        steps = self.interpret(
+            gcodeFile,
+            throttle=throttle,
+            speedx=speedx,
+            speedy=speedy,
+            offsets=offsets,
+            max_extruders=max_extruders,
+            g90_extruder=g90_extruder,
+        )
+
+        if not self._incl_time_index:
+            for _ in steps:
+                pass
+            return
+
+        step = None
+        if isinstance(gcodeFile, (io.IOBase, codecs.StreamReaderWriter)):
+            step = self._fileSize / TimeIndex.RESOLUTION
+
+        time_index = TimeIndex(step=step)
+        for pos, elapsed, layer in steps:
+            time_index.record(pos, elapsed, layer)
+        time_index.finish()
+        self._time_index = time_index
+
+    def interpret(
+        self,
+        gcodeFile,
+        throttle=None,
+        speedx=6000,
+        speedy=6000,
+        offsets=None,
+        max_extruders=10,
+        g90_extruder=False,
+    ):
+        """
+        Interprets ``gcodeFile`` line by line, as a generator.
+
+        Yields the number of bytes read so far, the total planned move time so far in seconds
+        and the number of layers started so far after every line. The analysis results are
+        available once the generator is exhausted.
+        """
         lineNo = 0
         readBytes = 0
         pos = Vector3D(0.0, 0.0, 0.0)
@@ -811,6 +864,9 @@ class gcode:
 
             if throttle is not None:
                 throttle(lineNo, readBytes)
+
+            yield readBytes, totalMoveTimeMinute * 60, self._layer_count
+
         if self._progress_callback is not None:
             self._progress_callback(100.0)
 
@@ -867,10 +923,334 @@ class gcode:
         }
         if self._incl_layers:
             result["layers"] = self.layers
+        if self._time_index is not None:
+            result["time_index"] = self._time_index.as_dict()
 
         return result
 
 
+class TimeIndex:
+    """
+    Planned print time and layer at positions throughout a GCODE file.
+
+    Produced by the GCODE analysis, with an entry at the start of every layer and, if
+    ``step`` is set, at least every ``step`` bytes in between. Entries are built up via
+    :meth:`record` and :meth:`finish`, or restored via :meth:`from_dict`.
+
+    Examples:
+
+    >>> index = TimeIndex(step=100)
+    >>> for pos, elapsed, layer in [(50, 5.0, 0), (100, 10.0, 1), (150, 15.0, 1), (250, 25.0, 2)]:
+    ...     index.record(pos, elapsed, layer)
+    >>> index.finish()
+    >>> index.positions, index.layers
+    ([0, 50, 150, 150, 250], [0, 1, 1, 2, 2])
+    >>> index.time_at(100), index.layer_at(100), index.layer_count
+    (10.0, 1, 2)
+    >>> index.next_layer(100)
+    (150, 15.0)
+    >>> index.next_layer(200) is None
+    True
+    >>> TimeIndex.from_dict(index.as_dict()).time_at(200)
+    20.0
+    """
+
+    RESOLUTION = 100
+    """Default number of entries to record in between layer changes, across the whole file."""
+
+    def __init__(self, positions=None, times=None, layers=None, step=None):
+        self.positions = list(positions) if positions else [0]
+        self.times = list(times) if times else [0.0]
+        self.layers = list(layers) if layers else [0]
+
+        self._step = step
+        self._next_checkpoint = step
+        self._previous = (self.positions[-1], self.times[-1], self.layers[-1])
+
+        self._layer_starts = [
+            i for i in range(1, len(self.layers)) if self.layers[i] > self.layers[i - 1]
+        ]
+        self._layer_start_positions = [self.positions[i] for i in self._layer_starts]
+
+    @property
+    def total(self) -> float:
+        """The total planned print time, in seconds."""
+        return self.times[-1]
+
+    @property
+    def size(self) -> int:
+        """The size of the indexed file, in bytes."""
+        return self.positions[-1]
+
+    @property
+    def layer_count(self) -> int:
+        return self.layers[-1]
+
+    def record(self, pos, elapsed, layer):
+        """Records the state after a line, as yielded by :meth:`gcode.interpret`."""
+        previous_pos, previous_elapsed, previous_layer = self._previous
+
+        if layer != previous_layer:
+            # the line we just saw started a new layer, at the position it started at
+            self._append(previous_pos, previous_elapsed, layer)
+            if layer > previous_layer:
+                self._layer_starts.append(len(self.positions) - 1)
+                self._layer_start_positions.append(previous_pos)
+
+        elif self._step and pos >= self._next_checkpoint:
+            self._append(pos, elapsed, layer)
+
+        self._previous = (pos, elapsed, layer)
+
+    def finish(self):
+        """Records the end of the file."""
+        pos, elapsed, layer = self._previous
+        if pos > self.positions[-1]:
+            self._append(pos, elapsed, layer)
+
+    def time_at(self, pos) -> float:
+        """The planned print time until ``pos``, interpolated between the closest entries."""
+        i = self._index(pos)
+        if i + 1 >= len(self.positions):
+            return self.times[-1]
+
+        start, end = self.positions[i], self.positions[i + 1]
+        if end <= start:
+            return self.times[i]
+
+        fraction = (pos - start) / (end - start)
+        return self.times[i] + fraction * (self.times[i + 1] - self.times[i])
+
+    def layer_at(self, pos) -> int:
+        return self.layers[self._index(pos)]
+
+    def next_layer(self, pos):
+        """The position and planned print time at which the first layer after ``pos`` starts, if any."""
+        j = bisect.bisect_left(self._layer_start_positions, pos)
+        if j >= len(self._layer_starts):
+            return None
+        i = self._layer_starts[j]
+        return self.positions[i], self.times[i]
+
+    def as_dict(self) -> dict:
+        return {
+            "positions": self.positions,
+            "times": [round(t, 2) for t in self.times],
+            "layers": self.layers,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restores an index from :meth:`as_dict` output, returns ``None`` if ``data`` is invalid."""
+        try:
+            positions = [int(x) for x in data["positions"]]
+            times = [float(x) for x in data["times"]]
+            layers = [int(x) for x in data["layers"]]
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if not positions or not len(positions) == len(times) == len(layers):
+            return None
+        if any(a > b for a, b in zip(positions, positions[1:])):
+            return None
+
+        return cls(positions=positions, times=times, layers=layers)
+
+    def _append(self, pos, elapsed, layer):
+        self.positions.append(pos)
+        self.times.append(elapsed)
+        self.layers.append(layer)
+        if self._step:
+            self._next_checkpoint = pos + self._step
+
+    def _index(self, pos):
+        # entries describe what follows their position, so we want the last one before pos
+        return max(0, bisect.bisect_left(self.positions, pos) - 1)
+
+
+class GcodeLookahead:
+    """
+    Interprets the lines of a GCODE file while it is being printed, a bit ahead of the printer.
+
+    Keeps a window of the planned move time and layer after each of the next ``lines``
+    lines, as determined by :class:`gcode`. :meth:`advance` moves it along with the
+    printer's position in the file, parsing one new line for each one the printer got
+    through, so the work per line is small and constant.
+
+    Combined with the file's :class:`TimeIndex`, this tells the planned print time
+    so far and left, and the current layer. Within the window, it also tells the planned
+    time until the next layer change or pausing command.
+
+    Arguments:
+        path (str): Path of the printed file.
+        pos (int): File position the print starts at.
+        lines (int): Number of lines to interpret ahead of the printer.
+        time_index (TimeIndex): The file's time index, if known.
+        pausing_commands (list): Commands that pause the print, e.g. ``M0`` or ``M600``.
+        **kwargs: Options for :meth:`gcode.interpret`, should match the ones of the
+            analysis that created ``time_index``.
+    """
+
+    def __init__(
+        self,
+        path,
+        pos=0,
+        lines=250,
+        time_index=None,
+        pausing_commands=None,
+        **kwargs,
+    ):
+        self._lines = max(1, lines)
+        self._time_index = time_index
+        self._pausing_commands = set(pausing_commands or ())
+
+        # positions in the file are counted in bytes of utf-8 encoded lines, including a
+        # BOM if there is one, like the analysis and the printing side do
+        self._handle = open(path, encoding="utf-8", errors="replace", newline="")
+        if pos:
+            self._handle.seek(pos)
+        self._start = pos
+
+        # planned time and layer at the start position, everything we interpret is relative to it
+        self._base_elapsed = None
+        self._base_layer = None
+        if not pos:
+            self._base_elapsed = 0.0
+            self._base_layer = 0
+        elif time_index is not None:
+            self._base_elapsed = time_index.time_at(pos)
+            self._base_layer = time_index.layer_at(pos)
+
+        self._window = collections.deque()  # (end pos, elapsed, layers) per line
+        self._layer_starts = (
+            collections.deque()
+        )  # (start pos, elapsed) per upcoming layer
+        self._pauses = collections.deque()  # (start pos, elapsed) per upcoming pause
+
+        self._current = self._parsed = (pos, 0.0, 0)
+        self._line = None
+
+        self._steps = gcode().interpret(self._read_lines(), **kwargs)
+        self._fill()
+
+    @property
+    def position(self) -> int:
+        return self._current[0]
+
+    @property
+    def elapsed(self):
+        """Planned print time until the current position in seconds, if known."""
+        if self._base_elapsed is None:
+            return None
+        return self._base_elapsed + self._current[1]
+
+    @property
+    def left(self):
+        """Planned print time from the current position until the end in seconds, if known."""
+        elapsed = self.elapsed
+        if elapsed is None or self._time_index is None:
+            return None
+        return max(0.0, self._time_index.total - elapsed)
+
+    @property
+    def layer(self):
+        """The current layer, if known. Layers are counted from 1, ``0`` is before the first layer."""
+        if self._base_layer is None:
+            return None
+        return self._layer(self._current[2])
+
+    @property
+    def layer_count(self):
+        if self._time_index is None:
+            return None
+        return self._time_index.layer_count
+
+    @property
+    def next_layer(self):
+        """Planned time until the next layer starts in seconds, if known."""
+        upcoming = self._peek(self._layer_starts)
+        if upcoming is not None:
+            return max(0.0, upcoming[1] - self._current[1])
+
+        elapsed = self.elapsed
+        if elapsed is None or self._time_index is None:
+            return None
+
+        upcoming = self._time_index.next_layer(max(self.position, self._parsed[0]))
+        if upcoming is None:
+            return None
+        return max(0.0, upcoming[1] - elapsed)
+
+    @property
+    def next_pause(self):
+        """Planned time until the next pausing command in seconds, if there is one within the window."""
+        upcoming = self._peek(self._pauses)
+        if upcoming is None:
+            return None
+        return max(0.0, upcoming[1] - self._current[1])
+
+    def advance(self, pos):
+        """Moves the window along to the printer's current position ``pos`` in the file."""
+        current = None
+        while self._window and self._window[0][0] <= pos:
+            current = self._window.popleft()
+        if current is not None:
+            self._current = current
+
+        while self._layer_starts and self._layer_starts[0][0] < pos:
+            self._layer_starts.popleft()
+        while self._pauses and self._pauses[0][0] < pos:
+            self._pauses.popleft()
+
+        self._fill()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._steps = None
+
+    def _fill(self):
+        while self._steps is not None and len(self._window) < self._lines:
+            try:
+                read, elapsed, layers = next(self._steps)
+            except StopIteration:
+                self._steps = None
+                break
+
+            pos = self._start + read
+            previous_pos, previous_elapsed, previous_layers = self._parsed
+
+            if layers != previous_layers:
+                self._layer_starts.append((previous_pos, previous_elapsed))
+
+            if self._pausing_commands and self._line is not None:
+                match = regex_command.search(self._line)
+                if match and match.group("codeGM") in self._pausing_commands:
+                    self._pauses.append((previous_pos, previous_elapsed))
+
+            self._parsed = (pos, elapsed, layers)
+            self._window.append(self._parsed)
+
+    def _read_lines(self):
+        for line in self._handle:
+            self._line = line
+            yield line
+
+    def _layer(self, layers):
+        if self._start:
+            # the interpreter counts the layer we start in as the first one
+            return self._base_layer + max(0, layers - 1)
+        return layers
+
+    @staticmethod
+    def _peek(queue):
+        try:
+            return queue[0]
+        except IndexError:
+            return None
+
+
 def getCodeInt(line, code):
     return getCode(line, code, int)
 
@@ -0,0 +1,425 @@
+"""
+A small in-process metrics registry.
+
+Counters, gauges and histograms are cheap to update from hot paths and get rendered
+in the Prometheus text exposition format on request. Metrics are registered on the
+default registry by calling :func:`counter`, :func:`gauge` or :func:`histogram`,
+which return the existing metric if one of the same name and type is already
+registered, so modules and plugins can simply define their metrics on import:
+
+.. sourcecode:: python
+
+   from octoprint.util import metrics
+
+   lines_sent = metrics.counter(
+       "octoprint_plugin_myplugin_lines_total",
+       "Lines processed by my plugin",
+       labelnames=("direction",),
+   )
+
+   lines_sent.labels("sent").inc()
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import bisect
+import contextlib
+import logging
+import math
+import re
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_valid_metric_name = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_valid_label_name = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _format_value(value):
+    if math.isnan(value):
+        return "NaN"
+    elif math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value, quote=True):
+    value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+    if quote:
+        value = value.replace('"', '\\"')
+    return value
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Metric:
+    """
+    Base class of all metrics.
+
+    A metric with ``labelnames`` is a family of values, one per combination of label
+    values, which are accessed through :meth:`labels`. A metric without labels is
+    updated directly.
+
+    Arguments:
+        name (str): name of the metric
+        description (str): help text of the metric
+        labelnames (tuple): names of the metric's labels
+    """
+
+    type = None
+
+    def __init__(self, name, description, labelnames=()):
+        if not _valid_metric_name.match(name):
+            raise ValueError(f"Invalid metric name: {name}")
+        for label in labelnames:
+            if not _valid_label_name.match(label) or label.startswith("__"):
+                raise ValueError(f"Invalid label name: {label}")
+
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+
+        self._children = {}
+        self._mutex = threading.Lock()
+
+        if not self.labelnames:
+            self._value = self._children[()] = self._create_value()
+
+    def labels(self, *args, **kwargs):
+        """
+        Returns the value for the provided label values, either given positionally in
+        the order of ``labelnames`` or as keyword arguments.
+        """
+        if kwargs:
+            try:
+                args = tuple(kwargs.pop(name) for name in self.labelnames)
+            except KeyError as exc:
+                raise ValueError(f"Missing label value for {exc}") from None
+            if kwargs:
+                raise ValueError(f"Unknown labels: {', '.join(kwargs)}")
+
+        key = tuple(str(arg) for arg in args)
+        if len(key) != len(self.labelnames):
+            raise ValueError(
+                f"Expected {len(self.labelnames)} label values for {self.name}, got {len(key)}"
+            )
+
+        value = self._children.get(key)
+        if value is None:
+            with self._mutex:
+                value = self._children.get(key)
+                if value is None:
+                    value = self._children[key] = self._create_value()
+        return value
+
+    def remove(self, *args):
+        """Removes the value for the provided label values."""
+        with self._mutex:
+            self._children.pop(tuple(str(arg) for arg in args), None)
+
+    def samples(self):
+        """
+        Yields ``(suffix, labels, value)`` tuples for all current values, with
+        ``labels`` being a string ready for output.
+        """
+        with self._mutex:
+            children = list(self._children.items())
+
+        for key, value in children:
+            yield from self._samples(key, value)
+
+    def _samples(self, key, value):
+        yield "", _format_labels(self.labelnames, key), value.get()
+
+    def _create_value(self):
+        raise NotImplementedError()
+
+    def _unlabeled(self):
+        if self.labelnames:
+            raise ValueError(f"Metric {self.name} has labels, use labels() first")
+        return self._value
+
+
+class CounterValue:
+    def __init__(self):
+        self._value = 0.0
+        self._mutex = threading.Lock()
+
+    def inc(self, amount=1.0):
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        with self._mutex:
+            self._value += amount
+
+    def get(self):
+        return self._value
+
+
+class Counter(Metric):
+    """A monotonically increasing value, e.g. the number of lines sent."""
+
+    type = "counter"
+
+    def inc(self, amount=1.0):
+        self._unlabeled().inc(amount)
+
+    def get(self):
+        return self._unlabeled().get()
+
+    def _create_value(self):
+        return CounterValue()
+
+
+class GaugeValue:
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._mutex = threading.Lock()
+
+    def set(self, value):
+        self._value = float(value)
+
+    def inc(self, amount=1.0):
+        with self._mutex:
+            self._value += amount
+
+    def dec(self, amount=1.0):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """
+        Makes the gauge report the result of calling ``function`` on collection
+        instead of a stored value. ``None`` reverts to the stored value.
+        """
+        self._function = function
+
+    def get(self):
+        function = self._function
+        if function is not None:
+            return float(function())
+        return self._value
+
+
+class Gauge(Metric):
+    """A value that can go up and down, e.g. the depth of a queue."""
+
+    type = "gauge"
+
+    def set(self, value):
+        self._unlabeled().set(value)
+
+    def inc(self, amount=1.0):
+        self._unlabeled().inc(amount)
+
+    def dec(self, amount=1.0):
+        self._unlabeled().dec(amount)
+
+    def set_function(self, function):
+        self._unlabeled().set_function(function)
+
+    def get(self):
+        return self._unlabeled().get()
+
+    def _create_value(self):
+        return GaugeValue()
+
+
+class HistogramValue:
+    def __init__(self, buckets):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._mutex = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._buckets, value)
+        with self._mutex:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextlib.contextmanager
+    def time(self):
+        """Observes the duration of the ``with`` block, in seconds."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start)
+
+    def get(self):
+        """
+        Returns the cumulative bucket counts (including the ``+Inf`` bucket) and the
+        sum of all observations.
+        """
+        with self._mutex:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative = []
+        count = 0
+        for c in counts:
+            count += c
+            cumulative.append(count)
+        return cumulative, total
+
+
+class Histogram(Metric):
+    """
+    Counts observations, e.g. durations, into configurable buckets.
+
+    Arguments:
+        buckets (tuple): upper bounds of the buckets, in increasing order
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, description, labelnames=(), buckets=DEFAULT_BUCKETS):
+        if "le" in labelnames:
+            raise ValueError("Histograms can't have a label named le")
+        buckets = tuple(float(bucket) for bucket in buckets)
+        if list(buckets) != sorted(buckets):
+            raise ValueError("Buckets must be sorted")
+        if buckets and math.isinf(buckets[-1]):
+            buckets = buckets[:-1]
+        self.buckets = buckets
+
+        Metric.__init__(self, name, description, labelnames=labelnames)
+
+    def observe(self, value):
+        self._unlabeled().observe(value)
+
+    def time(self):
+        return self._unlabeled().time()
+
+    def get(self):
+        return self._unlabeled().get()
+
+    def _create_value(self):
+        return HistogramValue(self.buckets)
+
+    def _samples(self, key, value):
+        counts, total = value.get()
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            yield (
+                "_bucket",
+                _format_labels(self.labelnames, key, ("le", _format_value(bound))),
+                count,
+            )
+        labels = _format_labels(self.labelnames, key)
+        yield "_sum", labels, total
+        yield "_count", labels, counts[-1]
+
+
+class MetricsRegistry:
+    """Keeps track of all registered metrics and renders them."""
+
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+        self._metrics = {}
+        self._mutex = threading.RLock()
+
+    def register(self, metric):
+        """
+        Registers ``metric``. If a metric of the same name is already registered it
+        is returned instead, as long as it is of the same type and has the same
+        labels.
+
+        Raises:
+            ValueError: if a different metric of the same name is already registered
+        """
+        with self._mutex:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+
+            if type(existing) is not type(metric) or (
+                existing.labelnames != metric.labelnames
+            ):
+                raise ValueError(
+                    f"A different metric named {metric.name} is already registered"
+                )
+            return existing
+
+    def unregister(self, metric):
+        """Unregisters ``metric``, or the metric of that name."""
+        name = metric if isinstance(metric, str) else metric.name
+        with self._mutex:
+            self._metrics.pop(name, None)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Renders all metrics in the Prometheus text exposition format."""
+        with self._mutex:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+
+        lines = []
+        for metric in metrics:
+            try:
+                samples = [
+                    f"{metric.name}{suffix}{labels} {_format_value(value)}"
+                    for suffix, labels, value in metric.samples()
+                ]
+            except Exception:
+                self._logger.exception(f"Error while collecting metric {metric.name}")
+                continue
+
+            lines.append(
+                f"# HELP {metric.name} {_escape(metric.description, quote=False)}"
+            )
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines += samples
+
+        return "".join(line + "\n" for line in lines)
+
+
+_registry = MetricsRegistry()
+
+
+def registry():
+    """Returns the default :class:`MetricsRegistry`."""
+    return _registry
+
+
+def counter(name, description, labelnames=()):
+    """Registers a :class:`Counter` with the default registry and returns it."""
+    return _registry.register(Counter(name, description, labelnames=labelnames))
+
+
+def gauge(name, description, labelnames=()):
+    """Registers a :class:`Gauge` with the default registry and returns it."""
+    return _registry.register(Gauge(name, description, labelnames=labelnames))
+
+
+def histogram(name, description, labelnames=(), buckets=DEFAULT_BUCKETS):
+    """Registers a :class:`Histogram` with the default registry and returns it."""
+    return _registry.register(
+        Histogram(name, description, labelnames=labelnames, buckets=buckets)
+    )
@@ -0,0 +1,267 @@
+"""
+An in-process sampling profiler.
+
+The :class:`SamplingProfiler` periodically captures the stacks of all threads of the
+process and aggregates them into folded stacks as understood by flame graph tools
+like `FlameGraph <https://github.com/brendangregg/FlameGraph>`_ or
+`speedscope <https://www.speedscope.app/>`_, one line per unique stack followed by
+the number of times it was seen::
+
+   MainThread;tornado/ioloop.py:start;asyncio/base_events.py:run_forever 1234
+
+Samples are kept in per-minute slots for a configurable window, memory usage is
+bounded by the number of unique stacks kept per slot.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+
+from octoprint.util import metrics
+
+TRUNCATED = "[truncated]"
+
+_overhead = metrics.gauge(
+    "octoprint_profiler_overhead_ratio",
+    "CPU time used by the sampling profiler relative to wall time",
+)
+_samples = metrics.counter(
+    "octoprint_profiler_samples_total", "Samples taken by the sampling profiler"
+)
+
+# singleton
+_instance = None
+
+
+def start_profiler(**kwargs):
+    """
+    Starts the process wide :class:`SamplingProfiler` with the provided arguments,
+    if it isn't running yet, and returns it.
+    """
+    global _instance
+    if _instance is None:
+        _instance = SamplingProfiler(**kwargs)
+        _instance.start()
+    return _instance
+
+
+def stop_profiler():
+    """Stops the process wide :class:`SamplingProfiler`, if it is running."""
+    global _instance
+    if _instance is not None:
+        _instance.stop()
+        _instance = None
+
+
+def get_profiler():
+    """Returns the process wide :class:`SamplingProfiler`, or None if it isn't running."""
+    return _instance
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads every ``interval`` seconds.
+
+    The sampling interval is stretched automatically if taking samples becomes
+    expensive (e.g. due to a lot of threads or very deep stacks), so that the
+    profiler's CPU usage stays below ``max_overhead``.
+
+    Arguments:
+        interval (float): seconds between two samples
+        window (int): minutes of samples to keep
+        max_stacks (int): maximum number of unique stacks kept per minute, further
+            stacks get counted as truncated
+        max_depth (int): maximum number of frames recorded per stack, the innermost
+            ones are kept
+        max_overhead (float): maximum share of CPU time the profiler may use
+    """
+
+    SLOT_LENGTH = 60.0
+
+    def __init__(
+        self,
+        interval=0.05,
+        window=10,
+        max_stacks=5000,
+        max_depth=64,
+        max_overhead=0.01,
+    ):
+        self._logger = logging.getLogger(__name__)
+
+        self.interval = interval
+        self.window = window
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.max_overhead = max_overhead
+
+        self._slots = collections.deque(maxlen=max(1, int(window)))
+        self._mutex = threading.Lock()
+
+        self._started = None
+        self._cpu = 0.0
+        self._sample_count = 0
+        self._cost = 0.0
+
+        self._thread = None
+        self._stop = threading.Event()
+
+        # code object -> frame label, saves us from formatting the same frames
+        # over and over again
+        self._labels = {}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+
+        self._stop.clear()
+        self._started = time.monotonic()
+        self._cpu = 0.0
+
+        self._thread = threading.Thread(target=self._work, name="SamplingProfiler")
+        self._thread.daemon = True
+        self._thread.start()
+        self._logger.info(
+            f"Sampling profiler started, sampling every {self.interval}s and keeping {self.window}min"
+        )
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sample(self):
+        """Takes a single sample of all threads but the profiler's own."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stacks.append(self._fold(names.get(ident, f"Thread-{ident}"), frame))
+
+        now = time.monotonic()
+        with self._mutex:
+            if not self._slots or now - self._slots[-1][0] >= self.SLOT_LENGTH:
+                self._slots.append((now, collections.Counter()))
+            counter = self._slots[-1][1]
+
+            for stack in stacks:
+                if stack not in counter and len(counter) >= self.max_stacks:
+                    stack = stack.split(";", 1)[0] + ";" + TRUNCATED
+                counter[stack] += 1
+
+        self._sample_count += 1
+        _samples.inc()
+
+    def folded(self, minutes=None):
+        """
+        Returns the aggregated folded stacks of the last ``minutes`` (or the whole
+        window), most frequent first.
+        """
+        cutoff = None
+        if minutes is not None:
+            cutoff = time.monotonic() - minutes * self.SLOT_LENGTH
+
+        total = collections.Counter()
+        with self._mutex:
+            for start, counter in self._slots:
+                if cutoff is not None and start + self.SLOT_LENGTH < cutoff:
+                    continue
+                total.update(counter)
+
+        return "".join(f"{stack} {count}\n" for stack, count in total.most_common())
+
+    def stats(self):
+        """Returns information about the profiler's state and its measured overhead."""
+        with self._mutex:
+            stacks = sum(len(counter) for _, counter in self._slots)
+            slots = len(self._slots)
+
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "effective_interval": self._effective_interval(),
+            "window": self.window,
+            "samples": self._sample_count,
+            "slots": slots,
+            "stacks": stacks,
+            "overhead": self.overhead,
+        }
+
+    @property
+    def overhead(self):
+        """CPU time spent sampling relative to the wall time the profiler has been running."""
+        if self._started is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started
+        if elapsed <= 0:
+            return 0.0
+        return self._cpu / elapsed
+
+    def _work(self):
+        _overhead.set_function(lambda: self.overhead)
+
+        try:
+            while not self._stop.is_set():
+                start = time.thread_time()
+                try:
+                    self.sample()
+                except Exception:
+                    self._logger.exception("Error while sampling threads")
+                cost = time.thread_time() - start
+
+                self._cpu += cost
+                self._cost = cost if not self._cost else 0.9 * self._cost + 0.1 * cost
+
+                self._stop.wait(self._effective_interval())
+        finally:
+            _overhead.set_function(None)
+            _overhead.set(0)
+
+    def _effective_interval(self):
+        if self.max_overhead <= 0:
+            return self.interval
+        return max(self.interval, self._cost / self.max_overhead)
+
+    def _fold(self, thread_name, frame):
+        # keep the innermost frames, that's where the time is actually spent
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if frame is not None:
+            labels.append(TRUNCATED)
+
+        labels.reverse()
+
+        return ";".join([thread_name.replace(";", "_").replace(" ", "_")] + labels)
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            parts = filename.replace("\\", "/").split("/")
+            if "site-packages" in parts:
+                # keep the package path, the location of the venv is noise
+                parts = parts[parts.index("site-packages") + 1 :]
+            else:
+                parts = parts[-2:]
+            path = "/".join(parts) or os.path.basename(filename)
+
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{path}:{name}".replace(";", "_").replace(" ", "_")
+            if len(self._labels) < 50000:
+                self._labels[code] = label
+        return label
@@ -1,12 +1,20 @@
 __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
 __copyright__ = "Copyright (C) 2015 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
+import asyncio
+import concurrent.futures
 import json
+import threading
 import time
+from collections import namedtuple
 
 import requests
+import requests.adapters
 import websocket
 
+DEFAULT_POOL_SIZE = 10
+"""Default number of connections to keep alive per host."""
+
 
 def build_base_url(
     https=False, httpuser=None, httppass=None, host=None, port=None, prefix=None
@@ -219,9 +227,53 @@ class SocketClient:
 
 
 class Client:
-    def __init__(self, baseurl, apikey):
+    """
+    Client for OctoPrint's REST API.
+
+    Connections are pooled and kept alive between requests, so only the first request
+    to an instance pays for the TCP (and TLS) handshake. Use the client as a context
+    manager or call :meth:`close` to release the pooled connections when done.
+
+    Arguments:
+        baseurl (str): Base URL of the OctoPrint instance, see :func:`build_base_url`
+        apikey (str): API key to use for authentication
+        pool_size (int): Number of connections to keep alive
+    """
+
+    def __init__(self, baseurl, apikey, pool_size=DEFAULT_POOL_SIZE):
         self.baseurl = baseurl
         self.apikey = apikey
+        self.pool_size = pool_size
+
+        self._session = None
+        self._session_mutex = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled ``requests.Session`` used for all requests, created on first use."""
+        with self._session_mutex:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self):
+        """Closes all pooled connections."""
+        with self._session_mutex:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def prepare_request(self, method=None, path=None, params=None):
         url = None
@@ -246,14 +298,13 @@ class Client:
         if timeout is None:
             timeout = 30
 
-        s = requests.Session()
         request = self.prepare_request(method, path, params=params)
         if data or files:
             if encoding == "json":
                 request.prepare_body(None, None, json=data)
             else:
                 request.prepare_body(data, files=files)
-        response = s.send(request, timeout=timeout)
+        response = self.session.send(request, timeout=timeout)
         return response
 
     def get(self, path, params=None, timeout=None):
@@ -428,3 +479,188 @@ class Client:
         socket.connect()
 
         return socket
+
+
+class AsyncClient:
+    """
+    ``asyncio`` variant of :class:`Client` with the same API, all request methods and
+    :meth:`create_socket` are coroutines.
+
+    Requests are run on worker threads through a pooled :class:`Client`, so they don't
+    block the event loop and many of them can be in flight at the same time. The
+    callbacks of sockets created through :meth:`create_socket` are called on the
+    socket's own thread, not on the event loop.
+
+    Arguments:
+        baseurl (str): Base URL of the OctoPrint instance, see :func:`build_base_url`
+        apikey (str): API key to use for authentication
+        pool_size (int): Number of connections to keep alive
+    """
+
+    def __init__(self, baseurl, apikey, pool_size=DEFAULT_POOL_SIZE):
+        self._client = Client(baseurl, apikey, pool_size=pool_size)
+
+    @property
+    def baseurl(self):
+        return self._client.baseurl
+
+    @property
+    def apikey(self):
+        return self._client.apikey
+
+    def close(self):
+        """Closes all pooled connections."""
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def prepare_request(self, method=None, path=None, params=None):
+        return self._client.prepare_request(method=method, path=path, params=params)
+
+    async def request(self, method, path, **kwargs):
+        return await asyncio.to_thread(self._client.request, method, path, **kwargs)
+
+    async def get(self, path, params=None, timeout=None):
+        return await self.request("GET", path, params=params, timeout=timeout)
+
+    async def post(self, path, data, encoding=None, params=None, timeout=None):
+        return await self.request(
+            "POST", path, data=data, encoding=encoding, params=params, timeout=timeout
+        )
+
+    async def post_json(self, path, data, params=None, timeout=None):
+        return await self.post(
+            path, data, encoding="json", params=params, timeout=timeout
+        )
+
+    async def post_command(self, path, command, additional=None, timeout=None):
+        return await asyncio.to_thread(
+            self._client.post_command,
+            path,
+            command,
+            additional=additional,
+            timeout=timeout,
+        )
+
+    async def upload(self, path, file_path, **kwargs):
+        return await asyncio.to_thread(self._client.upload, path, file_path, **kwargs)
+
+    async def delete(self, path, params=None, timeout=None):
+        return await self.request("DELETE", path, params=params, timeout=timeout)
+
+    async def patch(self, path, data, encoding=None, params=None, timeout=None):
+        return await self.request(
+            "PATCH", path, data=data, encoding=encoding, params=params, timeout=timeout
+        )
+
+    async def put(self, path, data, encoding=None, params=None, timeout=None):
+        return await self.request(
+            "PUT", path, data=data, encoding=encoding, params=params, timeout=timeout
+        )
+
+    async def create_socket(self, **kwargs):
+        return await asyncio.to_thread(self._client.create_socket, **kwargs)
+
+
+FleetResult = namedtuple("FleetResult", "response, error")
+"""Result of a :class:`Fleet` request to one instance: either ``response`` or the ``error`` raised."""
+
+
+class Fleet:
+    """
+    Issues the same request to a number of OctoPrint instances concurrently.
+
+    All methods of :class:`Client` are available and return a dict mapping the name of
+    each instance to a :class:`FleetResult`. Errors while talking to one instance don't
+    affect the others.
+
+    Example::
+
+        fleet = Fleet({
+            "mk3-1": Client("http://mk3-1.local", "..."),
+            "mk3-2": Client("http://mk3-2.local", "..."),
+        })
+        for name, result in fleet.get("/api/job").items():
+            if result.error:
+                print(f"{name}: {result.error}")
+            else:
+                print(f"{name}: {result.response.json()['state']}")
+
+    Arguments:
+        clients (dict): Clients to use, by name of the instance
+        max_workers (int): Maximum number of requests in flight at the same time
+    """
+
+    def __init__(self, clients, max_workers=32):
+        self.clients = dict(clients)
+        self.max_workers = max_workers
+
+    def close(self):
+        """Closes the pooled connections of all clients."""
+        for client in self.clients.values():
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def map(self, func):
+        """
+        Calls ``func`` with each client concurrently.
+
+        Returns:
+            dict: A :class:`FleetResult` by name of the instance, holding the return
+                value of ``func`` as ``response``.
+        """
+        if not self.clients:
+            return {}
+
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self.clients))
+        ) as executor:
+            futures = {
+                executor.submit(func, client): name
+                for name, client in self.clients.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = FleetResult(future.result(), None)
+                except Exception as exc:
+                    results[name] = FleetResult(None, exc)
+
+        return {name: results[name] for name in self.clients}
+
+    def request(self, method, path, **kwargs):
+        return self.map(lambda client: client.request(method, path, **kwargs))
+
+    def get(self, path, **kwargs):
+        return self.map(lambda client: client.get(path, **kwargs))
+
+    def post(self, path, data, **kwargs):
+        return self.map(lambda client: client.post(path, data, **kwargs))
+
+    def post_json(self, path, data, **kwargs):
+        return self.map(lambda client: client.post_json(path, data, **kwargs))
+
+    def post_command(self, path, command, **kwargs):
+        return self.map(lambda client: client.post_command(path, command, **kwargs))
+
+    def upload(self, path, file_path, **kwargs):
+        return self.map(lambda client: client.upload(path, file_path, **kwargs))
+
+    def delete(self, path, **kwargs):
+        return self.map(lambda client: client.delete(path, **kwargs))
+
+    def patch(self, path, data, **kwargs):
+        return self.map(lambda client: client.patch(path, data, **kwargs))
+
+    def put(self, path, data, **kwargs):
+        return self.map(lambda client: client.put(path, data, **kwargs))
@@ -11,7 +11,7 @@ import tempfile
 import unittest
 
 import octoprint.access.groups
-from octoprint.access.permissions import OctoPrintPermission
+from octoprint.access.permissions import OctoPrintPermission, Permissions
 
 TEST_PERMISSION_1 = OctoPrintPermission("Test 1", "Test permission 1", "p1")
 TEST_PERMISSION_2 = OctoPrintPermission("Test 2", "Test permission 2", "p2")
@@ -79,3 +79,34 @@ class GroupManagerTestCase(unittest.TestCase):
             )
             with self.assertRaises(octoprint.access.groups.CyclicSubgroupReference):
                 group_manager.update_group("alpha", subgroups=["beta"], save=False)
+
+    def test_subgroup_changes_propagate(self):
+        with group_manager_with_temp_file() as group_manager:
+            group_manager.add_group(
+                "alpha",
+                "Alpha",
+                "Alpha group",
+                permissions=[Permissions.STATUS],
+                subgroups=[],
+                save=False,
+            )
+            group_manager.add_group(
+                "beta",
+                "Beta",
+                "Beta group",
+                permissions=[],
+                subgroups=["alpha"],
+                save=False,
+            )
+
+            beta = group_manager.find_group("beta")
+            self.assertTrue(beta.has_permission(Permissions.STATUS))
+            self.assertFalse(beta.has_permission(Permissions.CONNECTION))
+
+            group_manager.update_group(
+                "alpha", permissions=[Permissions.CONNECTION], save=False
+            )
+
+            self.assertFalse(beta.has_permission(Permissions.STATUS))
+            self.assertTrue(beta.has_permission(Permissions.CONNECTION))
+            self.assertTrue(Permissions.CONNECTION.needs.issubset(beta.needs))
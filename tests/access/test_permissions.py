@@ -16,3 +16,28 @@ class PermissionsTest(unittest.TestCase):
     def test_find_fail(self):
         permission = Permissions.find("doesntexist")
         self.assertIsNone(permission)
+
+
+class NeedsCatalogTest(unittest.TestCase):
+    def test_mask(self):
+        from octoprint.access.permissions import NeedsCatalog
+        from octoprint.vendor.flask_principal import RoleNeed
+
+        catalog = NeedsCatalog()
+
+        a = catalog.mask([RoleNeed("a")])
+        b = catalog.mask([RoleNeed("b")])
+
+        self.assertEqual(a & b, 0)
+        self.assertEqual(catalog.mask([RoleNeed("a"), RoleNeed("b")]), a | b)
+        self.assertEqual(catalog.mask([RoleNeed("a")]), a)
+        self.assertEqual(catalog.mask([]), 0)
+
+    def test_changed(self):
+        from octoprint.access.permissions import NeedsCatalog
+
+        catalog = NeedsCatalog()
+        generation = catalog.generation
+
+        catalog.changed()
+        self.assertEqual(catalog.generation, generation + 1)
@@ -64,3 +64,54 @@ class SessionUserTestCase(unittest.TestCase):
 
         # but wrapped user should NOT be detected as SessionUser instance of course
         self.assertFalse(isinstance(self.user, octoprint.access.users.SessionUser))
+
+
+class UserPermissionsTestCase(unittest.TestCase):
+    def setUp(self):
+        from octoprint.access.groups import Group
+        from octoprint.access.permissions import OctoPrintPermission
+
+        self.permission_1 = OctoPrintPermission("Test 1", "Test permission 1", "p1")
+        self.permission_2 = OctoPrintPermission("Test 2", "Test permission 2", "p2")
+        self.permission_3 = OctoPrintPermission("Test 3", "Test permission 3", "p1", "p2")
+
+        self.group = Group("group", "Group", permissions=[self.permission_2])
+        self.user = octoprint.access.users.User(
+            "username", "passwordHash", True, permissions=[self.permission_1]
+        )
+
+    def test_has_permission(self):
+        self.assertTrue(self.user.has_permission(self.permission_1))
+        self.assertFalse(self.user.has_permission(self.permission_2))
+        self.assertFalse(self.user.has_permission(self.permission_3))
+
+    def test_user_modifications(self):
+        self.user.add_groups_to_user([self.group])
+        self.assertTrue(self.user.has_permission(self.permission_2))
+        self.assertTrue(self.user.has_permission(self.permission_3))
+
+        self.user.remove_permissions_from_user([self.permission_1])
+        self.assertFalse(self.user.has_permission(self.permission_1))
+        self.assertFalse(self.user.has_permission(self.permission_3))
+
+        self.user.remove_groups_from_user([self.group])
+        self.assertFalse(self.user.has_permission(self.permission_2))
+
+        self.user.add_permissions_to_user([self.permission_2])
+        self.assertTrue(self.user.has_permission(self.permission_2))
+
+    def test_group_modifications(self):
+        self.user.add_groups_to_user([self.group])
+        session = octoprint.access.users.SessionUser(self.user)
+        needs = session.needs
+
+        self.group.remove_permissions_from_group([self.permission_2])
+        self.assertFalse(session.has_permission(self.permission_2))
+
+        self.group.add_permissions_to_group([self.permission_3])
+        self.assertTrue(session.has_permission(self.permission_2))
+        self.assertTrue(session.has_permission(self.permission_3))
+        self.assertEqual(needs, session.needs)
+
+    def test_needs_are_cached(self):
+        self.assertIs(self.user.needs, self.user.needs)
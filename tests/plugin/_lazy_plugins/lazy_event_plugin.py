@@ -0,0 +1,12 @@
+import octoprint.plugin
+
+
+class TestLazyEventPlugin(octoprint.plugin.EventHandlerPlugin):
+    pass
+
+
+__plugin_name__ = "Lazy Event Plugin"
+__plugin_description__ = "Test lazy event plugin"
+__plugin_implementation__ = TestLazyEventPlugin()
+__plugin_activation__ = ["event:PrintStarted", "event:PrintDone"]
+__plugin_pythoncompat__ = ">=2.7,<4"
@@ -0,0 +1,9 @@
+def hook_lazy():
+    return "lazy success"
+
+
+__plugin_name__ = "Lazy Hook Plugin"
+__plugin_description__ = "Test lazy hook plugin"
+__plugin_hooks__ = {"some.lazy.callback": hook_lazy}
+__plugin_activation__ = ["hook:some.lazy.*"]
+__plugin_pythoncompat__ = ">=2.7,<4"
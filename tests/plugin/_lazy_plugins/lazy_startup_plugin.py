@@ -0,0 +1,12 @@
+import octoprint.plugin
+
+
+class TestLazyStartupPlugin(octoprint.plugin.StartupPlugin):
+    pass
+
+
+__plugin_name__ = "Lazy Startup Plugin"
+__plugin_description__ = "Test lazy startup plugin"
+__plugin_implementation__ = TestLazyStartupPlugin()
+__plugin_activation__ = ["implementation:StartupPlugin"]
+__plugin_pythoncompat__ = ">=2.7,<4"
@@ -0,0 +1,123 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import unittest
+from unittest import mock
+
+from octoprint.plugin.accounting import PluginAccounting, PluginCallStats
+
+
+class PluginCallStatsTest(unittest.TestCase):
+    def test_record(self):
+        stats = PluginCallStats("plugin", "EventHandlerPlugin.on_event")
+        stats.record(2.0, cpu=1.0)
+        stats.record(4.0, cpu=3.0, exception=True)
+
+        data = stats.as_dict()
+        self.assertEqual(data["calls"], 2)
+        self.assertEqual(data["exceptions"], 1)
+        self.assertEqual(data["total"], 6.0)
+        self.assertEqual(data["cpu"], 4.0)
+        self.assertEqual(data["max"], 4.0)
+        self.assertEqual(data["over_budget"], 0)
+
+    def test_percentile(self):
+        stats = PluginCallStats("plugin", "hook", samples=100)
+        self.assertEqual(stats.percentile(99), 0.0)
+
+        for duration in range(1, 201):
+            stats.record(float(duration))
+
+        # only the most recent samples are considered
+        self.assertEqual(stats.percentile(99), 199.0)
+        self.assertEqual(stats.percentile(50), 150.0)
+        self.assertEqual(stats.max, 200.0)
+
+    def test_budget(self):
+        stats = PluginCallStats("plugin", "hook", budget=5.0)
+        self.assertFalse(stats.record(5.0))
+        self.assertTrue(stats.record(5.1))
+        self.assertEqual(stats.over_budget, 1)
+
+
+class PluginAccountingTest(unittest.TestCase):
+    def setUp(self):
+        self.accounting = PluginAccounting(
+            budgets={
+                "octoprint.comm.protocol.*": 5.0,
+                "octoprint.comm.protocol.gcode.received": 1.0,
+            }
+        )
+
+    def test_wrap(self):
+        def hook(value):
+            return value * 2
+
+        wrapped = self.accounting.wrap("plugin", "some.hook", hook)
+        self.assertEqual(wrapped(21), 42)
+        self.assertEqual(wrapped.__name__, "hook")
+
+        stats = self.accounting.stats()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["plugin"], "plugin")
+        self.assertEqual(stats[0]["entry_point"], "some.hook")
+        self.assertEqual(stats[0]["calls"], 1)
+        self.assertEqual(stats[0]["exceptions"], 0)
+
+    def test_wrap_exception(self):
+        def hook():
+            raise RuntimeError("Expected")
+
+        wrapped = self.accounting.wrap("plugin", "some.hook", hook)
+        with self.assertRaises(RuntimeError):
+            wrapped()
+
+        stats = self.accounting.stats(plugin="plugin")
+        self.assertEqual(stats[0]["calls"], 1)
+        self.assertEqual(stats[0]["exceptions"], 1)
+
+    def test_budget_for(self):
+        self.assertEqual(
+            self.accounting.budget_for("octoprint.comm.protocol.gcode.received"), 1.0
+        )
+        self.assertEqual(
+            self.accounting.budget_for("octoprint.comm.protocol.gcode.sending"), 5.0
+        )
+        self.assertIsNone(self.accounting.budget_for("octoprint.server.http.routes"))
+
+    def test_over_budget_warning(self):
+        with mock.patch.object(self.accounting, "_logger") as logger:
+            for _ in range(3):
+                self.accounting.record(
+                    "plugin", "octoprint.comm.protocol.gcode.received", 10.0
+                )
+            self.accounting.record(
+                "plugin", "octoprint.comm.protocol.gcode.received", 0.5
+            )
+
+        # rate limited to one warning per interval
+        self.assertEqual(logger.warning.call_count, 1)
+
+        stats = self.accounting.stats(plugin="plugin")[0]
+        self.assertEqual(stats["calls"], 4)
+        self.assertEqual(stats["over_budget"], 3)
+        self.assertEqual(stats["budget"], 1.0)
+
+    def test_stats_sorting_and_reset(self):
+        self.accounting.record("plugin_a", "hook", 1.0)
+        self.accounting.record("plugin_b", "hook", 10.0)
+        self.accounting.record("plugin_a", "other.hook", 5.0)
+
+        self.assertEqual(
+            [(s["plugin"], s["entry_point"]) for s in self.accounting.stats()],
+            [("plugin_b", "hook"), ("plugin_a", "other.hook"), ("plugin_a", "hook")],
+        )
+
+        self.accounting.reset(plugin="plugin_a")
+        self.assertEqual(
+            [s["plugin"] for s in self.accounting.stats()],
+            ["plugin_b"],
+        )
+
+        self.accounting.reset()
+        self.assertEqual(self.accounting.stats(), [])
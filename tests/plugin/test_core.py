@@ -231,6 +231,35 @@ class PluginTestCase(unittest.TestCase):
         hooks = self.plugin_manager.get_hooks("octoprint.printing.print")
         self.assertEqual(0, len(hooks))
 
+    def test_get_hooks_accounting(self):
+        self.plugin_manager.accounting.reset()
+
+        hooks = self.plugin_manager.get_hooks("octoprint.core.startup")
+        hooks["hook_plugin"]()
+        hooks["hook_plugin"]()
+
+        stats = self.plugin_manager.accounting.stats(plugin="hook_plugin")
+        self.assertEqual(1, len(stats))
+        self.assertEqual("octoprint.core.startup", stats[0]["entry_point"])
+        self.assertEqual(2, stats[0]["calls"])
+        self.assertEqual(0, stats[0]["exceptions"])
+
+    def test_implementation_accounting(self):
+        implementation = self.plugin_manager.get_plugin_info(
+            "startup_plugin"
+        ).implementation
+        self.plugin_manager.accounting.reset()
+
+        implementation.on_startup("localhost", 5000)
+        implementation.get_sorting_key()
+
+        entry_points = {
+            entry["entry_point"]: entry
+            for entry in self.plugin_manager.accounting.stats(plugin="startup_plugin")
+        }
+        self.assertEqual(1, entry_points["StartupPlugin.on_startup"]["calls"])
+        self.assertEqual(1, entry_points["SortablePlugin.get_sorting_key"]["calls"])
+
     def test_sorted_hooks(self):
         hooks = self.plugin_manager.get_hooks("some.ordered.callback")
         self.assertEqual(3, len(hooks))
@@ -441,3 +470,208 @@ class PluginTestCase(unittest.TestCase):
             Foo, *bases_to_check
         )
         self.assertSetEqual(actual, set(expected))
+
+
+class LazyPluginTestCase(unittest.TestCase):
+    lazy_plugins = ("lazy_event_plugin", "lazy_hook_plugin", "lazy_startup_plugin")
+
+    def setUp(self):
+        import os
+
+        self.plugin_folder = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), "_lazy_plugins"
+        )
+        self._forget_modules()
+
+    def tearDown(self):
+        self._forget_modules()
+
+    def _forget_modules(self):
+        import sys
+
+        for name in self.lazy_plugins:
+            sys.modules.pop(name, None)
+
+    def _create_plugin_manager(self, lazy=True):
+        plugin_manager = octoprint.plugin.core.PluginManager(
+            [self.plugin_folder],
+            [octoprint.plugin.OctoPrintPlugin],
+            None,
+            plugin_disabled_list=[],
+            logging_prefix="logging_prefix.",
+            plugin_lazy_activation=lazy,
+        )
+        plugin_manager.reload_plugins(startup=True, initialize_implementations=False)
+        plugin_manager.initialize_implementations()
+        return plugin_manager
+
+    def test_parse_metadata(self):
+        import os
+
+        metadata = octoprint.plugin.core.parse_plugin_metadata(
+            os.path.join(self.plugin_folder, "lazy_event_plugin.py")
+        )
+        self.assertEqual(
+            ["event:PrintStarted", "event:PrintDone"],
+            metadata[octoprint.plugin.core.ControlProperties.attr_activation],
+        )
+
+    def test_loading(self):
+        import sys
+
+        plugin_manager = self._create_plugin_manager()
+
+        self.assertEqual(3, len(plugin_manager.enabled_plugins))
+        self.assertEqual(3, len(plugin_manager.lazy_plugins))
+        self.assertEqual(0, len(plugin_manager.plugin_hooks))
+        self.assertEqual(0, len(plugin_manager.plugin_implementations))
+        for name in self.lazy_plugins:
+            self.assertTrue(plugin_manager.enabled_plugins[name].lazy)
+            self.assertNotIn(name, sys.modules)
+
+        # metadata is still available without the import
+        self.assertEqual(
+            "Lazy Hook Plugin", plugin_manager.enabled_plugins["lazy_hook_plugin"].name
+        )
+
+    def test_loading_lazy_disabled(self):
+        plugin_manager = self._create_plugin_manager(lazy=False)
+
+        self.assertEqual(0, len(plugin_manager.lazy_plugins))
+        self.assertEqual(1, len(plugin_manager.plugin_hooks))
+        self.assertEqual(2, len(plugin_manager.plugin_implementations))
+
+    def test_hook_trigger(self):
+        plugin_manager = self._create_plugin_manager()
+
+        hooks = plugin_manager.get_hooks("some.lazy.callback")
+        self.assertEqual(["lazy_hook_plugin"], list(hooks.keys()))
+        self.assertEqual("lazy success", hooks["lazy_hook_plugin"]())
+
+        self.assertFalse(plugin_manager.enabled_plugins["lazy_hook_plugin"].lazy)
+        self.assertEqual(
+            ["lazy_event_plugin", "lazy_startup_plugin"],
+            sorted(plugin_manager.lazy_plugins.keys()),
+        )
+
+    def test_implementation_trigger(self):
+        plugin_manager = self._create_plugin_manager()
+
+        implementations = plugin_manager.get_implementations(
+            octoprint.plugin.StartupPlugin, activate_lazy=False
+        )
+        self.assertEqual([], implementations)
+
+        implementations = plugin_manager.get_implementations(
+            octoprint.plugin.StartupPlugin
+        )
+        self.assertEqual(
+            ["lazy_startup_plugin"], [x._identifier for x in implementations]
+        )
+        self.assertEqual(
+            "logging_prefix.lazy_startup_plugin", implementations[0]._logger.name
+        )
+
+        # initialize_implementations must not initialize the activated plugin again
+        implementation = implementations[0]
+        implementation._logger = None
+        plugin_manager.initialize_implementations()
+        self.assertIsNone(implementation._logger)
+
+    def test_event_trigger(self):
+        plugin_manager = self._create_plugin_manager()
+
+        self.assertEqual([], plugin_manager.activate_lazy_plugins("event:PrintFailed"))
+        self.assertEqual(
+            ["lazy_event_plugin"],
+            plugin_manager.activate_lazy_plugins("event:PrintDone"),
+        )
+        self.assertEqual([], plugin_manager.activate_lazy_plugins("event:PrintStarted"))
+
+        self.assertEqual(
+            ["lazy_event_plugin"],
+            [
+                x._identifier
+                for x in plugin_manager.get_implementations(
+                    octoprint.plugin.EventHandlerPlugin
+                )
+            ],
+        )
+
+    def test_get_plugin(self):
+        plugin_manager = self._create_plugin_manager()
+
+        plugin = plugin_manager.get_plugin("lazy_event_plugin")
+        self.assertIsNotNone(plugin)
+        self.assertEqual("Lazy Event Plugin", plugin.__plugin_name__)
+        self.assertNotIn("lazy_event_plugin", plugin_manager.lazy_plugins)
+
+    def test_disable_pending(self):
+        plugin_manager = self._create_plugin_manager()
+
+        plugin_manager.disable_plugin("lazy_hook_plugin")
+        self.assertNotIn("lazy_hook_plugin", plugin_manager.lazy_plugins)
+        self.assertEqual({}, plugin_manager.get_hooks("some.lazy.callback"))
+
+        plugin_manager.enable_plugin("lazy_hook_plugin")
+        self.assertEqual(
+            ["lazy_hook_plugin"],
+            list(plugin_manager.get_hooks("some.lazy.callback").keys()),
+        )
+
+    def test_activation_enables(self):
+        import threading
+
+        plugin_manager = self._create_plugin_manager()
+
+        enabled = []
+
+        def on_plugin_enabled(name, plugin):
+            # the lazy plugins must not be locked while callbacks run
+            acquired = []
+
+            def acquire():
+                mutex = plugin_manager._lazy_plugins_mutex
+                acquired.append(mutex.acquire(timeout=1))
+                if acquired[-1]:
+                    mutex.release()
+
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            thread.join()
+            enabled.append((name, acquired))
+
+        plugin_manager.on_plugin_enabled = on_plugin_enabled
+
+        plugin_manager.activate_lazy_plugins("event:PrintDone")
+        self.assertEqual([("lazy_event_plugin", [True])], enabled)
+        self.assertTrue(plugin_manager.enabled_plugins["lazy_event_plugin"].enabled)
+
+    def test_activation_validated(self):
+        plugin_manager = self._create_plugin_manager()
+        plugin_manager.plugin_validators = [
+            lambda phase, plugin: not (phase == "before_enable" and plugin.hooks)
+        ]
+
+        self.assertEqual({}, plugin_manager.get_hooks("some.lazy.callback"))
+        self.assertNotIn("lazy_hook_plugin", plugin_manager.enabled_plugins)
+        self.assertIn("lazy_hook_plugin", plugin_manager.disabled_plugins)
+        self.assertNotIn("lazy_hook_plugin", plugin_manager.lazy_plugins)
+        self.assertEqual(0, len(plugin_manager.plugin_hooks["some.lazy.callback"]))
+
+    def test_activation_initialization_failure(self):
+        plugin_manager = self._create_plugin_manager()
+
+        def fail(name, implementation):
+            raise RuntimeError("failed")
+
+        plugin_manager.implementation_pre_inits.append(fail)
+
+        self.assertEqual(
+            [],
+            plugin_manager.get_implementations(octoprint.plugin.StartupPlugin),
+        )
+        self.assertNotIn("lazy_startup_plugin", plugin_manager.enabled_plugins)
+        self.assertIn("lazy_startup_plugin", plugin_manager.disabled_plugins)
+        self.assertNotIn("lazy_startup_plugin", plugin_manager.plugin_implementations)
+        self.assertFalse(plugin_manager.disabled_plugins["lazy_startup_plugin"].enabled)
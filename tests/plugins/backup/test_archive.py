@@ -0,0 +1,173 @@
+import io
+import os
+import threading
+import zipfile
+
+import pytest
+
+from octoprint.plugins.backup import archive
+from octoprint.plugins.backup.archive import BackupWriter, StreamSink, file_hash
+
+
+class UnseekableOutput:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    files = {
+        "empty.txt": b"",
+        "small.gcode": b"G28\n",
+        "large.gcode": b"".join(
+            f"G1 X{i % 200} Y{i % 97} E{i * 0.01:.2f}\n".encode() for i in range(50000)
+        ),
+        "random.bin": os.urandom(3 * archive.BLOCK_SIZE + 17),
+        "timelapse.mp4": os.urandom(1024),
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    return tmp_path, files
+
+
+def _write(folder, files, output, **kwargs):
+    with BackupWriter(output, **kwargs) as writer:
+        digests = {
+            name: writer.write_file(str(folder / name), f"basedir/{name}")
+            for name in files
+        }
+        writer.writestr("metadata.json", '{"version": "1.0.0"}')
+    return digests
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_writer_roundtrip(sources, workers):
+    folder, files = sources
+    output = UnseekableOutput()
+
+    digests = _write(folder, files, output, workers=workers)
+
+    with zipfile.ZipFile(io.BytesIO(bytes(output.data))) as zip:
+        assert zip.testzip() is None
+        for name, data in files.items():
+            assert zip.read(f"basedir/{name}") == data
+            assert digests[name] == file_hash(str(folder / name))
+        assert zip.read("metadata.json") == b'{"version": "1.0.0"}'
+
+        assert zip.getinfo("basedir/large.gcode").compress_type == zipfile.ZIP_DEFLATED
+        assert (
+            zip.getinfo("basedir/large.gcode").compress_size
+            < len(files["large.gcode"]) / 3
+        )
+        assert zip.getinfo("basedir/timelapse.mp4").compress_type == zipfile.ZIP_STORED
+
+
+def test_writer_parallel_output_matches_sequential(sources):
+    folder, files = sources
+
+    sequential = UnseekableOutput()
+    _write(folder, {"large.gcode": None}, sequential, workers=1)
+    parallel = UnseekableOutput()
+    _write(folder, {"large.gcode": None}, parallel, workers=4)
+
+    # same blocks, same dictionaries, so same compressed stream
+    with (
+        zipfile.ZipFile(io.BytesIO(bytes(sequential.data))) as s,
+        zipfile.ZipFile(io.BytesIO(bytes(parallel.data))) as p,
+    ):
+        assert (
+            s.getinfo("basedir/large.gcode").compress_size
+            == p.getinfo("basedir/large.gcode").compress_size
+        )
+
+
+def test_writer_stored(sources):
+    folder, files = sources
+    output = UnseekableOutput()
+
+    _write(folder, files, output, compression=zipfile.ZIP_STORED)
+
+    with zipfile.ZipFile(io.BytesIO(bytes(output.data))) as zip:
+        assert zip.testzip() is None
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in zip.infolist())
+
+
+def test_writer_zip64(sources, monkeypatch):
+    monkeypatch.setattr(archive, "ZIP64_LIMIT", 1024)
+    monkeypatch.setattr(archive, "ZIP_FILECOUNT_LIMIT", 2)
+
+    folder, files = sources
+    output = UnseekableOutput()
+
+    _write(folder, files, output, workers=2)
+
+    assert b"PK\x06\x06" in output.data
+    with zipfile.ZipFile(io.BytesIO(bytes(output.data))) as zip:
+        assert zip.testzip() is None
+        assert len(zip.infolist()) == len(files) + 1
+        for name, data in files.items():
+            assert zip.read(f"basedir/{name}") == data
+
+
+def test_writer_unicode_names(tmp_path):
+    source = tmp_path / "bänchy.gcode"
+    source.write_bytes(b"G28\n")
+    output = UnseekableOutput()
+
+    with BackupWriter(output) as writer:
+        writer.write_file(str(source), "basedir/uploads/bänchy.gcode")
+
+    with zipfile.ZipFile(io.BytesIO(bytes(output.data))) as zip:
+        assert zip.read("basedir/uploads/bänchy.gcode") == b"G28\n"
+
+
+def test_writer_incomplete_on_error(sources):
+    folder, files = sources
+    output = UnseekableOutput()
+
+    with pytest.raises(FileNotFoundError):
+        with BackupWriter(output) as writer:
+            writer.write_file(str(folder / "small.gcode"), "basedir/small.gcode")
+            writer.write_file(str(folder / "missing.gcode"), "basedir/missing.gcode")
+
+    assert not zipfile.is_zipfile(io.BytesIO(bytes(output.data)))
+
+
+def test_stream_sink():
+    sink = StreamSink(chunk_size=10, maxsize=2)
+
+    def produce():
+        for _ in range(10):
+            sink.write(b"0123456789abc")
+        sink.finish()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+
+    received = b""
+    while (chunk := sink.get()) is not None:
+        received += chunk
+    thread.join()
+
+    assert received == b"0123456789abc" * 10
+
+
+def test_stream_sink_error():
+    sink = StreamSink()
+    sink.write(b"partial")
+    sink.finish(error=ValueError("broken"))
+
+    with pytest.raises(ValueError):
+        sink.get()
+
+
+def test_stream_sink_consumer_gone():
+    sink = StreamSink(chunk_size=1, maxsize=1)
+    sink.close()
+
+    with pytest.raises(BrokenPipeError):
+        sink.write(b"data")
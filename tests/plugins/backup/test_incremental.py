@@ -0,0 +1,268 @@
+import io
+import json
+import os
+import time
+import zipfile
+from unittest import mock
+
+import pytest
+
+from octoprint.plugins.backup import BackupPlugin, InvalidBaseBackup
+from octoprint.plugins.backup.archive import (
+    MANIFEST_FILE,
+    METADATA_FILE,
+    missing_requirements,
+    read_manifest,
+    restore_references,
+)
+
+
+@pytest.fixture
+def basedir(tmp_path):
+    basedir = tmp_path / "octoprint"
+    basedir.mkdir()
+    (basedir / "config.yaml").write_text("a: b\n")
+    (basedir / "users.yaml").write_text("{}\n")
+
+    uploads = basedir / "uploads"
+    uploads.mkdir()
+    (uploads / "benchy.gcode").write_text("G28\nG1 X10\n" * 100)
+    (uploads / "cube.gcode").write_text("G28\nG1 Y10\n" * 100)
+
+    timelapse = basedir / "timelapse"
+    timelapse.mkdir()
+    (timelapse / "benchy.mp4").write_bytes(os.urandom(1024))
+
+    (basedir / "data" / "backup").mkdir(parents=True)
+    return basedir
+
+
+@pytest.fixture
+def settings(basedir):
+    settings = mock.MagicMock()
+    settings._configfile = str(basedir / "config.yaml")
+    settings._basedir = str(basedir)
+    settings.global_get_basefolder.side_effect = lambda folder: str(
+        basedir / folder.replace("_", "/")
+    )
+    settings.getBaseFolder.side_effect = lambda folder: str(basedir / folder)
+    settings.get_int.return_value = None
+    return settings
+
+
+@pytest.fixture
+def plugin_manager():
+    plugin_manager = mock.MagicMock()
+    plugin_manager.get_hooks.return_value = {}
+    plugin_manager.get_helpers.return_value = {}
+    return plugin_manager
+
+
+@pytest.fixture
+def create(basedir, settings, plugin_manager):
+    datafolder = str(basedir / "data" / "backup")
+
+    def f(name, **kwargs):
+        BackupPlugin._create_backup(
+            name=name,
+            settings=settings,
+            plugin_manager=plugin_manager,
+            datafolder=datafolder,
+            **kwargs,
+        )
+        return os.path.join(datafolder, name)
+
+    return f
+
+
+def _members(path):
+    with zipfile.ZipFile(path) as zip:
+        return set(zip.namelist())
+
+
+def _metadata(path):
+    with zipfile.ZipFile(path) as zip:
+        return json.loads(zip.read(METADATA_FILE))
+
+
+def test_full_backup_has_manifest(create):
+    path = create("full.zip")
+
+    manifest = read_manifest(path)
+    assert manifest is not None
+    assert manifest["base"] is None
+    assert "basedir/uploads/benchy.gcode" in manifest["files"]
+    assert all(entry["source"] is None for entry in manifest["files"].values())
+
+    with zipfile.ZipFile(path) as zip:
+        assert (
+            zip.getinfo("basedir/timelapse/benchy.mp4").compress_type
+            == zipfile.ZIP_STORED
+        )
+
+    metadata = _metadata(path)
+    assert "requires" not in metadata
+    assert metadata["size"] == sum(entry["size"] for entry in manifest["files"].values())
+
+
+def test_incremental_backup_only_stores_changes(basedir, create):
+    create("full.zip")
+
+    time.sleep(0.01)
+    (basedir / "uploads" / "cube.gcode").write_text("G28\nG1 Z10\n")
+    (basedir / "uploads" / "new.gcode").write_text("M117 Hello\n")
+
+    path = create("incremental.zip", incremental=True)
+
+    members = _members(path)
+    assert "basedir/uploads/cube.gcode" in members
+    assert "basedir/uploads/new.gcode" in members
+    assert "basedir/uploads/benchy.gcode" not in members
+    assert "basedir/timelapse/benchy.mp4" not in members
+
+    metadata = _metadata(path)
+    assert metadata["base"] == "full.zip"
+    assert metadata["requires"] == ["full.zip"]
+
+
+def test_incremental_backup_deduplicates_content(basedir, create):
+    create("full.zip")
+
+    os.rename(basedir / "timelapse" / "benchy.mp4", basedir / "timelapse" / "renamed.mp4")
+
+    path = create("incremental.zip", incremental=True)
+
+    assert "basedir/timelapse/renamed.mp4" not in _members(path)
+    entry = read_manifest(path)["files"]["basedir/timelapse/renamed.mp4"]
+    assert entry["source"] == "full.zip"
+    assert entry["path"] == "basedir/timelapse/benchy.mp4"
+
+
+def test_incremental_backup_without_base_is_full(create):
+    path = create("incremental.zip", incremental=True)
+
+    assert "basedir/uploads/benchy.gcode" in _members(path)
+    assert "requires" not in _metadata(path)
+
+
+def test_restore_references(basedir, create, tmp_path):
+    create("full.zip")
+    time.sleep(0.01)
+    (basedir / "uploads" / "cube.gcode").write_text("changed")
+    path = create("incremental.zip", incremental=True)
+
+    target = tmp_path / "restore"
+    with zipfile.ZipFile(path) as zip:
+        zip.extractall(target)
+        manifest = json.loads(zip.read(MANIFEST_FILE))
+    restore_references(manifest, os.path.dirname(path), str(target))
+
+    for name in ("benchy.gcode", "cube.gcode"):
+        assert (target / "basedir" / "uploads" / name).read_bytes() == (
+            basedir / "uploads" / name
+        ).read_bytes()
+    assert (target / "basedir" / "timelapse" / "benchy.mp4").read_bytes() == (
+        basedir / "timelapse" / "benchy.mp4"
+    ).read_bytes()
+
+
+def test_restore_references_outside_target(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+
+    target = tmp_path / "restore"
+    target.mkdir()
+    manifest = {
+        "files": {
+            "basedir/secret.txt": {
+                "source": None,
+                "path": "../secret.txt",
+                "mtime": 0,
+            }
+        }
+    }
+    restore_references(manifest, str(tmp_path), str(target))
+
+    assert not (target / "basedir" / "secret.txt").exists()
+
+
+@pytest.mark.parametrize(
+    "source", ["../other.zip", "sub/other.zip", ".hidden.zip", "/tmp/other.zip"]
+)
+def test_restore_references_invalid_source(tmp_path, source):
+    folder = tmp_path / "backup"
+    folder.mkdir()
+    manifest = {
+        "files": {
+            "basedir/config.yaml": {
+                "source": source,
+                "path": "basedir/config.yaml",
+                "mtime": 0,
+            }
+        }
+    }
+
+    with pytest.raises(ValueError):
+        restore_references(manifest, str(folder), str(tmp_path / "restore"))
+
+
+def test_missing_requirements(tmp_path):
+    folder = tmp_path / "backup"
+    folder.mkdir()
+    (folder / "full.zip").write_bytes(b"")
+    (tmp_path / "other.zip").write_bytes(b"")
+
+    metadata = {"requires": ["full.zip", "missing.zip", "../other.zip"]}
+    assert missing_requirements(metadata, str(folder)) == [
+        "missing.zip",
+        "../other.zip",
+    ]
+
+
+def test_dependent_backups(basedir, create):
+    create("full.zip")
+    create("incremental.zip", incremental=True)
+
+    datafolder = str(basedir / "data" / "backup")
+    assert BackupPlugin._get_dependent_backups(datafolder, "full.zip") == [
+        "incremental.zip"
+    ]
+    assert BackupPlugin._get_dependent_backups(datafolder, "incremental.zip") == []
+
+
+def test_invalid_base(basedir, create):
+    datafolder = str(basedir / "data" / "backup")
+    with pytest.raises(InvalidBaseBackup):
+        BackupPlugin._find_backup_base(datafolder, "missing.zip")
+    with pytest.raises(InvalidBaseBackup):
+        BackupPlugin._find_backup_base(datafolder, "../../config.yaml")
+
+    # sibling folders sharing the data folder's name as prefix are outside of it
+    sibling = basedir / "data" / "backup-evil"
+    sibling.mkdir()
+    create("full.zip")
+    os.replace(os.path.join(datafolder, "full.zip"), sibling / "full.zip")
+    with pytest.raises(InvalidBaseBackup):
+        BackupPlugin._find_backup_base(datafolder, "../backup-evil/full.zip")
+
+
+def test_streamed_backup(basedir, settings, plugin_manager):
+    datafolder = str(basedir / "data" / "backup")
+    output = io.BytesIO()
+
+    result = BackupPlugin._create_backup(
+        name="streamed.zip",
+        settings=settings,
+        plugin_manager=plugin_manager,
+        datafolder=datafolder,
+        incremental=True,
+        output=output,
+    )
+
+    assert result is None
+    assert os.listdir(datafolder) == []
+
+    with zipfile.ZipFile(io.BytesIO(output.getvalue())) as zip:
+        assert zip.testzip() is None
+        assert zip.read("basedir/config.yaml") == b"a: b\n"
+        assert "requires" not in json.loads(zip.read(METADATA_FILE))
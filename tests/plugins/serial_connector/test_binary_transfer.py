@@ -0,0 +1,196 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import os
+
+import pytest
+
+from octoprint.plugins.serial_connector import binary_transfer
+from octoprint.plugins.serial_connector.binary_transfer import (
+    CONTROL_SYNC,
+    FILE_TRANSFER_WRITE,
+    PROTOCOL_CONTROL,
+    PROTOCOL_FILE_TRANSFER,
+    BinaryFileTransfer,
+    BinaryTransferCancelled,
+    BinaryTransferError,
+    BinaryTransferUnavailable,
+    Packet,
+    PacketReader,
+    build_packet,
+)
+from octoprint.plugins.virtual_printer.virtual import VirtualBinaryStream
+
+CONTENT = b"".join(b"G1 X%d Y10 E%d\n" % (i % 100, i) for i in range(500))
+
+
+def test_build_packet_without_payload():
+    packet = build_packet(0, PROTOCOL_CONTROL, CONTROL_SYNC)
+
+    assert packet[:2] == b"\xad\xb5"
+    assert len(packet) == binary_transfer.HEADER_SIZE
+
+
+def test_packet_reader_roundtrip():
+    data = build_packet(0, PROTOCOL_CONTROL, CONTROL_SYNC) + build_packet(
+        1, PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_WRITE, b"G28\n"
+    )
+
+    reader = PacketReader()
+    packets = []
+    for i in range(len(data)):
+        # byte by byte, as it might come in over the line
+        packets += reader.feed(data[i : i + 1])
+
+    assert packets == [
+        Packet(0, PROTOCOL_CONTROL, CONTROL_SYNC, b""),
+        Packet(1, PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_WRITE, b"G28\n"),
+    ]
+
+
+def test_packet_reader_skips_garbage():
+    data = b"\xb5garbage" + build_packet(3, PROTOCOL_FILE_TRANSFER, 0)
+
+    assert PacketReader().feed(data) == [Packet(3, PROTOCOL_FILE_TRANSFER, 0, b"")]
+
+
+def test_packet_reader_corrupt_payload():
+    packet = bytearray(
+        build_packet(3, PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_WRITE, b"G28")
+    )
+    packet[9] ^= 0xFF
+
+    assert PacketReader().feed(bytes(packet)) == [
+        Packet(3, PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_WRITE, None)
+    ]
+
+
+def test_packet_reader_corrupt_header():
+    packet = bytearray(
+        build_packet(3, PROTOCOL_FILE_TRANSFER, FILE_TRANSFER_WRITE, b"G28")
+    )
+    packet[2] ^= 0xFF
+
+    assert PacketReader().feed(bytes(packet)) == [Packet(None, None, None, None)]
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("ok5", True),
+        ("rs5", True),
+        ("fe5", True),
+        ("ss0,512,0.1.0", True),
+        ("PFT:success", True),
+        ("ok", False),
+        ("ok T:21.3 /0.0", False),
+        ("echo:Switching to Binary Protocol", False),
+        ("Resend: 5", False),
+    ],
+)
+def test_feed(line, expected):
+    transfer = BinaryFileTransfer(lambda *args: None, [], "test.gco")
+    assert transfer.feed(line) == expected
+
+
+class Printer:
+    """Connects a transfer to the virtual printer's side of the protocol."""
+
+    def __init__(self, folder, resend_every_n=0):
+        self.transfer = None
+        self.closed = False
+        self.stream = VirtualBinaryStream(
+            self._send, folder, self._close, resend_every_n=resend_every_n
+        )
+
+    def write(self, packet, description):
+        self.stream.feed(packet)
+
+    def _send(self, line):
+        self.transfer.feed(line)
+
+    def _close(self):
+        self.closed = True
+
+
+def transfer_to(printer, remote="test.gco", content=CONTENT, **kwargs):
+    chunks = [content[i : i + 100] for i in range(0, len(content), 100)]
+    printer.transfer = BinaryFileTransfer(
+        printer.write, chunks, remote, timeout=0.1, **kwargs
+    )
+    return printer.transfer
+
+
+@pytest.mark.parametrize("window", [1, 4])
+@pytest.mark.parametrize("resend_every_n", [0, 3])
+def test_transfer(tmp_path, window, resend_every_n):
+    printer = Printer(str(tmp_path), resend_every_n=resend_every_n)
+    transfer = transfer_to(printer, window=window)
+    progress = []
+
+    transfer.run(progress=lambda: progress.append(True))
+
+    assert (tmp_path / "test.gco").read_bytes() == CONTENT
+    assert printer.closed
+    assert transfer.size == len(CONTENT)
+    assert len(progress) == len(CONTENT) // 512 + 1
+    assert (transfer.resends > 0) == (resend_every_n > 0)
+
+
+def test_transfer_compressed(tmp_path, monkeypatch):
+    heatshrink = pytest.importorskip("heatshrink2.core")
+    monkeypatch.setattr(binary_transfer, "heatshrink", heatshrink)
+
+    printer = Printer(str(tmp_path))
+    transfer = transfer_to(printer)
+
+    transfer.run()
+
+    assert transfer.compressed
+    assert transfer.transferred < transfer.size
+    assert (tmp_path / "test.gco").read_bytes() == CONTENT
+
+
+def test_transfer_without_compression_support(tmp_path, monkeypatch):
+    monkeypatch.setattr(binary_transfer, "heatshrink", None)
+
+    printer = Printer(str(tmp_path))
+    transfer = transfer_to(printer)
+
+    transfer.run()
+
+    assert not transfer.compressed
+    assert transfer.transferred == transfer.size
+
+
+def test_transfer_unavailable():
+    transfer = BinaryFileTransfer(
+        lambda *args: None, [CONTENT], "test.gco", timeout=0.01, max_retries=2
+    )
+
+    with pytest.raises(BinaryTransferUnavailable):
+        transfer.run()
+
+    assert transfer.transferred == 0
+
+
+def test_transfer_open_fails(tmp_path):
+    printer = Printer(str(tmp_path / "missing"))
+    transfer = transfer_to(printer)
+
+    with pytest.raises(BinaryTransferError) as exc:
+        transfer.run()
+
+    assert not isinstance(exc.value, BinaryTransferUnavailable)
+    assert printer.closed
+
+
+def test_transfer_cancelled(tmp_path):
+    printer = Printer(str(tmp_path))
+    transfer = transfer_to(printer)
+
+    with pytest.raises(BinaryTransferCancelled):
+        transfer.run(progress=transfer.cancel)
+
+    assert not os.listdir(tmp_path)
+    assert printer.closed
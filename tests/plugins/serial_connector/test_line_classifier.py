@@ -0,0 +1,142 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import pytest
+
+from octoprint.plugins.serial_connector.line_classifier import (
+    LINE_BUSY,
+    LINE_CAPABILITY,
+    LINE_DEBUG,
+    LINE_EMPTY,
+    LINE_ERROR,
+    LINE_FIRMWARE,
+    LINE_INVALID_EXTRUDER,
+    LINE_OK,
+    LINE_OTHER,
+    LINE_POSITION,
+    LINE_RESEND,
+    LINE_TARGET_TEMPERATURE,
+    LINE_TEMPERATURE,
+    LINE_WAIT,
+    LineClassifier,
+    get_received_prefixes,
+    received_lines,
+    received_prefixes,
+    replay,
+)
+from octoprint.util import time_this
+
+LINES = [
+    ("", LINE_EMPTY),
+    ("ok", LINE_OK),
+    ("ok T:21.3 /0.0 B:21.3 /0.0 @:0 B@:0", LINE_OK),
+    ("ok N12 P15 B3", LINE_OK),
+    ("wait", LINE_WAIT),
+    ("waiting", LINE_OTHER),
+    ("busy: processing", LINE_BUSY),
+    ("echo:busy: paused for user", LINE_BUSY),
+    ("// action:pause", LINE_DEBUG),
+    ("Resend: 5", LINE_RESEND),
+    ("rs N5", LINE_RESEND),
+    ("Error:checksum mismatch, Last Line: 4", LINE_ERROR),
+    ("fatal: too hot", LINE_ERROR),
+    ("!! Heater decoupled", LINE_ERROR),
+    ("X:10.00 Y:20.00 Z:0.30 E:1.00 Count X:800 Y:1600 Z:120", LINE_POSITION),
+    ("T:210.0 /210.0 B:60.0 /60.0 @:64 B@:127", LINE_TEMPERATURE),
+    ("T0:210.0 /210.0 T1:25.0 /0.0", LINE_TEMPERATURE),
+    ("B:60.0 /60.0", LINE_TEMPERATURE),
+    ("B:60.0 /60.0 A:30.0", LINE_OTHER),
+    ("TargetExtr0:210", LINE_TARGET_TEMPERATURE),
+    ("TargetBed:60", LINE_TARGET_TEMPERATURE),
+    ("Cap:AUTOREPORT_TEMP:1", LINE_CAPABILITY),
+    ("FIRMWARE_NAME:Marlin 2.1.2 (Github) SOURCE_CODE_URL:...", LINE_FIRMWARE),
+    ("NAME. Malyan VER: 3.8 MODEL: M100 HW: HB02", LINE_FIRMWARE),
+    ("echo:Invalid extruder 2", LINE_INVALID_EXTRUDER),
+    ("echo:SD card ok", LINE_OTHER),
+    ("start", LINE_OTHER),
+    ("SD printing byte 123/456", LINE_OTHER),
+]
+
+
+def legacy_content_class(line):
+    # the checks the monitor loop used to run, in the order it ran them
+    lower_line = line.lower()
+    if "X:" in line and "Y:" in line and "Z:" in line:
+        return LINE_POSITION
+    elif (
+        " T:" in line
+        or line.startswith("T:")
+        or " T0:" in line
+        or line.startswith("T0:")
+        or ((" B:" in line or line.startswith("B:")) and "A:" not in line)
+    ):
+        return LINE_TEMPERATURE
+    elif "TargetExtr" in line or "TargetBed" in line:
+        return LINE_TARGET_TEMPERATURE
+    elif lower_line.startswith("cap:"):
+        return LINE_CAPABILITY
+    elif "NAME:" in line or line.startswith("NAME."):
+        return LINE_FIRMWARE
+    elif "invalid extruder" in lower_line:
+        return LINE_INVALID_EXTRUDER
+    return LINE_OTHER
+
+
+@pytest.mark.parametrize("line, expected", LINES)
+def test_classify(line, expected):
+    assert LineClassifier().classify(line) == expected
+
+
+@pytest.mark.parametrize("line", [line for line, _ in LINES])
+def test_classify_content_matches_legacy_checks(line):
+    assert LineClassifier().classify_content(line) == legacy_content_class(line)
+
+
+def test_classify_content_of_ok():
+    classifier = LineClassifier()
+    line = "ok T:21.3 /0.0 B:21.3 /0.0 @:0 B@:0"
+
+    assert classifier.classify(line) == LINE_OK
+    assert classifier.classify_content(line) == LINE_TEMPERATURE
+
+
+def test_counters():
+    classifier = LineClassifier()
+    for line in ("ok", "ok", "T:21.3 /0.0", "busy: processing", "ok"):
+        classifier.classify(line)
+
+    assert classifier.counters == {LINE_OK: 3, LINE_TEMPERATURE: 1, LINE_BUSY: 1}
+
+    classifier.reset()
+    assert not classifier.counters
+
+
+def test_received_prefixes():
+    @received_prefixes("FIRMWARE_NAME:", "ok")
+    def hook(comm, line, *args, **kwargs):
+        return line
+
+    def other_hook(comm, line, *args, **kwargs):
+        return line
+
+    # survives the timing wrapper the plugin manager puts around hooks
+    assert get_received_prefixes(time_this()(hook)) == ("FIRMWARE_NAME:", "ok")
+    assert get_received_prefixes(other_hook) is None
+
+
+def test_received_lines():
+    log = [
+        "2026-01-01 12:00:00,000 - Changing monitoring state from 'Offline' to 'Connecting'\n",
+        "2026-01-01 12:00:00,001 - >>> N0 M110 N0*125\n",
+        "2026-01-01 12:00:00,002 - <<< ok\n",
+        "2026-01-01 12:00:00,003 - <<< T:21.3 /0.0 B:21.3 /0.0\n",
+    ]
+
+    assert list(received_lines(log)) == ["ok", "T:21.3 /0.0 B:21.3 /0.0"]
+
+
+def test_replay():
+    duration, counters = replay(["ok", "T:21.3 /0.0", "ok"], repeat=3)
+
+    assert duration > 0
+    assert counters == {LINE_OK: 2, LINE_TEMPERATURE: 1}
@@ -0,0 +1,128 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from octoprint.plugins.serial_connector.scheduler import PollScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = PollScheduler()
+    scheduler.start()
+    yield scheduler
+    scheduler.cancel()
+    scheduler.join(timeout=1.0)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_runs_tasks_on_one_thread(scheduler):
+    threads = {"a": set(), "b": set()}
+
+    scheduler.add(
+        "a", lambda: threads["a"].add(threading.current_thread()), 0.01, run_first=True
+    )
+    scheduler.add("b", lambda: threads["b"].add(threading.current_thread()), 0.02)
+
+    assert wait_for(lambda: scheduler.schedule["b"]["runs"] >= 2)
+    assert threads["a"] == threads["b"] == {scheduler}
+    assert scheduler.schedule["a"]["runs"] > scheduler.schedule["b"]["runs"]
+
+
+def test_run_first(scheduler):
+    function = mock.Mock()
+
+    scheduler.add("poll", function, 10.0, run_first=True)
+
+    assert wait_for(lambda: function.call_count == 1)
+    assert scheduler.schedule["poll"]["due"] > 9.0
+
+
+def test_dynamic_interval(scheduler):
+    interval = mock.Mock(return_value=10.0)
+
+    scheduler.add("poll", mock.Mock(), interval)
+    assert scheduler.schedule["poll"]["interval"] == 10.0
+
+    interval.return_value = 5.0
+    assert scheduler.schedule["poll"]["interval"] == 5.0
+
+
+def test_notify_postpones(scheduler):
+    function = mock.Mock()
+
+    scheduler.add("poll", function, 0.2)
+    for _ in range(6):
+        time.sleep(0.05)
+        scheduler.notify("poll")
+
+    function.assert_not_called()
+    schedule = scheduler.schedule["poll"]
+    assert schedule["notifications"] == 6
+    assert schedule["due"] > 0.1
+
+    scheduler.notify("unknown")
+
+
+def test_busy_backs_off():
+    busy = threading.Event()
+    busy.set()
+
+    scheduler = PollScheduler(busy=busy.is_set, max_backoff=4)
+    poll = mock.Mock()
+    flush = mock.Mock()
+    scheduler.add("poll", poll, 0.01, run_first=True)
+    scheduler.add("flush", flush, 0.01, backoff=False)
+    scheduler.start()
+
+    try:
+        assert wait_for(lambda: scheduler.schedule["poll"]["skips"] >= 3)
+        poll.assert_not_called()
+        assert flush.call_count > 0
+        assert scheduler.schedule["poll"]["factor"] == 4
+        assert scheduler.schedule["poll"]["interval"] == pytest.approx(0.04)
+
+        busy.clear()
+        assert wait_for(lambda: poll.call_count > 0)
+        assert wait_for(lambda: scheduler.schedule["poll"]["factor"] == 1)
+    finally:
+        scheduler.cancel()
+        scheduler.join(timeout=1.0)
+
+
+def test_errors_dont_stop_other_tasks(scheduler):
+    function = mock.Mock()
+
+    scheduler.add("broken", mock.Mock(side_effect=RuntimeError()), 0.01)
+    scheduler.add("poll", function, 0.01)
+
+    assert wait_for(lambda: function.call_count >= 3)
+    assert scheduler.schedule["broken"]["runs"] >= 1
+
+
+def test_remove_and_cancel(scheduler):
+    function = mock.Mock()
+
+    scheduler.add("poll", function, 0.01)
+    scheduler.remove("poll")
+    assert "poll" not in scheduler.schedule
+
+    time.sleep(0.05)
+    function.assert_not_called()
+
+    scheduler.cancel()
+    scheduler.join(timeout=1.0)
+    assert not scheduler.is_alive()
+    assert scheduler.cancelled
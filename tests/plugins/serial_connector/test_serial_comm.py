@@ -563,3 +563,39 @@ def test__validate_m20_timestamp(val, expected):
 )
 def test_parse_file_list_line(val, expected):
     assert comm.parse_file_list_line(val) == expected
+
+
+class TestSerialCommEvents(unittest.TestCase):
+    def setUp(self):
+        self._comm = mock.create_autospec(comm.MachineCom)
+        self._comm._event_payload = (
+            lambda *args, **kwargs: comm.MachineCom._event_payload(
+                self._comm, *args, **kwargs
+            )
+        )
+
+    def _fire(self, event, payload=None):
+        with mock.patch.object(comm, "eventManager") as event_manager:
+            comm.MachineCom._fire_event(self._comm, event, payload)
+        return event_manager.return_value.fire
+
+    def test_fire_event_tagged(self):
+        from octoprint.printer.connection import ConnectedPrinter
+
+        self._comm._callback = mock.create_autospec(ConnectedPrinter, instance=True)
+        self._comm._callback.event_payload.side_effect = lambda payload: dict(
+            payload or {}, printer="mk3"
+        )
+
+        self._fire("Error", {"error": "Printer halted"}).assert_called_once_with(
+            "Error", {"error": "Printer halted", "printer": "mk3"}
+        )
+        self._fire("Home").assert_called_once_with("Home", {"printer": "mk3"})
+
+    def test_fire_event_untagged(self):
+        self._comm._callback = comm.MachineComPrintCallback()
+
+        self._fire("Error", {"error": "Printer halted"}).assert_called_once_with(
+            "Error", {"error": "Printer halted"}
+        )
+        self._fire("Home").assert_called_once_with("Home", None)
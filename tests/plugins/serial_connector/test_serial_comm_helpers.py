@@ -588,3 +588,74 @@ class TestTemperatureRecord(unittest.TestCase):
 
     def _create_temperature(self, **kwargs):
         return comm.TemperatureRecord(**kwargs)
+
+
+class TestLineHistory(unittest.TestCase):
+    def test_lookup(self):
+        history = comm.LineHistory(1024)
+        for lineno in range(1, 11):
+            history.append(lineno, b"G1 X%d" % lineno)
+
+        self.assertEqual(10, len(history))
+        self.assertEqual(1, history.first)
+        self.assertEqual(b"G1 X5", history.get(5))
+        self.assertIsNone(history.get(11))
+        self.assertIn(10, history)
+        self.assertNotIn(0, history)
+
+    def test_bounded_by_bytes(self):
+        history = comm.LineHistory(20)
+        for lineno in range(1, 11):
+            history.append(lineno, b"G1 X10")  # 6 bytes each
+
+        self.assertEqual(3, len(history))
+        self.assertEqual(18, history.size)
+        self.assertEqual(8, history.first)
+        self.assertIsNone(history.get(7))
+        self.assertEqual(b"G1 X10", history.get(10))
+
+    def test_min_lines(self):
+        history = comm.LineHistory(10, min_lines=5)
+        for lineno in range(1, 11):
+            history.append(lineno, b"G1 X10")
+
+        self.assertEqual(5, len(history))
+        self.assertEqual(6, history.first)
+
+    def test_line_number_reset(self):
+        history = comm.LineHistory(1024)
+        for lineno in range(1, 11):
+            history.append(lineno, b"G1 X10")
+
+        history.append(0, b"M110 N0")
+
+        self.assertEqual(1, len(history))
+        self.assertEqual(0, history.first)
+        self.assertEqual(7, history.size)
+
+    def test_clear(self):
+        history = comm.LineHistory(1024)
+        history.append(1, b"G28")
+        history.clear()
+
+        self.assertEqual(0, len(history))
+        self.assertEqual(0, history.size)
+        self.assertIsNone(history.first)
+
+
+@ddt
+class TestResendErrorType(unittest.TestCase):
+    @data(
+        (None, "none"),
+        ("checksum mismatch, Last Line: 4", "checksum"),
+        ("Wrong checksum", "checksum"),
+        ("No Checksum with line number, Last Line: 4", "missing_checksum"),
+        ("No Line Number with checksum, Last Line: 4", "missing_line_number"),
+        ("Line Number is not Last Line Number+1, Last Line: 4", "line_number"),
+        ("expected line 5 got 6", "line_number"),
+        ("Format error", "format"),
+        ("Something else", "other"),
+    )
+    @unpack
+    def test_resend_error_type(self, error, expected):
+        self.assertEqual(expected, comm.resend_error_type(error))
@@ -0,0 +1,140 @@
+import io
+import logging
+import threading
+from collections import deque
+from unittest import mock
+
+import octoprint.plugins.serial_connector.serial_comm as comm
+from octoprint.logging import LOGGING_TIMED_MESSAGE_ONLY_FORMAT, log_batch
+from octoprint.plugins.serial_connector import SerialLogHandler, iter_binary_log
+
+TIMESTAMP = 1767225600.25  # 2026-01-01 00:00:00.250 UTC
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def test_log_batch_preserves_timestamps(tmp_path):
+    path = tmp_path / "serial.log"
+    handler = SerialLogHandler(str(path), delay=True)
+    handler.setFormatter(logging.Formatter(LOGGING_TIMED_MESSAGE_ONLY_FORMAT))
+    logger = _logger("test_log_batch_preserves_timestamps", handler)
+
+    with mock.patch.object(
+        handler._executor, "submit", wraps=handler._executor.submit
+    ) as submit:
+        log_batch(
+            logger,
+            logging.DEBUG,
+            [(TIMESTAMP, "Send: G28"), (TIMESTAMP + 1.5, "Recv: ok")],
+        )
+    handler.close()
+
+    assert submit.call_count == 1
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith(",250 - Send: G28")
+    assert lines[1].endswith(",750 - Recv: ok")
+
+
+def test_log_batch_respects_level(tmp_path):
+    path = tmp_path / "serial.log"
+    handler = SerialLogHandler(str(path), delay=True)
+    logger = _logger("test_log_batch_respects_level", handler)
+    logger.setLevel(logging.INFO)
+
+    log_batch(logger, logging.DEBUG, [(TIMESTAMP, "Send: G28")])
+    handler.close()
+
+    assert not path.exists()
+
+
+def test_binary_log_roundtrip(tmp_path):
+    path = tmp_path / "serial.bin.log"
+    handler = SerialLogHandler(str(path), delay=True, binary=True)
+    logger = _logger("test_binary_log_roundtrip", handler)
+
+    entries = [(TIMESTAMP, "Send: N1 G28*18"), (TIMESTAMP + 0.1, "Recv: ök")]
+    log_batch(logger, logging.DEBUG, entries)
+    logger.debug("Recv: T:21.0 /0.0")
+    handler.close()
+
+    with open(path, "rb") as f:
+        records = list(iter_binary_log(f))
+
+    assert records[:2] == entries
+    assert records[2][1] == "Recv: T:21.0 /0.0"
+
+
+def test_binary_log_truncated():
+    data = io.BytesIO()
+    handler = SerialLogHandler.__new__(SerialLogHandler)
+    handler.binary = True
+
+    for message in ("Send: G28", "Recv: ok"):
+        record = logging.LogRecord("test", logging.DEBUG, "", 0, message, (), None)
+        record.created = TIMESTAMP
+        data.write(handler.format(record))
+
+    truncated = io.BytesIO(data.getvalue()[:-3])
+    assert list(iter_binary_log(truncated)) == [(TIMESTAMP, "Send: G28")]
+
+
+class TestMachineComLogBatching:
+    def _comm(self):
+        machinecom = mock.create_autospec(comm.MachineCom)
+        machinecom._log = lambda *args, **kwargs: comm.MachineCom._log(
+            machinecom, *args, **kwargs
+        )
+        machinecom._flush_log = lambda *args, **kwargs: comm.MachineCom._flush_log(
+            machinecom, *args, **kwargs
+        )
+        machinecom._terminal_log = deque([], 20)
+        machinecom._log_buffer = deque([], comm.MachineCom.LOG_BUFFER_SIZE)
+        machinecom._log_flush_mutex = threading.Lock()
+        machinecom._scheduler = mock.Mock()
+        machinecom._callback = mock.Mock()
+        machinecom._logger = logging.getLogger(__name__)
+        return machinecom
+
+    def test_lines_are_batched(self):
+        machinecom = self._comm()
+
+        machinecom._log("Send: G28")
+        machinecom._log("Recv: ok")
+
+        assert list(machinecom._terminal_log) == ["Send: G28", "Recv: ok"]
+        machinecom._callback.on_comm_logs.assert_not_called()
+
+        machinecom._flush_log()
+
+        machinecom._callback.on_comm_logs.assert_called_once()
+        entries = machinecom._callback.on_comm_logs.call_args[0][0]
+        assert [message for _, message in entries] == ["Send: G28", "Recv: ok"]
+
+        machinecom._flush_log()
+        machinecom._callback.on_comm_logs.assert_called_once()
+
+    def test_flushes_directly_without_scheduler(self):
+        machinecom = self._comm()
+        machinecom._scheduler = None
+
+        machinecom._log("Changing state to Offline")
+
+        machinecom._callback.on_comm_logs.assert_called_once()
+
+    def test_default_callback_calls_single_line_handler(self):
+        callback = comm.MachineComPrintCallback()
+        with mock.patch.object(callback, "on_comm_log") as on_comm_log:
+            callback.on_comm_logs([(TIMESTAMP, "Send: G28"), (TIMESTAMP, "Recv: ok")])
+
+        assert on_comm_log.call_args_list == [
+            mock.call("Send: G28"),
+            mock.call("Recv: ok"),
+        ]
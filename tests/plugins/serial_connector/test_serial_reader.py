@@ -0,0 +1,89 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import os
+import sys
+import threading
+
+import pytest
+import serial
+
+from octoprint.plugins.serial_connector.serial_comm import (
+    BufferedReadlineWrapper,
+    BulkReadlineWrapper,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs a pty")
+
+
+@pytest.fixture
+def port():
+    master, slave = os.openpty()
+    port = serial.Serial(os.ttyname(slave), timeout=0.1)
+    yield master, port
+    port.close()
+    os.close(master)
+    os.close(slave)
+
+
+def test_is_supported(port):
+    _, serial_obj = port
+
+    assert BulkReadlineWrapper.is_supported(serial_obj)
+    assert not BulkReadlineWrapper.is_supported(object())
+
+
+def test_read_lines_batch(port):
+    master, serial_obj = port
+    wrapper = BulkReadlineWrapper(serial_obj)
+
+    os.write(master, b"ok\nT:21.3 /0.0\nbusy: processing\nX:0.00 Y:")
+
+    assert wrapper.read_lines() == [b"ok\n", b"T:21.3 /0.0\n", b"busy: processing\n"]
+
+    # the incomplete line waits for its terminator
+    assert wrapper.read_lines() == []
+
+    os.write(master, b"0.00 Z:0.00\n")
+    assert wrapper.read_lines() == [b"X:0.00 Y:0.00 Z:0.00\n"]
+
+
+def test_readline(port):
+    master, serial_obj = port
+    wrapper = BulkReadlineWrapper(serial_obj)
+
+    os.write(master, b"start\nok\n")
+
+    assert wrapper.readline() == b"start\n"
+    assert wrapper.readline() == b"ok\n"
+    assert wrapper.readline() == b""
+
+
+def test_read_lines_waits_for_data(port):
+    master, serial_obj = port
+    serial_obj.timeout = 2.0
+    wrapper = BulkReadlineWrapper(serial_obj)
+
+    threading.Timer(0.05, lambda: os.write(master, b"ok\n")).start()
+
+    assert wrapper.read_lines() == [b"ok\n"]
+
+
+def test_same_lines_as_buffered_reader(port):
+    master, serial_obj = port
+    data = b"".join(b"T:%d.0 /0.0 B:21.3 /0.0 @:0\nok\n" % i for i in range(50))
+
+    os.write(master, data)
+    bulk = BulkReadlineWrapper(serial_obj)
+    bulk_lines = []
+    while lines := bulk.read_lines():
+        bulk_lines += lines
+
+    os.write(master, data)
+    buffered = BufferedReadlineWrapper(serial_obj)
+    buffered_lines = []
+    while line := buffered.readline():
+        buffered_lines.append(line)
+
+    assert bulk_lines == buffered_lines
+    assert len(bulk_lines) == 100
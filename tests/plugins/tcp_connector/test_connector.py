@@ -0,0 +1,192 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import time
+from unittest import mock
+
+import pytest
+
+from octoprint.events import Events
+from octoprint.filemanager.destinations import FileDestinations
+from octoprint.plugins.tcp_connector.config_schema import TcpConfig
+from octoprint.plugins.tcp_connector.connector import ConnectedTcpPrinter
+from octoprint.plugins.tcp_connector.loopback import LoopbackPrinter
+from octoprint.printer.async_connection import get_event_loop_thread
+from octoprint.printer.connection import ConnectedPrinterState
+from octoprint.printer.job import PrintJob
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met within timeout")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def plugin_settings():
+    config = TcpConfig(timeout={"temperature": 0.1}).model_dump()
+
+    def get(path, **kwargs):
+        value = config
+        for key in path:
+            value = value[key]
+        return value
+
+    plugin_settings = mock.MagicMock()
+    plugin_settings.get.side_effect = get
+    plugin_settings.get_int.side_effect = get
+    plugin_settings.get_float.side_effect = get
+    return plugin_settings
+
+
+@pytest.fixture
+def event_manager(plugin_settings):
+    plugin_manager = mock.MagicMock()
+    plugin_manager.get_hooks.return_value = {}
+
+    event_manager = mock.MagicMock()
+    settings = mock.MagicMock()
+    settings.loadScript.return_value = None
+
+    with (
+        mock.patch.object(ConnectedTcpPrinter, "_plugin_settings", plugin_settings),
+        mock.patch.object(ConnectedTcpPrinter, "_plugin_manager", plugin_manager),
+        mock.patch(
+            "octoprint.plugins.tcp_connector.connector.eventManager",
+            return_value=event_manager,
+        ),
+        mock.patch(
+            "octoprint.plugins.tcp_connector.connector.settings", return_value=settings
+        ),
+    ):
+        yield event_manager
+
+
+@pytest.fixture
+def loopback():
+    loop_thread = get_event_loop_thread()
+    printer = LoopbackPrinter(corrupt_lines={3})
+    loop_thread.submit(printer.start()).result(timeout=5)
+    yield printer
+    loop_thread.submit(printer.stop()).result(timeout=5)
+
+
+@pytest.fixture
+def connection(event_manager, loopback):
+    listener = mock.MagicMock()
+    connection = ConnectedTcpPrinter(
+        mock.MagicMock(),
+        listener=listener,
+        profile={"id": "_default"},
+        host=loopback.host,
+        port=loopback.port,
+    )
+    connection.connect()
+    wait_for(lambda: connection.state == ConnectedPrinterState.OPERATIONAL)
+    yield connection
+    connection.disconnect()
+    wait_for(lambda: connection.state == ConnectedPrinterState.CLOSED)
+
+
+def test_connect(connection, loopback, event_manager):
+    wait_for(lambda: connection.firmware_info is not None)
+
+    assert loopback.received[:2] == ["M110 N0", "M115"]
+    assert connection.firmware_info.name == "Loopback Marlin"
+    event_manager.fire.assert_any_call(
+        Events.CONNECTED,
+        {"connector": "tcp", "host": loopback.host, "port": loopback.port},
+    )
+    assert connection.connection_parameters["host"] == loopback.host
+
+
+def test_commands_and_resend(connection, loopback):
+    connection.commands("G28", "G1 X10 ; move", "M117 Hello")
+
+    wait_for(lambda: "M117 Hello" in loopback.received)
+
+    commands = [c for c in loopback.received if c != "M105"]
+    assert commands == ["M110 N0", "M115", "G28", "G1 X10", "M117 Hello"]
+    assert connection.communication_health.errors == 1
+
+
+def test_temperatures(connection, loopback):
+    connection.set_temperature("bed", 60)
+
+    def reported():
+        return any(
+            call.args[0].get("bed") == (60.0, 60.0)
+            for call in connection._listener.on_printer_temperature_update.call_args_list
+        )
+
+    wait_for(reported)
+
+
+def test_sending_hooks(event_manager, loopback):
+    def rewrite(comm, phase, command, *args, **kwargs):
+        if command == "M117 Hello":
+            return "M117 Rewritten"
+
+    ConnectedTcpPrinter._plugin_manager.get_hooks.side_effect = lambda hook: (
+        {"rewrite": rewrite} if hook.endswith(".sending") else {}
+    )
+
+    connection = ConnectedTcpPrinter(
+        mock.MagicMock(),
+        listener=mock.MagicMock(),
+        host=loopback.host,
+        port=loopback.port,
+    )
+    connection.connect()
+    try:
+        wait_for(lambda: connection.is_operational())
+        connection.commands("M117 Hello")
+        wait_for(lambda: "M117 Rewritten" in loopback.received)
+    finally:
+        connection.disconnect()
+        wait_for(lambda: connection.state == ConnectedPrinterState.CLOSED)
+
+    assert "M117 Hello" not in loopback.received
+
+
+def test_connection_refused(event_manager, loopback):
+    port = loopback.port
+    get_event_loop_thread().submit(loopback.stop()).result(timeout=5)
+
+    connection = ConnectedTcpPrinter(
+        mock.MagicMock(), listener=mock.MagicMock(), host="127.0.0.1", port=port
+    )
+    connection.connect()
+
+    wait_for(lambda: connection.state == ConnectedPrinterState.CLOSED_WITH_ERROR)
+    assert connection.get_error()
+    connection._listener.on_printer_error.assert_called_once()
+
+
+def test_print_job(connection, loopback, tmp_path):
+    path = tmp_path / "job.gcode"
+    path.write_text("; a comment\nG28\nG1 X10 Y10\n\nG1 X20 Y20 ; move\n")
+
+    job = PrintJob(
+        storage=FileDestinations.LOCAL,
+        path="job.gcode",
+        display="job.gcode",
+        path_on_disk=str(path),
+    )
+    with mock.patch(
+        "octoprint.plugins.tcp_connector.connector.valid_file_type", return_value=True
+    ):
+        assert connection.supports_job(job)
+
+    connection.set_job(job)
+    connection.start_print()
+
+    wait_for(lambda: connection._listener.on_printer_job_done.called)
+    wait_for(lambda: connection.state == ConnectedPrinterState.OPERATIONAL)
+
+    commands = [c for c in loopback.received if c != "M105"]
+    assert commands[2:] == ["G28", "G1 X10 Y10", "G1 X20 Y20"]
+    assert connection.job_progress.progress == 1.0
+    connection._listener.on_printer_job_started.assert_called_once()
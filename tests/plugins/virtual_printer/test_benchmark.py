@@ -0,0 +1,137 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import sys
+
+import pytest
+
+from octoprint.plugins.virtual_printer.benchmark import (
+    Benchmark,
+    LineTracker,
+    latency_stats,
+    percentile,
+)
+
+
+@pytest.mark.parametrize(
+    "values, p, expected",
+    [
+        ([], 50, None),
+        ([3], 99, 3),
+        ([5, 1, 4, 2, 3], 50, 3),
+        (list(range(1, 101)), 90, 90),
+        (list(range(1, 101)), 99, 99),
+        (list(range(1, 101)), 100, 100),
+    ],
+)
+def test_percentile(values, p, expected):
+    assert percentile(values, p) == expected
+
+
+def test_latency_stats():
+    stats = latency_stats([0.001, 0.002, 0.003, 0.004])
+    assert stats.p50 == 2.0
+    assert stats.max == 4.0
+
+    assert latency_stats([]).p50 is None
+
+
+def feed(tracker, *lines):
+    for timestamp, line in lines:
+        tracker.feed(timestamp, line)
+
+
+def test_tracker_latencies():
+    tracker = LineTracker()
+    feed(
+        tracker,
+        (1.0, ">>> G28"),
+        (1.5, "<<< ok"),
+        (2.0, ">>> G1 X10"),
+        (2.0, "<<< T:21.3 /0.0 B:21.3 /0.0"),
+        (2.25, "<<< ok"),
+    )
+
+    assert tracker.sent == 2
+    assert tracker.latencies == [0.5, 0.25]
+    assert tracker.idle
+
+
+def test_tracker_resend_recovery():
+    tracker = LineTracker()
+    feed(
+        tracker,
+        (1.0, ">>> N1 G1 X10*57"),
+        (1.1, "<<< ok"),
+        (1.2, ">>> N2 G1 X20*57"),
+        (1.3, "<<< Error:checksum mismatch"),
+        (1.3, "<<< Resend: 2"),
+        (1.3, "<<< ok"),
+        (1.4, ">>> N2 G1 X20*57"),
+        (1.5, "<<< ok"),
+        (1.6, ">>> N3 G1 X30*57"),
+        (1.7, "<<< ok"),
+    )
+
+    assert tracker.sent == 4
+    assert tracker.resends == 1
+    assert tracker.recoveries == [pytest.approx(0.3)]
+
+
+def test_tracker_line_number_reset():
+    tracker = LineTracker()
+    feed(
+        tracker,
+        (1.0, ">>> N100 G1 X10*57"),
+        (1.1, "<<< ok"),
+        (1.2, ">>> N0 M110 N0*125"),
+        (1.3, "<<< ok"),
+        (1.4, ">>> N1 G1 X20*57"),
+        (1.5, "<<< Resend: 2"),
+        (1.6, ">>> N2 G1 X30*57"),
+    )
+
+    assert tracker.recoveries == [pytest.approx(0.1)]
+
+
+def test_tracker_reset():
+    tracker = LineTracker()
+    feed(tracker, (1.0, ">>> G28"), (1.5, "<<< Resend: 1"))
+
+    tracker.reset()
+
+    assert tracker.sent == 0
+    assert tracker.resends == 0
+    assert tracker.idle
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs a pty")
+def test_benchmark():
+    report = Benchmark(lines=50, resend_ratio=10).run(scenarios=["print"])
+
+    assert report.lines == 50
+    assert len(report.results) == 1
+
+    result = report.results[0]
+    assert result.scenario == "print"
+    assert result.completed
+    assert result.lines >= 50
+    assert result.lines_per_second > 0
+    assert result.send_latency.p50 is not None
+    assert result.resends > 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs a pty")
+def test_benchmark_resend_sweep():
+    report = Benchmark(lines=50, resend_ratio=0, sweep_ratios=[0, 10]).run(
+        scenarios=["resends"]
+    )
+
+    assert [result.resend_ratio for result in report.results] == [0, 10]
+    assert all(result.completed for result in report.results)
+
+    without, noisy = report.results
+    assert without.resends == 0
+    assert not without.resend_errors
+    assert noisy.resends > 0
+    assert noisy.resend_errors.get("checksum", 0) > 0
@@ -0,0 +1,41 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import queue
+import threading
+
+import pytest
+
+from octoprint.plugins.virtual_printer.virtual import CharCountingQueue
+
+
+def test_char_counting_queue_partial_put():
+    q = CharCountingQueue(8)
+
+    assert q.put(b"0123456789", partial=True) == 8
+    assert q.qsize() == 8
+
+
+def test_char_counting_queue_partial_put_waits_for_space():
+    q = CharCountingQueue(8)
+    q.put(b"01234567")
+
+    def consume():
+        q.get()
+        q.task_done()
+
+    threading.Timer(0.05, consume).start()
+
+    # doesn't wait for space for the whole item, just for any space
+    assert q.put(b"0123456789", timeout=1.0, partial=True) == 8
+
+
+def test_char_counting_queue_full():
+    q = CharCountingQueue(8)
+    q.put(b"01234567")
+
+    with pytest.raises(queue.Full):
+        q.put(b"89", timeout=0.01, partial=True)
+
+    with pytest.raises(queue.Full):
+        q.put(b"89", block=False)
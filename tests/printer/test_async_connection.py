@@ -0,0 +1,117 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+
+from octoprint.printer.async_connection import (
+    AsyncConnectedPrinter,
+    EventLoopThread,
+    get_event_loop_thread,
+)
+from octoprint.printer.connection import ConnectedPrinterState
+
+
+class WaitingPrinter(AsyncConnectedPrinter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = threading.Event()
+        self.cleaned_up = threading.Event()
+
+    async def run(self):
+        self.set_state(ConnectedPrinterState.OPERATIONAL)
+        self.running.set()
+        await asyncio.Event().wait()
+
+    async def cleanup(self):
+        self.cleaned_up.set()
+
+
+class FailingPrinter(AsyncConnectedPrinter):
+    async def run(self):
+        raise ConnectionError("Printer unreachable")
+
+
+@pytest.fixture
+def listener():
+    return mock.MagicMock()
+
+
+def wait_for_state(connection, state):
+    for _ in range(500):
+        if connection.state == state:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"State {state} not reached, still {connection.state}")
+
+
+def test_connect_and_disconnect(listener):
+    connection = WaitingPrinter(mock.MagicMock(), listener=listener)
+
+    connection.connect()
+    assert connection.running.wait(5)
+    assert connection.state == ConnectedPrinterState.OPERATIONAL
+
+    connection.disconnect()
+    wait_for_state(connection, ConnectedPrinterState.CLOSED)
+
+    assert connection.cleaned_up.is_set()
+    assert connection.get_error() == ""
+    listener.on_printer_error.assert_not_called()
+
+
+def test_connect_twice(listener):
+    connection = WaitingPrinter(mock.MagicMock(), listener=listener)
+
+    connection.connect()
+    assert connection.running.wait(5)
+    task = connection._task
+    connection.connect()
+    assert connection._task is task
+
+    connection.disconnect()
+    wait_for_state(connection, ConnectedPrinterState.CLOSED)
+
+
+def test_run_fails(listener):
+    connection = FailingPrinter(mock.MagicMock(), listener=listener)
+
+    connection.connect()
+    wait_for_state(connection, ConnectedPrinterState.CLOSED_WITH_ERROR)
+
+    assert connection.get_error() == "Printer unreachable"
+    listener.on_printer_error.assert_called_once()
+    listener.on_printer_state_changed.assert_called_with(
+        ConnectedPrinterState.CLOSED_WITH_ERROR, error_str="Printer unreachable"
+    )
+
+
+def test_connections_share_loop(listener):
+    first = WaitingPrinter(mock.MagicMock(), listener=listener)
+    second = WaitingPrinter(mock.MagicMock(), listener=listener)
+
+    assert first.loop is second.loop is get_event_loop_thread().loop
+
+
+def test_call_soon_on_loop(listener):
+    connection = WaitingPrinter(mock.MagicMock(), listener=listener)
+
+    async def call():
+        results = []
+        connection.call_soon(results.append, "immediately")
+        return list(results)
+
+    assert connection.submit(call()).result(timeout=5) == ["immediately"]
+
+
+def test_event_loop_thread_stop():
+    loop_thread = EventLoopThread(name="test")
+
+    assert loop_thread.submit(asyncio.sleep(0, result=42)).result(timeout=5) == 42
+    assert loop_thread.running
+
+    loop_thread.stop(timeout=5)
+    assert not loop_thread.running
@@ -4,10 +4,12 @@ __copyright__ = "Copyright (C) 2014 The OctoPrint Project - Released under terms
 
 
 import unittest
+from unittest import mock
 
 from ddt import data, ddt, unpack
 
-from octoprint.printer.estimation import TimeEstimationHelper
+from octoprint.printer.estimation import PrintTimeEstimator, TimeEstimationHelper
+from octoprint.printer.job import PlannedMotion
 
 
 @ddt
@@ -90,3 +92,44 @@ class EstimationTestCase(unittest.TestCase):
             self.estimation_helper.update(estimate)
 
         self.assertEqual(self.estimation_helper.is_stable(), expected)
+
+
+class PlannedEstimationTestCase(unittest.TestCase):
+    def setUp(self):
+        with mock.patch("octoprint.printer.estimation.settings") as settings:
+            settings.return_value.getFloat.return_value = 1.0
+            self.estimator = PrintTimeEstimator("local")
+
+    def estimate(self, cleaned_print_time, planned):
+        self.estimator.update_plan(planned)
+        return self.estimator.estimate(
+            0.5, cleaned_print_time, cleaned_print_time, 1000.0, "analysis"
+        )
+
+    def test_plan_used_as_is_at_start(self):
+        planned = PlannedMotion(elapsed=10.0, left=500.0)
+        self.assertEqual(self.estimate(12.0, planned), (500.0, "lookahead"))
+
+    def test_plan_corrected_by_actual_progress(self):
+        self.estimate(100.0, PlannedMotion(elapsed=50.0, left=450.0))
+
+        # 100s printed for 50s planned, so the rest takes twice as long as planned
+        left, origin = self.estimate(200.0, PlannedMotion(elapsed=100.0, left=400.0))
+        self.assertEqual(origin, "lookahead")
+        self.assertAlmostEqual(left, 800.0)
+
+    def test_plan_window(self):
+        self.estimate(1.0, PlannedMotion(elapsed=0.0, left=1000.0))
+        self.estimate(200.0, PlannedMotion(elapsed=50.0, left=950.0))
+        self.estimate(500.0, PlannedMotion(elapsed=350.0, left=650.0))
+
+        # the slow start fell out of the window, since then the print kept to the plan
+        left, _ = self.estimate(600.0, PlannedMotion(elapsed=450.0, left=550.0))
+        self.assertAlmostEqual(left, 550.0)
+
+    def test_unknown_plan_falls_back(self):
+        _, origin = self.estimate(12.0, PlannedMotion())
+        self.assertNotEqual(origin, "lookahead")
+
+        _, origin = self.estimate(12.0, None)
+        self.assertNotEqual(origin, "lookahead")
@@ -0,0 +1,164 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+from unittest import mock
+
+import pytest
+
+from octoprint.events import Events
+from octoprint.printer import DEFAULT_PRINTER, tag_event_payload
+from octoprint.printer.registry import PrinterRegistry, UnknownPrinter
+from octoprint.printer.standard import Printer
+
+
+@pytest.fixture
+def event_manager():
+    event_manager = mock.MagicMock()
+
+    settings = mock.MagicMock()
+    settings.getInt.return_value = 1
+    settings.getBoolean.return_value = False
+
+    plugin_manager = mock.MagicMock()
+    plugin_manager.get_hooks.return_value = {}
+    plugin_manager.get_implementations.return_value = []
+
+    with (
+        mock.patch("octoprint.printer.standard.eventManager", return_value=event_manager),
+        mock.patch("octoprint.printer.standard.settings", return_value=settings),
+        mock.patch(
+            "octoprint.printer.standard.plugin_manager", return_value=plugin_manager
+        ),
+    ):
+        yield event_manager
+
+
+@pytest.fixture
+def profile_manager():
+    profile_manager = mock.MagicMock()
+    profile_manager.get.side_effect = lambda identifier: {"id": identifier}
+    profile_manager.get_default.return_value = {"id": "_default"}
+    return profile_manager
+
+
+@pytest.fixture
+def registry(event_manager, profile_manager):
+    file_manager = mock.MagicMock()
+    analysis_queue = mock.MagicMock()
+
+    return PrinterRegistry(
+        Printer(file_manager, analysis_queue, profile_manager),
+        factory=lambda identifier: Printer(
+            file_manager, analysis_queue, profile_manager, identifier=identifier
+        ),
+    )
+
+
+def test_tag_event_payload():
+    payload = {"connector": "serial"}
+
+    assert tag_event_payload(DEFAULT_PRINTER, payload) is payload
+    assert tag_event_payload(DEFAULT_PRINTER, None) is None
+    assert tag_event_payload("mk3", payload) == {"connector": "serial", "printer": "mk3"}
+    assert tag_event_payload("mk3", None) == {"printer": "mk3"}
+    assert payload == {"connector": "serial"}
+
+
+def test_registry(registry):
+    printer = registry.add("mk3", name="Prusa MK3")
+
+    assert registry.get() is registry.default
+    assert registry.get(DEFAULT_PRINTER) is registry.default
+    assert registry.get("mk3") is printer
+    assert printer.identifier == "mk3"
+    assert registry.default.identifier == DEFAULT_PRINTER
+
+    assert registry.identifiers == [DEFAULT_PRINTER, "mk3"]
+    assert list(registry) == [registry.default, printer]
+    assert len(registry) == 2
+    assert "mk3" in registry
+
+    assert registry.get_name("mk3") == "Prusa MK3"
+    assert registry.get_name(DEFAULT_PRINTER) == DEFAULT_PRINTER
+
+
+def test_registry_unknown(registry):
+    with pytest.raises(UnknownPrinter):
+        registry.get("unknown")
+
+    with pytest.raises(UnknownPrinter):
+        registry.get_name("unknown")
+
+
+@pytest.mark.parametrize("identifier", ["", "MK3", "mk 3", "-mk3", "../mk3"])
+def test_registry_invalid_identifier(registry, identifier):
+    with pytest.raises(ValueError):
+        registry.add(identifier)
+
+
+def test_registry_duplicate(registry):
+    registry.add("mk3")
+
+    with pytest.raises(ValueError):
+        registry.add("mk3")
+
+    with pytest.raises(ValueError):
+        registry.add(DEFAULT_PRINTER)
+
+
+def test_registry_without_factory():
+    with pytest.raises(ValueError):
+        PrinterRegistry(mock.MagicMock()).add("mk3")
+
+
+def test_events_tagged(registry, event_manager):
+    printer = registry.add("mk3")
+
+    registry.default.disconnect()
+    event_manager.fire.assert_called_with(Events.DISCONNECTED, payload=None)
+
+    printer.disconnect()
+    event_manager.fire.assert_called_with(Events.DISCONNECTED, payload={"printer": "mk3"})
+
+
+def test_markings_only_for_own_events(registry):
+    printer = registry.add("mk3")
+
+    for target in (registry.default, printer):
+        target._on_event_ChartMarked(
+            Events.CHART_MARKED, tag_event_payload(target.identifier, {"label": "x"})
+        )
+
+    registry.default._on_event_Connected(Events.CONNECTED, {"connector": "serial"})
+    printer._on_event_Connected(
+        Events.CONNECTED, {"connector": "serial", "printer": "mk3"}
+    )
+
+    assert [m["type"] for m in registry.default.get_markings()] == [
+        "unknown",
+        "connected",
+    ]
+    assert [m["type"] for m in printer.get_markings()] == ["unknown", "connected"]
+
+
+def test_additional_printer_profile(registry, profile_manager):
+    printer = registry.add("mk3")
+
+    with mock.patch("octoprint.printer.standard.ConnectedPrinter") as connected_printer:
+        printer.connect("serial", profile="mk3_profile")
+
+    profile_manager.select.assert_not_called()
+    assert printer._current_profile() == {"id": "mk3_profile"}
+    connected_printer.find.return_value.assert_called_once_with(
+        printer, profile={"id": "mk3_profile"}
+    )
+
+
+def test_additional_printer_leaves_file_storage_alone(registry):
+    printer = registry.add("mk3")
+
+    printer.disconnect()
+    printer.on_printer_files_available(True)
+
+    printer._file_manager.add_storage.assert_not_called()
+    printer._file_manager.remove_storage.assert_not_called()
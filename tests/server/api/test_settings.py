@@ -0,0 +1,136 @@
+"""
+Unit tests for ``octoprint.server.api`` settings.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+
+class SettingsCacheTest(unittest.TestCase):
+    def setUp(self):
+        import octoprint.server.api.settings as settings_api
+
+        self.settings_api = settings_api
+        self.settings = mock.MagicMock()
+        self.settings.generation = 1
+
+        patches = [
+            mock.patch.object(settings_api, "settings", return_value=self.settings),
+            mock.patch.object(settings_api, "_lastmodified", return_value=1000.0),
+            mock.patch.object(settings_api, "_settings_cache", {}),
+            mock.patch.object(settings_api, "_settings_cache_generation", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_cached_per_key(self):
+        factory = mock.Mock(side_effect=[b"user", b"admin"])
+
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"user")
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"user")
+        self.assertEqual(self.settings_api._cached_settings("admin", factory), b"admin")
+        self.assertEqual(factory.call_count, 2)
+
+    def test_invalidated_by_generation(self):
+        factory = mock.Mock(side_effect=[b"first", b"second"])
+
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"first")
+
+        self.settings.generation = 2
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"second")
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"second")
+
+    def test_invalidated_by_last_modified(self):
+        factory = mock.Mock(side_effect=[b"first", b"second"])
+
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"first")
+
+        self.settings_api._lastmodified.return_value = 2000.0
+        self.assertEqual(self.settings_api._cached_settings("user", factory), b"second")
+
+
+class SettingsEtagTest(unittest.TestCase):
+    def setUp(self):
+        import octoprint.server.api.settings as settings_api
+
+        self.app = Flask(__name__)
+        self.settings_api = settings_api
+
+        self.settings = mock.MagicMock()
+        self.settings.generation = 1
+
+        self.user = mock.MagicMock()
+        self.user.is_anonymous = False
+        self.user.needs = {("role", "user"), ("permission", "settings_read")}
+
+        self.serial_connector = mock.MagicMock()
+        self.serial_connector.connection_options.return_value = {
+            "port": ["/dev/ttyUSB0"],
+            "baudrate": [115200],
+        }
+
+        patches = [
+            mock.patch.object(settings_api, "settings", return_value=self.settings),
+            mock.patch.object(settings_api, "current_user", self.user),
+            mock.patch.object(
+                settings_api, "credentials_checked_recently", return_value=False
+            ),
+            mock.patch.object(settings_api, "get_webcams_as_dicts", return_value=[]),
+            mock.patch(
+                "octoprint.printer.connection.ConnectedPrinter.find",
+                return_value=self.serial_connector,
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def etag(self):
+        with self.app.test_request_context("/api/settings"):
+            return self.settings_api._etag(lm=1000.0)
+
+    def test_stable(self):
+        self.assertEqual(self.etag(), self.etag())
+
+    def test_generation(self):
+        etag = self.etag()
+        self.settings.generation = 2
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_permissions(self):
+        etag = self.etag()
+        self.user.needs = self.user.needs | {("permission", "admin")}
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_serial_ports(self):
+        etag = self.etag()
+        self.serial_connector.connection_options.return_value = {
+            "port": ["/dev/ttyUSB0", "/dev/ttyACM0"],
+            "baudrate": [115200],
+        }
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_webcams(self):
+        etag = self.etag()
+        self.settings_api.get_webcams_as_dicts.return_value = [
+            {"name": "classic", "provider": "classicwebcam"}
+        ]
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_live_data_determined_once_per_request(self):
+        with self.app.test_request_context("/api/settings"):
+            self.settings_api._etag(lm=1000.0)
+            self.settings_api._live_data()
+        self.settings_api.get_webcams_as_dicts.assert_called_once_with()
+        self.serial_connector.connection_options.assert_called_once_with()
+
+    def test_doesnt_load_plugin_settings(self):
+        with mock.patch.object(self.settings_api, "_get_plugin_settings") as plugins:
+            self.etag()
+            plugins.assert_not_called()
@@ -0,0 +1,56 @@
+"""
+Unit tests for ``octoprint.server.LifecycleManager``.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import unittest
+from unittest import mock
+
+from octoprint.server import LifecycleManager
+
+
+class PluginManager:
+    def __init__(self):
+        self.on_plugin_loaded = mock.MagicMock()
+        self.on_plugin_unloaded = mock.MagicMock()
+        self.on_plugin_enabled = mock.MagicMock()
+        self.on_plugin_disabled = mock.MagicMock()
+
+
+class LifecycleManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.plugin_manager = PluginManager()
+        self.original_enabled = self.plugin_manager.on_plugin_enabled
+        self.lifecycle_manager = LifecycleManager(self.plugin_manager)
+
+    def test_plugin_manager_events(self):
+        callback = mock.MagicMock()
+        self.lifecycle_manager.add_callback(["enabled", "disabled"], callback)
+        plugin = mock.MagicMock()
+
+        self.plugin_manager.on_plugin_enabled("foo", plugin)
+        self.plugin_manager.on_plugin_loaded("foo", plugin)
+
+        self.original_enabled.assert_called_once_with("foo", plugin)
+        callback.assert_called_once_with("foo", plugin)
+
+    def test_custom_events(self):
+        callback = mock.MagicMock()
+        self.lifecycle_manager.add_callback("installed", callback)
+        plugin = mock.MagicMock()
+
+        self.lifecycle_manager.on_plugin_event("installed", "foo", plugin)
+        self.lifecycle_manager.on_plugin_event("uninstalled", "foo", plugin)
+
+        callback.assert_called_once_with("foo", plugin)
+
+    def test_remove_callback(self):
+        callback = mock.MagicMock()
+        self.lifecycle_manager.add_callback("disabled", callback)
+        self.lifecycle_manager.remove_callback(callback)
+
+        self.plugin_manager.on_plugin_disabled("foo", mock.MagicMock())
+
+        callback.assert_not_called()
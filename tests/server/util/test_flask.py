@@ -7,6 +7,7 @@ __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agp
 __copyright__ = "Copyright (C) 2016 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
 
+import gzip
 import unittest
 from unittest import mock
 
@@ -14,6 +15,7 @@ import flask
 from ddt import data, ddt, unpack
 
 from octoprint.server.util.flask import (
+    LateBlueprintDispatcher,
     OctoPrintFlaskRequest,
     OctoPrintFlaskResponse,
     ReverseProxiedEnvironment,
@@ -589,3 +591,134 @@ class OctoPrintFlaskResponseTest(unittest.TestCase):
                             path=expected_path_delete,
                             domain=None,
                         )
+
+
+class LateBlueprintDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask("late_test")
+
+        blueprint = flask.Blueprint("late", "late")
+
+        @blueprint.route("/hello/<name>")
+        def hello(name):
+            return f"Hello {name}"
+
+        @blueprint.route("/forbidden")
+        def forbidden():
+            flask.abort(403)
+
+        @blueprint.errorhandler(403)
+        def handle_forbidden(e):
+            return "Nope", 403
+
+        @blueprint.route("/broken")
+        def broken():
+            raise RuntimeError("broken")
+
+        @blueprint.after_request
+        def after(response):
+            response.headers["X-Late"] = "yes"
+            return response
+
+        self.teardowns = []
+
+        @blueprint.teardown_request
+        def teardown(exception):
+            self.teardowns.append(exception)
+
+        dispatcher = LateBlueprintDispatcher(blueprint, "/plugin/late")
+
+        @self.app.route("/plugin/late/<path:path>")
+        def dispatch(path):
+            return dispatcher.dispatch()
+
+        # first request happened, blueprints can no longer be registered on the app
+        self.client = self.app.test_client()
+        self.client.get("/")
+
+    def test_dispatch(self):
+        response = self.client.get("/plugin/late/hello/world")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b"Hello world", response.data)
+        self.assertEqual("yes", response.headers["X-Late"])
+
+    def test_error_handler(self):
+        response = self.client.get("/plugin/late/forbidden")
+        self.assertEqual(403, response.status_code)
+        self.assertEqual(b"Nope", response.data)
+
+    def test_not_found(self):
+        response = self.client.get("/plugin/late/unknown")
+        self.assertEqual(404, response.status_code)
+
+    def test_teardown(self):
+        self.client.get("/plugin/late/hello/world")
+        self.client.get("/plugin/late/forbidden")
+        self.assertEqual([None, None], self.teardowns)
+
+    def test_teardown_unhandled_exception(self):
+        response = self.client.get("/plugin/late/broken")
+        self.assertEqual(500, response.status_code)
+        self.assertEqual(1, len(self.teardowns))
+        self.assertIsInstance(self.teardowns[0], RuntimeError)
+
+
+@ddt
+class CompressResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+
+        patcher = mock.patch("octoprint.server.util.flask._compressed", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch(
+            "octoprint.util.files.get_compression_encodings", return_value=["gzip"]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def compress(self, response, accept_encoding="gzip, deflate"):
+        from octoprint.server.util.flask import compress_response
+
+        with self.app.test_request_context(
+            "/", headers={"Accept-Encoding": accept_encoding}
+        ):
+            return compress_response(response)
+
+    def test_compressed(self):
+        response = self.compress(flask.Response("<html></html>", mimetype="text/html"))
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertEqual(gzip.decompress(response.get_data()), b"<html></html>")
+
+    def test_not_accepted(self):
+        response = self.compress(
+            flask.Response("<html></html>", mimetype="text/html"),
+            accept_encoding="identity",
+        )
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertEqual(response.get_data(), b"<html></html>")
+
+    @data(
+        flask.Response("<html></html>", mimetype="text/html", status=404),
+        flask.Response(b"\x89PNG", mimetype="image/png"),
+    )
+    def test_not_compressed(self, response):
+        response = self.compress(response)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_compressed_once_per_etag(self):
+        from octoprint.util import files
+
+        with mock.patch.object(files, "compress", wraps=files.compress) as compress:
+            for _ in range(2):
+                response = flask.Response("<html></html>", mimetype="text/html")
+                response.set_etag("etag")
+                response = self.compress(response)
+                self.assertEqual(gzip.decompress(response.get_data()), b"<html></html>")
+
+            self.assertEqual(compress.call_count, 1)
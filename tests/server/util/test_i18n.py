@@ -0,0 +1,156 @@
+"""
+Unit tests for ``octoprint.server.util.i18n``.
+"""
+
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import octoprint.server.util.i18n
+from octoprint.server.util.i18n import TranslationBundles
+
+PO_TEMPLATE = """
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=2; plural=(n != 1);\\n"
+
+msgid "Hello"
+msgstr "{hello}"
+
+msgid "World"
+msgstr "{world}"
+"""
+
+
+class TranslationBundlesTest(unittest.TestCase):
+    def setUp(self):
+        self.basedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.basedir)
+
+        self.folder = os.path.join(self.basedir, "generated", "i18n")
+        self.core_path = os.path.join(self.basedir, "core")
+        self.user_path = os.path.join(self.basedir, "user")
+
+        self.plugin = mock.MagicMock()
+        self.plugin.location = os.path.join(self.basedir, "plugin")
+
+        plugin_manager = mock.MagicMock()
+        plugin_manager.enabled_plugins = {"plugin": self.plugin}
+
+        patcher = mock.patch(
+            "octoprint.plugin.plugin_manager", return_value=plugin_manager
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self._write_po(self.core_path, "de", hello="Hallo", world="Welt")
+
+    def _write_po(self, basedir, locale, hello="", world=""):
+        folder = os.path.join(basedir, locale, "LC_MESSAGES")
+        os.makedirs(folder, exist_ok=True)
+
+        path = os.path.join(folder, "messages.po")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(PO_TEMPLATE.format(hello=hello, world=world))
+        return path
+
+    def _bundles(self):
+        return TranslationBundles(self.folder, self.core_path, self.user_path, json.dumps)
+
+    def test_get(self):
+        self._write_po(
+            os.path.join(self.plugin.location, "translations"), "de", hello="Servus"
+        )
+
+        bundle = self._bundles().get("de", "messages")
+
+        catalog = json.loads(bundle.read())
+        self.assertEqual(catalog["locale"], "de")
+        self.assertEqual(catalog["domain"], "messages")
+        self.assertEqual(catalog["messages"]["Hello"], "Hallo")
+        self.assertEqual(catalog["messages"]["World"], "Welt")
+        self.assertEqual(catalog["plural_expr"], "(n != 1)")
+        self.assertEqual(
+            gzip.decompress(bundle.read(path=bundle.path + ".gz")), bundle.read()
+        )
+
+        path, encoding = bundle.variant("gzip, deflate")
+        self.assertEqual(path, bundle.path + ".gz")
+        self.assertEqual(encoding, "gzip")
+        self.assertTrue(bundle.path.startswith(os.path.join(self.folder, "de")))
+        self.assertIsNotNone(bundle.lastmodified)
+
+    def test_get_cached(self):
+        bundles = self._bundles()
+        bundle = bundles.get("de", "messages")
+
+        with mock.patch.object(octoprint.server.util.i18n, "read_translations") as read:
+            self.assertIs(bundles.get("de", "messages"), bundle)
+            read.assert_not_called()
+
+    def test_reused_from_disk(self):
+        bundle = self._bundles().get("de", "messages")
+
+        with mock.patch.object(octoprint.server.util.i18n, "read_translations") as read:
+            restored = self._bundles().get("de", "messages")
+            read.assert_not_called()
+
+        self.assertEqual(restored.etag, bundle.etag)
+        self.assertEqual(restored.read(), bundle.read())
+
+    def test_rebuild(self):
+        bundles = self._bundles()
+        bundle = bundles.get("de", "messages")
+
+        self._write_po(self.user_path, "de", hello="Moin")
+        bundles.rebuild().join()
+
+        rebuilt = bundles.get("de", "messages")
+        self.assertNotEqual(rebuilt.etag, bundle.etag)
+        self.assertEqual(json.loads(rebuilt.read())["messages"]["Hello"], "Hallo")
+        self.assertEqual(json.loads(rebuilt.read())["messages"]["World"], "Welt")
+
+        # outdated bundles get cleaned up
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.folder, "de"))),
+            sorted(
+                name
+                for name in os.listdir(os.path.join(self.folder, "de"))
+                if name.startswith(os.path.basename(rebuilt.path))
+            ),
+        )
+
+    def test_without_translations(self):
+        bundles = self._bundles()
+
+        for locale in ("en", "fr"):
+            bundle = bundles.get(locale, "messages")
+            self.assertIsNone(bundle.path)
+            self.assertEqual(json.loads(bundle.read())["messages"], {})
+
+        self.assertFalse(os.path.exists(self.folder))
+
+    def test_without_translations_cached(self):
+        renderer = mock.Mock(side_effect=json.dumps)
+        bundles = TranslationBundles(
+            self.folder, self.core_path, self.user_path, renderer
+        )
+
+        bundle = bundles.get("en", "messages")
+        self.assertIs(bundles.get("en", "messages"), bundle)
+        self.assertEqual(1, renderer.call_count)
+
+    def test_invalid_name(self):
+        bundles = self._bundles()
+
+        for locale, domain in (("..", "messages"), ("de", "../messages")):
+            with self.assertRaises(ValueError):
+                bundles.get(locale, domain)
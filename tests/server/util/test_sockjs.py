@@ -0,0 +1,210 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import json
+from unittest import mock
+
+import pytest
+
+from octoprint.server.util.sockjs import PrinterStateConnection, TerminalFilterSet
+
+TERMINAL_FILTERS = [
+    {
+        "name": "Suppress temperature messages",
+        "regex": r"(Send: (N\d+\s+)?M105)|(Recv:\s+(ok\s+([PBN]\d+\s+)*)?([BCLPR]|T\d*):-?\d+)",
+    },
+    {
+        "name": "Suppress SD status messages",
+        "regex": r"(Send: (N\d+\s+)?M27)|(Recv: SD printing byte)|(Recv: Not SD printing)",
+    },
+    {"name": "Suppress wait responses", "regex": r"Recv: wait"},
+    {"name": "Broken", "regex": r"(?<=unbalanced"},
+]
+
+LOGS = [
+    "Send: M105",
+    "Recv: ok T:210.0 /210.0 B:60.0 /60.0",
+    "Send: G1 X10",
+    "Recv: wait",
+    "Recv: ok",
+    "Send: M27",
+    "Recv: SD printing byte 10/100",
+    "Recv: wait",
+]
+
+
+@pytest.fixture
+def terminal_filters():
+    settings = mock.MagicMock()
+    settings.get.return_value = TERMINAL_FILTERS
+    with mock.patch("octoprint.server.util.sockjs.settings", return_value=settings):
+        yield
+
+
+@pytest.fixture
+def connection(terminal_filters):
+    connection = PrinterStateConnection(
+        mock.MagicMock(),  # printer
+        mock.MagicMock(),  # file manager
+        mock.MagicMock(),  # analysis queue
+        mock.MagicMock(),  # user manager
+        mock.MagicMock(),  # group manager
+        mock.MagicMock(),  # event manager
+        mock.MagicMock(),  # plugin manager
+        mock.MagicMock(),  # connectivity checker
+        mock.MagicMock(),  # session
+    )
+    connection._initial_data_sent = True
+    return connection
+
+
+def test_filter_set(terminal_filters):
+    filter_set = TerminalFilterSet.for_names(
+        ["Suppress temperature messages", "Suppress wait responses"]
+    )
+
+    logs, filtered = filter_set.filter(LOGS)
+
+    assert logs == [
+        "Send: G1 X10",
+        "Recv: ok",
+        "Send: M27",
+        "Recv: SD printing byte 10/100",
+    ]
+    assert filtered == 4
+
+
+def test_filter_set_shared(terminal_filters):
+    first = TerminalFilterSet.for_names(
+        ["Suppress wait responses", "Suppress SD status messages"]
+    )
+    second = TerminalFilterSet.for_names(
+        ["Suppress SD status messages", "Suppress wait responses", "Unknown"]
+    )
+    other = TerminalFilterSet.for_names(["Suppress wait responses"])
+
+    assert first is second
+    assert first is not other
+
+
+def test_filter_set_evaluates_line_once(terminal_filters):
+    filter_set = TerminalFilterSet.for_names(["Suppress wait responses"])
+    filter_set._regex = mock.MagicMock(wraps=filter_set._regex)
+
+    filter_set.filter(LOGS)
+    filter_set.filter(LOGS)
+
+    # 7 distinct lines, each only matched once across both calls
+    assert filter_set._regex.search.call_count == len(set(LOGS))
+
+
+def test_filter_set_ignores_invalid_regex(terminal_filters):
+    filter_set = TerminalFilterSet.for_names(["Broken", "Suppress wait responses"])
+
+    logs, filtered = filter_set.filter(LOGS)
+
+    assert "Recv: wait" not in logs
+    assert filtered == 2
+
+
+def test_filter_set_only_invalid_regex(terminal_filters):
+    filter_set = TerminalFilterSet.for_names(["Broken"])
+
+    assert filter_set.filter(LOGS) == (LOGS, 0)
+
+
+def test_terminal_filters_message(connection):
+    connection.on_message(json.dumps({"terminalFilters": ["Suppress wait responses"]}))
+
+    assert connection._terminal_filters is TerminalFilterSet.for_names(
+        ["Suppress wait responses"]
+    )
+    connection._printer.send_initial_callback.assert_called_once_with(connection)
+    assert connection._filter_terminal(LOGS) == (
+        [line for line in LOGS if line != "Recv: wait"],
+        2,
+    )
+
+
+def test_terminal_filters_message_unchanged(connection):
+    connection.on_message(json.dumps({"terminalFilters": ["Suppress wait responses"]}))
+    connection.on_message(json.dumps({"terminalFilters": ["Suppress wait responses"]}))
+
+    connection._printer.send_initial_callback.assert_called_once_with(connection)
+
+
+def test_terminal_filters_message_reset(connection):
+    connection.on_message(json.dumps({"terminalFilters": ["Suppress wait responses"]}))
+    connection.on_message(json.dumps({"terminalFilters": []}))
+
+    assert connection._terminal_filters is None
+    assert connection._filter_terminal(LOGS) == (LOGS, None)
+
+
+def test_terminal_filters_message_invalid(connection):
+    connection.on_message(json.dumps({"terminalFilters": "Suppress wait responses"}))
+
+    assert connection._terminal_filters is None
+    connection._printer.send_initial_callback.assert_not_called()
+
+
+@pytest.fixture
+def printers():
+    printers = mock.MagicMock()
+    additional = mock.MagicMock()
+    additional.identifier = "mk3"
+    printers.__contains__.side_effect = lambda identifier: identifier == "mk3"
+    printers.get.return_value = additional
+    return printers
+
+
+def test_subscribe_printers(connection, printers):
+    connection._printers = printers
+    connection._registered = True
+
+    connection.on_message(json.dumps({"subscribe": {"printers": ["mk3", "unknown"]}}))
+
+    additional = printers.get.return_value
+    forwarder = connection._printer_forwarders["mk3"]
+    assert list(connection._printer_forwarders) == ["mk3"]
+    additional.register_callback.assert_called_once_with(forwarder)
+    additional.send_initial_callback.assert_called_once_with(forwarder)
+
+    connection.on_message(json.dumps({"subscribe": {"printers": []}}))
+
+    assert connection._printer_forwarders == {}
+    additional.unregister_callback.assert_called_once_with(forwarder)
+
+
+def test_subscribe_printers_invalid(connection, printers):
+    connection._printers = printers
+    connection._registered = True
+
+    connection.on_message(json.dumps({"subscribe": {"printers": "mk3"}}))
+
+    assert connection._printer_forwarders == {}
+
+
+def test_forwarded_printer_state(connection, printers):
+    connection._printers = printers
+    connection._registered = True
+    connection._emit = mock.MagicMock()
+    connection.on_message(json.dumps({"subscribe": {"printers": ["mk3"]}}))
+
+    forwarder = connection._printer_forwarders["mk3"]
+    forwarder.printer.get_markings.return_value = []
+    forwarder.on_printer_add_temperature({"time": 1})
+    forwarder.on_printer_add_log("Recv: ok")
+    forwarder.on_printer_send_current_data({"state": {"text": "Operational"}})
+
+    # rate limited
+    forwarder.on_printer_send_current_data({"state": {"text": "Printing"}})
+
+    connection._emit.assert_called_once()
+    (message_type,) = connection._emit.call_args.args
+    payload = connection._emit.call_args.kwargs["payload"]
+    assert message_type == "current"
+    assert payload["printer"] == "mk3"
+    assert payload["state"] == {"text": "Operational"}
+    assert payload["temps"] == [{"time": 1}]
+    assert payload["logs"] == ["Recv: ok"]
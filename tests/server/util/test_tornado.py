@@ -7,8 +7,14 @@ __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agp
 __copyright__ = "Copyright (C) 2016 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
 
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
 
+import tornado.testing
+import tornado.web
 from ddt import data, ddt, unpack
 
 ##~~ _parse_header
@@ -125,3 +131,248 @@ class ExtendedHeaderValueTest(unittest.TestCase):
         actual = _extended_header_value(value)
 
         self.assertEqual(expected, actual)
+
+
+##~~ LargeResponseHandler
+
+
+class LargeResponseHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+
+        with open(os.path.join(self.folder, "bundle.js"), "wb") as f:
+            f.write(b"plain")
+        with open(os.path.join(self.folder, "bundle.js.gz"), "wb") as f:
+            f.write(gzip.compress(b"plain"))
+        with open(os.path.join(self.folder, "bundle.js.br"), "wb") as f:
+            f.write(b"brotli")
+
+        super().setUp()
+
+    def get_app(self):
+        from octoprint.server.util.tornado import LargeResponseHandler
+
+        return tornado.web.Application(
+            [
+                (
+                    r"/(.*)",
+                    LargeResponseHandler,
+                    {
+                        "path": self.folder,
+                        "is_pre_compressed": True,
+                        "immutable": True,
+                    },
+                )
+            ]
+        )
+
+    def test_brotli(self):
+        response = self.fetch(
+            "/bundle.js",
+            headers={"Accept-Encoding": "gzip, br"},
+            decompress_response=False,
+        )
+
+        self.assertEqual(response.body, b"brotli")
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertTrue(
+            response.headers["Content-Type"].startswith("application/javascript")
+            or response.headers["Content-Type"].startswith("text/javascript")
+        )
+
+    def test_gzip(self):
+        response = self.fetch(
+            "/bundle.js", headers={"Accept-Encoding": "gzip"}, decompress_response=False
+        )
+
+        self.assertEqual(gzip.decompress(response.body), b"plain")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+
+    def test_uncompressed(self):
+        response = self.fetch(
+            "/bundle.js",
+            headers={"Accept-Encoding": "identity"},
+            decompress_response=False,
+        )
+
+        self.assertEqual(response.body, b"plain")
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_variants_have_different_etags(self):
+        etags = {
+            self.fetch(
+                "/bundle.js",
+                headers={"Accept-Encoding": encoding},
+                decompress_response=False,
+            ).headers["Etag"]
+            for encoding in ("br", "gzip", "identity")
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_immutable(self):
+        versioned = self.fetch("/bundle.js?1234")
+        self.assertEqual(
+            versioned.headers["Cache-Control"], "public, max-age=31536000, immutable"
+        )
+
+        unversioned = self.fetch("/bundle.js")
+        self.assertNotIn("immutable", unversioned.headers.get("Cache-Control", ""))
+
+
+##~~ Request lanes
+
+
+class RequestLaneTest(unittest.TestCase):
+    def test_router(self):
+        import flask
+
+        from octoprint.server.util.tornado import RequestLane, RequestLaneRouter
+
+        app = flask.Flask(__name__)
+        api = flask.Blueprint("api", __name__)
+        api.add_url_rule("/job", "controlJob", lambda: "", methods=["POST"])
+        api.add_url_rule("/job", "jobState", lambda: "", methods=["GET"])
+        api.add_url_rule("/files", "readGcodeFiles", lambda: "")
+        app.register_blueprint(api, url_prefix="/api")
+
+        control = RequestLane("control", workers=1, routes=["api.controlJob"])
+        bulk = RequestLane(
+            "bulk", workers=1, routes=["api.readGcodeFiles", "/api/plugin/backup*"]
+        )
+        default = RequestLane("default", workers=1)
+        for lane in (control, bulk, default):
+            self.addCleanup(lane.executor.shutdown)
+
+        router = RequestLaneRouter([control, bulk, default], url_map=app.url_map)
+
+        self.assertIs(router("POST", "/api/job"), control)
+        self.assertIs(router("GET", "/api/job"), default)
+        self.assertIs(router("GET", "/api/files"), bulk)
+        self.assertIs(router("POST", "/api/plugin/backup"), bulk)
+        self.assertIs(router("GET", "/unknown"), default)
+
+    def test_queue_limit(self):
+        import threading
+
+        from octoprint.server.util.tornado import RequestLane
+
+        lane = RequestLane("test", workers=1, queue=1)
+        self.addCleanup(lane.executor.shutdown)
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        running = lane.submit(release.wait, 5)
+        waiting = lane.submit(lambda: "done")
+        self.assertIsNotNone(running)
+        self.assertIsNotNone(waiting)
+
+        # one request being handled and one waiting, the next one gets rejected
+        self.assertIsNone(lane.submit(lambda: "rejected"))
+
+        release.set()
+        self.assertEqual(waiting.result(timeout=5), "done")
+        self.assertEqual(lane.waiting, 0)
+
+        # requests count as running until they are finished
+        self.assertEqual(lane.running, 2)
+        self.assertIsNone(lane.submit(lambda: "rejected"))
+
+        lane.finish()
+        self.assertIsNotNone(lane.submit(lambda: "accepted"))
+
+    def test_failed_request_finished(self):
+        from octoprint.server.util.tornado import RequestLane
+
+        lane = RequestLane("test", workers=1, queue=0)
+        self.addCleanup(lane.executor.shutdown)
+
+        def fail():
+            raise RuntimeError("failed")
+
+        with self.assertRaises(RuntimeError):
+            lane.submit(fail).result(timeout=5)
+        self.assertEqual(lane.running, 0)
+
+
+class WsgiInputContainerLanesTest(tornado.testing.AsyncHTTPTestCase):
+    def setUp(self):
+        import threading
+
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.streaming = threading.Event()
+        super().setUp()
+
+    def get_app(self):
+        from octoprint.server.util.tornado import (
+            RequestLane,
+            RequestLaneRouter,
+            WsgiInputContainer,
+        )
+
+        def stream():
+            yield b"first"
+            self.streaming.set()
+            self.release.wait(5)
+            yield b"second"
+
+        def wsgi_app(environ, start_response):
+            if environ["PATH_INFO"] == "/slow":
+                self.release.wait(5)
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            if environ["PATH_INFO"] == "/stream":
+                return stream()
+            return [environ["PATH_INFO"].encode("utf-8")]
+
+        self.bulk = RequestLane("bulk", workers=1, queue=0, routes=["/slow", "/stream"])
+        self.default = RequestLane("default", workers=1)
+        for lane in (self.bulk, self.default):
+            self.addCleanup(lane.executor.shutdown, wait=False)
+
+        container = WsgiInputContainer(
+            wsgi_app,
+            lanes=RequestLaneRouter([self.bulk, self.default]),
+            retry_after=7,
+        )
+        return tornado.web.Application(
+            [(r".*", tornado.web.FallbackHandler, {"fallback": container})]
+        )
+
+    def test_overloaded_lane(self):
+        slow = self.http_client.fetch(self.get_url("/slow"), raise_error=False)
+
+        # wait for the slow request to occupy the bulk lane's only worker
+        while not self.bulk.running:
+            self.io_loop.run_sync(lambda: tornado.gen.sleep(0.01))
+
+        rejected = self.fetch("/slow")
+        self.assertEqual(rejected.code, 503)
+        self.assertEqual(rejected.headers["Retry-After"], "7")
+
+        # other lanes are unaffected
+        other = self.fetch("/other")
+        self.assertEqual(other.code, 200)
+        self.assertEqual(other.body, b"/other")
+
+        self.release.set()
+        response = self.io_loop.run_sync(lambda: slow)
+        self.assertEqual(response.code, 200)
+
+    def test_streaming_occupies_lane(self):
+        streamed = self.http_client.fetch(self.get_url("/stream"), raise_error=False)
+
+        # wait for the response to be streamed
+        while not self.streaming.is_set():
+            self.io_loop.run_sync(lambda: tornado.gen.sleep(0.01))
+
+        self.assertEqual(self.bulk.running, 1)
+        self.assertEqual(self.fetch("/slow").code, 503)
+
+        self.release.set()
+        response = self.io_loop.run_sync(lambda: streamed)
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body, b"firstsecond")
+        self.assertEqual(self.bulk.running, 0)
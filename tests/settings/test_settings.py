@@ -815,6 +815,59 @@ class SettingsTest(unittest.TestCase):
             settings.save(force=True)
             self.assertGreater(settings.last_modified, last_modified)
 
+    ##~~ test generation
+
+    def test_generation_set_and_remove(self):
+        with self.settings() as settings:
+            generation = settings.generation
+
+            settings.set(["server", "port"], 8081)
+            self.assertGreater(settings.generation, generation)
+            generation = settings.generation
+
+            settings.set(["server", "port"], 8081)
+            self.assertEqual(settings.generation, generation)
+
+            settings.remove(["server", "port"])
+            self.assertGreater(settings.generation, generation)
+
+    def test_generation_overlays(self):
+        with self.settings() as settings:
+            generation = settings.generation
+
+            key = settings.add_overlay({"server": {"host": "1.1.1.1"}})
+            self.assertGreater(settings.generation, generation)
+            generation = settings.generation
+
+            settings.remove_overlay(key)
+            self.assertGreater(settings.generation, generation)
+            generation = settings.generation
+
+            settings.remove_overlay(key)
+            self.assertEqual(settings.generation, generation)
+
+    def test_generation_save_and_bump(self):
+        with self.settings() as settings:
+            generation = settings.generation
+
+            settings.set(["server", "port"], 8081)
+            settings.save()
+            self.assertGreater(settings.generation, generation + 1)
+            generation = settings.generation
+
+            settings.bump_generation()
+            self.assertEqual(settings.generation, generation + 1)
+
+    def test_generation_forgets_hashes(self):
+        with self.settings() as settings:
+            effective_hash = settings.effective_hash
+
+            key = settings.add_overlay({"server": {"host": "1.1.1.1"}})
+            self.assertNotEqual(settings.effective_hash, effective_hash)
+
+            settings.remove_overlay(key)
+            self.assertEqual(settings.effective_hash, effective_hash)
+
     ##~~ test migrations
 
     @ddt.data(
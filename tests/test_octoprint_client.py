@@ -0,0 +1,150 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import asyncio
+import http.server
+import json
+import threading
+from unittest import mock
+
+import pytest
+import requests
+
+from octoprint_client import AsyncClient, Client, Fleet
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.server.api_keys.append(self.headers.get("X-Api-Key"))
+
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        data = json.loads(self.rfile.read(length))
+
+        body = json.dumps({"received": data}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.connections = set()
+    server.api_keys = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def base_url(server):
+    return "http://127.0.0.1:{}".format(server.server_address[1])
+
+
+def test_client_reuses_connection(server):
+    with Client(base_url(server), "apikey") as client:
+        for _ in range(5):
+            response = client.get("/api/version")
+            assert response.json() == {"path": "/api/version"}
+
+    assert len(server.connections) == 1
+    assert server.api_keys == ["apikey"] * 5
+
+
+def test_client_close(server):
+    client = Client(base_url(server), "apikey")
+    client.get("/api/version")
+    client.close()
+    client.get("/api/version")
+
+    assert len(server.connections) == 2
+
+
+def test_async_client(server):
+    async def run():
+        async with AsyncClient(base_url(server), "apikey") as client:
+            responses = await asyncio.gather(
+                *(client.get(f"/api/{i}") for i in range(5)),
+                client.post_json("/api/files", {"foo": "bar"}),
+            )
+        return [response.json() for response in responses]
+
+    results = asyncio.run(run())
+
+    assert results[:5] == [{"path": f"/api/{i}"} for i in range(5)]
+    assert results[5] == {"received": {"foo": "bar"}}
+
+
+def test_async_client_prepare_request():
+    client = AsyncClient("http://example.com", "apikey")
+
+    request = client.prepare_request(method="GET", path="/api/version")
+
+    assert request.method == "GET"
+    assert request.url == "http://example.com/api/version"
+    assert request.headers["X-Api-Key"] == "apikey"
+
+
+def test_async_client_create_socket():
+    client = AsyncClient("http://example.com", "apikey")
+    on_message = mock.MagicMock()
+
+    with mock.patch.object(
+        client._client, "create_socket", return_value="socket"
+    ) as create_socket:
+        socket = asyncio.run(client.create_socket(on_message=on_message))
+
+    assert socket == "socket"
+    create_socket.assert_called_once_with(on_message=on_message)
+
+
+def test_fleet(server):
+    fleet = Fleet(
+        {
+            "first": Client(base_url(server), "first"),
+            "second": Client(base_url(server), "second"),
+            "unreachable": Client("http://127.0.0.1:1", "unreachable"),
+        }
+    )
+
+    with fleet:
+        results = fleet.get("/api/job", timeout=5)
+
+    assert list(results) == ["first", "second", "unreachable"]
+    assert results["first"].response.json() == {"path": "/api/job"}
+    assert results["first"].error is None
+    assert results["second"].response.json() == {"path": "/api/job"}
+    assert results["unreachable"].response is None
+    assert isinstance(results["unreachable"].error, requests.ConnectionError)
+    assert sorted(server.api_keys) == ["first", "second"]
+
+
+def test_fleet_post_command(server):
+    fleet = Fleet({"printer": Client(base_url(server), "apikey")})
+
+    results = fleet.post_command("/api/job", "pause", additional={"action": "pause"})
+
+    assert results["printer"].response.json() == {
+        "received": {"command": "pause", "action": "pause"}
+    }
+
+
+def test_empty_fleet():
+    assert Fleet({}).get("/api/job") == {}
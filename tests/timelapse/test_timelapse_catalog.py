@@ -0,0 +1,125 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from octoprint.timelapse import TimelapseCatalog
+
+
+class TimelapseCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.basedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.basedir)
+
+        self.capture_dir = os.path.join(self.basedir, "timelapse_tmp")
+        os.mkdir(self.capture_dir)
+        self.path = os.path.join(self.basedir, "catalog.yaml")
+
+    def _frame(self, name, size=10):
+        path = os.path.join(self.capture_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return path
+
+    def _catalog(self):
+        catalog = TimelapseCatalog(self.capture_dir, path=self.path, save_delay=3600)
+        self.addCleanup(self._cancel_save, catalog)
+        return catalog
+
+    def _cancel_save(self, catalog):
+        if catalog._save_timer is not None:
+            catalog._save_timer.cancel()
+
+    def test_scan(self):
+        self._frame("one-0.jpg", size=1)
+        self._frame("one-1.jpg", size=2)
+        self._frame("two-0.jpg", size=4)
+        self._frame("nope.mpg")
+        self._frame("tmp_00000.jpg")
+
+        jobs = self._catalog().jobs()
+
+        self.assertEqual(set(jobs), {"one", "two"})
+        self.assertEqual(jobs["one"]["count"], 2)
+        self.assertEqual(jobs["one"]["bytes"], 3)
+        self.assertEqual(jobs["one"]["last"], 1)
+        self.assertEqual(jobs["two"]["count"], 1)
+        self.assertEqual(jobs["two"]["bytes"], 4)
+
+        # legacy frames get removed
+        self.assertFalse(os.path.exists(os.path.join(self.capture_dir, "tmp_00000.jpg")))
+
+    def test_record(self):
+        self._frame("one-0.jpg")
+        catalog = self._catalog()
+        catalog.jobs()
+
+        with mock.patch.object(catalog, "_scan") as scan:
+            catalog.record(self._frame("one-1.jpg", size=5))
+            catalog.record(self._frame("two-0.jpg", size=7))
+            jobs = catalog.jobs()
+            scan.assert_not_called()
+
+        self.assertEqual(jobs["one"]["count"], 2)
+        self.assertEqual(jobs["one"]["bytes"], 15)
+        self.assertEqual(jobs["two"]["count"], 1)
+        self.assertEqual(jobs["two"]["bytes"], 7)
+
+    def test_record_known_frame(self):
+        catalog = self._catalog()
+        catalog.jobs()
+
+        path = self._frame("one-0.jpg")
+        catalog.jobs()  # rescan picks up the frame before it gets recorded
+        catalog.record(path)
+
+        self.assertEqual(catalog.jobs()["one"]["count"], 1)
+
+    def test_discard(self):
+        self._frame("one-0.jpg")
+        self._frame("two-0.jpg")
+        catalog = self._catalog()
+        catalog.jobs()
+
+        os.remove(os.path.join(self.capture_dir, "one-0.jpg"))
+        catalog.discard({"one"})
+
+        with mock.patch.object(catalog, "_scan") as scan:
+            self.assertEqual(set(catalog.jobs()), {"two"})
+            scan.assert_not_called()
+
+    def test_external_change(self):
+        self._frame("one-0.jpg")
+        catalog = self._catalog()
+        catalog.jobs()
+
+        self._frame("two-0.jpg")
+
+        self.assertEqual(set(catalog.jobs()), {"one", "two"})
+
+    def test_persisted(self):
+        self._frame("one-0.jpg", size=3)
+        catalog = self._catalog()
+        catalog.jobs()
+        catalog.save()
+
+        restored = self._catalog()
+        with mock.patch.object(restored, "_scan") as scan:
+            jobs = restored.jobs()
+            scan.assert_not_called()
+
+        self.assertEqual(jobs, catalog.jobs())
+
+    def test_persisted_stale(self):
+        self._frame("one-0.jpg")
+        catalog = self._catalog()
+        catalog.jobs()
+        catalog.save()
+
+        self._frame("two-0.jpg")
+
+        self.assertEqual(set(self._catalog().jobs()), {"one", "two"})
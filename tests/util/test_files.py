@@ -2,17 +2,21 @@ __license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agp
 __copyright__ = "Copyright (C) 2021 The OctoPrint Project - Released under terms of the AGPLv3 License"
 
 import datetime
+import gzip
 import os
 import re
 
 import pytest
 
+import octoprint.util.files
 from octoprint.util.files import (
+    get_precompressed_variant,
     m20_timestamp_to_unix_timestamp,
     sanitize_filename,
     search_through_file,
     search_through_file_python,
     unix_timestamp_to_m20_timestamp,
+    write_precompressed_variants,
 )
 
 
@@ -117,3 +121,51 @@ def test_m20_timestamp_to_unix_timestamp(val, expected):
 @pytest.mark.parametrize("expected,val", m20_timestamp_tests)
 def test_unix_timestamp_to_m20_timestamp(expected, val):
     assert unix_timestamp_to_m20_timestamp(val) == expected
+
+
+def test_write_precompressed_variants(tmp_path, monkeypatch):
+    monkeypatch.setattr(octoprint.util.files, "brotli", None)
+
+    path = tmp_path / "bundle.js"
+    (tmp_path / "bundle.js.br").write_bytes(b"outdated")
+
+    write_precompressed_variants(str(path), b"content")
+
+    assert gzip.decompress((tmp_path / "bundle.js.gz").read_bytes()) == b"content"
+    assert not (tmp_path / "bundle.js.br").exists()
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, variants, expected",
+    (
+        ("gzip, deflate, br", (".br", ".gz"), "br"),
+        ("gzip, deflate, br", (".gz",), "gzip"),
+        ("gzip", (".br", ".gz"), "gzip"),
+        ("br;q=0, gzip;q=0.5", (".br", ".gz"), "gzip"),
+        ("gzip;q=1, br;q=0.1", (".br", ".gz"), "gzip"),
+        ("gzip;q=0.5, br;q=0.5", (".br", ".gz"), "br"),
+        ("*;q=0.5, gzip", (".br", ".gz"), "gzip"),
+        ("*", (".br", ".gz"), "br"),
+        ("*, br;q=0", (".br", ".gz"), "gzip"),
+        ("identity", (".br", ".gz"), None),
+        ("", (".br", ".gz"), None),
+        ("br", (".gz",), None),
+    ),
+)
+def test_get_precompressed_variant(tmp_path, accept_encoding, variants, expected):
+    path = tmp_path / "bundle.js"
+    path.write_bytes(b"content")
+    for extension in variants:
+        (tmp_path / f"bundle.js{extension}").write_bytes(b"compressed")
+
+    actual = get_precompressed_variant(str(path), accept_encoding)
+
+    if expected is None:
+        assert actual is None
+    else:
+        variant, encoding = actual
+        assert encoding == expected
+        assert (
+            variant
+            == str(path) + dict(octoprint.util.files.PRECOMPRESSED_VARIANTS)[encoding]
+        )
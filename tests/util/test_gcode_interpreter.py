@@ -0,0 +1,156 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import pytest
+
+from octoprint.util.gcodeInterpreter import GcodeLookahead, TimeIndex, gcode
+
+# three layers of 10 moves each over 10mm at F600, so one second per move
+LAYER_LINES = 10
+GCODE = (
+    "\n".join(
+        ["G90", "M82", "G28", "G1 Z0.2 F600"]
+        + [
+            line
+            for layer in range(3)
+            for line in (
+                ([f"G1 Z{0.2 * (layer + 1):.1f}"] if layer else [])
+                + (["M0"] if layer == 2 else [])
+                + [
+                    f"G1 X{10 * (i % 2 + 1)} Y10 E{layer * LAYER_LINES + i + 1}"
+                    for i in range(LAYER_LINES)
+                ]
+            )
+        ]
+    )
+    + "\n"
+)
+
+
+@pytest.fixture
+def gcode_file(tmp_path):
+    path = tmp_path / "test.gcode"
+    path.write_text(GCODE, encoding="utf-8")
+    return str(path)
+
+
+def analyse(path):
+    interpreter = gcode(incl_time_index=True)
+    interpreter.load(path)
+    return interpreter
+
+
+def test_interpret_matches_load(gcode_file):
+    interpreter = gcode()
+    steps = list(interpreter.interpret(GCODE.splitlines(keepends=True)))
+
+    assert len(steps) == len(GCODE.splitlines())
+    pos, elapsed, layers = steps[-1]
+    assert pos == len(GCODE.encode("utf-8"))
+    assert layers == 3
+    assert elapsed == pytest.approx(analyse(gcode_file).totalMoveTimeMinute * 60)
+
+
+def test_time_index(gcode_file):
+    interpreter = analyse(gcode_file)
+    index = TimeIndex.from_dict(interpreter.get_result()["time_index"])
+
+    assert index.layer_count == 3
+    assert index.size == len(GCODE.encode("utf-8"))
+    # times are stored rounded to centiseconds
+    assert index.total == pytest.approx(interpreter.totalMoveTimeMinute * 60, abs=0.01)
+
+    start, time = index.next_layer(0)
+    assert index.layer_at(start) == 0
+    assert index.layer_at(start + 1) == 1
+
+    second, second_time = index.next_layer(start + 1)
+    assert index.layer_at(second + 1) == 2
+    assert second_time - time == pytest.approx(LAYER_LINES, abs=1.0)
+
+    assert index.next_layer(index.size) is None
+    assert index.time_at(index.size) == index.total
+
+
+def test_time_index_from_invalid_dict():
+    assert TimeIndex.from_dict(None) is None
+    assert (
+        TimeIndex.from_dict({"positions": [0, 1], "times": [0.0], "layers": [0]}) is None
+    )
+    assert (
+        TimeIndex.from_dict({"positions": [5, 1], "times": [0, 1], "layers": [0, 0]})
+        is None
+    )
+
+
+def test_lookahead_follows_print(gcode_file):
+    index = TimeIndex.from_dict(analyse(gcode_file).get_result()["time_index"])
+    lookahead = GcodeLookahead(
+        gcode_file, lines=5, time_index=index, pausing_commands=["M0"]
+    )
+
+    try:
+        assert lookahead.elapsed == 0.0
+        assert lookahead.layer == 0
+        assert lookahead.layer_count == 3
+        assert lookahead.left == pytest.approx(index.total)
+        assert lookahead.next_pause is None
+
+        pos = 0
+        layers = []
+        pauses = []
+        for line in GCODE.splitlines(keepends=True):
+            pos += len(line.encode("utf-8"))
+            lookahead.advance(pos)
+            layers.append(lookahead.layer)
+            if lookahead.next_pause is not None:
+                pauses.append(lookahead.next_pause)
+
+            assert lookahead.elapsed == pytest.approx(index.time_at(pos), abs=1.0)
+            assert lookahead.left == pytest.approx(
+                max(0.0, index.total - lookahead.elapsed)
+            )
+
+        assert layers[-1] == 3
+        assert layers == sorted(layers)
+
+        # the pause was seen coming up to five lines ahead, counting down to it
+        assert len(pauses) == 5
+        assert pauses == sorted(pauses, reverse=True)
+        assert pauses[-1] == 0.0
+
+        assert lookahead.left == 0.0
+        assert lookahead.next_layer is None
+    finally:
+        lookahead.close()
+
+
+def test_lookahead_next_layer_from_index(gcode_file):
+    index = TimeIndex.from_dict(analyse(gcode_file).get_result()["time_index"])
+    lookahead = GcodeLookahead(gcode_file, lines=2, time_index=index)
+
+    try:
+        start, time = index.next_layer(0)
+        assert lookahead.next_layer == pytest.approx(time)
+    finally:
+        lookahead.close()
+
+
+def test_lookahead_resumed(gcode_file):
+    index = TimeIndex.from_dict(analyse(gcode_file).get_result()["time_index"])
+    second, _ = index.next_layer(index.next_layer(0)[0] + 1)
+    pos = second + len("G1 Z0.6\n")
+
+    with_index = GcodeLookahead(gcode_file, pos=pos, time_index=index)
+    without_index = GcodeLookahead(gcode_file, pos=pos)
+
+    try:
+        assert with_index.layer == 2
+        assert with_index.elapsed == pytest.approx(index.time_at(pos))
+
+        assert without_index.layer is None
+        assert without_index.elapsed is None
+        assert without_index.left is None
+    finally:
+        with_index.close()
+        without_index.close()
@@ -0,0 +1,123 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import unittest
+
+from octoprint.util.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        counter = self.registry.register(Counter("test_total", "A counter"))
+        counter.inc()
+        counter.inc(2)
+
+        self.assertEqual(
+            self.registry.render(),
+            "# HELP test_total A counter\n# TYPE test_total counter\ntest_total 3.0\n",
+        )
+
+    def test_counter_decrease(self):
+        counter = Counter("test_total", "A counter")
+        with self.assertRaises(ValueError):
+            counter.inc(-1)
+
+    def test_labels(self):
+        counter = self.registry.register(
+            Counter("test_total", "A counter", labelnames=("direction",))
+        )
+        counter.labels("sent").inc()
+        counter.labels(direction="received").inc(2)
+        counter.labels('weird "value"\n').inc()
+
+        output = self.registry.render()
+        self.assertIn('test_total{direction="sent"} 1.0\n', output)
+        self.assertIn('test_total{direction="received"} 2.0\n', output)
+        self.assertIn('test_total{direction="weird \\"value\\"\\n"} 1.0\n', output)
+
+    def test_labels_required(self):
+        counter = Counter("test_total", "A counter", labelnames=("direction",))
+
+        with self.assertRaises(ValueError):
+            counter.inc()
+        with self.assertRaises(ValueError):
+            counter.labels()
+        with self.assertRaises(ValueError):
+            counter.labels(direction="sent", unknown="label")
+
+    def test_gauge(self):
+        gauge = self.registry.register(Gauge("test_depth", "A gauge"))
+        gauge.set(5)
+        gauge.dec(2)
+        self.assertEqual(gauge.get(), 3.0)
+
+        gauge.set_function(lambda: 42)
+        self.assertIn("test_depth 42.0\n", self.registry.render())
+
+    def test_gauge_failing_function(self):
+        failing = self.registry.register(Gauge("test_failing", "A failing gauge"))
+        failing.set_function(lambda: 1 / 0)
+        self.registry.register(Gauge("test_working", "A working gauge")).set(1)
+
+        output = self.registry.render()
+        self.assertNotIn("test_failing", output)
+        self.assertIn("test_working 1.0\n", output)
+
+    def test_histogram(self):
+        histogram = self.registry.register(
+            Histogram("test_seconds", "A histogram", buckets=(0.1, 1.0))
+        )
+        histogram.observe(0.05)
+        histogram.observe(0.1)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        self.assertEqual(
+            self.registry.render(),
+            "# HELP test_seconds A histogram\n"
+            "# TYPE test_seconds histogram\n"
+            'test_seconds_bucket{le="0.1"} 2.0\n'
+            'test_seconds_bucket{le="1.0"} 3.0\n'
+            'test_seconds_bucket{le="+Inf"} 4.0\n'
+            "test_seconds_sum 5.65\n"
+            "test_seconds_count 4.0\n",
+        )
+
+    def test_histogram_time(self):
+        histogram = Histogram("test_seconds", "A histogram", labelnames=("blueprint",))
+
+        with histogram.labels("api").time():
+            pass
+
+        counts, total = histogram.labels("api").get()
+        self.assertEqual(counts[-1], 1)
+        self.assertGreaterEqual(total, 0)
+
+    def test_register_existing(self):
+        counter = self.registry.register(Counter("test_total", "A counter"))
+
+        self.assertIs(self.registry.register(Counter("test_total", "A counter")), counter)
+        with self.assertRaises(ValueError):
+            self.registry.register(Gauge("test_total", "A gauge"))
+        with self.assertRaises(ValueError):
+            self.registry.register(
+                Counter("test_total", "A counter", labelnames=("direction",))
+            )
+
+    def test_unregister(self):
+        counter = self.registry.register(Counter("test_total", "A counter"))
+        self.registry.unregister(counter)
+
+        self.assertIsNone(self.registry.get("test_total"))
+        self.assertEqual(self.registry.render(), "")
+
+    def test_invalid_names(self):
+        with self.assertRaises(ValueError):
+            Counter("invalid-name", "A counter")
+        with self.assertRaises(ValueError):
+            Counter("test_total", "A counter", labelnames=("invalid-label",))
+        with self.assertRaises(ValueError):
+            Histogram("test_seconds", "A histogram", labelnames=("le",))
@@ -0,0 +1,115 @@
+__license__ = "GNU Affero General Public License http://www.gnu.org/licenses/agpl.html"
+__copyright__ = "Copyright (C) 2026 The OctoPrint Project - Released under terms of the AGPLv3 License"
+
+import threading
+import time
+import unittest
+
+from octoprint.util.profiler import TRUNCATED, SamplingProfiler
+
+
+def _wait_for_profiler(event):
+    event.wait()
+
+
+class SamplingProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.event = threading.Event()
+        self.addCleanup(self.event.set)
+
+        self.thread = threading.Thread(
+            target=_wait_for_profiler, args=(self.event,), name="Profiled Thread"
+        )
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _stacks(self, folded):
+        result = {}
+        for line in folded.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            result[stack] = int(count)
+        return result
+
+    def test_sample(self):
+        profiler = SamplingProfiler()
+        profiler.sample()
+        profiler.sample()
+
+        stacks = self._stacks(profiler.folded())
+        profiled = [stack for stack in stacks if stack.startswith("Profiled_Thread;")]
+
+        self.assertEqual(len(profiled), 1)
+        self.assertIn("test_profiler.py:_wait_for_profiler;", profiled[0])
+        self.assertEqual(stacks[profiled[0]], 2)
+
+        # the sampling thread itself is never part of the samples
+        self.assertFalse(any("SamplingProfiler.sample" in stack for stack in stacks))
+
+    def test_max_stacks(self):
+        other = threading.Thread(target=self.event.wait, name="Other Thread")
+        other.daemon = True
+        other.start()
+
+        profiler = SamplingProfiler(max_stacks=1)
+        profiler.sample()
+
+        stacks = self._stacks(profiler.folded())
+        truncated = [stack for stack in stacks if stack.endswith(";" + TRUNCATED)]
+        self.assertEqual(len(stacks) - len(truncated), 1)
+        self.assertGreaterEqual(len(truncated), 1)
+
+    def test_max_depth(self):
+        profiler = SamplingProfiler(max_depth=2)
+        profiler.sample()
+
+        for stack in self._stacks(profiler.folded()):
+            self.assertLessEqual(len(stack.split(";")), 4)
+
+    def _profiled_stack(self, profiler):
+        profiler.sample()
+        return next(
+            stack.split(";")
+            for stack in self._stacks(profiler.folded())
+            if stack.startswith("Profiled_Thread;")
+        )
+
+    def test_max_depth_keeps_leaf(self):
+        full = self._profiled_stack(SamplingProfiler())
+        truncated = self._profiled_stack(SamplingProfiler(max_depth=2))
+
+        self.assertGreater(len(full), 4)
+        self.assertEqual(truncated, ["Profiled_Thread", TRUNCATED] + full[-2:])
+
+    def test_window(self):
+        profiler = SamplingProfiler(window=2)
+
+        for offset in (300, 120, 0):
+            profiler._slots.append((time.monotonic() - offset, {f"Slot;{offset}": 1}))
+
+        self.assertEqual(len(profiler._slots), 2)
+        self.assertEqual(self._stacks(profiler.folded()), {"Slot;120": 1, "Slot;0": 1})
+        self.assertEqual(self._stacks(profiler.folded(minutes=1)), {"Slot;0": 1})
+
+    def test_overhead_limit(self):
+        profiler = SamplingProfiler(interval=0.01, max_overhead=0.01)
+
+        profiler._cost = 0.0001
+        self.assertEqual(profiler._effective_interval(), 0.01)
+
+        profiler._cost = 0.001
+        self.assertAlmostEqual(profiler._effective_interval(), 0.1)
+
+    def test_start_stop(self):
+        profiler = SamplingProfiler(interval=0.01)
+        profiler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while profiler.stats()["samples"] < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            profiler.stop()
+
+        stats = profiler.stats()
+        self.assertFalse(stats["running"])
+        self.assertGreaterEqual(stats["samples"], 3)
+        self.assertGreater(stats["overhead"], 0)